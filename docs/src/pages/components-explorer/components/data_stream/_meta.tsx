@@ -0,0 +1,13 @@
+import { Component } from "@site/src/types";
+
+const ComponentMetadata: Component = {
+  title: "Data Stream",
+  name: "data_stream",
+  description:
+    "Passes frames, detector results and events between the parts of Viseron.",
+  image: "/img/undraw_server.svg",
+  tags: ["system"],
+  category: null,
+};
+
+export default ComponentMetadata;
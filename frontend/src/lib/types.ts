@@ -336,6 +336,7 @@ export type CameraEvent =
 
 export type CameraEvents = {
   events: CameraEvent[];
+  next_cursor: string | null;
 };
 
 export type CameraSnapshotEvent =
@@ -1,12 +1,32 @@
 """Manager for communication between python shells."""
 
+from __future__ import annotations
+
+import logging
+import secrets
+import threading
+import time
 from collections.abc import Callable
+from multiprocessing import resource_tracker
 from multiprocessing.managers import (  # type: ignore[attr-defined]
     BaseManager,
     dispatch,
     listener_client,
 )
+from multiprocessing.shared_memory import SharedMemory
 from queue import Queue
+from typing import Any
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+SHARED_FRAME_KEY = "shared_frame"
+SHARED_FRAME_SLOT_TIMEOUT = 30
+# Frames smaller than this are pickled, since copying them to shared memory is not
+# faster. Measured with scripts/benchmark_subprocess_frames.py, where shared memory
+# was consistently faster from 416x416 RGB frames and up
+SHARED_FRAME_MIN_BYTES = 416 * 416 * 3
 
 
 class QueueManager(BaseManager):
@@ -57,3 +77,163 @@ def connect(address: str, port: int, authkey: str) -> tuple[Queue, Queue]:
     process_queue = manager.get_process_queue()
     output_queue = manager.get_output_queue()
     return process_queue, output_queue
+
+
+class SharedFramePool:
+    """Pool of shared memory slots used to pass frames to a subprocess.
+
+    The frame of a work item is copied to a free slot and replaced with a reference
+    to the slot, so that only the reference is pickled and sent over the queue.
+    The subprocess maps the slot by name using SharedFrameReader.
+    The slot is released when the item is returned by the subprocess, or reclaimed
+    after SHARED_FRAME_SLOT_TIMEOUT seconds if the item was lost.
+
+    If the frame is smaller than min_frame_bytes, no slot is free or shared memory
+    cannot be allocated, the item is sent as is.
+    Slots are allocated lazily and grown if a larger frame arrives.
+    """
+
+    def __init__(
+        self, slots: int, min_frame_bytes: int = SHARED_FRAME_MIN_BYTES
+    ) -> None:
+        self._min_frame_bytes = min_frame_bytes
+        self._prefix = f"viseron_{secrets.token_hex(4)}"
+        self._lock = threading.Lock()
+        self._free = list(range(slots))
+        # Slot -> (sequence number, time of acquisition)
+        self._acquired: dict[int, tuple[int, float]] = {}
+        self._sequence = 0
+        self._segments: dict[int, SharedMemory] = {}
+        self._generation = 0
+
+    def _acquire(self) -> tuple[int, int] | None:
+        """Return a free slot and its sequence number.
+
+        Slots of lost items are reclaimed if no slot is free.
+        """
+        with self._lock:
+            if not self._free:
+                now = time.monotonic()
+                for slot, (_, acquired_at) in list(self._acquired.items()):
+                    if now - acquired_at > SHARED_FRAME_SLOT_TIMEOUT:
+                        del self._acquired[slot]
+                        self._free.append(slot)
+            if not self._free:
+                return None
+            slot = self._free.pop()
+            self._sequence += 1
+            self._acquired[slot] = (self._sequence, time.monotonic())
+            return slot, self._sequence
+
+    def _release(self, slot: int, sequence: int) -> None:
+        """Return slot to the pool, unless it was reclaimed and acquired again."""
+        with self._lock:
+            acquired = self._acquired.get(slot)
+            if acquired is not None and acquired[0] == sequence:
+                del self._acquired[slot]
+                self._free.append(slot)
+
+    def _segment(self, slot: int, size: int) -> SharedMemory:
+        """Return the segment of slot, (re)creating it if it is too small."""
+        segment = self._segments.get(slot)
+        if segment is not None and segment.size >= size:
+            return segment
+        if segment is not None:
+            del self._segments[slot]
+            segment.close()
+            segment.unlink()
+        self._generation += 1
+        segment = SharedMemory(
+            name=f"{self._prefix}_{slot}_{self._generation}", create=True, size=size
+        )
+        self._segments[slot] = segment
+        return segment
+
+    def put(self, item: Any) -> Any:
+        """Return item with its frame moved to a shared memory slot."""
+        if not isinstance(item, dict):
+            return item
+        frame = item.get("frame")
+        if (
+            not isinstance(frame, np.ndarray)
+            or frame.nbytes == 0
+            or frame.nbytes < self._min_frame_bytes
+        ):
+            return item
+
+        acquired = self._acquire()
+        if acquired is None:
+            return item
+        slot, sequence = acquired
+        try:
+            segment = self._segment(slot, frame.nbytes)
+        except OSError as error:
+            LOGGER.debug(f"Failed to allocate shared memory, sending frame: {error}")
+            self._release(slot, sequence)
+            return item
+
+        np.ndarray(frame.shape, frame.dtype, buffer=segment.buf)[...] = frame
+        shared_item = {key: value for key, value in item.items() if key != "frame"}
+        shared_item[SHARED_FRAME_KEY] = (
+            slot,
+            sequence,
+            segment.name,
+            frame.shape,
+            frame.dtype.str,
+        )
+        return shared_item
+
+    def release(self, item: Any) -> None:
+        """Release the slot used by item, if any."""
+        if isinstance(item, dict) and SHARED_FRAME_KEY in item:
+            self._release(*item[SHARED_FRAME_KEY][:2])
+
+    def close(self) -> None:
+        """Free all shared memory."""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
+                segment.unlink()
+            self._segments.clear()
+
+
+class SharedFrameReader:
+    """Map the shared memory slots of a SharedFramePool in a subprocess."""
+
+    def __init__(self) -> None:
+        self._segments: dict[int, SharedMemory] = {}
+
+    def _attach(self, slot: int, name: str) -> SharedMemory:
+        """Return the mapped segment of slot."""
+        segment = self._segments.get(slot)
+        if segment is not None and segment.name == name:
+            return segment
+        if segment is not None:
+            try:
+                segment.close()
+            except BufferError:
+                # A view of the old segment is still alive, let it be collected
+                pass
+
+        segment = SharedMemory(name=name)
+        # The pool owns the segment. Stop the resource tracker of this process from
+        # unlinking it on exit, https://github.com/python/cpython/issues/82300
+        resource_tracker.unregister(
+            segment._name, "shared_memory"  # type: ignore[attr-defined] # pylint: disable=protected-access
+        )
+        self._segments[slot] = segment
+        return segment
+
+    def read(self, item: Any) -> None:
+        """Set the frame of item to a view of its shared memory slot."""
+        if not isinstance(item, dict) or SHARED_FRAME_KEY not in item:
+            return
+        slot, _, name, shape, dtype = item[SHARED_FRAME_KEY]
+        segment = self._attach(slot, name)
+        item["frame"] = np.ndarray(shape, dtype, buffer=segment.buf)
+
+    @staticmethod
+    def done(item: Any) -> None:
+        """Drop the frame view so that only the slot reference is sent back."""
+        if isinstance(item, dict) and SHARED_FRAME_KEY in item:
+            item.pop("frame", None)
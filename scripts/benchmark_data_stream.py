@@ -0,0 +1,143 @@
+"""Benchmark DataStream callback dispatching and wildcard topic matching.
+
+Compares the previous thread-per-callback approach with the bounded CallbackDispatcher
+by measuring events/sec and p99 callback latency.
+Compares matching wildcard subscriptions using fnmatch against the TopicTrie.
+
+Usage: python -m scripts.benchmark_data_stream --events 2000 --subscribers 10
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import threading
+import time
+import uuid
+
+from viseron.components.data_stream.dispatcher import CallbackDispatcher
+from viseron.components.data_stream.topic_trie import TopicTrie
+
+
+class _Recorder:
+    """Record callback latencies."""
+
+    def __init__(self, expected: int) -> None:
+        self.latencies: list[float] = []
+        self._expected = expected
+        self._lock = threading.Lock()
+        self.done = threading.Event()
+
+    def callback(self, published_at: float) -> None:
+        """Record latency of a single callback."""
+        latency = time.perf_counter() - published_at
+        with self._lock:
+            self.latencies.append(latency)
+            if len(self.latencies) == self._expected:
+                self.done.set()
+
+    def p99(self) -> float:
+        """Return p99 latency in milliseconds."""
+        latencies = sorted(self.latencies)
+        return latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+def bench_threads(events: int, subscribers: int) -> tuple[float, float]:
+    """Start a new thread for every callback, like DataStream used to."""
+    recorder = _Recorder(events * subscribers)
+    start = time.perf_counter()
+    for _ in range(events):
+        for _ in range(subscribers):
+            threading.Thread(
+                target=recorder.callback, args=(time.perf_counter(),), daemon=True
+            ).start()
+    recorder.done.wait()
+    elapsed = time.perf_counter() - start
+    return events * subscribers / elapsed, recorder.p99()
+
+
+def bench_dispatcher(events: int, subscribers: int) -> tuple[float, float]:
+    """Run callbacks using the CallbackDispatcher."""
+    recorder = _Recorder(events * subscribers)
+    dispatcher = CallbackDispatcher(32, events)
+    unique_ids = [uuid.uuid4() for _ in range(subscribers)]
+    start = time.perf_counter()
+    for _ in range(events):
+        for unique_id in unique_ids:
+            dispatcher.submit(
+                unique_id, "benchmark", recorder.callback, time.perf_counter()
+            )
+    recorder.done.wait()
+    elapsed = time.perf_counter() - start
+    dispatcher.stop()
+    return events * subscribers / elapsed, recorder.p99()
+
+
+def _wildcard_topics(wildcards: int) -> list[str]:
+    """Return wildcard topics similar to the ones used by Viseron."""
+    topics = []
+    for i in range(wildcards):
+        camera = f"camera_{i // 10}"
+        topics.append(
+            [
+                f"{camera}/camera_event/*/*",
+                f"event/{camera}/*",
+                f"domain/setup/*/camera/{camera}",
+                f"{camera}/*/state",
+                f"*/camera_event/object_detected_{i}/*",
+            ][i % 5]
+        )
+    return topics
+
+
+def bench_wildcards(events: int, wildcards: int) -> tuple[float, float]:
+    """Match published topics against wildcard subscriptions.
+
+    Returns topics/sec using fnmatch on every pattern and using the TopicTrie.
+    """
+    patterns = _wildcard_topics(wildcards)
+    published = [
+        f"camera_{i % 100}/camera_event/object_detected_{i % 50}/objects"
+        for i in range(events)
+    ]
+
+    start = time.perf_counter()
+    for topic in published:
+        _ = [pattern for pattern in patterns if fnmatch.fnmatch(topic, pattern)]
+    fnmatch_rate = events / (time.perf_counter() - start)
+
+    trie = TopicTrie()
+    for pattern in patterns:
+        trie.add(pattern, uuid.uuid4(), pattern)
+    start = time.perf_counter()
+    for topic in published:
+        trie.match(topic)
+    trie_rate = events / (time.perf_counter() - start)
+    return fnmatch_rate, trie_rate
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--subscribers", type=int, default=10)
+    parser.add_argument("--wildcards", type=int, default=10000)
+    args = parser.parse_args()
+    events = args.events
+    subscribers = args.subscribers
+
+    for name, bench in (
+        ("thread per callback", bench_threads),
+        ("dispatcher", bench_dispatcher),
+    ):
+        events_per_sec, p99 = bench(events, subscribers)
+        print(f"{name:<20} {events_per_sec:>10.0f} events/sec  p99 {p99:.2f} ms")
+
+    wildcards = args.wildcards
+    fnmatch_rate, trie_rate = bench_wildcards(events, wildcards)
+    print(f"{wildcards} wildcard subscriptions")
+    print(f"{'fnmatch':<20} {fnmatch_rate:>10.0f} topics/sec")
+    print(f"{'topic trie':<20} {trie_rate:>10.0f} topics/sec")
+
+
+if __name__ == "__main__":
+    main()
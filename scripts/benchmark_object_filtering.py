@@ -0,0 +1,162 @@
+"""Benchmark filtering detections against labels and zones.
+
+Compares creating a DetectedObject for every detection and evaluating the label
+filters and zones per object, with evaluating them for a DetectionBatch at once and
+only creating the objects that pass, like in a crowded scene.
+
+Usage: python -m scripts.benchmark_object_filtering --detections 500 --zones 20
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from viseron.domains.object_detector.const import (
+    CONFIG_LABEL_CONFIDENCE,
+    CONFIG_LABEL_HEIGHT_MAX,
+    CONFIG_LABEL_HEIGHT_MIN,
+    CONFIG_LABEL_LABEL,
+    CONFIG_LABEL_REQUIRE_MOTION,
+    CONFIG_LABEL_STORE,
+    CONFIG_LABEL_STORE_INTERVAL,
+    CONFIG_LABEL_TRIGGER_EVENT_RECORDING,
+    CONFIG_LABEL_WIDTH_MAX,
+    CONFIG_LABEL_WIDTH_MIN,
+)
+from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
+from viseron.helpers import object_in_polygon
+from viseron.helpers.filter import Filter
+
+FRAME_RES = (1920, 1080)
+MODEL_RES = (640, 640)
+LABELS = ["person", "car", "truck", "bicycle", "dog", "cat", "bird", "backpack"]
+
+Zone = tuple[dict[str, Filter], np.ndarray]
+
+
+def _filters(labels: list[str], confidence: float) -> dict[str, Filter]:
+    return {
+        label: Filter(
+            FRAME_RES,
+            {
+                CONFIG_LABEL_LABEL: label,
+                CONFIG_LABEL_CONFIDENCE: confidence,
+                CONFIG_LABEL_WIDTH_MIN: 0.01,
+                CONFIG_LABEL_WIDTH_MAX: 0.5,
+                CONFIG_LABEL_HEIGHT_MIN: 0.01,
+                CONFIG_LABEL_HEIGHT_MAX: 0.8,
+                CONFIG_LABEL_TRIGGER_EVENT_RECORDING: True,
+                CONFIG_LABEL_STORE: True,
+                CONFIG_LABEL_STORE_INTERVAL: 60,
+                CONFIG_LABEL_REQUIRE_MOTION: False,
+            },
+            [],
+        )
+        for label in labels
+    }
+
+
+def _zone(rng: np.random.Generator) -> np.ndarray:
+    """Return a polygon around a random center."""
+    center = rng.uniform((200, 200), (FRAME_RES[0] - 200, FRAME_RES[1] - 200))
+    angles = np.sort(rng.uniform(0, 2 * np.pi, 8))
+    radii = rng.uniform(80, 400, 8)
+    return np.column_stack(
+        (center[0] + radii * np.cos(angles), center[1] + radii * np.sin(angles))
+    ).astype(np.int32)
+
+
+def bench_per_object(
+    detections: tuple[list[str], list[float], list[list[float]]],
+    fov_filters: dict[str, Filter],
+    zones: list[Zone],
+) -> int:
+    """Return number of relevant objects, evaluating each object on its own."""
+    objects = [
+        DetectedObject.from_absolute(
+            label, confidence, *box, frame_res=FRAME_RES, model_res=MODEL_RES
+        )
+        for label, confidence, box in zip(*detections)
+    ]
+    relevant = []
+    for obj in objects:
+        in_fov = bool(
+            fov_filters.get(obj.label) and fov_filters[obj.label].filter_object(obj)
+        )
+        in_zones = [
+            bool(
+                zone_filters.get(obj.label)
+                and zone_filters[obj.label].filter_object(obj)
+                and object_in_polygon(FRAME_RES, obj, coordinates)
+            )
+            for zone_filters, coordinates in zones
+        ]
+        if in_fov or any(in_zones):
+            relevant.append(obj)
+    return len(relevant)
+
+
+def bench_batch(
+    detections: tuple[list[str], list[float], list[list[float]]],
+    fov_filters: dict[str, Filter],
+    zones: list[Zone],
+) -> int:
+    """Return number of relevant objects, evaluating all detections at once."""
+    batch = DetectionBatch.from_absolute(
+        *detections, frame_res=FRAME_RES, model_res=MODEL_RES
+    )
+    relevant = np.zeros(len(batch), dtype=bool)
+    for object_filter in fov_filters.values():
+        relevant |= object_filter.filter_batch(batch)
+    for zone_filters, coordinates in zones:
+        in_zone = np.zeros(len(batch), dtype=bool)
+        for object_filter in zone_filters.values():
+            in_zone |= object_filter.filter_batch(batch)
+        indices = np.flatnonzero(in_zone)
+        in_zone[indices] = batch.in_polygon(FRAME_RES, coordinates, indices)
+        relevant |= in_zone
+    return len(batch.objects(np.flatnonzero(relevant)))
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--detections", type=int, default=500)
+    parser.add_argument("--zones", type=int, default=20)
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    top_left = rng.uniform(0, MODEL_RES[0] - 100, (args.detections, 2))
+    sizes = rng.uniform(5, 100, (args.detections, 2))
+    detections = (
+        rng.choice(LABELS, args.detections).tolist(),
+        rng.uniform(0.05, 1, args.detections).tolist(),
+        np.floor(np.hstack((top_left, top_left + sizes))).tolist(),
+    )
+    fov_filters = _filters(["person", "car"], 0.8)
+    zones = [
+        (_filters(["person", "car", "bicycle"], 0.5), _zone(rng))
+        for _ in range(args.zones)
+    ]
+
+    print(f"{args.detections} detections, {args.zones} zones")
+    for name, bench in (
+        ("per object", bench_per_object),
+        ("batch", bench_batch),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            relevant = bench(detections, fov_filters, zones)
+        frames_per_sec = args.frames / (time.perf_counter() - start)
+        print(
+            f"{name:<12} {frames_per_sec:>10.1f} frames/sec  "
+            f"{relevant} relevant objects"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark segment lookups for recordings and time periods.
+
+Fills the files table of a scratch PostgreSQL database with segments and compares
+the previous query, which filtered on an expression of orig_ctime and duration,
+with the range scan on idx_files_orig_ctime used by get_time_period_fragments.
+All tables are dropped when the benchmark is done, so never point it at a
+database that is in use.
+
+Usage: python -m scripts.benchmark_segment_queries --url postgresql://... --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import statistics
+import time
+
+from sqlalchemy import and_, create_engine, desc, func, or_, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from viseron.components.storage.const import (
+    TIER_CATEGORY_RECORDER,
+    TIER_SUBCATEGORY_SEGMENTS,
+)
+from viseron.components.storage.models import Base, Files
+from viseron.components.storage.queries import get_time_period_fragments
+
+CAMERAS = 10
+SEGMENT_DURATION = 5
+START = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _populate(session: Session, rows: int) -> None:
+    """Insert segments for CAMERAS cameras, every segment present in two tiers."""
+    session.execute(
+        text(
+            "INSERT INTO files (tier_id, tier_path, camera_identifier, category, "
+            "subcategory, path, directory, filename, size, duration, orig_ctime, "
+            "created_at, updated_at) "
+            "SELECT n % 2, '/tier' || n % 2, 'camera_' || (n / 2) % :cameras, "
+            ":category, :subcategory, '/tier' || n % 2 || '/' || n, '/', "
+            "(n / 2 / :cameras) || '.m4s', 1000, :duration, "
+            ":start + make_interval(secs => (n / 2 / :cameras) * :duration), "
+            "now(), now() "
+            "FROM generate_series(0, :rows - 1) AS n"
+        ),
+        {
+            "cameras": CAMERAS,
+            "category": TIER_CATEGORY_RECORDER,
+            "subcategory": TIER_SUBCATEGORY_SEGMENTS,
+            "duration": SEGMENT_DURATION,
+            "start": START,
+            "rows": rows,
+        },
+    )
+    session.commit()
+    session.execute(text("ANALYZE files"))
+
+
+def _previous_query(start: datetime.datetime, end: datetime.datetime, cameras):
+    """Return the query used before orig_end_time existed."""
+    row_number = (
+        func.row_number()
+        .over(partition_by=Files.filename, order_by=desc(Files.created_at))
+        .label("row_number")
+    )
+    files = (
+        select(Files)
+        .add_columns(row_number)
+        .where(Files.camera_identifier.in_(cameras))
+        .where(Files.category == TIER_CATEGORY_RECORDER)
+        .where(Files.subcategory == TIER_SUBCATEGORY_SEGMENTS)
+        .where(Files.duration.isnot(None))
+        .where(
+            or_(
+                Files.orig_ctime.between(start, end),
+                and_(
+                    start >= Files.orig_ctime,
+                    start
+                    <= Files.orig_ctime
+                    + func.make_interval(0, 0, 0, 0, 0, 0, func.round(Files.duration)),
+                ),
+            )
+        )
+        .cte("files")
+    )
+    return (
+        select(files).where(files.c.row_number == 1).order_by(files.c.orig_ctime.asc())
+    )
+
+
+def _timed(func_, iterations: int) -> float:
+    """Return the median runtime of func_ in milliseconds."""
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func_()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", required=True, help="URL of a scratch database")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    get_session = sessionmaker(bind=engine)
+    Base.metadata.create_all(engine)
+    try:
+        with get_session() as session:
+            _populate(session, args.rows)
+
+        span = args.rows // 2 // CAMERAS * SEGMENT_DURATION
+        start = START + datetime.timedelta(seconds=span // 2)
+        end = start + datetime.timedelta(minutes=10)
+        cameras = ["camera_0"]
+
+        def previous() -> None:
+            with get_session() as session:
+                session.execute(_previous_query(start, end, cameras)).all()
+
+        def current() -> None:
+            get_time_period_fragments(
+                cameras, start.timestamp(), end.timestamp(), get_session
+            )
+
+        print(f"Rows: {args.rows}, period: {start} - {end}")
+        print(f"Previous query: {_timed(previous, args.iterations):.2f} ms")
+        print(f"Range scan:     {_timed(current, args.iterations):.2f} ms")
+    finally:
+        Base.metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark passing frames to a subprocess through QueueManager queues.
+
+Compares pickling the frame over the queue with passing it through a
+SharedFramePool, by measuring items/sec with a number of items in flight, like
+when multiple cameras share one detector.
+
+Usage: python -m scripts.benchmark_subprocess_frames --items 500 --in-flight 8
+"""
+from __future__ import annotations
+
+import argparse
+import secrets
+import subprocess as sp
+import sys
+import threading
+import time
+from queue import Queue
+
+import numpy as np
+
+from manager import SharedFramePool, SharedFrameReader, connect, start, stop
+from viseron.helpers import get_free_port
+
+
+def echo(port: int, authkey: str) -> None:
+    """Map each frame and send the item back, like the detector scripts do."""
+    process_queue, output_queue = connect("127.0.0.1", port, authkey)
+    reader = SharedFrameReader()
+    while True:
+        item = process_queue.get()
+        if item is None:
+            return
+        reader.read(item)
+        item["result"] = int(item["frame"][0, 0, 0])
+        reader.done(item)
+        item.pop("frame", None)
+        output_queue.put(item)
+
+
+def bench(items: int, in_flight: int, resolution: int, shared: bool) -> float:
+    """Return items/sec for frames of resolution x resolution."""
+    process_queue: Queue = Queue()
+    output_queue: Queue = Queue()
+    port = get_free_port(port=50000)
+    authkey = secrets.token_hex(16)
+    manager = start("127.0.0.1", port, authkey, process_queue, output_queue)
+    server = manager.get_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Separate python shell, like SubProcessWorker spawns
+    process = sp.Popen(
+        [
+            sys.executable,
+            "-m",
+            "scripts.benchmark_subprocess_frames",
+            "--echo",
+            str(port),
+            authkey,
+        ]
+    )
+
+    # Always use shared memory to measure where it gets faster than pickling
+    frame_pool = SharedFramePool(in_flight, min_frame_bytes=0) if shared else None
+    frame = np.random.default_rng().integers(
+        0, 255, (resolution, resolution, 3), dtype=np.uint8
+    )
+
+    def put() -> None:
+        item = {"frame": frame, "camera_identifier": "benchmark"}
+        if frame_pool:
+            item = frame_pool.put(item)
+        process_queue.put(item)
+
+    start_time = time.perf_counter()
+    for _ in range(min(in_flight, items)):
+        put()
+    for sent in range(in_flight, items + in_flight):
+        result = output_queue.get()
+        if frame_pool:
+            frame_pool.release(result)
+        if sent < items:
+            put()
+    items_per_sec = items / (time.perf_counter() - start_time)
+
+    process_queue.put(None)
+    process.wait()
+    if frame_pool:
+        frame_pool.close()
+    stop("127.0.0.1", port, authkey)
+    return items_per_sec
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--in-flight", type=int, default=8)
+    parser.add_argument("--echo", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.echo:
+        echo(int(args.echo[0]), args.echo[1])
+        return
+
+    for resolution in (320, 416, 512, 640):
+        for name, shared in (("pickle", False), ("shared memory", True)):
+            items_per_sec = bench(args.items, args.in_flight, resolution, shared)
+            print(
+                f"{resolution}x{resolution} {name:<14} "
+                f"{items_per_sec:>10.0f} items/sec"
+            )
+
+
+if __name__ == "__main__":
+    main()
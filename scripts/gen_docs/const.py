@@ -2,7 +2,7 @@
 
 """gen_docs constants."""
 
-EXCLUDED_COMPONENTS = ["data_stream"]
+EXCLUDED_COMPONENTS: list[str] = []
 
 META_CONTENTS = """import {{ Component }} from "@site/src/types";
 
@@ -0,0 +1 @@
+"""Darknet tests."""
@@ -0,0 +1,60 @@
+"""Darknet subprocess tests."""
+
+from __future__ import annotations
+
+from queue import Queue
+
+import numpy as np
+
+from viseron.components.darknet.darknet_subprocess import (
+    decode_detections,
+    get_batch,
+)
+
+
+def _row(box: list[float], class_scores: list[float]) -> list[float]:
+    """Return a YOLO region layer row."""
+    return [*box, max(class_scores), *class_scores]
+
+
+def test_decode_detections() -> None:
+    """Test decoding and suppression of region layer rows."""
+    rows = np.array(
+        [
+            _row([0.5, 0.5, 0.2, 0.4], [0.9, 0.0]),
+            # Overlaps the first row with a lower confidence
+            _row([0.5, 0.5, 0.2, 0.38], [0.8, 0.0]),
+            # Same box but another class, not suppressed
+            _row([0.5, 0.5, 0.2, 0.4], [0.0, 0.7]),
+            # Below min_confidence
+            _row([0.1, 0.1, 0.1, 0.1], [0.2, 0.0]),
+        ],
+        dtype=np.float32,
+    )
+
+    class_ids, confidences, boxes = decode_detections(rows, 100, 200, 0.5, 0.4)
+
+    assert class_ids.tolist() == [0, 1]
+    np.testing.assert_allclose(confidences, [0.9, 0.7])
+    assert boxes.tolist() == [[40, 60, 20, 80], [40, 60, 20, 80]]
+
+
+def test_decode_detections_empty() -> None:
+    """Test decoding rows without any detection above min_confidence."""
+    rows = np.array([_row([0.5, 0.5, 0.2, 0.4], [0.1, 0.2])], dtype=np.float32)
+
+    class_ids, confidences, boxes = decode_detections(rows, 100, 100, 0.5, 0.4)
+
+    assert len(class_ids) == len(confidences) == len(boxes) == 0
+
+
+def test_get_batch() -> None:
+    """Test that jobs are batched up to max_batch."""
+    process_queue: Queue = Queue()
+    for i in range(5):
+        process_queue.put(i)
+
+    assert get_batch(process_queue, 3, 0.01) == [0, 1, 2]
+    assert get_batch(process_queue, 3, 0.01) == [3, 4]
+    process_queue.put(5)
+    assert get_batch(process_queue, 1, 0.01) == [5]
@@ -0,0 +1,121 @@
+"""Tests for the data stream callback dispatcher."""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+
+import pytest
+
+from viseron.components.data_stream.dispatcher import CallbackDispatcher
+
+
+@pytest.fixture
+def dispatcher():
+    """Return a dispatcher and stop it after the test."""
+    _dispatcher = CallbackDispatcher(4, 100, {"limited/*": 1})
+    yield _dispatcher
+    _dispatcher.stop()
+
+
+def _wait_for(condition, timeout: float = 5) -> None:
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            pytest.fail("Timed out waiting for condition")
+        time.sleep(0.01)
+
+
+def test_ordering_per_subscriber(dispatcher: CallbackDispatcher) -> None:
+    """Test that callbacks for the same subscriber run in order."""
+    received: list[int] = []
+    unique_id = uuid.uuid4()
+
+    def callback(data):
+        time.sleep(0.001)
+        received.append(data)
+
+    for i in range(1, 51):
+        dispatcher.submit(unique_id, "topic", callback, i)
+
+    _wait_for(lambda: len(received) == 50)
+    assert received == list(range(1, 51))
+    assert dispatcher.metrics["executed"] == 50
+
+
+def test_callback_without_data(dispatcher: CallbackDispatcher) -> None:
+    """Test that callbacks are called without arguments when data is empty."""
+    called = threading.Event()
+    dispatcher.submit(uuid.uuid4(), "topic", called.set, None)
+    assert called.wait(5)
+
+
+def test_topic_concurrency(dispatcher: CallbackDispatcher) -> None:
+    """Test that topic concurrency limits are respected."""
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+    done: list[int] = []
+
+    def callback(data):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+            done.append(data)
+
+    for i in range(10):
+        dispatcher.submit(uuid.uuid4(), "limited/topic", callback, i + 1)
+
+    _wait_for(lambda: len(done) == 10)
+    assert max_running == 1
+
+
+def test_drop_oldest() -> None:
+    """Test that the oldest item is dropped when a subscriber falls behind."""
+    dispatcher = CallbackDispatcher(1, 2)
+    release = threading.Event()
+    received: list[int] = []
+
+    def callback(data):
+        release.wait(5)
+        received.append(data)
+
+    unique_id = uuid.uuid4()
+    dispatcher.submit(unique_id, "topic", callback, 1)
+    _wait_for(lambda: dispatcher.metrics["busy_workers"] == 1)
+    for i in range(2, 6):
+        dispatcher.submit(unique_id, "topic", callback, i)
+    release.set()
+
+    _wait_for(lambda: len(received) == 3)
+    assert received == [1, 4, 5]
+    assert dispatcher.metrics["dropped"] == 2
+    dispatcher.stop()
+
+
+def test_topic_slot_released_after_removed_subscriber(
+    dispatcher: CallbackDispatcher,
+) -> None:
+    """Test that a removed waiting subscriber doesn't keep the topic slot."""
+    release = threading.Event()
+    received: list[int] = []
+
+    def callback(data):
+        if data == 1:
+            release.wait(5)
+        received.append(data)
+
+    running_id, removed_id, waiting_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    dispatcher.submit(running_id, "limited/topic", callback, 1)
+    _wait_for(lambda: dispatcher.metrics["busy_workers"] == 1)
+    dispatcher.submit(removed_id, "limited/topic", callback, 2)
+    dispatcher.submit(waiting_id, "limited/topic", callback, 3)
+    dispatcher.remove_subscriber(removed_id)
+    release.set()
+
+    _wait_for(lambda: len(received) == 2)
+    assert received == [1, 3]
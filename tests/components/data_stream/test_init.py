@@ -0,0 +1,38 @@
+"""Tests for the data_stream component."""
+from __future__ import annotations
+
+import pytest
+import voluptuous as vol
+
+from viseron.components.data_stream import CONFIG_SCHEMA
+from viseron.components.data_stream.const import (
+    COMPONENT,
+    CONFIG_MAX_PENDING,
+    CONFIG_MAX_WORKERS,
+    CONFIG_PRIORITY_LANES,
+    CONFIG_TOPIC_CONCURRENCY,
+    DEFAULT_MAX_PENDING,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PRIORITY_LANES,
+)
+
+
+@pytest.mark.parametrize("config", [{}, {COMPONENT: {}}])
+def test_config_schema_defaults(config) -> None:
+    """Test that the default config is valid."""
+    assert CONFIG_SCHEMA(config) == {
+        COMPONENT: {
+            CONFIG_MAX_WORKERS: DEFAULT_MAX_WORKERS,
+            CONFIG_MAX_PENDING: DEFAULT_MAX_PENDING,
+            CONFIG_TOPIC_CONCURRENCY: {},
+            CONFIG_PRIORITY_LANES: DEFAULT_PRIORITY_LANES,
+        }
+    }
+
+
+def test_config_schema_topic_concurrency() -> None:
+    """Test that topic patterns are validated."""
+    config = CONFIG_SCHEMA({COMPONENT: {CONFIG_TOPIC_CONCURRENCY: {"*/frame": 2}}})
+    assert config[COMPONENT][CONFIG_TOPIC_CONCURRENCY] == {"*/frame": 2}
+    with pytest.raises(vol.Invalid):
+        CONFIG_SCHEMA({COMPONENT: {CONFIG_TOPIC_CONCURRENCY: {"*/frame": 0}}})
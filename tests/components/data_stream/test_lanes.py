@@ -0,0 +1,53 @@
+"""Tests for the data stream lanes."""
+from __future__ import annotations
+
+import pytest
+
+from viseron.components.data_stream.lanes import DataLane, DataLanes
+
+
+@pytest.mark.parametrize(
+    "data_topic, camera_identifier",
+    [
+        ("event/camera_one/camera/frame_bytes", "camera_one"),
+        ("event/camera_one/nvr/processed_frame", "camera_one"),
+        ("event/camera_one/nvr/object_detector/scan", "camera_one"),
+        ("event/object_detector/camera_one/scan", "camera_one"),
+        ("event/object_detector/camera_one/result", "camera_one"),
+        ("event/motion_detector/camera_one/result", "camera_one"),
+        ("event/state_changed", None),
+        ("event/camera_one/camera/status", None),
+        ("event/camera_one/camera_event/recorder/start", None),
+    ],
+)
+def test_lane_for_topic(data_topic: str, camera_identifier: str | None) -> None:
+    """Test that frame pipeline topics are published on the camera priority lane."""
+    lanes = DataLanes(4, 10)
+    lane = lanes.lane_for_topic(data_topic)
+    if camera_identifier is None:
+        assert lane is lanes.default
+        return
+    assert lane is lanes.lane_for_topic(
+        f"event/{camera_identifier}/camera/frame_bytes"
+    )
+    assert lane in lanes.priority
+
+
+def test_lane_for_topic_no_priority_lanes() -> None:
+    """Test that everything is published on the default lane without priority lanes."""
+    lanes = DataLanes(0, 10)
+    assert lanes.lane_for_topic("event/camera_one/camera/frame_bytes") is lanes.default
+
+
+def test_lane_drops_oldest() -> None:
+    """Test that the oldest item is dropped and counted when the lane is full."""
+    lane = DataLane("test", 2)
+    for i in range(4):
+        lane.put({"data_topic": "topic", "data": i})
+
+    assert lane.metrics["depth"] == 2
+    assert lane.metrics["dropped"] == 2
+    assert lane.get(timeout=0.1)["data"] == 2
+    assert lane.get(timeout=0.1)["data"] == 3
+    assert lane.metrics["published"] == 4
+    assert lane.metrics["latency_p99"] is not None
@@ -0,0 +1,68 @@
+"""Tests for the data stream topic trie."""
+from __future__ import annotations
+
+import fnmatch
+import uuid
+
+import pytest
+
+from viseron.components.data_stream.topic_trie import TopicTrie
+
+PATTERNS = [
+    "*",
+    "event/*",
+    "*/camera_event/*/*",
+    "camera_one/camera_event/*/*",
+    "domain/setup/*/camera/*",
+    "*/state",
+    "event/*/camera_*",
+]
+
+TOPICS = [
+    "",
+    "event/",
+    "event/state_changed",
+    "event/camera_one/camera_registered",
+    "camera_one/camera_event/recorder/start",
+    "camera_two/camera_event/motion_detected/zone/one",
+    "domain/setup/loaded/camera/camera_one",
+    "domain/setup/loaded/object_detector/camera_one",
+    "sensor/fps/state",
+    "camera_one/state/other",
+]
+
+
+@pytest.mark.parametrize("topic", TOPICS)
+def test_match_same_as_fnmatch(topic: str) -> None:
+    """Test that the trie matches the same patterns as fnmatch."""
+    trie = TopicTrie()
+    for pattern in PATTERNS:
+        trie.add(pattern, uuid.uuid4(), pattern)
+
+    matched = sorted(
+        subscriber
+        for subscribers in trie.match(topic)
+        for subscriber in subscribers.values()
+    )
+    assert matched == sorted(
+        pattern for pattern in PATTERNS if fnmatch.fnmatch(topic, pattern)
+    )
+
+
+def test_remove() -> None:
+    """Test that removed subscribers are no longer matched and nodes are pruned."""
+    trie = TopicTrie()
+    unique_id = uuid.uuid4()
+    other_id = uuid.uuid4()
+    trie.add("event/*/state", unique_id, "first")
+    trie.add("event/*/state", other_id, "second")
+
+    trie.remove("event/*/state", unique_id)
+    assert trie.match("event/camera/state") == [{other_id: "second"}]
+
+    trie.remove("event/*/state", other_id)
+    assert trie.match("event/camera/state") == []
+    assert trie._root.is_empty()  # pylint: disable=protected-access
+
+    with pytest.raises(KeyError):
+        trie.remove("event/*/state", other_id)
@@ -2,7 +2,6 @@
 
 import datetime
 import logging
-import time
 from types import SimpleNamespace
 from unittest.mock import ANY, MagicMock, Mock, patch
 
@@ -15,11 +14,16 @@ from viseron.components.nvr.const import (
     NO_DETECTOR,
     OBJECT_DETECTOR,
 )
-from viseron.components.nvr.nvr import EVENT_MOTION_DETECTOR_RESULT, NVR
+from viseron.components.nvr.nvr import (
+    EVENT_MOTION_DETECTOR_RESULT,
+    NVR,
+    EventProcessedFrame,
+)
 from viseron.components.storage.models import TriggerTypes
 from viseron.domain_registry import DomainState
 from viseron.domains.camera import EventFrameBytesData
 from viseron.domains.camera.recorder import ManualRecording
+from viseron.domains.camera.shared_frames import SharedFrame
 from viseron.events import Event
 from viseron.helpers import utcnow
 from viseron.viseron_types import Domain
@@ -94,14 +98,13 @@ def feed_frame_to_nvr(nvr) -> None:
     """Queue frame + scanner tokens."""
     for scanner in nvr._frame_scanners.values():  # pylint: disable=protected-access
         safe_put(scanner.result_queue, object())
+    shared_frame = SharedFrame(2, 3, "yuv420p", (2, 2), nvr._camera.identifier)
+    shared_frame.name = "dummy_frame"  # type: ignore[assignment]
     frame = Event(
         "dummy",
         EventFrameBytesData(
             camera_identifier=nvr._camera.identifier,
-            shared_frame=SimpleNamespace(  # type: ignore[arg-type]
-                name="dummy_frame",
-                capture_time=time.time(),
-            ),
+            shared_frame=shared_frame,
         ),
         utcnow().timestamp(),
     )
@@ -1081,3 +1084,59 @@ class TestNVRRunManualRecording:
         assert "Max recording time exceeded, stopping recorder" in caplog.text
         nvr.stop_recorder.assert_called_once_with(force=True)
         assert not camera.is_recording
+
+
+class TestNVRProcessedFrame:
+    """Test lazy publication of processed frames."""
+
+    def test_no_listeners_skips_conversion(self, vis):
+        """Processed frames are not published when nobody is listening."""
+        nvr, camera = make_nvr(vis)
+        camera.shared_frames = MagicMock()
+        vis.data["data_stream"].has_subscribers.return_value = False
+        with patch.object(vis, "dispatch_event") as mock_dispatch_event:
+            nvr.publish_processed_frame(MagicMock())
+        mock_dispatch_event.assert_not_called()
+        camera.shared_frames.get_decoded_frame_rgb.assert_not_called()
+        assert nvr.conversions_avoided == 1
+
+    def test_frame_decoded_on_access(self):
+        """The frame is decoded once on access and the reference released."""
+        shared_frame = SharedFrame(2, 3, "yuv420p", (2, 2), "test")
+        shared_frames = MagicMock()
+        shared_frames.get_decoded_frame_rgb.return_value = np.zeros((2, 2, 3))
+        on_discard = Mock()
+
+        processed_frame = EventProcessedFrame(
+            shared_frame=shared_frame,
+            shared_frames=shared_frames,
+            objects_in_fov=None,
+            motion_contours=None,
+            on_discard=on_discard,
+        )
+        assert shared_frame.reference_count == 1
+        assert processed_frame.frame is processed_frame.frame
+        shared_frames.get_decoded_frame_rgb.assert_called_once_with(shared_frame)
+        assert shared_frame.reference_count == 0
+
+        del processed_frame
+        on_discard.assert_not_called()
+
+    def test_discarded_frame_releases_reference(self):
+        """Discarding an event without decoding releases the reference."""
+        shared_frame = SharedFrame(2, 3, "yuv420p", (2, 2), "test")
+        shared_frames = MagicMock()
+        on_discard = Mock()
+
+        processed_frame = EventProcessedFrame(
+            shared_frame=shared_frame,
+            shared_frames=shared_frames,
+            objects_in_fov=None,
+            motion_contours=None,
+            on_discard=on_discard,
+        )
+        assert shared_frame.reference_count == 1
+        del processed_frame
+        assert shared_frame.reference_count == 0
+        on_discard.assert_called_once()
+        shared_frames.get_decoded_frame_rgb.assert_not_called()
@@ -9,10 +9,15 @@ import voluptuous as vol
 from viseron.components.storage import CONFIG_SCHEMA, validate_tiers
 from viseron.components.storage.config import _check_path_exists
 from viseron.components.storage.const import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_COMMIT_INTERVAL,
+    DEFAULT_MAX_BUFFER_SIZE,
     DEFAULT_TIER_CHECK_BATCH_SIZE,
     DEFAULT_TIER_CHECK_CPU_LIMIT,
     DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
     DEFAULT_TIER_CHECK_WORKERS,
+    DEFAULT_TIER_MOVE_MAX_BANDWIDTH,
+    DEFAULT_TIER_MOVE_WORKERS,
 )
 
 
@@ -108,6 +113,15 @@ DEFAULT_CONFIG = {
         "tier_check_batch_size": DEFAULT_TIER_CHECK_BATCH_SIZE,
         "tier_check_sleep_between_batches": DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
         "tier_check_workers": DEFAULT_TIER_CHECK_WORKERS,
+        "tier_move_workers": DEFAULT_TIER_MOVE_WORKERS,
+        "tier_move_max_bandwidth": DEFAULT_TIER_MOVE_MAX_BANDWIDTH,
+        "event_recorder": {
+            "batch_size": DEFAULT_BATCH_SIZE,
+            "commit_interval": DEFAULT_COMMIT_INTERVAL,
+            "max_buffer_size": DEFAULT_MAX_BUFFER_SIZE,
+            "exclude": [],
+            "sample": {},
+        },
         "recorder": {"tiers": [create_tier(events={"max_age": {"days": 7}})]},
         "snapshots": {
             "tiers": [
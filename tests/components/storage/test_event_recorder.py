@@ -0,0 +1,129 @@
+"""Tests for the write-behind event recorder."""
+from __future__ import annotations
+
+import datetime
+import threading
+from dataclasses import dataclass
+from unittest.mock import MagicMock
+
+from viseron.components.storage.config import EVENT_RECORDER_SCHEMA
+from viseron.components.storage.event_recorder import EventRecorder
+from viseron.events import Event, EventData
+
+
+@dataclass
+class DummyEventData(EventData):
+    """Dummy event data."""
+
+    value: int
+
+
+def _make_recorder(vis, **config) -> tuple[EventRecorder, MagicMock]:
+    storage = MagicMock()
+    session = storage.get_session.return_value.__enter__.return_value
+    return EventRecorder(vis, storage, EVENT_RECORDER_SCHEMA(config)), session
+
+
+def _event(name: str, value: int = 0) -> Event:
+    return Event(name, DummyEventData(value=value), 1700000000.0)
+
+
+def _inserted_rows(session: MagicMock) -> list[dict]:
+    return [row for call in session.execute.call_args_list for row in call.args[1]]
+
+
+def test_flush_in_batches(vis) -> None:
+    """Test that buffered events are inserted in batches of batch_size."""
+    recorder, session = _make_recorder(vis, batch_size=2)
+    for i in range(5):
+        recorder.record(_event("state_changed", i))
+
+    recorder.flush()
+    assert session.execute.call_count == 3
+    assert session.commit.call_count == 3
+    rows = _inserted_rows(session)
+    assert [row["data"] for row in rows] == [f'{{"value": {i}}}' for i in range(5)]
+    assert rows[0]["created_at"] == datetime.datetime.fromtimestamp(
+        1700000000.0, tz=datetime.timezone.utc
+    )
+
+
+def test_stop_drains_buffer(vis) -> None:
+    """Test that stopping writes the remaining events."""
+    recorder, session = _make_recorder(vis)
+    recorder.record(_event("state_changed"))
+    recorder.stop()
+    assert len(_inserted_rows(session)) == 1
+
+
+def test_exclude_and_sample(vis) -> None:
+    """Test that events can be excluded or sampled by name."""
+    recorder, session = _make_recorder(
+        vis,
+        exclude=["*/fps"],
+        sample={"state_changed": 0.25},
+    )
+    for _ in range(8):
+        recorder.record(_event("camera_one/fps"))
+        recorder.record(_event("state_changed"))
+        recorder.record(_event("camera_one/recorder/start"))
+
+    recorder.flush()
+    names = [row["name"] for row in _inserted_rows(session)]
+    assert names.count("camera_one/fps") == 0
+    assert names.count("state_changed") == 2
+    assert names.count("camera_one/recorder/start") == 8
+
+
+def test_sample_from_many_threads(vis) -> None:
+    """Test that sampling keeps the exact rate when events come from many threads."""
+    recorder, session = _make_recorder(
+        vis, max_buffer_size=10000, sample={"state_changed": 0.5}
+    )
+
+    def record() -> None:
+        for _ in range(500):
+            recorder.record(_event("state_changed"))
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    recorder.flush()
+    assert len(_inserted_rows(session)) == 2000
+
+
+def test_buffer_full_drops_oldest(vis) -> None:
+    """Test that the oldest events are dropped when the buffer is full."""
+    recorder, session = _make_recorder(vis, max_buffer_size=2)
+    for i in range(4):
+        recorder.record(_event("state_changed", i))
+
+    recorder.flush()
+    assert [row["data"] for row in _inserted_rows(session)] == [
+        '{"value": 2}',
+        '{"value": 3}',
+    ]
+
+
+def test_failed_batch_inserted_one_at_a_time(vis) -> None:
+    """Test that a bad row only discards itself when a batch fails to insert."""
+    recorder, session = _make_recorder(vis)
+    for i in range(3):
+        recorder.record(_event("state_changed", i))
+
+    def execute(_statement, rows):
+        if len(rows) > 1 or rows[0]["data"] == '{"value": 1}':
+            raise ValueError("bad row")
+
+    session.execute.side_effect = execute
+    recorder.flush()
+    assert session.commit.call_count == 2
+    assert [call.args[1][0]["data"] for call in session.execute.call_args_list] == [
+        '{"value": 0}',
+        '{"value": 0}',
+        '{"value": 1}',
+        '{"value": 2}',
+    ]
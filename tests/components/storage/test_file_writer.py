@@ -0,0 +1,142 @@
+"""Tests for the files writer."""
+from __future__ import annotations
+
+import datetime
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.sql.dml import Delete, Insert
+
+from viseron.components.storage.file_writer import FilesWriter
+
+
+def _make_writer(vis) -> tuple[FilesWriter, MagicMock]:
+    storage = MagicMock()
+    session = storage.get_session.return_value.__enter__.return_value
+    return FilesWriter(vis, storage), session
+
+
+def _row(path: str) -> dict:
+    return {
+        "tier_id": 0,
+        "tier_path": os.path.dirname(path),
+        "camera_identifier": "test",
+        "category": "recorder",
+        "subcategory": "segments",
+        "path": path,
+        "directory": os.path.dirname(path),
+        "filename": os.path.basename(path),
+        "size": 0,
+        "orig_ctime": datetime.datetime(2024, 1, 1),
+        "duration": None,
+    }
+
+
+def test_create_modify_delete_is_not_written(vis, tmp_path) -> None:
+    """Test that a file deleted before it is written never reaches the database."""
+    writer, session = _make_writer(vis)
+    path = str(tmp_path / "1.m4s")
+    created, modified, deleted = MagicMock(), MagicMock(), MagicMock()
+
+    writer.created(_row(path), created)
+    writer.modified(path, modified)
+    writer.deleted(path, deleted)
+    writer.flush()
+
+    session.execute.assert_not_called()
+    session.connection.return_value.execute.assert_not_called()
+    created.assert_not_called()
+    modified.assert_not_called()
+    deleted.assert_not_called()
+
+
+def test_bulk_write(vis, tmp_path) -> None:
+    """Test that changes to several files are written in a single transaction."""
+    writer, session = _make_writer(vis)
+    new_path = str(tmp_path / "new.m4s")
+    existing_path = str(tmp_path / "existing.m4s")
+    for path in (new_path, existing_path):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("data")
+
+    session.execute.side_effect = lambda stmt: (
+        [SimpleNamespace(id=10, path=new_path)] if isinstance(stmt, Insert) else None
+    )
+    created, modified, deleted = MagicMock(), MagicMock(), MagicMock()
+    row = _row(new_path)
+    writer.created(row, created)
+    writer.modified(new_path)
+    writer.modified(existing_path, modified)
+    writer.modified(existing_path, modified)
+    writer.deleted(str(tmp_path / "old.m4s"), deleted)
+    writer.flush()
+
+    statements = [call.args[0] for call in session.execute.call_args_list]
+    assert len(statements) == 2
+    assert isinstance(statements[0], Delete)
+    assert isinstance(statements[1], Insert)
+    updates = session.connection.return_value.execute.call_args.args[1]
+    assert updates == [{"b_path": existing_path, "b_size": 4}]
+    session.commit.assert_called_once()
+
+    assert row["size"] == 4
+    created.assert_called_once_with(10)
+    assert modified.call_count == 2
+    modified.assert_called_with(4)
+    deleted.assert_called_once_with()
+
+
+def test_insert_conflict(vis, tmp_path) -> None:
+    """Test that the callback is not called for files that already exist."""
+    writer, session = _make_writer(vis)
+    session.execute.return_value = []
+    created = MagicMock()
+
+    writer.created(_row(str(tmp_path / "1.m4s")), created)
+    writer.flush()
+
+    created.assert_not_called()
+
+
+def test_delete_then_create(vis, tmp_path) -> None:
+    """Test that a replaced file is deleted before it is inserted again."""
+    writer, session = _make_writer(vis)
+    path = str(tmp_path / "1.m4s")
+    session.execute.side_effect = lambda stmt: (
+        [SimpleNamespace(id=1, path=path)] if isinstance(stmt, Insert) else None
+    )
+
+    writer.deleted(path)
+    writer.created(_row(path))
+    writer.flush()
+
+    statements = [call.args[0] for call in session.execute.call_args_list]
+    assert len(statements) == 2
+    assert isinstance(statements[0], Delete)
+    assert isinstance(statements[1], Insert)
+
+
+def test_failed_bulk_write_written_one_at_a_time(vis, tmp_path) -> None:
+    """Test that a failed bulk write falls back to writing each file separately."""
+    writer, _ = _make_writer(vis)
+    good_path = str(tmp_path / "good.m4s")
+    bad_path = str(tmp_path / "bad.m4s")
+    old_path = str(tmp_path / "old.m4s")
+
+    def _write(_deletes, rows, _sizes):
+        if any(row["path"] == bad_path for row in rows):
+            raise ValueError("bad row")
+        return {row["path"]: 1 for row in rows}
+
+    good_created, bad_created, deleted = MagicMock(), MagicMock(), MagicMock()
+    writer.created(_row(good_path), good_created)
+    writer.created(_row(bad_path), bad_created)
+    writer.deleted(old_path, deleted)
+    with patch.object(writer, "_write", side_effect=_write) as write:
+        writer.flush()
+
+    assert write.call_count == 4
+    good_created.assert_called_once_with(1)
+    bad_created.assert_not_called()
+    deleted.assert_called_once_with()
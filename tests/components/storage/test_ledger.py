@@ -0,0 +1,142 @@
+"""Tests for the tier check worker ledgers."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import numpy as np
+
+from viseron.components.storage.check_tier import Worker
+from viseron.components.storage.ledger import LEDGER_DTYPE, FilesLedger
+from viseron.components.storage.move_engine import MoveEngine
+from viseron.components.storage.storage_subprocess import (
+    DataItemFileEvent,
+    DataItemReconcileLedgers,
+)
+
+
+def _rows(*rows: tuple[int, int, int, str, str]) -> np.ndarray:
+    return np.array(list(rows), dtype=LEDGER_DTYPE)
+
+
+def _loaded_ledger() -> FilesLedger:
+    ledger = FilesLedger()
+    ledger.reload(
+        lambda: _rows(
+            (2, 20, 200, "/tier1/2.m4s", "/tier1/"),
+            (1, 10, 100, "/tier1/1.m4s", "/tier1/"),
+        )
+    )
+    return ledger
+
+
+def test_reload_sorts_rows() -> None:
+    """Test that loaded rows are sorted by orig_ctime."""
+    ledger = FilesLedger()
+    assert ledger.needs_reload
+    ledger = _loaded_ledger()
+    assert not ledger.needs_reload
+    assert list(ledger.snapshot()["id"]) == [1, 2]
+
+
+def test_upsert_set_size_and_remove() -> None:
+    """Test that file events are applied to the ledger."""
+    ledger = _loaded_ledger()
+    ledger.upsert(3, 30, 300, "/tier1/3.m4s", "/tier1/")
+    ledger.set_size("/tier1/3.m4s", 35)
+    ledger.remove("/tier1/1.m4s")
+    ledger.remove("/tier1/unknown.m4s")
+
+    snapshot = ledger.snapshot()
+    assert list(snapshot["id"]) == [2, 3]
+    assert list(snapshot["size"]) == [20, 35]
+    assert np.char.endswith(snapshot["path"].astype(str), ".m4s").all()
+
+
+def test_upsert_out_of_order() -> None:
+    """Test that files created out of order end up sorted."""
+    ledger = _loaded_ledger()
+    ledger.upsert(3, 30, 50, "/tier1/3.m4s", "/tier1/")
+    ledger.upsert(2, 25, 200, "/tier1/2.m4s", "/tier1/")
+
+    snapshot = ledger.snapshot()
+    assert list(snapshot["id"]) == [3, 1, 2]
+    assert list(snapshot["size"]) == [30, 10, 25]
+
+
+def test_grow_and_compact() -> None:
+    """Test that the ledger grows and compacts removed rows."""
+    ledger = FilesLedger()
+    ledger.reload(_rows)
+    for i in range(100):
+        ledger.upsert(i, i, i, f"/tier1/{i}.m4s", "/tier1/")
+    for i in range(0, 100, 2):
+        ledger.remove(f"/tier1/{i}.m4s")
+
+    snapshot = ledger.snapshot()
+    assert list(snapshot["id"]) == list(range(1, 100, 2))
+    # Rows are reindexed after compaction
+    ledger.set_size("/tier1/99.m4s", 1000)
+    assert ledger.snapshot()["size"][-1] == 1000
+
+
+def test_events_during_reload() -> None:
+    """Test that events received while loading are applied to the loaded rows."""
+    ledger = _loaded_ledger()
+
+    def _load() -> np.ndarray:
+        ledger.upsert(3, 30, 300, "/tier1/3.m4s", "/tier1/")
+        ledger.remove("/tier1/1.m4s")
+        return _rows(
+            (1, 10, 100, "/tier1/1.m4s", "/tier1/"),
+            (2, 20, 200, "/tier1/2.m4s", "/tier1/"),
+        )
+
+    ledger.reload(_load)
+    assert list(ledger.snapshot()["id"]) == [2, 3]
+
+
+def test_needs_reload_after_interval() -> None:
+    """Test that the ledger is reconciled after LEDGER_RECONCILE_INTERVAL."""
+    ledger = _loaded_ledger()
+    with patch(
+        "viseron.components.storage.ledger.time.monotonic",
+        return_value=ledger._loaded_at + 3601,  # pylint: disable=protected-access
+    ):
+        assert ledger.needs_reload
+
+
+def test_invalidate() -> None:
+    """Test that an invalidated ledger is reloaded."""
+    ledger = _loaded_ledger()
+    ledger.invalidate()
+    assert ledger.needs_reload
+
+
+def test_worker_reconcile_ledgers() -> None:
+    """Test that file events update the ledgers and a reconcile reloads them."""
+    worker = Worker(MoveEngine())
+    key = ("camera", 0, "recorder", "segments")
+    ledger = _loaded_ledger()
+    worker._files_ledgers[key] = ledger  # pylint: disable=protected-access
+
+    event = DataItemFileEvent(
+        cmd="file_event",
+        event="created",
+        camera_identifier="camera",
+        tier_id=0,
+        category="recorder",
+        subcategory="segments",
+        path="/tier1/3.m4s",
+        file_id=3,
+        size=30,
+        orig_ctime=300,
+    )
+    # Created events without a tier path are ignored
+    worker.work_input(event)
+    assert list(ledger.snapshot()["id"]) == [1, 2]
+    event.tier_path = "/tier1/"
+    worker.work_input(event)
+    assert list(ledger.snapshot()["id"]) == [1, 2, 3]
+
+    worker.work_input(DataItemReconcileLedgers(cmd="reconcile_ledgers"))
+    assert ledger.needs_reload
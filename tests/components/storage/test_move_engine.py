@@ -0,0 +1,149 @@
+"""Tests for the tier move engine."""
+from __future__ import annotations
+
+import os
+import time
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from viseron.components.storage.check_tier import move_file
+from viseron.components.storage.move_engine import (
+    BandwidthLimiter,
+    MoveEngine,
+    MoveMetrics,
+)
+
+
+def _write(path: str, size: int) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(os.urandom(size))
+
+
+def test_move_same_device(tmp_path) -> None:
+    """Test that files on the same device are renamed."""
+    src = str(tmp_path / "tier1" / "1.m4s")
+    dst = str(tmp_path / "tier2" / "camera" / "1.m4s")
+    _write(src, 1000)
+
+    result = MoveEngine().move(src, dst)
+
+    assert result.method == "rename"
+    assert result.size == 1000
+    assert not os.path.exists(src)
+    assert os.path.getsize(dst) == 1000
+
+
+@pytest.mark.parametrize("copy_file_range", [True, False])
+def test_move_other_device(tmp_path, copy_file_range: bool) -> None:
+    """Test that files on another device are copied and the source is removed."""
+    src = str(tmp_path / "tier1" / "1.m4s")
+    dst = str(tmp_path / "tier2" / "1.m4s")
+    _write(src, 20 * 1024 * 1024 + 1)
+    with open(src, "rb") as file:
+        data = file.read()
+
+    engine = MoveEngine()
+    engine._copy_file_range = copy_file_range
+    with patch.object(MoveEngine, "same_device", return_value=False):
+        result = engine.move(src, dst)
+
+    assert result.method == "copy"
+    assert result.size == len(data)
+    assert not os.path.exists(src)
+    with open(dst, "rb") as file:
+        assert file.read() == data
+
+
+def test_copy_size_mismatch(tmp_path) -> None:
+    """Test that an incomplete copy is removed and the source is kept."""
+    src = str(tmp_path / "tier1" / "1.m4s")
+    dst = str(tmp_path / "tier2" / "1.m4s")
+    _write(src, 1000)
+    os.makedirs(os.path.dirname(dst))
+
+    engine = MoveEngine()
+    with patch.object(MoveEngine, "_copy_chunk", side_effect=[500, 0]), pytest.raises(
+        OSError
+    ):
+        engine.copy(src, dst)
+
+    assert os.path.exists(src)
+    assert not os.path.exists(dst)
+
+
+def test_copy_error(tmp_path) -> None:
+    """Test that a partial copy is removed when copying fails."""
+    src = str(tmp_path / "tier1" / "1.m4s")
+    dst = str(tmp_path / "tier2" / "1.m4s")
+    _write(src, 1000)
+    os.makedirs(os.path.dirname(dst))
+
+    def _copy_chunk(_src_fd, dst_fd, _count):
+        os.write(dst_fd, b"partial")
+        raise OSError("No space left on device")
+
+    engine = MoveEngine()
+    with patch.object(engine, "_copy_chunk", side_effect=_copy_chunk), pytest.raises(
+        OSError
+    ):
+        engine.copy(src, dst)
+
+    assert os.path.exists(src)
+    assert not os.path.exists(dst)
+
+
+def test_move_file_failed_keeps_source(tmp_path) -> None:
+    """Test that the source and its row are kept when a move fails."""
+    src = str(tmp_path / "tier1" / "1.m4s")
+    dst = str(tmp_path / "tier2" / "1.m4s")
+    _write(src, 1000)
+    get_session = MagicMock()
+    engine = MoveEngine()
+
+    copy_error = OSError("size mismatch")
+    with patch.object(engine, "copy", side_effect=copy_error), patch.object(
+        MoveEngine, "same_device", return_value=False
+    ), pytest.raises(OSError):
+        move_file(get_session, src, dst, logging.getLogger(__name__), engine)
+
+    assert os.path.exists(src)
+    get_session.assert_not_called()
+
+
+def test_bandwidth_limiter() -> None:
+    """Test that the limiter spreads chunks over time."""
+    limiter = BandwidthLimiter(1000)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire(100)
+    # The first chunk is sent right away, the two others wait 0.1s each
+    assert time.monotonic() - start >= 0.2
+
+    unlimited = BandwidthLimiter(None)
+    start = time.monotonic()
+    unlimited.acquire(10**9)
+    assert time.monotonic() - start < 0.1
+
+
+def test_move_metrics() -> None:
+    """Test backlog and throughput per tier."""
+    metrics = MoveMetrics()
+    for _ in range(3):
+        metrics.queued("recorder.segments.tier_0")
+    metrics.done("recorder.segments.tier_0", "rename", 1024 * 1024, None)
+    metrics.done("recorder.segments.tier_0", "copy", 59 * 1024 * 1024, None)
+
+    tier = metrics.metrics["recorder.segments.tier_0"]
+    assert tier["backlog"] == 1
+    assert tier["renamed"] == 1
+    assert tier["copied"] == 1
+    assert tier["failed"] == 0
+    assert tier["throughput"] == pytest.approx(1.0)
+
+    metrics.done("recorder.segments.tier_0", None, None, "error")
+    tier = metrics.metrics["recorder.segments.tier_0"]
+    assert tier["backlog"] == 0
+    assert tier["failed"] == 1
@@ -106,3 +106,37 @@ class TestQueries(BaseTestWithRecordings):
         assert len(files) == 15
         assert files[4].tier_id == 0
         assert files[5].tier_id == 1
+
+    def test_get_time_period_fragments_overlap(self):
+        """Test that segments playing during the period are returned."""
+        with self._get_db_session() as session:
+            for offset, duration in ((-20, 5), (-5, 10), (10, 5), (40, 5)):
+                timestamp = self._now + datetime.timedelta(seconds=offset)
+                filename = f"{int(timestamp.timestamp())}.m4s"
+                session.execute(
+                    insert(Files).values(
+                        tier_id=0,
+                        tier_path="/tier1/",
+                        camera_identifier="overlap",
+                        category="recorder",
+                        subcategory="segments",
+                        path=f"/tier1/overlap/{filename}",
+                        directory="tier1",
+                        filename=filename,
+                        size=10,
+                        orig_ctime=timestamp,
+                        duration=duration,
+                        created_at=timestamp,
+                    )
+                )
+            session.commit()
+
+        files = get_time_period_fragments(
+            ["overlap"],
+            (self._now + datetime.timedelta(seconds=2)).timestamp(),
+            (self._now + datetime.timedelta(seconds=30)).timestamp(),
+            self._get_db_session,
+        )
+        assert len(files) == 2
+        assert files[0].orig_ctime == self._now - datetime.timedelta(seconds=5)
+        assert files[1].orig_ctime == self._now + datetime.timedelta(seconds=10)
@@ -0,0 +1,112 @@
+"""Tests for the shared tier watchers."""
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable
+from unittest.mock import MagicMock
+
+from watchdog.events import (
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+)
+
+from viseron.components.storage.watcher import TierWatcher
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 5) -> bool:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _events(handler: MagicMock) -> list[tuple[type, str]]:
+    return [
+        (type(call.args[0]), call.args[0].src_path)
+        for call in handler.handle_event.call_args_list
+    ]
+
+
+def test_find_handler(vis, tmp_path) -> None:
+    """Test that events are routed to the handler of the closest parent."""
+    watcher = TierWatcher(vis, str(tmp_path), poll=True)
+    segments = MagicMock()
+    thumbnails = MagicMock()
+    watcher.register(os.path.join(tmp_path, "segments", "camera_one"), segments)
+    watcher.register(f"{tmp_path}/thumbnails/camera_one/", thumbnails)
+
+    # pylint: disable=protected-access
+    assert (
+        watcher._find_handler(f"{tmp_path}/segments/camera_one/1.m4s") is segments
+    )
+    assert (
+        watcher._find_handler(f"{tmp_path}/thumbnails/camera_one/2024/1.jpg")
+        is thumbnails
+    )
+    assert watcher._find_handler(f"{tmp_path}/segments/camera_two/1.m4s") is None
+    assert watcher._find_handler("/some/other/path/1.m4s") is None
+
+    watcher.unregister(f"{tmp_path}/segments/camera_one")
+    assert watcher._find_handler(f"{tmp_path}/segments/camera_one/1.m4s") is None
+
+
+def test_polling_watcher(vis, tmp_path) -> None:
+    """Test that the polling watcher emits events for files in changed folders."""
+    camera_path = os.path.join(tmp_path, "segments", "camera_one")
+    os.makedirs(camera_path)
+    existing = os.path.join(camera_path, "existing.m4s")
+    with open(existing, "w", encoding="utf-8") as file:
+        file.write("data")
+
+    handler = MagicMock()
+    watcher = TierWatcher(vis, str(tmp_path), poll=True)
+    watcher.register(camera_path, handler)
+    unrelated = MagicMock()
+    watcher.register(os.path.join(tmp_path, "segments", "camera_two"), unrelated)
+    watcher.start()
+    try:
+        new_file = os.path.join(camera_path, "2024", "new.m4s")
+        os.makedirs(os.path.dirname(new_file))
+        with open(new_file, "w", encoding="utf-8") as file:
+            file.write("data")
+        assert _wait_for(lambda: (FileCreatedEvent, new_file) in _events(handler))
+
+        with open(new_file, "a", encoding="utf-8") as file:
+            file.write("more data")
+        assert _wait_for(lambda: (FileModifiedEvent, new_file) in _events(handler))
+
+        os.remove(existing)
+        assert _wait_for(lambda: (FileDeletedEvent, existing) in _events(handler))
+    finally:
+        watcher.stop()
+
+    assert (FileCreatedEvent, existing) not in _events(handler)
+    unrelated.handle_event.assert_not_called()
+
+
+def test_moved_event(vis, tmp_path) -> None:
+    """Test that files moved between handlers are seen as deleted and created."""
+    watcher = TierWatcher(vis, str(tmp_path), poll=False)
+    tier1 = MagicMock()
+    tier2 = MagicMock()
+    watcher.register(f"{tmp_path}/tier1/segments/camera_one", tier1)
+    watcher.register(f"{tmp_path}/tier2/segments/camera_one", tier2)
+
+    src = f"{tmp_path}/tier1/segments/camera_one/1.m4s"
+    dst = f"{tmp_path}/tier2/segments/camera_one/1.m4s"
+    watcher.on_any_event(FileMovedEvent(src, dst))
+
+    # pylint: disable=protected-access
+    handler, event = watcher._event_queue.get_nowait()
+    assert handler is tier1
+    assert isinstance(event, FileDeletedEvent)
+    assert event.src_path == src
+    handler, event = watcher._event_queue.get_nowait()
+    assert handler is tier2
+    assert isinstance(event, FileCreatedEvent)
+    assert event.src_path == dst
@@ -1,15 +1,24 @@
 """Test the Events API handler."""
 from __future__ import annotations
 
+import asyncio
 import datetime
 import json
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from sqlalchemy import insert
+import voluptuous as vol
+from sqlalchemy import delete, insert
 from sqlalchemy.orm.session import Session, sessionmaker
+from tornado.iostream import StreamClosedError
 
 from viseron.components.storage.models import Motion, PostProcessorResults
+from viseron.components.webserver.api.v1.events import (
+    EventCursor,
+    EventsAPIHandler,
+    decode_cursor,
+    encode_cursor,
+)
 from viseron.domains.camera.const import CONFIG_LOOKBACK, CONFIG_RECORDER
 
 from tests.common import BaseTestWithRecordings, MockCamera
@@ -128,6 +137,35 @@ class TestEventsApiHandler(TestAppBaseNoAuth, BaseTestWithRecordings):
         assert body["events"][2]["type"] == "face_recognition"
         assert body["events"][2]["created_at"] == "2024-06-22T01:00:00+00:00"
 
+    def test_get_events_paginated(self):
+        """Test getting events one page at a time."""
+        url = "/api/v1/events/test?date=2024-06-22&limit=2"
+        headers = {"X-Client-UTC-Offset": "120"}
+        response = self.fetch(url, headers=headers)
+        assert response.code == 200
+
+        body = json.loads(response.body)
+        assert len(body["events"]) == 2
+        assert body["events"][0]["start_time"] == "2024-06-22T03:00:00+00:00"
+        assert body["events"][1]["start_time"] == "2024-06-22T01:00:00+00:00"
+        assert body["next_cursor"] is not None
+
+        response = self.fetch(
+            f"{url}&before={body['next_cursor']}",
+            headers=headers,
+        )
+        assert response.code == 200
+
+        body = json.loads(response.body)
+        assert len(body["events"]) == 1
+        assert body["events"][0]["type"] == "face_recognition"
+        assert body["next_cursor"] is None
+
+    def test_get_events_invalid_cursor(self):
+        """Test getting events with an invalid cursor."""
+        response = self.fetch("/api/v1/events/test?date=2024-06-22&before=invalid")
+        assert response.code == 400
+
     def test_get_events_amount(self):
         """Test getting events with amount."""
         response = self.fetch(
@@ -173,6 +211,32 @@ class TestEventsApiHandler(TestAppBaseNoAuth, BaseTestWithRecordings):
         assert body["events_amount"]["2024-06-23"]["motion"] == 1
         assert body["events_amount"]["2024-06-22"]["face_recognition"] == 1
 
+    def test_get_events_amount_after_delete(self, get_db_session):
+        """Test that deleted events are removed from the amount."""
+        with get_db_session() as session:
+            session.execute(
+                delete(Motion).where(
+                    Motion.start_time
+                    == datetime.datetime(
+                        2024, 6, 22, 1, 0, 0, tzinfo=datetime.timezone.utc
+                    )
+                )
+            )
+            session.commit()
+
+        response = self.fetch(
+            "/api/v1/events/test/amount",
+            headers={
+                "X-Client-UTC-Offset": "-120",
+            },
+        )
+
+        assert response.code == 200
+
+        body = json.loads(response.body)
+        assert "motion" not in body["events_amount"]["2024-06-21"]
+        assert body["events_amount"]["2024-06-22"]["motion"] == 1
+
     def test_post_dates_of_interest(self):
         """Test getting dates of interest."""
         response = self.fetch(
@@ -213,3 +277,33 @@ class TestEventsApiHandler(TestAppBaseNoAuth, BaseTestWithRecordings):
         body = json.loads(response.body)
         assert body["dates_of_interest"]["2024-06-21"]["events"] == 2
         assert body["dates_of_interest"]["2024-06-22"]["events"] == 2
+
+
+def test_cursor():
+    """Test encoding and decoding event cursors."""
+    created_at = datetime.datetime(
+        2024, 6, 22, 1, 0, 0, 123456, tzinfo=datetime.timezone.utc
+    )
+    cursor = decode_cursor(
+        encode_cursor({"created_at": created_at, "type": "object", "id": 5})
+    )
+    assert cursor == EventCursor(created_at, "object", 5)
+
+    with pytest.raises(vol.Invalid):
+        decode_cursor("1:object")
+
+
+def test_stream_events_client_disconnected():
+    """Test that streaming stops when the client disconnects."""
+    handler = MagicMock()
+    handler.run_in_executor = AsyncMock(return_value="[]")
+    handler.flush = AsyncMock(side_effect=StreamClosedError())
+    events = iter([{"id": i} for i in range(250)])
+
+    asyncio.run(
+        EventsAPIHandler._stream_events(  # pylint: disable=protected-access
+            handler, events, None
+        )
+    )
+    handler.flush.assert_awaited_once()
+    handler.finish.assert_not_called()
@@ -245,6 +245,49 @@ class TestHlsApiHandler(TestAppBaseNoAuth, BaseTestWithRecordings):
         """Test getting HLS playlist for a specific time period with date not today."""
         self._get_hls_playlist_time_period(0, None, "2023-10-01", 0, 1)
 
+    def test_get_hls_playlist_time_period_blocking_reload(self):
+        """Test blocking reloads of live HLS playlists."""
+        mocked_camera = MockCamera(
+            identifier="test",
+        )
+        url = (
+            "/api/v1/hls/test/index.m3u8?start_timestamp="
+            f"{int(self._now.timestamp())}"
+        )
+        with patch(
+            (
+                "viseron.components.webserver.request_handler.ViseronRequestHandler."
+                "_get_camera"
+            ),
+            return_value=mocked_camera,
+        ), patch(
+            (
+                "viseron.components.webserver.request_handler.ViseronRequestHandler"
+                "._get_session"
+            ),
+            return_value=self._get_db_session(),
+        ), patch(
+            "viseron.components.webserver.api.v1.hls._get_init_file",
+            return_value="/test/init.mp4",
+        ), patch(
+            "viseron.components.storage.queries.utcnow",
+            return_value=self._simulated_now,
+        ):
+            response = self.fetch(url)
+            assert response.code == 200
+            response_string = response.body.decode()
+            assert "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES" in response_string
+            assert "#EXT-X-MEDIA-SEQUENCE:0" in response_string
+
+            # Segment is already in the playlist
+            response = self.fetch(f"{url}&_HLS_msn=14")
+            assert response.code == 200
+            assert response.body.decode().count("#EXTINF") == 15
+
+            # Segment is too far in the future
+            response = self.fetch(f"{url}&_HLS_msn=17")
+            assert response.code == 400
+
 
 def test_count_files_removed_no_files_removed():
     """Test count_files_removed with no files removed."""
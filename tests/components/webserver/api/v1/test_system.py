@@ -2,9 +2,16 @@
 from __future__ import annotations
 
 import json
-from unittest.mock import PropertyMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
+from viseron.components.storage.const import COMPONENT as STORAGE_COMPONENT
 from viseron.components.webserver.auth import Role, User
+from viseron.components.webserver.const import (
+    MJPEG_ENCODERS,
+    WEBSOCKET_CONNECTIONS,
+)
+from viseron.domains.camera.const import SNAPSHOT_WRITER
+from viseron.domains.object_detector.const import BATCH_METRICS
 
 from tests.components.webserver.common import TestAppBaseAuth
 
@@ -24,6 +31,70 @@ class TestSystemApiHandler(TestAppBaseAuth):
             data = json.loads(response.body)
             assert data == {"events": ["event1", "event2"]}
 
+    def test_get_data_stream(self):
+        """Test getting data stream metrics."""
+        response = self.fetch_with_auth("/api/v1/system/data_stream")
+        assert response.code == 200
+        data = json.loads(response.body)
+        assert "default" in data["lanes"]
+        assert "priority_0" in data["lanes"]
+        assert data["lanes"]["default"]["dropped"] == 0
+        assert "pending" in data["dispatcher"]
+
+    def test_get_mjpeg_encoders(self):
+        """Test getting MJPEG encoder metrics."""
+        encoder = MagicMock()
+        encoder.metrics = {"camera_identifier": "test", "viewers": 2}
+        with patch.dict(self.vis.data, {MJPEG_ENCODERS: {("test", ()): encoder}}):
+            response = self.fetch_with_auth("/api/v1/system/mjpeg_encoders")
+        assert response.code == 200
+        data = json.loads(response.body)
+        assert data == {"encoders": [{"camera_identifier": "test", "viewers": 2}]}
+
+    def test_get_websocket_connections(self):
+        """Test getting WebSocket connection metrics."""
+        connection = MagicMock()
+        connection.metrics = {"buffered": 0, "dropped": 1, "coalesced": 2}
+        with patch.dict(self.vis.data, {WEBSOCKET_CONNECTIONS: [connection]}):
+            response = self.fetch_with_auth("/api/v1/system/websocket_connections")
+        assert response.code == 200
+        data = json.loads(response.body)
+        assert data == {"connections": [{"buffered": 0, "dropped": 1, "coalesced": 2}]}
+
+    def test_get_snapshot_writer(self):
+        """Test getting snapshot writer metrics."""
+        snapshot_writer = MagicMock()
+        snapshot_writer.metrics = {"pending": 1, "dropped": 0, "reused": 3}
+        with patch.dict(self.vis.data, {SNAPSHOT_WRITER: snapshot_writer}):
+            response = self.fetch_with_auth("/api/v1/system/snapshot_writer")
+        assert response.code == 200
+        data = json.loads(response.body)
+        assert data == {"snapshot_writer": {"pending": 1, "dropped": 0, "reused": 3}}
+
+    def test_get_object_detector_batches(self):
+        """Test getting object detector batch metrics."""
+        batch_metrics = MagicMock()
+        batch_metrics.metrics = {"batch_size_avg": 2.0, "batch_size_max": 4}
+        with patch.dict(self.vis.data, {BATCH_METRICS: {"darknet": batch_metrics}}):
+            response = self.fetch_with_auth("/api/v1/system/object_detector_batches")
+        assert response.code == 200
+        data = json.loads(response.body)
+        assert data == {
+            "object_detectors": {
+                "darknet": {"batch_size_avg": 2.0, "batch_size_max": 4}
+            }
+        }
+
+    def test_get_storage_moves(self):
+        """Test getting storage move metrics."""
+        storage = MagicMock()
+        storage.move_metrics.metrics = {"recorder.segments.tier_0": {"backlog": 2}}
+        with patch.dict(self.vis.data, {STORAGE_COMPONENT: storage}):
+            response = self.fetch_with_auth("/api/v1/system/storage_moves")
+        assert response.code == 200
+        data = json.loads(response.body)
+        assert data == {"tiers": {"recorder.segments.tier_0": {"backlog": 2}}}
+
     def test_get_dispatched_events_non_admin(self):
         """Test getting dispatched events as non-admin."""
         with patch(
@@ -0,0 +1,216 @@
+"""Tests for the live HLS playlist."""
+from __future__ import annotations
+
+import asyncio
+import datetime
+from unittest.mock import MagicMock, patch
+
+from viseron.components.storage.util import EventFileCreated, EventFileDeleted
+from viseron.components.webserver.live_playlist import LivePlaylist, LiveSegment
+from viseron.events import Event
+from viseron.helpers import utcnow
+
+NOW = utcnow()
+
+
+def _segment(index: int, tier_id: int = 0) -> LiveSegment:
+    orig_ctime = NOW - datetime.timedelta(seconds=50 - 5 * index)
+    filename = f"{int(orig_ctime.timestamp())}.m4s"
+    return LiveSegment(
+        filename=filename,
+        path=f"/tier{tier_id}/test/{filename}",
+        tier_id=tier_id,
+        tier_path=f"/tier{tier_id}/",
+        duration=5,
+        orig_ctime=orig_ctime,
+    )
+
+
+def _created(segment: LiveSegment) -> Event[EventFileCreated]:
+    return Event(
+        "file_created",
+        EventFileCreated(
+            camera_identifier="test",
+            category="recorder",
+            subcategory="segments",
+            file_name=segment.filename,
+            path=segment.path,
+            tier_id=segment.tier_id,
+            tier_path=segment.tier_path,
+            orig_ctime=segment.orig_ctime,
+            duration=segment.duration,
+        ),
+        NOW.timestamp(),
+    )
+
+
+def _deleted(segment: LiveSegment) -> Event[EventFileDeleted]:
+    return Event(
+        "file_deleted",
+        EventFileDeleted(
+            camera_identifier="test",
+            category="recorder",
+            subcategory="segments",
+            file_name=segment.filename,
+            path=segment.path,
+        ),
+        NOW.timestamp(),
+    )
+
+
+async def _setup_playlist(segments: list[LiveSegment]) -> LivePlaylist:
+    vis = MagicMock()
+    live_playlist = LivePlaylist(vis, "test")
+    with patch(
+        "viseron.components.webserver.live_playlist.get_time_period_fragments",
+        return_value=segments,
+    ):
+        await live_playlist.async_setup(MagicMock(), asyncio.get_running_loop())
+    assert vis.listen_event.call_count == 2
+    return live_playlist
+
+
+def test_live_playlist_media_sequence():
+    """Test that segments keep their media sequence as the window changes."""
+
+    async def _test():
+        segments = [_segment(i) for i in range(5)]
+        live_playlist = await _setup_playlist(segments)
+        assert live_playlist.last_sequence == 4
+
+        media_sequence, playlist_segments = live_playlist.segments_since(
+            segments[2].orig_ctime + datetime.timedelta(seconds=1)
+        )
+        assert media_sequence == 2
+        assert [s.filename for s in playlist_segments] == [
+            s.filename for s in segments[2:]
+        ]
+
+        # New segments are appended
+        await live_playlist._async_on_created(  # pylint: disable=protected-access
+            _created(_segment(5))
+        )
+        assert live_playlist.last_sequence == 5
+
+        # Removing the oldest segment advances the media sequence
+        with patch(
+            "viseron.components.webserver.live_playlist.LIVE_PLAYLIST_DELETE_GRACE",
+            -1,
+        ):
+            await live_playlist._async_on_deleted(  # pylint: disable=protected-access
+                _deleted(segments[0])
+            )
+            media_sequence, playlist_segments = live_playlist.segments_since(
+                segments[2].orig_ctime + datetime.timedelta(seconds=1)
+            )
+        assert media_sequence == 2
+        assert playlist_segments[0].filename == segments[2].filename
+        assert live_playlist.last_sequence == 5
+
+    asyncio.run(_test())
+
+
+def test_live_playlist_tier_move():
+    """Test that a segment moved to another tier keeps its place."""
+
+    async def _test():
+        segments = [_segment(i) for i in range(3)]
+        live_playlist = await _setup_playlist(segments)
+
+        moved = _segment(0, tier_id=1)
+        # The delete event of the previous tier can arrive first
+        await live_playlist._async_on_deleted(  # pylint: disable=protected-access
+            _deleted(segments[0])
+        )
+        await live_playlist._async_on_created(  # pylint: disable=protected-access
+            _created(moved)
+        )
+        with patch(
+            "viseron.components.webserver.live_playlist.LIVE_PLAYLIST_DELETE_GRACE",
+            -1,
+        ):
+            media_sequence, playlist_segments = live_playlist.segments_since(
+                segments[0].orig_ctime
+            )
+        assert media_sequence == 0
+        assert len(playlist_segments) == 3
+        assert playlist_segments[0].path == moved.path
+        assert playlist_segments[0].tier_id == 1
+
+    asyncio.run(_test())
+
+
+def test_live_playlist_stable_media_sequence():
+    """Test that deleted and late segments don't renumber the window."""
+
+    async def _test():
+        segments = [_segment(i) for i in range(5)]
+        live_playlist = await _setup_playlist(segments[:2] + segments[3:])
+
+        # A segment older than the newest segment is not inserted
+        await live_playlist._async_on_created(  # pylint: disable=protected-access
+            _created(segments[2])
+        )
+        assert live_playlist.last_sequence == 3
+
+        # A deleted segment in the middle of the window is kept as a gap
+        with patch(
+            "viseron.components.webserver.live_playlist.LIVE_PLAYLIST_DELETE_GRACE",
+            -1,
+        ):
+            await live_playlist._async_on_deleted(  # pylint: disable=protected-access
+                _deleted(segments[1])
+            )
+            media_sequence, playlist_segments = live_playlist.segments_since(
+                segments[3].orig_ctime
+            )
+            assert media_sequence == 2
+            assert playlist_segments[0].filename == segments[3].filename
+
+            media_sequence, playlist_segments = live_playlist.segments_since(
+                segments[0].orig_ctime
+            )
+            assert media_sequence == 0
+            assert [s.gap for s in playlist_segments] == [False, True, False, False]
+
+            # The gap is removed once it is at the start of the window
+            await live_playlist._async_on_deleted(  # pylint: disable=protected-access
+                _deleted(segments[0])
+            )
+            media_sequence, playlist_segments = live_playlist.segments_since(
+                segments[0].orig_ctime
+            )
+        assert media_sequence == 2
+        assert playlist_segments[0].filename == segments[3].filename
+        assert live_playlist.last_sequence == 3
+
+    asyncio.run(_test())
+
+
+def test_live_playlist_wait_for_sequence():
+    """Test blocking until a segment is added."""
+
+    async def _test():
+        live_playlist = await _setup_playlist([_segment(i) for i in range(2)])
+        assert await live_playlist.async_wait_for_sequence(1, 1)
+        assert not await live_playlist.async_wait_for_sequence(2, 0.01)
+
+        waiter = asyncio.create_task(live_playlist.async_wait_for_sequence(2, 1))
+        await asyncio.sleep(0)
+        await live_playlist._async_on_created(  # pylint: disable=protected-access
+            _created(_segment(2))
+        )
+        assert await waiter
+
+    asyncio.run(_test())
+
+
+def test_live_playlist_window():
+    """Test that starts before the window are not served."""
+
+    async def _test():
+        live_playlist = await _setup_playlist([])
+        assert live_playlist.in_window(NOW)
+        assert not live_playlist.in_window(NOW - datetime.timedelta(days=2))
+
+    asyncio.run(_test())
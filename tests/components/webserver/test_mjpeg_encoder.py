@@ -0,0 +1,92 @@
+"""Tests for the shared MJPEG encoder."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from tornado.ioloop import IOLoop
+
+from viseron.components.webserver.const import MJPEG_ENCODERS
+from viseron.components.webserver.mjpeg_encoder import get_mjpeg_encoder
+from viseron.domains.camera.config import MJPEG_STREAM_SCHEMA
+from viseron.events import Event
+
+
+def _setup():
+    vis = MagicMock()
+    vis.data = {MJPEG_ENCODERS: {}}
+    nvr = MagicMock()
+    nvr.camera.identifier = "test"
+    return vis, nvr
+
+
+def _frame_queue(vis):
+    return vis.listen_event.call_args[0][1]
+
+
+def test_mjpeg_encoder_shared_by_profile():
+    """Test that viewers of the same profile share one encoder."""
+
+    async def _test():
+        vis, nvr = _setup()
+        ioloop = IOLoop.current()
+        config = MJPEG_STREAM_SCHEMA({"width": 640, "height": 360})
+
+        encoder = get_mjpeg_encoder(vis, nvr, config, ioloop)
+        queue_1 = encoder.subscribe()
+        assert get_mjpeg_encoder(vis, nvr, dict(config), ioloop) is encoder
+        queue_2 = encoder.subscribe()
+        assert encoder.viewers == 2
+
+        other = get_mjpeg_encoder(vis, nvr, MJPEG_STREAM_SCHEMA({}), ioloop)
+        assert other is not encoder
+
+        with patch(
+            "viseron.components.webserver.mjpeg_encoder.process_frame",
+            return_value=(True, np.array([1, 2, 3], dtype=np.uint8)),
+        ) as mock_process_frame:
+            await asyncio.sleep(0)
+            assert vis.listen_event.call_count == 1
+            await _frame_queue(vis).put(Event("frame", MagicMock(), 0))
+            assert await queue_1.get() == b"\x01\x02\x03"
+            assert await queue_2.get() == b"\x01\x02\x03"
+        assert mock_process_frame.call_count == 1
+        assert encoder.metrics["frames"] == 1
+        assert encoder.encode_time is not None
+
+        encoder.unsubscribe(queue_1)
+        encoder.unsubscribe(queue_2)
+        await _frame_queue(vis).put(Event("frame", MagicMock(), 0))
+        await asyncio.sleep(0.1)
+        assert not vis.data[MJPEG_ENCODERS]
+
+    asyncio.run(_test())
+
+
+def test_mjpeg_encoder_drops_frames_for_slow_viewers():
+    """Test that a viewer only gets the latest frame."""
+
+    async def _test():
+        vis, nvr = _setup()
+        encoder = get_mjpeg_encoder(
+            vis, nvr, MJPEG_STREAM_SCHEMA({}), IOLoop.current()
+        )
+        queue = encoder.subscribe()
+
+        with patch(
+            "viseron.components.webserver.mjpeg_encoder.process_frame",
+            side_effect=[
+                (True, np.array([index], dtype=np.uint8)) for index in range(3)
+            ],
+        ):
+            await asyncio.sleep(0)
+            for _ in range(3):
+                await _frame_queue(vis).put(Event("frame", MagicMock(), 0))
+                await asyncio.sleep(0.1)
+
+        assert queue.qsize() == 1
+        assert await queue.get() == b"\x02"
+        encoder.unsubscribe(queue)
+
+    asyncio.run(_test())
@@ -0,0 +1,107 @@
+"""Tests for the WebSocket API handler."""
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from tornado.ioloop import IOLoop
+
+from viseron.components.webserver.websocket_api import (
+    MessageBuffer,
+    SubscriptionEvent,
+    async_event_json,
+)
+from viseron.components.webserver.websocket_api.messages import (
+    subscription_result_json,
+    subscription_result_message,
+)
+from viseron.events import Event
+from viseron.helpers.json import JSONEncoder
+
+
+def _event(entity_id: str, state: str) -> Event[dict[str, str]]:
+    return Event("state_changed", {"entity_id": entity_id, "state": state}, 0)
+
+
+def test_message_buffer_coalesce():
+    """Test that superseded state changes are coalesced when the buffer is full."""
+
+    async def _test():
+        buffer = MessageBuffer(2)
+        buffer.put(SubscriptionEvent(1, _event("a", "on"), "a"))
+        buffer.put(SubscriptionEvent(1, _event("b", "on"), "b"))
+        buffer.put(SubscriptionEvent(1, _event("a", "off"), "a"))
+        buffer.put(SubscriptionEvent(1, _event("c", "on"), "c"))
+        assert len(buffer) == 2
+        assert buffer.coalesced == 1
+        assert buffer.dropped == 1
+
+        # Results of commands are never dropped
+        buffer.put({"command_id": 2})
+        assert len(buffer) == 3
+
+        message = await buffer.get()
+        assert isinstance(message, SubscriptionEvent)
+        assert message.event.data == {"entity_id": "a", "state": "off"}
+        message = await buffer.get()
+        assert isinstance(message, SubscriptionEvent)
+        assert message.event.data == {"entity_id": "b", "state": "on"}
+        assert await buffer.get() == {"command_id": 2}
+
+        # Buffered events that have been written can no longer be coalesced
+        buffer.put(SubscriptionEvent(1, _event("a", "on"), "a"))
+        buffer.put(SubscriptionEvent(1, _event("b", "off"), "b"))
+        buffer.put(SubscriptionEvent(1, _event("a", "off"), "a"))
+        assert buffer.coalesced == 2
+        assert buffer.dropped == 1
+
+    asyncio.run(_test())
+
+
+def test_message_buffer_get_waits():
+    """Test that get waits for a message."""
+
+    async def _test():
+        buffer = MessageBuffer(2)
+        getter = asyncio.create_task(buffer.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        buffer.put(None)
+        assert await getter is None
+        assert buffer.empty()
+
+    asyncio.run(_test())
+
+
+def test_async_event_json_once():
+    """Test that an event is serialized once for all connections."""
+
+    async def _test():
+        event = _event("a", "on")
+        assert event.cached_json is None
+        as_json = Event.as_json
+        calls = []
+
+        def _as_json(self):
+            calls.append(self)
+            return as_json(self)
+
+        with patch.object(Event, "as_json", _as_json):
+            results = await asyncio.gather(
+                *(async_event_json(IOLoop.current(), event) for _ in range(5))
+            )
+            assert await async_event_json(IOLoop.current(), event) == results[0]
+        assert len(calls) == 1
+        assert len(set(results)) == 1
+        assert event.cached_json == results[0]
+
+    asyncio.run(_test())
+
+
+def test_subscription_result_json():
+    """Test that the shared result is wrapped in a subscription result message."""
+    event = _event("a", "on")
+    assert json.loads(subscription_result_json(5, event.as_json())) == json.loads(
+        json.dumps(subscription_result_message(5, event), cls=JSONEncoder)
+    )
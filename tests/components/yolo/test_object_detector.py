@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any, cast
 
@@ -10,6 +12,17 @@ import pytest
 from pytest import MonkeyPatch
 
 import viseron.components.yolo.object_detector as od
+from viseron.components import yolo
+from viseron.components.yolo.const import (
+    CONFIG_BATCH_TIMEOUT,
+    CONFIG_DEVICE,
+    CONFIG_HALF_PRECISION,
+    CONFIG_IOU,
+    CONFIG_MAX_BATCH,
+    CONFIG_MIN_CONFIDENCE,
+    CONFIG_MODEL_PATH,
+    CONFIG_OBJECT_DETECTOR,
+)
 from viseron.domains.camera.shared_frames import SharedFrame
 from viseron.domains.object_detector import AbstractObjectDetector
 from viseron.domains.object_detector.detected_object import DetectedObject
@@ -19,6 +32,7 @@ from tests.components.yolo.common import (
     DetectionBuilder,
     DetectionSpec,
     ErrYOLO,
+    FakeResult,
     FakeYOLO,
 )
 from tests.conftest import MockViseron
@@ -47,7 +61,7 @@ def patch_yolo(monkeypatch: MonkeyPatch) -> None:
     dependencies.
     """
     # Replace the YOLO class in the imported module with our dummy
-    monkeypatch.setattr(od, "YOLO", FakeYOLO)
+    monkeypatch.setattr(yolo, "YOLO", FakeYOLO)
 
     # Patch AbstractObjectDetector.__init__ to avoid heavy initialization
     def fake_init(
@@ -88,12 +102,14 @@ def detector_config(tmp_path: Path) -> dict[str, dict[str, Any]]:
         Configuration dictionary with all required settings
     """
     return {
-        od.CONFIG_OBJECT_DETECTOR: {
-            od.CONFIG_MODEL_PATH: str(tmp_path / "model.pt"),
-            od.CONFIG_MIN_CONFIDENCE: 0.25,
-            od.CONFIG_IOU: 0.45,
-            od.CONFIG_HALF_PRECISION: False,
-            od.CONFIG_DEVICE: "cpu",
+        CONFIG_OBJECT_DETECTOR: {
+            CONFIG_MODEL_PATH: str(tmp_path / "model.pt"),
+            CONFIG_MIN_CONFIDENCE: 0.25,
+            CONFIG_IOU: 0.45,
+            CONFIG_HALF_PRECISION: False,
+            CONFIG_DEVICE: "cpu",
+            CONFIG_MAX_BATCH: 1,
+            CONFIG_BATCH_TIMEOUT: 0.01,
         }
     }
 
@@ -103,7 +119,7 @@ def detector(
     patch_yolo: None,  # pylint: disable=unused-argument # noqa: ARG001
     vis: MockViseron,
     detector_config: dict[str, dict[str, Any]],
-) -> od.ObjectDetector:
+) -> Iterator[od.ObjectDetector]:
     """Provide a configured ObjectDetector instance.
 
     Args:
@@ -111,15 +127,18 @@ def detector(
         vis: MockViseron instance
         detector_config: Configuration dictionary
 
-    Returns:
+    Yields:
         ObjectDetector instance ready for testing
     """
     # Set up required component and camera
     # Use resolution that matches our test detection data (640x480)
     _ = MockComponent(vis, COMPONENT)
     _ = MockCamera(vis, identifier=CAMERA_IDENTIFIER, resolution=(640, 480))
+    inference = yolo.YOLOInference(vis, detector_config[CONFIG_OBJECT_DETECTOR])
+    vis.data[COMPONENT] = inference
 
-    return od.ObjectDetector(vis, detector_config, CAMERA_IDENTIFIER)
+    yield od.ObjectDetector(vis, detector_config, CAMERA_IDENTIFIER)
+    inference.stop()
 
 
 # ============================================================================
@@ -261,7 +280,7 @@ def test_return_objects_calls_predict(detector: od.ObjectDetector):
     # Configure the dummy detector with prediction results
     expected = CAT_DETECTION
     result = DetectionBuilder().add_spec(expected).build()
-    detector._detector.set_pred([result])  # type: ignore[attr-defined]
+    detector._inference.model.set_pred([result])  # type: ignore[attr-defined]
 
     frame = cast(SharedFrame, np.zeros((480, 640, 3), dtype=np.uint8))
     objects = detector.return_objects(frame)
@@ -275,7 +294,7 @@ def test_return_objects_with_multiple_detections(detector: od.ObjectDetector):
     expected = [PERSON_DETECTION, CAT_DETECTION, DOG_DETECTION]
     result = DetectionBuilder().add_specs(expected).build()
 
-    detector._detector.set_pred([result])  # type: ignore[attr-defined]
+    detector._inference.model.set_pred([result])  # type: ignore[attr-defined]
 
     frame = cast(SharedFrame, np.zeros((480, 640, 3), dtype=np.uint8))
     objects = detector.return_objects(frame)
@@ -290,7 +309,7 @@ def test_return_objects_with_multiple_detections(detector: od.ObjectDetector):
 def test_return_objects_with_no_detections(detector: od.ObjectDetector):
     """Test return_objects when no objects are detected."""
     result = DetectionBuilder().build()
-    detector._detector.set_pred([result])  # type: ignore[attr-defined]
+    detector._inference.model.set_pred([result])  # type: ignore[attr-defined]
 
     frame = cast(SharedFrame, np.zeros((480, 640, 3), dtype=np.uint8))
     objects = detector.return_objects(frame)
@@ -311,7 +330,9 @@ def test_return_objects_handles_prediction_exception(
     This test verifies the code doesn't crash unexpectedly.
     """
     # Replace the detector with one that raises errors
-    monkeypatch.setattr(detector, "_detector", ErrYOLO(ValueError, "prediction failed"))
+    monkeypatch.setattr(
+        detector._inference, "model", ErrYOLO(ValueError, "prediction failed")
+    )
 
     frame = cast(SharedFrame, np.zeros((480, 640, 3), dtype=np.uint8))
 
@@ -330,7 +351,7 @@ def test_return_objects_with_empty_frame(detector: od.ObjectDetector):
     """Test return_objects with edge case empty frame."""
     # Configure detector to return empty results
     result = DetectionBuilder().build()
-    detector._detector.set_pred([result])  # type: ignore[attr-defined]
+    detector._inference.model.set_pred([result])  # type: ignore[attr-defined]
 
     # Create minimal valid frame
     frame = cast(SharedFrame, np.zeros((1, 1, 3), dtype=np.uint8))
@@ -339,3 +360,116 @@ def test_return_objects_with_empty_frame(detector: od.ObjectDetector):
     objects = detector.return_objects(frame)
 
     assert objects == []
+
+
+# ============================================================================
+# Shared Inference Tests
+# ============================================================================
+
+
+class BatchRecordingYOLO(FakeYOLO):
+    """YOLO variant returning one result per frame and recording batch sizes."""
+
+    def __init__(self, model_path: str | None = None):
+        """Initialize with an empty batch record."""
+        super().__init__(model_path)
+        self.batch_sizes: list[int] = []
+
+    def predict(self, source: Any = None, **kwargs: Any) -> list[FakeResult]:
+        """Return a result per frame, with the frame height as orig_shape."""
+        del kwargs
+        self.batch_sizes.append(len(source))
+        return [
+            DetectionBuilder().add_spec(PERSON_DETECTION).build(frame.shape[:2])
+            for frame in source
+        ]
+
+
+def test_inference_batches_frames_from_multiple_cameras(
+    monkeypatch: MonkeyPatch,
+    vis: MockViseron,
+    detector_config: dict[str, dict[str, Any]],
+):
+    """Frames queued at the same time should be predicted in a single batch."""
+    monkeypatch.setattr(yolo, "YOLO", BatchRecordingYOLO)
+    config = detector_config[CONFIG_OBJECT_DETECTOR]
+    config[CONFIG_MAX_BATCH] = 4
+    config[CONFIG_BATCH_TIMEOUT] = 1.0
+    inference = yolo.YOLOInference(vis, config)
+    model = cast(BatchRecordingYOLO, inference.model)
+
+    results: dict[int, Any] = {}
+
+    def predict(height: int) -> None:
+        results[height] = inference.predict(np.zeros((height, 10, 3), dtype=np.uint8))
+
+    threads = [
+        threading.Thread(target=predict, args=(height,)) for height in (1, 2, 3, 4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    inference.stop()
+
+    assert model.batch_sizes == [4]
+    # Each camera gets the result of its own frame
+    assert {height: result.orig_shape[0] for height, result in results.items()} == {
+        1: 1,
+        2: 2,
+        3: 3,
+        4: 4,
+    }
+    assert inference.batch_metrics.metrics["batch_size_max"] == 4
+
+
+def test_predict_returns_none_when_stopped_while_queueing(
+    patch_yolo: None,  # pylint: disable=unused-argument # noqa: ARG001
+    vis: MockViseron,
+    detector_config: dict[str, dict[str, Any]],
+):
+    """A frame queued after the pending jobs are released should not block."""
+    inference = yolo.YOLOInference(vis, detector_config[CONFIG_OBJECT_DETECTOR])
+    queue_put = inference._queue.put  # pylint: disable=protected-access
+
+    def put(job: yolo.InferenceJob) -> None:
+        inference.stop()
+        queue_put(job)
+
+    inference._queue.put = put  # type: ignore[method-assign] # pylint: disable=protected-access
+
+    results: list[Any] = []
+    thread = threading.Thread(
+        target=lambda: results.append(
+            inference.predict(np.zeros((1, 10, 3), dtype=np.uint8))
+        ),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert results == [None]
+
+
+def test_model_is_shared_between_cameras(
+    monkeypatch: MonkeyPatch,
+    patch_yolo: None,  # pylint: disable=unused-argument # noqa: ARG001
+    vis: MockViseron,
+    detector_config: dict[str, dict[str, Any]],
+):
+    """The model should only be loaded once regardless of the number of cameras."""
+    loaded: list[FakeYOLO] = []
+
+    def load_model(model_path: str) -> FakeYOLO:
+        loaded.append(FakeYOLO(model_path))
+        return loaded[-1]
+
+    monkeypatch.setattr(yolo, "YOLO", load_model)
+    _ = MockComponent(vis, COMPONENT)
+    yolo.setup(vis, {COMPONENT: detector_config})
+    for camera_identifier in ("camera_1", "camera_2", "camera_3"):
+        _ = MockCamera(vis, identifier=camera_identifier, resolution=(640, 480))
+        od.ObjectDetector(vis, detector_config, camera_identifier)
+    yolo.unload(vis)
+
+    assert len(loaded) == 1
@@ -8,6 +8,8 @@ import shutil
 import tempfile
 from unittest.mock import MagicMock, Mock, patch
 
+from watchdog.events import FileClosedEvent, FileCreatedEvent, FileModifiedEvent
+
 from viseron.domains.camera.const import MP4BOX_PATH
 from viseron.domains.camera.fragmenter import (
     Fragment,
@@ -75,6 +77,21 @@ def test_generate_playlist() -> None:
     )
 
 
+def test_generate_playlist_gap() -> None:
+    """Test that gaps are marked with EXT-X-GAP."""
+    now = utcnow()
+    fragments = [
+        Fragment("test1.mp4", "/test/test1.mp4", 5, now),
+        Fragment("test2.mp4", "/test/test2.mp4", 5, now, gap=True),
+    ]
+
+    playlist = generate_playlist(fragments, "/test/init.mp4")
+    lines = playlist.split("\n")
+    assert lines[1] == "#EXT-X-VERSION:8"
+    assert lines.count("#EXT-X-GAP") == 1
+    assert lines[lines.index("#EXT-X-GAP") + 1] == "/test/test2.mp4"
+
+
 class TestFragmenter:
     """Tests for Fragmenter."""
 
@@ -142,6 +159,66 @@ class TestFragmenter:
         )
         assert mock_shutil_move.call_count == 2
 
+    @patch("viseron.helpers.child_process_worker.RestartableProcess")
+    def test_handle_event(self, _mock_restartable_process: Mock):
+        """Test that only completed segments are sent to the subprocess."""
+        self.camera.stopped.is_set.return_value = False
+        input_queue = self.fragmenter._fragment_worker.input_queue  # pylint: disable=protected-access
+        folder = self.camera.temp_segments_folder
+        self.fragmenter.handle_event(FileModifiedEvent(f"{folder}/1723111140.m4s"))
+        self.fragmenter.handle_event(FileClosedEvent(f"{folder}/init.mp4"))
+        self.fragmenter.handle_event(FileClosedEvent(f"{folder}/1723111140/clip.mp4"))
+        assert input_queue.empty()
+
+        self.fragmenter.handle_event(FileCreatedEvent(f"{folder}/index.m3u8"))
+        assert input_queue.get_nowait() == {"cmd": "fragment", "playlist": True}
+        self.fragmenter.handle_event(FileClosedEvent(f"{folder}/1723111140.mp4"))
+        assert input_queue.get_nowait() == {
+            "cmd": "fragment",
+            "files": ["1723111140.mp4"],
+        }
+
+    @patch("viseron.helpers.child_process_worker.RestartableProcess")
+    def test_get_segments_in_playlist(self, _mock_restartable_process: Mock):
+        """Test that segments not yet in the playlist are not fragmented."""
+        folder = self.camera.temp_segments_folder
+        with open(os.path.join(folder, "index.m3u8"), "w", encoding="utf-8") as file:
+            file.write(PLAYLIST_CONTENT)
+        for segment in ("init.mp4", "1723111166.m4s", "1723111171.m4s", "1.m4s"):
+            with open(os.path.join(folder, segment), "wb"):
+                pass
+
+        assert sorted(
+            self.fragmenter._fragment_worker._get_segments_in_playlist()  # pylint: disable=protected-access
+        ) == ["1723111166.m4s", "1723111171.m4s"]
+
+    @patch("viseron.helpers.child_process_worker.RestartableProcess")
+    def test_queue_timelapse_frame(self, _mock_restartable_process: Mock, tmp_path):
+        """Test that the segment is linked and not copied for the frame extractor."""
+        self.camera.temp_timelapse_folder = str(tmp_path / "temp_timelapse")
+        self.camera.timelapse_folder = str(tmp_path / "timelapse")
+        os.makedirs(self.camera.temp_timelapse_folder)
+        folder = self.camera.temp_segments_folder
+        init_path = os.path.join(folder, "init.mp4")
+        segment_path = os.path.join(folder, "1723111140.m4s")
+        for path in (init_path, segment_path):
+            with open(path, "wb") as file:
+                file.write(b"data")
+
+        worker = self.fragmenter._fragment_worker  # pylint: disable=protected-access
+        with patch.object(worker, "_output_queue") as output_queue:
+            worker._queue_timelapse_frame(  # pylint: disable=protected-access
+                "1723111140.m4s", init_path, segment_path
+            )
+
+        item = output_queue.put.call_args.args[0]["timelapse"]
+        init_source, segment_source = item["source_paths"]
+        assert os.path.samefile(segment_source, segment_path)
+        assert not os.path.samefile(init_source, init_path)
+        assert item["frame_path"] == os.path.join(
+            self.camera.timelapse_folder, "1723111140.jpg"
+        )
+
 
 def test_extract_extinf_number():
     """Test _extract_extinf_number."""
@@ -0,0 +1,100 @@
+"""Tests for shared frames."""
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from viseron.domains.camera.shared_frames import (
+    SharedFrame,
+    SharedFrameRingBuffer,
+    SharedFrames,
+)
+
+
+@pytest.fixture
+def ring_buffer():
+    """Return a small ring buffer."""
+    buffer = SharedFrameRingBuffer(6, 2)
+    yield buffer
+    buffer.unlink()
+
+
+def test_ring_buffer_acquire_release(ring_buffer: SharedFrameRingBuffer) -> None:
+    """Test that slots are handed out round robin and reused after release."""
+    assert ring_buffer.acquire() == (0, 1)
+    assert ring_buffer.acquire() == (1, 2)
+    assert ring_buffer.acquire() is None
+    assert ring_buffer.in_use() == 2
+
+    ring_buffer.release(0)
+    assert ring_buffer.acquire() == (0, 3)
+
+
+def test_shared_frame_reference_count() -> None:
+    """Test that references added and removed from many threads are not lost."""
+    shared_frame = SharedFrame(2, 3, "yuv420p", (2, 2), "test")
+
+    def add_and_remove() -> None:
+        for _ in range(1000):
+            shared_frame.add_reference()
+            with shared_frame:
+                pass
+            shared_frame.remove_reference()
+
+    threads = [threading.Thread(target=add_and_remove) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert shared_frame.reference_count == 0
+
+
+def test_shared_frames_create_from_slot(ring_buffer: SharedFrameRingBuffer) -> None:
+    """Test that frames are zero-copy views and that removal releases the slot."""
+    vis = MagicMock()
+    vis.shutdown_stage = None
+    shared_frames = SharedFrames(vis)
+    shared_frame = SharedFrame(2, 3, "yuv420p", (2, 2), "test")
+
+    acquired = ring_buffer.acquire()
+    assert acquired
+    slot, _ = acquired
+    ring_buffer.slot_buffer(slot)[:] = bytes(range(6))
+    shared_frames.create_from_slot(shared_frame, ring_buffer, slot)
+
+    frame = shared_frames.get_decoded_frame(shared_frame)
+    np.testing.assert_array_equal(frame, np.arange(6, dtype=np.uint8).reshape(3, 2))
+    ring_buffer.slot_buffer(slot)[0] = 42
+    assert frame[0, 0] == 42
+
+    del frame
+    shared_frames.remove(shared_frame, None)  # type: ignore[arg-type]
+    assert ring_buffer.in_use() == 0
+
+
+def test_shared_frames_luma_and_resized_frames() -> None:
+    """Test the zero-copy luma view and the cache of resized frames."""
+    vis = MagicMock()
+    vis.shutdown_stage = None
+    shared_frames = SharedFrames(vis)
+    shared_frame = SharedFrame(4, 6, "yuv420p", (4, 4), "test")
+    shared_frames.create(shared_frame, bytes(range(24)))
+
+    luma = shared_frames.get_luma_view(shared_frame)
+    np.testing.assert_array_equal(luma, np.arange(16, dtype=np.uint8).reshape(4, 4))
+    assert np.shares_memory(luma, shared_frames.get_decoded_frame(shared_frame))
+    assert not luma.flags.writeable
+    np.testing.assert_array_equal(
+        shared_frames.get_decoded_frame_gray(shared_frame), luma
+    )
+
+    resized = shared_frames.get_resized_frame(shared_frame, "gray", (2, 2))
+    assert resized.shape == (2, 2)
+    assert not resized.flags.writeable
+    assert shared_frames.get_resized_frame(shared_frame, "gray", (2, 2)) is resized
+
+    shared_frames.remove(shared_frame, None)  # type: ignore[arg-type]
+    assert not shared_frames._resized  # pylint: disable=protected-access
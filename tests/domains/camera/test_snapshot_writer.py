@@ -0,0 +1,132 @@
+"""Tests for the snapshot writer."""
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+import pytest
+
+from viseron.const import VISERON_SIGNAL_SHUTDOWN
+from viseron.domains.camera.const import SNAPSHOT_WRITER
+from viseron.domains.camera.snapshot_writer import SnapshotWriter, get_snapshot_writer
+
+
+def _frame() -> np.ndarray:
+    return np.full((48, 64, 3), 128, dtype=np.uint8)
+
+
+def test_write(tmp_path):
+    """Test that snapshots are written and the path is returned."""
+    writer = SnapshotWriter(max_workers=1, max_pending=10, cache_size=2)
+    path = os.path.join(tmp_path, "object_detector", "snapshot.jpg")
+    assert writer.write(path, None, _frame, 90) == path
+    writer.stop()
+
+    snapshot = cv2.imread(path)
+    assert snapshot.shape == (48, 64, 3)
+    metrics = writer.metrics
+    assert metrics["written"] == 1
+    assert metrics["encoded"] == 1
+    assert metrics["pending"] == 0
+    assert metrics["write_time_p99"] is not None
+
+
+def test_write_reuse(tmp_path):
+    """Test that the same snapshot is only rendered and encoded once."""
+    render = MagicMock(side_effect=_frame)
+    writer = SnapshotWriter(max_workers=2, max_pending=10, cache_size=2)
+    paths = [
+        writer.write(os.path.join(tmp_path, domain, "snapshot.jpg"), "key", render, 90)
+        for domain in ("object_detector", "motion_detector", "face_recognition")
+    ]
+    # A different quality is encoded separately
+    paths.append(writer.write(os.path.join(tmp_path, "low.jpg"), "key", render, 10))
+    writer.stop()
+
+    assert render.call_count == 2
+    for path in paths:
+        assert os.path.exists(path)
+    with open(paths[0], "rb") as first, open(paths[1], "rb") as second:
+        assert first.read() == second.read()
+    metrics = writer.metrics
+    assert metrics["written"] == 4
+    assert metrics["encoded"] == 2
+    assert metrics["reused"] == 2
+
+
+def test_write_cache_size(tmp_path):
+    """Test that only the most recent snapshots are reused."""
+    render = MagicMock(side_effect=_frame)
+    writer = SnapshotWriter(max_workers=1, max_pending=10, cache_size=1)
+    for key in ("first", "second", "first"):
+        writer.write(os.path.join(tmp_path, f"{key}.jpg"), key, render, 90)
+    writer.stop()
+    assert render.call_count == 3
+
+
+def test_write_drop_oldest(tmp_path):
+    """Test that the oldest snapshot is dropped when the writer falls behind."""
+    on_dropped = MagicMock()
+    writer = SnapshotWriter(max_workers=0, max_pending=2, cache_size=2)
+    paths = [
+        writer.write(os.path.join(tmp_path, f"{i}.jpg"), None, _frame, 90, on_dropped)
+        for i in range(3)
+    ]
+    # The callback is left to the workers
+    on_dropped.assert_not_called()
+    metrics = writer.metrics
+    assert metrics["submitted"] == 3
+    assert metrics["dropped"] == 1
+    assert metrics["pending"] == 2
+
+    # Pending snapshots are written by the workers before they stop
+    writer.stop()
+    writer._worker()  # pylint: disable=protected-access
+    on_dropped.assert_called_once_with(paths[0])
+    assert not os.path.exists(paths[0])
+    assert os.path.exists(paths[1])
+    assert os.path.exists(paths[2])
+    assert writer.metrics["written"] == 2
+
+
+def test_write_failed(tmp_path):
+    """Test that failed writes are counted."""
+    file_path = os.path.join(tmp_path, "file")
+    with open(file_path, "w", encoding="utf-8"):
+        pass
+    on_dropped = MagicMock()
+    writer = SnapshotWriter(max_workers=1, max_pending=10, cache_size=2)
+    path = writer.write(
+        os.path.join(file_path, "snapshot.jpg"), None, _frame, 90, on_dropped
+    )
+    writer.stop()
+    on_dropped.assert_called_once_with(path)
+    assert writer.metrics["failed"] == 1
+    assert writer.metrics["written"] == 0
+
+
+def test_write_render_failed(tmp_path):
+    """Test that on_dropped is called when the snapshot can't be rendered."""
+    on_dropped = MagicMock()
+    writer = SnapshotWriter(max_workers=1, max_pending=10, cache_size=2)
+    path = os.path.join(tmp_path, "snapshot.jpg")
+    with pytest.raises(ValueError):
+        writer.write(path, None, MagicMock(side_effect=ValueError), 90, on_dropped)
+    writer.stop()
+    on_dropped.assert_called_once_with(path)
+    assert writer.metrics["submitted"] == 0
+
+
+def test_get_snapshot_writer(vis):
+    """Test that a single snapshot writer is shared and stopped on shutdown."""
+    vis.data.pop(SNAPSHOT_WRITER, None)
+    vis.register_signal_handler = MagicMock()
+    snapshot_writer = get_snapshot_writer(vis)
+    assert get_snapshot_writer(vis) is snapshot_writer
+    assert vis.data[SNAPSHOT_WRITER] is snapshot_writer
+    vis.register_signal_handler.assert_called_once_with(
+        VISERON_SIGNAL_SHUTDOWN, snapshot_writer.stop
+    )
+    snapshot_writer.stop()
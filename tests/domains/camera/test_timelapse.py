@@ -0,0 +1,81 @@
+"""Tests for timelapse frame extraction."""
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock, Mock, patch
+
+import cv2
+import numpy as np
+
+from viseron.domains.camera.timelapse import TimelapseFrameExtractor, extract_keyframe
+
+
+def _write_video(path: str, width: int = 64, height: int = 48) -> None:
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 5, (width, height))
+    for i in range(5):
+        writer.write(np.full((height, width, 3), i * 40, np.uint8))
+    writer.release()
+
+
+def test_extract_keyframe(tmp_path) -> None:
+    """Test that the first frame is extracted and scaled down."""
+    source = str(tmp_path / "1.mp4")
+    _write_video(source)
+
+    jpg = extract_keyframe([source], None, 90)
+    assert jpg is not None
+    frame = cv2.imdecode(np.frombuffer(jpg, np.uint8), cv2.IMREAD_COLOR)
+    assert frame.shape == (48, 64, 3)
+
+    jpg = extract_keyframe([source], 32, 90)
+    assert jpg is not None
+    frame = cv2.imdecode(np.frombuffer(jpg, np.uint8), cv2.IMREAD_COLOR)
+    assert frame.shape == (24, 32, 3)
+
+
+def test_extract_keyframe_invalid(tmp_path) -> None:
+    """Test that None is returned for files that can not be decoded."""
+    source = tmp_path / "1.mp4"
+    source.write_bytes(b"not a video")
+    assert extract_keyframe([str(source)], None, 90) is None
+
+
+def test_extract_keyframe_split(tmp_path) -> None:
+    """Test that a file split in two, like init and media segment, is decoded."""
+    source = str(tmp_path / "1.mp4")
+    _write_video(source)
+    with open(source, "rb") as file:
+        data = file.read()
+    init, segment = tmp_path / "init.mp4", tmp_path / "1.m4s"
+    init.write_bytes(data[:1000])
+    segment.write_bytes(data[1000:])
+
+    jpg = extract_keyframe([str(init), str(segment)], None, 90)
+    assert jpg is not None
+
+
+@patch("viseron.helpers.child_process_worker.RestartableProcess")
+def test_work_input(_mock_restartable_process: Mock, tmp_path) -> None:
+    """Test that the frame is written and the source is removed."""
+    extractor = TimelapseFrameExtractor(MagicMock(), None, 85)
+    source = str(tmp_path / "1.mp4")
+    _write_video(source)
+    os.makedirs(tmp_path / "timelapse")
+    item = {
+        "source_paths": [source],
+        "tmp_frame_path": str(tmp_path / "1.jpg"),
+        "frame_path": str(tmp_path / "timelapse" / "1.jpg"),
+    }
+
+    result = extractor.work_input(item)
+    assert "error" not in result
+    assert os.path.exists(item["frame_path"])
+    assert not os.path.exists(item["tmp_frame_path"])
+    assert not os.path.exists(source)
+
+    with open(source, "wb") as file:
+        file.write(b"not a video")
+    result = extractor.work_input(item)
+    assert result["error"]
+    assert not os.path.exists(source)
+    extractor.stop()
@@ -0,0 +1 @@
+"""Motion detector domain tests."""
@@ -0,0 +1,78 @@
+"""Tests for the motion_detector domain."""
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from viseron.domains.motion_detector import AbstractMotionDetectorScanner
+from viseron.domains.motion_detector.const import (
+    CONFIG_AREA,
+    CONFIG_CAMERAS,
+    CONFIG_COORDINATES,
+    CONFIG_HEIGHT,
+    CONFIG_MASK,
+    CONFIG_WIDTH,
+)
+
+from tests.common import MockCamera
+
+CAMERA_IDENTIFIER = "test_camera"
+
+
+class _MotionDetectorScanner(AbstractMotionDetectorScanner):
+    """Motion detector scanner which keeps the last scanned frame."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.frame: np.ndarray | None = None
+        self.scanned = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def return_motion(self, frame):
+        """Keep the frame instead of detecting motion."""
+        self.frame = frame
+        self.scanned.set()
+        return MagicMock(max_area=0)
+
+
+def test_mask_scaled_to_scanner_resolution() -> None:
+    """Test that the mask covers the same area at a lower scanner resolution."""
+    vis = MagicMock()
+    camera = MockCamera(identifier=CAMERA_IDENTIFIER, resolution=(1920, 1080))
+    camera.shared_frames.get_resized_frame.return_value = np.full(
+        (360, 640), 255, dtype=np.uint8
+    )
+    vis.get_registered_domain.return_value = camera
+    config = {
+        CONFIG_CAMERAS: {
+            CAMERA_IDENTIFIER: {
+                CONFIG_WIDTH: 640,
+                CONFIG_HEIGHT: 360,
+                CONFIG_AREA: 0.08,
+                CONFIG_MASK: [
+                    {
+                        CONFIG_COORDINATES: [
+                            {"x": 960, "y": 0},
+                            {"x": 1920, "y": 0},
+                            {"x": 1920, "y": 540},
+                            {"x": 960, "y": 540},
+                        ]
+                    }
+                ],
+            }
+        }
+    }
+
+    scanner = _MotionDetectorScanner(vis, "test", config, CAMERA_IDENTIFIER)
+    try:
+        scanner.motion_detection_queue.put(MagicMock())
+        assert scanner.scanned.wait(5)
+    finally:
+        scanner.stop()
+
+    assert scanner.frame is not None
+    # The top right quarter of the camera frame is masked
+    assert not scanner.frame[:180, 320:].any()
+    assert scanner.frame[181:, :].all()
+    assert scanner.frame[:, :319].all()
@@ -0,0 +1,35 @@
+"""Tests for BatchMetrics."""
+from __future__ import annotations
+
+from viseron.domains.object_detector.batch_metrics import BatchMetrics
+from viseron.domains.object_detector.const import BATCH_METRICS
+
+
+def test_metrics(vis):
+    """Test batch size and queue wait metrics."""
+    batch_metrics = BatchMetrics(vis, "darknet")
+    assert vis.data[BATCH_METRICS]["darknet"] is batch_metrics
+    assert batch_metrics.metrics == {
+        "batch_size_avg": None,
+        "batch_size_max": None,
+        "queue_wait_avg": None,
+        "queue_wait_p99": None,
+    }
+
+    for batch_size, queue_wait in ((1, 0.01), (3, 0.02), (3, 0.03), (3, 0.04)):
+        batch_metrics.add(batch_size, queue_wait)
+    metrics = batch_metrics.metrics
+    assert metrics["batch_size_avg"] == 2.5
+    assert metrics["batch_size_max"] == 3
+    assert metrics["queue_wait_avg"] == 0.025
+    assert metrics["queue_wait_p99"] == 0.04
+
+
+def test_unregister(vis):
+    """Test that only the registered instance is removed."""
+    first = BatchMetrics(vis, "darknet")
+    second = BatchMetrics(vis, "darknet")
+    first.unregister()
+    assert vis.data[BATCH_METRICS]["darknet"] is second
+    second.unregister()
+    assert "darknet" not in vis.data[BATCH_METRICS]
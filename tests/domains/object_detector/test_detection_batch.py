@@ -0,0 +1,120 @@
+"""Tests for DetectionBatch."""
+from __future__ import annotations
+
+import numpy as np
+
+from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
+from viseron.helpers import object_in_polygon
+
+FRAME_RES = (1920, 1080)
+MODEL_RES = (320, 320)
+
+LABELS = ["person", "car", "dog"]
+CONFIDENCES = [0.9, 0.8123, 0.5]
+BOXES = [(12, 40, 80, 200), (-5, 100, 150, 310), (200, 15, 260, 90)]
+
+
+def _assert_same(obj: DetectedObject, expected: DetectedObject) -> None:
+    assert obj.label == expected.label
+    assert obj.confidence == expected.confidence
+    assert obj.rel_coordinates == expected.rel_coordinates
+    assert obj.abs_coordinates == expected.abs_coordinates
+    assert obj.rel_width == expected.rel_width
+    assert obj.rel_height == expected.rel_height
+
+
+def test_from_absolute():
+    """Test that objects match objects created with DetectedObject.from_absolute."""
+    batch = DetectionBatch.from_absolute(
+        LABELS, CONFIDENCES, BOXES, FRAME_RES, MODEL_RES
+    )
+    assert len(batch) == 3
+    assert batch.labels.tolist() == LABELS
+    assert batch.confidences.tolist() == [0.9, 0.812, 0.5]
+
+    for obj, label, confidence, box in zip(
+        batch.objects(range(3)), LABELS, CONFIDENCES, BOXES
+    ):
+        _assert_same(
+            obj,
+            DetectedObject.from_absolute(
+                label, confidence, *box, frame_res=FRAME_RES, model_res=MODEL_RES
+            ),
+        )
+
+    objects = batch.objects(np.array([2]))
+    assert len(objects) == 1
+    assert objects[0].label == "dog"
+
+
+def test_from_letterboxed():
+    """Test that objects match objects created from letterboxed coordinates."""
+    batch = DetectionBatch.from_absolute_letterboxed(
+        LABELS, CONFIDENCES, BOXES, FRAME_RES, MODEL_RES
+    )
+    for obj, label, confidence, box in zip(
+        batch.objects(range(3)), LABELS, CONFIDENCES, BOXES
+    ):
+        _assert_same(
+            obj,
+            DetectedObject.from_absolute_letterboxed(
+                label, confidence, *box, frame_res=FRAME_RES, model_res=MODEL_RES
+            ),
+        )
+
+    relative_boxes = [
+        (0.05, 0.125, 0.25, 0.5),
+        (0.5, 0.3, 0.75, 0.6),
+    ]
+    batch = DetectionBatch.from_relative_letterboxed(
+        LABELS[:2], CONFIDENCES[:2], relative_boxes, FRAME_RES, MODEL_RES
+    )
+    for obj, label, confidence, box in zip(
+        batch.objects(range(2)), LABELS, CONFIDENCES, relative_boxes
+    ):
+        _assert_same(
+            obj,
+            DetectedObject.from_relative_letterboxed(
+                label, confidence, *box, frame_res=FRAME_RES, model_res=MODEL_RES
+            ),
+        )
+
+
+def test_from_objects():
+    """Test that objects passed to the batch are returned as is."""
+    objects = [
+        DetectedObject.from_absolute(
+            label, confidence, *box, frame_res=FRAME_RES, model_res=MODEL_RES
+        )
+        for label, confidence, box in zip(LABELS, CONFIDENCES, BOXES)
+    ]
+    batch = DetectionBatch.from_objects(objects, FRAME_RES)
+    assert batch.objects([0, 2]) == [objects[0], objects[2]]
+    # Sizes are calculated before clamping negative coordinates
+    assert batch.widths.tolist() == [obj.rel_width for obj in objects]
+
+
+def test_from_objects_empty():
+    """Test batch without detections."""
+    batch = DetectionBatch.from_objects([], FRAME_RES)
+    assert len(batch) == 0
+    assert batch.in_polygon(FRAME_RES, np.array([[0, 0], [10, 0], [10, 10]])).size == 0
+    assert not batch.objects(np.flatnonzero(batch.confidences > 0))
+
+
+def test_in_polygon():
+    """Test that in_polygon matches object_in_polygon."""
+    batch = DetectionBatch.from_absolute(
+        LABELS, CONFIDENCES, BOXES, FRAME_RES, MODEL_RES
+    )
+    objects = batch.objects(range(3))
+    coordinates = np.array([[0, 0], [600, 0], [600, 1080], [0, 1080]])
+    expected = [object_in_polygon(FRAME_RES, obj, coordinates) for obj in objects]
+    assert batch.in_polygon(FRAME_RES, coordinates).tolist() == expected
+    assert expected == [True, True, False]
+
+    assert batch.in_polygon(FRAME_RES, coordinates, np.array([2, 0])).tolist() == [
+        False,
+        True,
+    ]
@@ -0,0 +1,96 @@
+"""Tests for the object tracker."""
+from __future__ import annotations
+
+import numpy as np
+
+from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.tracker import ObjectTracker, box_iou
+
+FRAME_RES = (1920, 1080)
+
+
+def _obj(label: str, x1: float, y1: float, x2: float, y2: float) -> DetectedObject:
+    return DetectedObject(label, 0.9, x1, y1, x2, y2, FRAME_RES)
+
+
+def test_box_iou():
+    """Test IoU of bounding boxes."""
+    boxes_a = np.array([[0.0, 0.0, 0.2, 0.2], [0.5, 0.5, 0.6, 0.6]])
+    boxes_b = np.array([[0.0, 0.0, 0.2, 0.2], [0.1, 0.0, 0.3, 0.2]])
+    np.testing.assert_allclose(
+        box_iou(boxes_a, boxes_b), [[1.0, 1 / 3], [0.0, 0.0]], rtol=1e-6
+    )
+
+
+def test_tracker_stationary_object():
+    """Test that a stationary object keeps its track and is refreshed on interval."""
+    tracker = ObjectTracker(refresh_interval=5)
+
+    first = [_obj("car", 0.1, 0.1, 0.3, 0.3)]
+    tracker.update(first, [frozenset()], 0)
+    assert first[0].track_id == 1
+    assert first[0].track_changed
+    assert first[0].track_refreshed
+
+    second = [_obj("car", 0.11, 0.1, 0.31, 0.3)]
+    tracker.update(second, [frozenset()], 1)
+    assert second[0].track_id == 1
+    assert not second[0].track_changed
+    assert not second[0].track_refreshed
+
+    third = [_obj("car", 0.11, 0.1, 0.31, 0.3)]
+    tracker.update(third, [frozenset()], 6)
+    assert third[0].track_id == 1
+    assert not third[0].track_changed
+    assert third[0].track_refreshed
+
+
+def test_tracker_changes():
+    """Test that label and zone changes are detected."""
+    tracker = ObjectTracker(refresh_interval=60)
+    tracker.update([_obj("dog", 0.1, 0.1, 0.3, 0.3)], [frozenset()], 0)
+
+    objects = [_obj("cat", 0.1, 0.1, 0.3, 0.3)]
+    tracker.update(objects, [frozenset()], 1)
+    assert objects[0].track_id == 1
+    assert objects[0].track_changed
+
+    objects = [_obj("cat", 0.1, 0.1, 0.3, 0.3)]
+    tracker.update(objects, [frozenset({"yard"})], 2)
+    assert objects[0].track_id == 1
+    assert objects[0].track_changed
+
+
+def test_tracker_multiple_objects():
+    """Test matching on overlap and on distance between centers."""
+    tracker = ObjectTracker(refresh_interval=60)
+    tracker.update(
+        [_obj("person", 0.1, 0.1, 0.2, 0.4), _obj("person", 0.6, 0.1, 0.7, 0.4)],
+        [frozenset(), frozenset()],
+        0,
+    )
+
+    # The first person walked past the edge of its previous bounding box
+    objects = [
+        _obj("person", 0.62, 0.1, 0.72, 0.4),
+        _obj("person", 0.22, 0.1, 0.32, 0.4),
+        _obj("person", 0.9, 0.6, 0.95, 0.9),
+    ]
+    tracker.update(objects, [frozenset()] * 3, 1)
+    assert [obj.track_id for obj in objects] == [2, 1, 3]
+    assert [obj.track_changed for obj in objects] == [False, False, True]
+
+
+def test_tracker_expire():
+    """Test that tracks are kept for missed frames and then removed."""
+    tracker = ObjectTracker(refresh_interval=60)
+    tracker.update([_obj("car", 0.1, 0.1, 0.3, 0.3)], [frozenset()], 0)
+    tracker.update([], [], 5)
+    assert len(tracker.tracks) == 1
+
+    objects = [_obj("car", 0.1, 0.1, 0.3, 0.3)]
+    tracker.update(objects, [frozenset()], 6)
+    assert objects[0].track_id == 1
+
+    tracker.update([], [], 20)
+    assert not tracker.tracks
@@ -2,6 +2,8 @@
 from contextlib import nullcontext
 from datetime import datetime, timedelta, timezone
 
+import cv2
+import numpy as np
 import pytest
 
 from viseron import helpers
@@ -84,6 +86,69 @@ def test_convert_letterboxed_bbox(
         assert str(exception.value) == message
 
 
+@pytest.mark.parametrize(
+    "frame_res, model_res",
+    [
+        ((1920, 1080), (300, 300)),
+        ((1080, 1920), (300, 300)),
+        ((640, 360), (640, 640)),
+        ((360, 640), (640, 640)),
+    ],
+)
+def test_convert_letterboxed_boxes(frame_res, model_res):
+    """Test that convert_letterboxed_boxes matches convert_letterboxed_bbox."""
+    boxes = [(75, 90, 105, 120), (10, 140, 10, 140), (320, 5, 320, 5), (0, 0, 64, 32)]
+    converted_boxes = helpers.convert_letterboxed_boxes(
+        frame_res[0], frame_res[1], model_res[0], model_res[1], np.array(boxes)
+    )
+    assert [
+        [round(coordinate, 3) for coordinate in converted_bbox]
+        for converted_bbox in converted_boxes.tolist()
+    ] == [
+        list(
+            helpers.convert_letterboxed_bbox(
+                frame_res[0], frame_res[1], model_res[0], model_res[1], bbox
+            )
+        )
+        for bbox in boxes
+    ]
+
+
+def test_points_in_polygon():
+    """Test that points_in_polygon matches cv2.pointPolygonTest."""
+    polygon = np.array([[10, 10], [90, 20], [60, 50], [90, 90], [10, 70]])
+    points = np.array(
+        [[x, y] for x in range(0, 101, 5) for y in range(0, 101, 5)]
+        + [[35.5, 10.5], [60, 50], [10, 40], [95, 50]],
+        dtype=np.float64,
+    )
+    assert helpers.points_in_polygon(points, polygon).tolist() == [
+        cv2.pointPolygonTest(polygon, (float(x), float(y)), False) >= 0
+        for x, y in points
+    ]
+
+
+def test_generate_mask_image_scaled():
+    """Test that mask coordinates are scaled to the image resolution."""
+    mask = [np.array([[0, 0], [960, 0], [960, 540], [0, 540]])]
+    full = helpers.generate_mask_image(mask, (1920, 1080))
+    scaled = helpers.generate_mask_image(mask, (640, 360), (1920, 1080))
+
+    assert full[0].max() == 540
+    assert full[1].max() == 960
+    assert scaled[0].max() == 180
+    assert scaled[1].max() == 320
+    assert len(scaled[0]) == 181 * 321
+
+
+def test_percentile():
+    """Test nearest-rank percentile."""
+    assert helpers.percentile([], 0.99) is None
+    assert helpers.percentile([3.0], 0.99) == 3.0
+    assert helpers.percentile(range(1, 1001), 0.99) == 990
+    assert helpers.percentile([5, 1, 4, 2, 3], 0.5) == 3
+
+
 def test_basic_conversion_zero_offset():
     """Test with zero UTC offset."""
     date = "2024-01-01"
@@ -15,22 +15,23 @@ from viseron.domains.object_detector.const import (
     CONFIG_LABEL_WIDTH_MIN,
 )
 from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
+from viseron.domains.object_detector.tracker import ObjectTracker
 from viseron.helpers import utcnow
 from viseron.helpers.filter import Filter
 
 FRAME_RES = (1920, 1080)
 
 
-def test_should_store() -> None:
-    """Test that should_store returns the correct value."""
-    _filter = Filter(
+def _person_filter() -> Filter:
+    return Filter(
         FRAME_RES,
         {
             CONFIG_LABEL_LABEL: "person",
             CONFIG_LABEL_CONFIDENCE: 0.8,
             CONFIG_LABEL_WIDTH_MIN: 0,
-            CONFIG_LABEL_WIDTH_MAX: 1,
-            CONFIG_LABEL_HEIGHT_MIN: 0,
+            CONFIG_LABEL_WIDTH_MAX: 0.5,
+            CONFIG_LABEL_HEIGHT_MIN: 0.05,
             CONFIG_LABEL_HEIGHT_MAX: 1,
             CONFIG_TRIGGER_EVENT_RECORDING: True,
             CONFIG_LABEL_REQUIRE_MOTION: False,
@@ -39,6 +40,11 @@ def test_should_store() -> None:
         },
         [],
     )
+
+
+def test_should_store() -> None:
+    """Test that should_store returns the correct value."""
+    _filter = _person_filter()
     obj = DetectedObject("person", 0.9, 0.1, 0.1, 0.2, 0.2, FRAME_RES)
     assert _filter.should_store(obj) is True
     assert obj.store is True
@@ -48,3 +54,62 @@ def test_should_store() -> None:
     )
     assert _filter.should_store(obj) is False
     assert obj.store is False
+
+
+def test_should_store_tracked() -> None:
+    """Test that tracked objects are stored when they change or on interval."""
+    _filter = _person_filter()
+    tracker = ObjectTracker(refresh_interval=5)
+
+    obj = DetectedObject("person", 0.9, 0.1, 0.1, 0.2, 0.2, FRAME_RES)
+    tracker.update([obj], [frozenset()], 0)
+    assert _filter.should_store(obj) is True
+    assert obj.store is True
+
+    obj = DetectedObject("person", 0.9, 0.1, 0.1, 0.2, 0.2, FRAME_RES)
+    tracker.update([obj], [frozenset()], 1)
+    assert _filter.should_store(obj) is False
+    assert obj.store is False
+
+    # A new object is stored even if the store interval has not passed
+    new_obj = DetectedObject("person", 0.9, 0.7, 0.7, 0.8, 0.8, FRAME_RES)
+    tracker.update([obj, new_obj], [frozenset(), frozenset()], 2)
+    assert _filter.should_store(new_obj) is True
+
+    assert obj.track
+    obj.track.last_stored = utcnow() - timedelta(seconds=11)
+    assert _filter.should_store(obj) is True
+
+
+def test_filter_batch() -> None:
+    """Test that filter_batch matches filter_object for every detection."""
+    _filter = _person_filter()
+    detections = [
+        ("person", 0.9, (0.1, 0.1, 0.2, 0.2)),
+        ("person", 0.5, (0.1, 0.1, 0.2, 0.2)),
+        ("person", 0.9, (0.1, 0.1, 0.7, 0.2)),
+        ("person", 0.9, (0.1, 0.1, 0.2, 0.12)),
+        ("person", 0.8, (0.1, 0.1, 0.2, 0.2)),
+        ("car", 0.9, (0.1, 0.1, 0.2, 0.2)),
+    ]
+    batch = DetectionBatch.from_relative(
+        [label for label, _, _ in detections],
+        [confidence for _, confidence, _ in detections],
+        [box for _, _, box in detections],
+        FRAME_RES,
+    )
+    objects = [
+        DetectedObject(label, confidence, *box, FRAME_RES)
+        for label, confidence, box in detections
+    ]
+    assert _filter.filter_batch(batch).tolist() == [
+        obj.label == "person" and _filter.filter_object(obj) for obj in objects
+    ]
+    assert _filter.filter_batch(batch).tolist() == [
+        True,
+        False,
+        False,
+        False,
+        False,
+        False,
+    ]
@@ -0,0 +1,109 @@
+"""Test manager for communication between python shells."""
+
+from __future__ import annotations
+
+import pickle
+import subprocess as sp
+import sys
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+import pytest
+
+from manager import SHARED_FRAME_KEY, SharedFramePool, SharedFrameReader
+
+READ_SCRIPT = """
+import pickle
+import sys
+
+from manager import SharedFrameReader
+
+reader = SharedFrameReader()
+results = []
+for item in pickle.load(sys.stdin.buffer):
+    reader.read(item)
+    frame = item["frame"].copy()
+    reader.done(item)
+    results.append((frame, item))
+pickle.dump(results, sys.stdout.buffer)
+"""
+
+
+def _read_in_subprocess(
+    items: list[dict[str, Any]],
+) -> list[tuple[np.ndarray, dict[str, Any]]]:
+    """Map the frames of items in a separate python shell, like the detectors."""
+    process = sp.run(
+        [sys.executable, "-c", READ_SCRIPT],
+        input=pickle.dumps(items),
+        capture_output=True,
+        check=True,
+    )
+    return pickle.loads(process.stdout)  # noqa: S301
+
+
+@pytest.fixture(name="frame_pool")
+def fixture_frame_pool() -> Iterator[SharedFramePool]:
+    """Return a SharedFramePool with two slots that shares frames of any size."""
+    frame_pool = SharedFramePool(2, min_frame_bytes=0)
+    yield frame_pool
+    frame_pool.close()
+
+
+def test_shared_frame_roundtrip(frame_pool: SharedFramePool) -> None:
+    """Test that the frame is passed through shared memory."""
+    frame = np.arange(320 * 320 * 3, dtype=np.uint8).reshape(320, 320, 3)
+    item = frame_pool.put({"frame": frame, "camera_identifier": "camera"})
+    assert "frame" not in item
+    assert item["camera_identifier"] == "camera"
+
+    [(read_frame, returned_item)] = _read_in_subprocess([item])
+    np.testing.assert_array_equal(read_frame, frame)
+    # Only the slot reference is sent back
+    assert "frame" not in returned_item
+    assert returned_item[SHARED_FRAME_KEY] == item[SHARED_FRAME_KEY]
+
+
+def test_shared_frame_slot_reuse(frame_pool: SharedFramePool) -> None:
+    """Test that released slots are reused and grown for larger frames."""
+    item = frame_pool.put({"frame": np.zeros((10, 10, 3), dtype=np.uint8)})
+    frame_pool.release(item)
+    reused = frame_pool.put({"frame": np.ones((10, 10, 3), dtype=np.uint8)})
+    assert reused[SHARED_FRAME_KEY][2] == item[SHARED_FRAME_KEY][2]
+    frame_pool.release(reused)
+
+    larger = frame_pool.put({"frame": np.ones((20, 20, 3), dtype=np.uint8)})
+    assert larger[SHARED_FRAME_KEY][2] != item[SHARED_FRAME_KEY][2]
+
+    [(read_frame, _)] = _read_in_subprocess([larger])
+    np.testing.assert_array_equal(read_frame, np.ones((20, 20, 3), dtype=np.uint8))
+
+
+def test_shared_frame_fallback(frame_pool: SharedFramePool) -> None:
+    """Test that items are sent as is when shared memory cannot be used."""
+    assert frame_pool.put("get_model_size") == "get_model_size"
+    assert frame_pool.put({"frame": b"bytes"}) == {"frame": b"bytes"}
+
+    frame = np.zeros((10, 10, 3), dtype=np.uint8)
+    frame_pool.put({"frame": frame})
+    frame_pool.put({"frame": frame})
+    # Both slots are in use
+    item = frame_pool.put({"frame": frame})
+    assert item["frame"] is frame
+    assert SHARED_FRAME_KEY not in item
+
+    SharedFrameReader().read(item)
+    assert item["frame"] is frame
+
+
+def test_shared_frame_min_bytes() -> None:
+    """Test that small frames are pickled instead of shared."""
+    frame_pool = SharedFramePool(2, min_frame_bytes=20 * 20 * 3)
+    try:
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        assert frame_pool.put({"frame": frame})["frame"] is frame
+        item = frame_pool.put({"frame": np.zeros((20, 20, 3), dtype=np.uint8)})
+        assert SHARED_FRAME_KEY in item
+    finally:
+        frame_pool.close()
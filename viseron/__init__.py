@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import concurrent.futures
-import json
 import logging
 import multiprocessing.process
 import os
@@ -11,7 +10,6 @@ import sys
 import threading
 import time
 import tracemalloc
-from functools import partial
 from logging.handlers import RotatingFileHandler
 from timeit import default_timer as timer
 from typing import TYPE_CHECKING, Any, Literal, overload
@@ -20,7 +18,6 @@ import voluptuous as vol
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.schedulers.base import Job, SchedulerNotRunningError
 from jinja2 import BaseLoader, Environment, StrictUndefined
-from sqlalchemy import insert
 
 from viseron.components import (
     CriticalComponentsConfigStore,
@@ -38,7 +35,6 @@ from viseron.components.nvr.const import (
     DOMAIN as NVR_DOMAIN,
 )
 from viseron.components.storage.const import COMPONENT as STORAGE_COMPONENT
-from viseron.components.storage.models import Events
 from viseron.config import load_config
 from viseron.const import (
     ENV_LOG_BACKUP_COUNT,
@@ -58,7 +54,6 @@ from viseron.domains.camera.const import DOMAIN as CAMERA_DOMAIN
 from viseron.events import Event, EventData
 from viseron.exceptions import DataStreamNotLoaded
 from viseron.helpers import memory_usage_profiler, parse_size_to_bytes, utcnow
-from viseron.helpers.json import JSONEncoder
 from viseron.helpers.logs import (
     LOG_DATE_FORMAT,
     LOG_FORMAT,
@@ -380,36 +375,17 @@ class Viseron:
 
         return unsubscribe
 
-    def _insert_event(self, event: Event[EventData]) -> None:
-        """Insert event into database."""
-        if self.storage:
-            event_data_json = "{}"
-            if event.data and event.data.json_serializable:
-                try:
-                    event_data_json = partial(
-                        json.dumps, cls=JSONEncoder, allow_nan=False
-                    )(event.data)
-                except (TypeError, ValueError, json.JSONDecodeError) as error:
-                    LOGGER.warning(
-                        f"Failed to decode event {event.name} to JSON: {error}"
-                    )
-                    return
-
-            with self.storage.get_session() as session:
-                stmt = insert(Events).values(
-                    name=event.name,
-                    data=event_data_json,
-                )
-                session.execute(stmt)
-                session.commit()
+    def has_event_listeners(self, event: str) -> bool:
+        """Return True if there are any listeners for event."""
+        return self.data[DATA_STREAM_COMPONENT].has_subscribers(f"event/{event}")
 
     def dispatch_event(
         self, event: str, data: EventData, *, store: bool = True
     ) -> None:
         """Dispatch an event."""
         _event: Event[EventData] = Event(event, data, utcnow().timestamp())
-        if store:
-            self._insert_event(_event)
+        if store and self.storage:
+            self.storage.event_recorder.record(_event)
         self.data[DATA_STREAM_COMPONENT].publish_data(f"event/{event}", data=_event)
 
         if event not in self._dispatched_events:
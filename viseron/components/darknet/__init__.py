@@ -7,6 +7,7 @@ import logging
 import multiprocessing as mp
 import os
 import pwd
+import time
 from abc import ABC, abstractmethod
 from queue import Empty, Queue
 from typing import TYPE_CHECKING, Any
@@ -18,39 +19,46 @@ from viseron.const import ENV_CUDA_SUPPORTED, ENV_OPENCL_SUPPORTED
 from viseron.domains import OptionalDomain, RequireDomain, setup_domain
 from viseron.domains.motion_detector.const import DOMAIN as MOTION_DETECTOR_DOMAIN
 from viseron.domains.object_detector import BASE_CONFIG_SCHEMA
+from viseron.domains.object_detector.batch_metrics import BatchMetrics
 from viseron.domains.object_detector.const import CONFIG_CAMERAS
-from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
 from viseron.exceptions import ComponentNotReady, ViseronError
 from viseron.helpers import letterbox_resize, pop_if_full
 from viseron.helpers.child_process_worker import ChildProcessWorker
 from viseron.helpers.logs import CTypesLogPipe
-from viseron.helpers.schemas import FLOAT_MIN_ZERO_MAX_ONE
+from viseron.helpers.schemas import FLOAT_MIN_ZERO, FLOAT_MIN_ZERO_MAX_ONE
 from viseron.helpers.subprocess_worker import SubProcessWorker
 from viseron.watchdog.subprocess_watchdog import RestartablePopen
 
 from . import darknet
 from .const import (
     COMPONENT,
+    CONFIG_BATCH_TIMEOUT,
     CONFIG_DNN_BACKEND,
     CONFIG_DNN_TARGET,
     CONFIG_HALF_PRECISION,
     CONFIG_LABEL_PATH,
+    CONFIG_MAX_BATCH,
     CONFIG_MODEL_CONFIG,
     CONFIG_MODEL_PATH,
     CONFIG_OBJECT_DETECTOR,
     CONFIG_SUPPRESSION,
+    DEFAULT_BATCH_TIMEOUT,
     DEFAULT_DNN_BACKEND,
     DEFAULT_DNN_TARGET,
     DEFAULT_HALF_PRECISION,
     DEFAULT_LABEL_PATH,
+    DEFAULT_MAX_BATCH,
     DEFAULT_MODEL_CONFIG,
     DEFAULT_MODEL_PATH,
     DEFAULT_SUPPRESSION,
+    DESC_BATCH_TIMEOUT,
     DESC_COMPONENT,
     DESC_DNN_BACKEND,
     DESC_DNN_TARGET,
     DESC_HALF_PRECISION,
     DESC_LABEL_PATH,
+    DESC_MAX_BATCH,
     DESC_MODEL_CONFIG,
     DESC_MODEL_PATH,
     DESC_OBJECT_DETECTOR,
@@ -113,6 +121,16 @@ CONFIG_SCHEMA = vol.Schema(
                             default=DEFAULT_HALF_PRECISION,
                             description=DESC_HALF_PRECISION,
                         ): bool,
+                        vol.Optional(
+                            CONFIG_MAX_BATCH,
+                            default=DEFAULT_MAX_BATCH,
+                            description=DESC_MAX_BATCH,
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Optional(
+                            CONFIG_BATCH_TIMEOUT,
+                            default=DEFAULT_BATCH_TIMEOUT,
+                            description=DESC_BATCH_TIMEOUT,
+                        ): FLOAT_MIN_ZERO,
                     }
                 ),
             }
@@ -234,7 +252,7 @@ class BaseDarknet(ABC):
         """Perform detection."""
 
     @abstractmethod
-    def post_process(self, detections, camera_resolution) -> list[DetectedObject]:
+    def post_process(self, detections, camera_resolution) -> DetectionBatch:
         """Post process detections."""
 
     @abstractmethod
@@ -258,7 +276,10 @@ class DarknetDNN(BaseDarknet, SubProcessWorker):
         BaseDarknet.__init__(self, vis, config)
         self._process_initialization_done = mp.Event()
         self._process_initialization_error = mp.Event()
-        SubProcessWorker.__init__(self, vis, f"{COMPONENT}.{CONFIG_OBJECT_DETECTOR}")
+        self.batch_metrics = BatchMetrics(vis, COMPONENT)
+        SubProcessWorker.__init__(
+            self, vis, f"{COMPONENT}.{CONFIG_OBJECT_DETECTOR}", shared_frames=True
+        )
 
         if cv2.ocl.haveOpenCL():
             LOGGER.debug("Enabling OpenCL")
@@ -286,6 +307,8 @@ class DarknetDNN(BaseDarknet, SubProcessWorker):
                 f"--model-height={self.model_height} "
                 f"--backend={self.dnn_preferable_backend} "
                 f"--target={self.dnn_preferable_target} "
+                f"--max-batch={self._config[CONFIG_MAX_BATCH]} "
+                f"--batch-timeout={self._config[CONFIG_BATCH_TIMEOUT]} "
                 f"--loglevel DEBUG"
             ).split(" "),
             name=self.subprocess_name,
@@ -311,6 +334,7 @@ class DarknetDNN(BaseDarknet, SubProcessWorker):
                 "camera_identifier": camera_identifier,
                 "min_confidence": min_confidence,
                 "nms": self._nms,
+                "queued_at": time.time(),
             },
         )
         item = result_queue.get()
@@ -328,26 +352,20 @@ class DarknetDNN(BaseDarknet, SubProcessWorker):
             self._process_initialization_error.set()
             self._process_initialization_done.set()
             return
+
+        self.batch_metrics.add(item["batch_size"], item["queue_wait"])
         pop_if_full(self._result_queues[item["camera_identifier"]], item)
 
-    def post_process(self, detections, camera_resolution) -> list[DetectedObject]:
+    def post_process(self, detections, camera_resolution) -> DetectionBatch:
         """Post process detections."""
-        _detections = []
-        for label, confidence, box in zip(detections[0], detections[1], detections[2]):
-            _detections.append(
-                DetectedObject.from_absolute(
-                    self.labels[int(label)],
-                    confidence,
-                    box[0],
-                    box[1],
-                    box[0] + box[2],
-                    box[1] + box[3],
-                    frame_res=camera_resolution,
-                    model_res=self.model_res,
-                )
-            )
-
-        return _detections
+        labels, confidences, boxes = detections
+        return DetectionBatch.from_absolute(
+            [self.labels[int(label)] for label in labels],
+            confidences,
+            [(box[0], box[1], box[0] + box[2], box[1] + box[3]) for box in boxes],
+            frame_res=camera_resolution,
+            model_res=self.model_res,
+        )
 
     @property
     def dnn_preferable_backend(self) -> int:
@@ -369,6 +387,7 @@ class DarknetDNN(BaseDarknet, SubProcessWorker):
 
     def stop(self) -> None:
         """Stop Darknet."""
+        self.batch_metrics.unregister()
         SubProcessWorker.stop(self)
 
 
@@ -471,24 +490,15 @@ class DarknetNative(BaseDarknet, ChildProcessWorker):
             return None
         return item["result"]
 
-    def post_process(self, detections, camera_resolution) -> list[DetectedObject]:
+    def post_process(self, detections, camera_resolution) -> DetectionBatch:
         """Post process detections."""
-        _detections = []
-        for label, confidence, box in detections:
-            _detections.append(
-                DetectedObject.from_absolute_letterboxed(
-                    str(label),
-                    confidence,
-                    box[0],
-                    box[1],
-                    box[2],
-                    box[3],
-                    frame_res=camera_resolution,
-                    model_res=self.model_res,
-                )
-            )
-
-        return _detections
+        return DetectionBatch.from_absolute_letterboxed(
+            [str(label) for label, _, _ in detections],
+            [confidence for _, confidence, _ in detections],
+            [box[:4] for _, _, box in detections],
+            frame_res=camera_resolution,
+            model_res=self.model_res,
+        )
 
     @property
     def model_width(self) -> int:
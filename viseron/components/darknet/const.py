@@ -17,6 +17,8 @@ CONFIG_SUPPRESSION: Final = "suppression"
 CONFIG_DNN_BACKEND: Final = "dnn_backend"
 CONFIG_DNN_TARGET: Final = "dnn_target"
 CONFIG_HALF_PRECISION: Final = "half_precision"
+CONFIG_MAX_BATCH: Final = "max_batch"
+CONFIG_BATCH_TIMEOUT: Final = "batch_timeout"
 
 DEFAULT_MODEL_PATH: Final = "/detectors/models/darknet/default.weights"
 DEFAULT_MODEL_CONFIG: Final = "/detectors/models/darknet/default.cfg"
@@ -25,6 +27,8 @@ DEFAULT_SUPPRESSION: Final = 0.4
 DEFAULT_DNN_BACKEND: Final = None
 DEFAULT_DNN_TARGET: Final = None
 DEFAULT_HALF_PRECISION: Final = False
+DEFAULT_MAX_BATCH: Final = 1
+DEFAULT_BATCH_TIMEOUT: Final = 0.01
 
 DESC_COMPONENT = "Darknet configuration."
 DESC_OBJECT_DETECTOR = "Object detector domain config."
@@ -44,6 +48,16 @@ DESC_HALF_PRECISION = (
     "Enable/disable half precision accuracy.<br>"
     "If your GPU supports FP16, enabling this might give you a performance increase."
 )
+DESC_MAX_BATCH = (
+    "Maximum number of frames, from different cameras, that are run through the "
+    "network in a single forward pass.<br>"
+    "A value of 1 disables batching. "
+    "Only used by the OpenCV DNN implementation, not by native Darknet."
+)
+DESC_BATCH_TIMEOUT = (
+    "Maximum time in seconds to wait for more frames to arrive before running an "
+    "incomplete batch.<br>Only used when <code>max_batch</code> is larger than 1."
+)
 
 
 # DNN backend/target constants
@@ -3,10 +3,13 @@
 import argparse
 import logging
 import sys
+import time
+from queue import Empty
 
 import cv2
+import numpy as np
 
-from manager import connect
+from manager import SharedFrameReader, connect
 
 LOGGER = logging.getLogger(__name__)
 
@@ -67,6 +70,97 @@ class DarknetDNN:
         )
         item["result"] = objs
 
+    def work_batch(self, items: list) -> None:
+        """Perform object detection on a batch of frames in a single forward pass.
+
+        Frames are expected to already be resized to the model resolution.
+        """
+        blob = cv2.dnn.blobFromImages(
+            [item["frame"] for item in items],
+            scalefactor=1 / 255,
+            size=(self.model_width, self.model_height),
+            swapRB=False,
+            crop=False,
+        )
+        self._net.setInput(blob)
+        outputs = self._net.forward(self._net.getUnconnectedOutLayersNames())
+
+        # Region layers output either (batch, rows, cols) or (batch * rows, cols)
+        outputs = [
+            output.reshape(len(items), -1, output.shape[-1]) for output in outputs
+        ]
+        for index, item in enumerate(items):
+            item["result"] = decode_detections(
+                np.concatenate([output[index] for output in outputs]),
+                self.model_width,
+                self.model_height,
+                item["min_confidence"],
+                item["nms"],
+            )
+
+
+def decode_detections(
+    rows: np.ndarray,
+    model_width: int,
+    model_height: int,
+    min_confidence: float,
+    nms: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Decode YOLO region layer rows of a single frame.
+
+    Returns class ids, confidences and boxes in the same format as
+    cv2.dnn_DetectionModel.detect.
+    """
+    scores = rows[:, 5:]
+    class_ids = scores.argmax(axis=1)
+    confidences = scores[np.arange(len(scores)), class_ids]
+    keep = confidences > min_confidence
+    if not keep.any():
+        return (
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.float32),
+            np.empty((0, 4), dtype=np.int32),
+        )
+
+    class_ids = class_ids[keep]
+    confidences = confidences[keep]
+    centers = rows[keep, :4] * [model_width, model_height, model_width, model_height]
+    boxes = np.empty_like(centers)
+    boxes[:, :2] = centers[:, :2] - centers[:, 2:] / 2
+    boxes[:, 2:] = centers[:, 2:]
+    boxes = np.rint(boxes).astype(np.int32)
+
+    indices = np.asarray(
+        cv2.dnn.NMSBoxesBatched(
+            boxes.tolist(),
+            confidences.tolist(),
+            class_ids.tolist(),
+            min_confidence,
+            nms,
+        ),
+        dtype=np.int32,
+    ).reshape(-1)
+    return (
+        class_ids[indices].astype(np.int32),
+        confidences[indices].astype(np.float32),
+        boxes[indices],
+    )
+
+
+def get_batch(process_queue, max_batch: int, batch_timeout: float) -> list:
+    """Block for one job, then collect up to max_batch jobs within batch_timeout."""
+    batch = [process_queue.get()]
+    deadline = time.monotonic() + batch_timeout
+    while len(batch) < max_batch:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(process_queue.get(timeout=remaining))
+        except Empty:
+            break
+    return batch
+
 
 def setup_logger(loglevel: str) -> None:
     """Log to stdout without any formatting.
@@ -97,6 +191,15 @@ def get_parser() -> argparse.ArgumentParser:
     parser.add_argument("--model-height", help="Model height", required=True, type=int)
     parser.add_argument("--backend", help="DNN backend", required=True, type=int)
     parser.add_argument("--target", help="DNN target", required=True, type=int)
+    parser.add_argument(
+        "--max-batch", help="Max frames per forward pass", default=1, type=int
+    )
+    parser.add_argument(
+        "--batch-timeout",
+        help="Max seconds to wait for a batch to fill up",
+        default=0.01,
+        type=float,
+    )
 
     parser.add_argument(
         "--loglevel",
@@ -134,10 +237,23 @@ def main() -> None:
     output_queue.put("init_done")
 
     LOGGER.debug("Starting loop")
+    frame_reader = SharedFrameReader()
     while True:
-        job = process_queue.get()
-        darknet.work_input(job)
-        output_queue.put(job)
+        batch = get_batch(process_queue, args.max_batch, args.batch_timeout)
+        started_at = time.time()
+        for job in batch:
+            frame_reader.read(job)
+        if args.max_batch > 1:
+            darknet.work_batch(batch)
+        else:
+            darknet.work_input(batch[0])
+
+        for job in batch:
+            # The frame is not needed in the main process, skip sending it back
+            del job["frame"]
+            job["batch_size"] = len(batch)
+            job["queue_wait"] = started_at - job["queued_at"]
+            output_queue.put(job)
 
 
 if __name__ == "__main__":
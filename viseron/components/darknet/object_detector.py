@@ -17,6 +17,7 @@ if TYPE_CHECKING:
     from viseron import Viseron
     from viseron.domains.camera.shared_frames import SharedFrame
     from viseron.domains.object_detector.detected_object import DetectedObject
+    from viseron.domains.object_detector.detection_batch import DetectionBatch
 
 
 LOGGER = logging.getLogger(__name__)
@@ -43,7 +44,7 @@ class ObjectDetector(AbstractObjectDetector):
         """Return preprocessed frame before performing object detection."""
         return self._darknet.preprocess(frame)
 
-    def return_objects(self, frame: SharedFrame) -> list[DetectedObject] | None:
+    def return_objects(self, frame: SharedFrame) -> DetectionBatch | None:
         """Perform object detection."""
         detections = self._darknet.detect(
             frame,
@@ -2,34 +2,86 @@
 
 from __future__ import annotations
 
-import fnmatch
 import inspect
 import logging
-import subprocess
-import threading
-import time
 import uuid
 from queue import Empty, Queue
-from typing import TYPE_CHECKING, Any, Final, TypedDict
+from typing import TYPE_CHECKING, Any, TypedDict
 
+import voluptuous as vol
 from tornado.ioloop import IOLoop
 from tornado.queues import Queue as TornadoQueue
 
 from viseron import helpers
 from viseron.watchdog.thread_watchdog import RestartableThread
 
+from .const import (
+    COMPONENT,
+    CONFIG_MAX_PENDING,
+    CONFIG_MAX_WORKERS,
+    CONFIG_PRIORITY_LANES,
+    CONFIG_TOPIC_CONCURRENCY,
+    DEFAULT_MAX_PENDING,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PRIORITY_LANES,
+    DEFAULT_TOPIC_CONCURRENCY,
+    DESC_COMPONENT,
+    DESC_MAX_PENDING,
+    DESC_MAX_WORKERS,
+    DESC_PRIORITY_LANES,
+    DESC_TOPIC_CONCURRENCY,
+    DESC_TOPIC_PATTERN,
+    LANE_MAXSIZE,
+)
+from .dispatcher import CallbackDispatcher
+from .lanes import DataLane, DataLanes
+from .topic_trie import TopicTrie
+
 if TYPE_CHECKING:
     import multiprocessing as mp
     from collections.abc import Callable
 
-COMPONENT: Final = "data_stream"
-
 LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(COMPONENT, default={}, description=DESC_COMPONENT): vol.Schema(
+            {
+                vol.Optional(
+                    CONFIG_MAX_WORKERS,
+                    default=DEFAULT_MAX_WORKERS,
+                    description=DESC_MAX_WORKERS,
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Optional(
+                    CONFIG_MAX_PENDING,
+                    default=DEFAULT_MAX_PENDING,
+                    description=DESC_MAX_PENDING,
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Optional(
+                    CONFIG_TOPIC_CONCURRENCY,
+                    default=DEFAULT_TOPIC_CONCURRENCY,
+                    description=DESC_TOPIC_CONCURRENCY,
+                ): {
+                    vol.Optional(str, description=DESC_TOPIC_PATTERN): vol.All(
+                        int, vol.Range(min=1)
+                    )
+                },
+                vol.Optional(
+                    CONFIG_PRIORITY_LANES,
+                    default=DEFAULT_PRIORITY_LANES,
+                    description=DESC_PRIORITY_LANES,
+                ): vol.All(int, vol.Range(min=0)),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 class DataSubscriber(TypedDict):
     """Data subscriber type."""
 
+    data_topic: str
     callback: Callable | Queue | TornadoQueue
     ioloop: IOLoop | None
     stage: str | None
@@ -49,9 +101,9 @@ class Publish(TypedDict):
     data: Any
 
 
-def setup(vis, _) -> bool:
+def setup(vis, config: dict[str, Any]) -> bool:
     """Set up the data_stream component."""
-    vis.data[COMPONENT] = DataStream(vis)
+    vis.data[COMPONENT] = DataStream(vis, config.get(COMPONENT))
     return True
 
 
@@ -63,50 +115,56 @@ class DataStream:
     A data topic can have any value.
     You can subscribe to wildcard topics using '*', eg topic/*/event_name
 
-    Data is published to topics using a thread.
+    Data is published to topics using consumer threads, one per lane.
+    Frames and detector results are published on priority lanes sharded by camera,
+    everything else is published on the default lane, see DataLanes.
+    Callables are run on a bounded pool of worker threads, see CallbackDispatcher.
     """
 
     _subscribers: dict[str, Any] = {}
-    _wildcard_subscribers: dict[str, Any] = {}
-    _data_queue: Queue = Queue(maxsize=1000)
+    _wildcard_subscribers: TopicTrie = TopicTrie()
 
-    def __init__(self, vis) -> None:
+    def __init__(self, vis, config: dict[str, Any] | None = None) -> None:
         self._vis = vis
-        self._max_threads = self._get_max_threads()
-        LOGGER.debug(f"Max threads: {self._max_threads}")
-
-        self._kill_received = False
-        self._data_consumer = RestartableThread(
-            name="data_stream", target=self.consume_data, daemon=True, register=True
-        )
-        self._data_consumer.start()
+        if config is None:
+            config = CONFIG_SCHEMA({})[COMPONENT]
 
-    def _get_max_threads(self) -> int:
-        """Get the maximum number of threads allowed."""
-        command = ["ulimit", "-u"]
-        result = subprocess.run(
-            command, shell=True, capture_output=True, text=True, check=False
+        self._dispatcher = CallbackDispatcher(
+            config[CONFIG_MAX_WORKERS],
+            config[CONFIG_MAX_PENDING],
+            config[CONFIG_TOPIC_CONCURRENCY],
         )
+        LOGGER.debug(f"Callback workers: {config[CONFIG_MAX_WORKERS]}")
 
-        # Check if the command executed successfully
-        if result.returncode == 0:
-            ulimit_output = result.stdout.strip()
-            LOGGER.debug(f"ulimit -u output: {ulimit_output}")
-        else:
-            LOGGER.error(f"Error executing ulimit -u command: {result.stderr}")
-            return 999999
-
-        try:
-            return int(ulimit_output)
-        except ValueError:
-            return 999999
+        self._lanes = DataLanes(config[CONFIG_PRIORITY_LANES], LANE_MAXSIZE)
 
-    @staticmethod
-    def publish_data(data_topic: str, data: Any = None) -> None:
+        self._kill_received = False
+        self._data_consumers = [
+            RestartableThread(
+                name=f"data_stream.{lane.name}",
+                target=self.consume_data,
+                args=(lane,),
+                daemon=True,
+                register=True,
+            )
+            for lane in self._lanes.lanes
+        ]
+        for data_consumer in self._data_consumers:
+            data_consumer.start()
+
+    @property
+    def dispatcher_metrics(self) -> dict[str, Any]:
+        """Return metrics of the callback dispatcher."""
+        return self._dispatcher.metrics
+
+    @property
+    def lane_metrics(self) -> dict[str, dict[str, Any]]:
+        """Return metrics of the consumer lanes."""
+        return self._lanes.metrics
+
+    def publish_data(self, data_topic: str, data: Any = None) -> None:
         """Publish data to topic."""
-        helpers.pop_if_full(
-            DataStream._data_queue, {"data_topic": data_topic, "data": data}
-        )
+        self._lanes.put(data_topic, data)
 
     @staticmethod
     def subscribe_data(
@@ -123,32 +181,43 @@ class DataStream:
         unique_id = uuid.uuid4()
 
         if "*" in data_topic:
-            DataStream._wildcard_subscribers.setdefault(data_topic, {})[unique_id] = (
+            DataStream._wildcard_subscribers.add(
+                data_topic,
+                unique_id,
                 DataSubscriber(
+                    data_topic=data_topic,
                     callback=callback,
                     ioloop=ioloop,
                     stage=stage,
-                )
+                ),
             )
             return unique_id
 
         DataStream._subscribers.setdefault(data_topic, {})[unique_id] = DataSubscriber(
+            data_topic=data_topic,
             callback=callback,
             ioloop=ioloop,
             stage=stage,
         )
         return unique_id
 
-    @staticmethod
-    def unsubscribe_data(data_topic: str, unique_id: uuid.UUID) -> None:
+    def unsubscribe_data(self, data_topic: str, unique_id: uuid.UUID) -> None:
         """Unsubscribe from a topic using the Unique ID returned from subscribe_data."""
         LOGGER.debug(f"Unsubscribing from data topic {data_topic}, {unique_id}")
+        self._dispatcher.remove_subscriber(unique_id)
         if "*" in data_topic:
-            DataStream._wildcard_subscribers[data_topic].pop(unique_id)
+            DataStream._wildcard_subscribers.remove(data_topic, unique_id)
             return
 
         DataStream._subscribers[data_topic].pop(unique_id)
 
+    @staticmethod
+    def has_subscribers(data_topic: str) -> bool:
+        """Return True if anyone is subscribed to data_topic."""
+        if DataStream._subscribers.get(data_topic):
+            return True
+        return bool(DataStream._wildcard_subscribers.match(data_topic))
+
     @staticmethod
     def remove_all_subscriptions() -> None:
         """Remove all subscriptions."""
@@ -184,48 +253,29 @@ class DataStream:
         data: Any,
     ) -> None:
         """Run callbacks or put to queues."""
-        for callback in callbacks.copy().values():
-            if callable(callback["callback"]) and callback["ioloop"] is None:
-                name = f"data_stream.callback.{callback['callback']}"
-                daemon = bool(callback["stage"] is None)
-                if data:
-                    thread = RestartableThread(
-                        name=name,
-                        target=callback["callback"],
-                        args=(data,),
-                        daemon=daemon,
-                        register=False,
-                        stage=callback["stage"],
-                    )
-                else:
-                    thread = RestartableThread(
-                        name=name,
-                        target=callback["callback"],
-                        daemon=daemon,
-                        register=False,
-                        stage=callback["stage"],
-                    )
+        for unique_id, callback in callbacks.copy().items():
+            if (
+                callable(callback["callback"])
+                and callback["ioloop"] is None
+                and callback["stage"] is not None
+            ):
+                # Signal handlers run in their own non-daemon thread so that
+                # shutdown can wait for them to finish in the matching stage
+                thread = RestartableThread(
+                    name=f"data_stream.callback.{callback['callback']}",
+                    target=callback["callback"],
+                    args=(data,) if data else (),
+                    daemon=False,
+                    register=False,
+                    stage=callback["stage"],
+                )
+                thread.start()
+                continue
 
-                while True:
-                    # Check if we can start a new thread
-                    active_threads = threading.active_count()
-                    if active_threads > self._max_threads:
-                        time.sleep(0.01)
-                        continue
-
-                    try:
-                        thread.start()
-                    except RuntimeError as err:
-                        if "can't start new thread" in str(err):
-                            LOGGER.debug(
-                                "Unable to start new thread, "
-                                "Max threads: %s, Active threads: %s",
-                                self._max_threads,
-                                active_threads,
-                            )
-                            self._max_threads = int(active_threads * 0.95)
-                            continue
-                    break
+            if callable(callback["callback"]) and callback["ioloop"] is None:
+                self._dispatcher.submit(
+                    unique_id, callback["data_topic"], callback["callback"], data
+                )
                 continue
 
             if callable(callback["callback"]) and callback["ioloop"] is not None:
@@ -266,31 +316,29 @@ class DataStream:
 
     def wildcard_subscriptions(self, data_item: dict[str, Any]) -> None:
         """Run callbacks for wildcard subscriptions."""
-        for data_topic, callbacks in DataStream._wildcard_subscribers.copy().items():
-            if fnmatch.fnmatch(data_item["data_topic"], data_topic):
-                # LOGGER.debug(
-                #     f"Got data on topic {data_item['data_topic']} "
-                #     f"matching with subscriber on topic {data_topic}"
-                # )
-
-                self.run_callbacks(callbacks, data_item["data"])
+        for callbacks in DataStream._wildcard_subscribers.match(
+            data_item["data_topic"]
+        ):
+            self.run_callbacks(callbacks, data_item["data"])
 
-    def consume_data(self) -> None:
-        """Publish data to topics."""
+    def consume_data(self, lane: DataLane) -> None:
+        """Publish data from lane to topics."""
         while not self._kill_received:
             try:
-                data_item = self._data_queue.get(timeout=0.1)
+                data_item = lane.get(timeout=0.1)
             except Empty:
                 continue
 
             self.static_subscriptions(data_item)
             self.wildcard_subscriptions(data_item)
-        LOGGER.debug("Data stream stopped")
+        LOGGER.debug(f"Data stream lane {lane.name} stopped")
 
     def join(self) -> None:
         """Join the data stream."""
-        self._data_consumer.join()
+        for data_consumer in self._data_consumers:
+            data_consumer.join()
 
     def stop(self) -> None:
         """Stop the data stream."""
         self._kill_received = True
+        self._dispatcher.stop()
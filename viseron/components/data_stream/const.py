@@ -0,0 +1,42 @@
+"""Data stream constants."""
+
+from typing import Final
+
+COMPONENT: Final = "data_stream"
+
+
+# CONFIG_SCHEMA constants
+CONFIG_MAX_WORKERS: Final = "max_workers"
+CONFIG_MAX_PENDING: Final = "max_pending"
+CONFIG_TOPIC_CONCURRENCY: Final = "topic_concurrency"
+
+DEFAULT_MAX_WORKERS: Final = 32
+DEFAULT_MAX_PENDING: Final = 100
+DEFAULT_TOPIC_CONCURRENCY: dict[str, int] = {}
+
+DESC_COMPONENT = "Data stream configuration."
+DESC_MAX_WORKERS = "Number of worker threads used to run subscriber callbacks."
+DESC_MAX_PENDING = (
+    "Maximum number of items queued per subscriber. When a subscriber falls behind, "
+    "the oldest item is dropped."
+)
+DESC_TOPIC_CONCURRENCY = (
+    "Map of topic patterns and the maximum number of callbacks that are allowed to "
+    "run concurrently for subscriptions matching the pattern. "
+    "Wildcards using <code>*</code> are supported."
+)
+DESC_TOPIC_PATTERN = (
+    "Topic pattern and the maximum number of concurrent callbacks for it."
+)
+
+CONFIG_PRIORITY_LANES: Final = "priority_lanes"
+DEFAULT_PRIORITY_LANES: Final = 4
+DESC_PRIORITY_LANES = (
+    "Number of high priority lanes used to publish frames and detector results. "
+    "Each camera is assigned to one lane, while all other data, like state changes, "
+    "is published on a separate lane."
+)
+
+LANE_DEFAULT: Final = "default"
+LANE_PRIORITY: Final = "priority"
+LANE_MAXSIZE: Final = 1000
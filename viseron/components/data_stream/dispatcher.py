@@ -0,0 +1,221 @@
+"""Bounded worker pool used to run DataStream callbacks."""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from viseron.helpers import percentile
+from viseron.watchdog.thread_watchdog import RestartableThread
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Callable
+
+LOGGER = logging.getLogger(__name__)
+
+_NO_DATA = object()
+
+
+@dataclass
+class _SubscriberQueue:
+    """Pending items for a single subscriber."""
+
+    unique_id: uuid.UUID
+    data_topic: str
+    callback: Callable
+    items: deque[tuple[Any, float]] = field(default_factory=deque)
+    scheduled: bool = False
+    removed: bool = False
+
+
+@dataclass
+class _TopicState:
+    """Concurrency bookkeeping for a subscription topic."""
+
+    limit: int
+    running: int = 0
+    waiting: deque[_SubscriberQueue] = field(default_factory=deque)
+
+
+class CallbackDispatcher:
+    """Run subscriber callbacks on a fixed number of worker threads.
+
+    Each subscriber has its own FIFO of pending items and is only ever handled by one
+    worker at a time, which keeps callbacks for the same subscriber in order.
+    The number of callbacks running concurrently for the same subscription topic can
+    be limited using topic_concurrency, which maps topic patterns to a limit.
+
+    When a subscriber falls behind by more than max_pending items, the oldest item is
+    dropped, mirroring how DataStream treats full queues.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        topic_concurrency: dict[str, int] | None = None,
+    ) -> None:
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._topic_concurrency = topic_concurrency or {}
+
+        self._lock = threading.Lock()
+        self._ready: deque[_SubscriberQueue] = deque()
+        self._ready_condition = threading.Condition(self._lock)
+        self._subscribers: dict[uuid.UUID, _SubscriberQueue] = {}
+        self._topics: dict[str, _TopicState] = {}
+
+        self._kill_received = False
+        self._busy_workers = 0
+        self._submitted = 0
+        self._executed = 0
+        self._dropped = 0
+        self._failed = 0
+        self._latencies: deque[float] = deque(maxlen=1000)
+
+        self._workers = [
+            RestartableThread(
+                name=f"data_stream.dispatcher.{i}",
+                target=self._worker,
+                daemon=True,
+                register=True,
+            )
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _topic_limit(self, data_topic: str) -> int:
+        """Return the concurrency limit for a subscription topic."""
+        for pattern, limit in self._topic_concurrency.items():
+            if fnmatch.fnmatch(data_topic, pattern):
+                return limit
+        return self._max_workers
+
+    def submit(
+        self,
+        unique_id: uuid.UUID,
+        data_topic: str,
+        callback: Callable,
+        data: Any,
+    ) -> None:
+        """Queue data for a subscriber callback."""
+        with self._lock:
+            subscriber = self._subscribers.get(unique_id)
+            if subscriber is None or subscriber.callback is not callback:
+                subscriber = _SubscriberQueue(unique_id, data_topic, callback)
+                self._subscribers[unique_id] = subscriber
+
+            if len(subscriber.items) >= self._max_pending:
+                subscriber.items.popleft()
+                self._dropped += 1
+                LOGGER.debug(
+                    f"Callback {callback} on topic {data_topic} is falling behind, "
+                    "dropping oldest item"
+                )
+            subscriber.items.append((data if data else _NO_DATA, time.perf_counter()))
+            self._submitted += 1
+            self._schedule(subscriber)
+
+    def remove_subscriber(self, unique_id: uuid.UUID) -> None:
+        """Discard pending items for a subscriber that has unsubscribed."""
+        with self._lock:
+            subscriber = self._subscribers.pop(unique_id, None)
+            if subscriber:
+                subscriber.removed = True
+                subscriber.items.clear()
+
+    def _schedule(self, subscriber: _SubscriberQueue) -> None:
+        """Make subscriber available to a worker. Must be called with the lock held."""
+        if subscriber.scheduled or not subscriber.items:
+            return
+
+        topic = self._topics.get(subscriber.data_topic)
+        if topic is None:
+            topic = _TopicState(limit=self._topic_limit(subscriber.data_topic))
+            self._topics[subscriber.data_topic] = topic
+
+        subscriber.scheduled = True
+        if topic.running >= topic.limit:
+            topic.waiting.append(subscriber)
+            return
+
+        topic.running += 1
+        self._ready.append(subscriber)
+        self._ready_condition.notify()
+
+    def _worker(self) -> None:
+        """Run callbacks for subscribers which have pending items."""
+        while not self._kill_received:
+            with self._lock:
+                if not self._ready:
+                    self._ready_condition.wait(timeout=1)
+                    continue
+                subscriber = self._ready.popleft()
+                if not subscriber.items:
+                    self._finish(subscriber)
+                    continue
+                data, queued_at = subscriber.items.popleft()
+                self._busy_workers += 1
+
+            try:
+                if data is _NO_DATA:
+                    subscriber.callback()
+                else:
+                    subscriber.callback(data)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception(
+                    f"Error in callback {subscriber.callback} "
+                    f"for topic {subscriber.data_topic}"
+                )
+                with self._lock:
+                    self._failed += 1
+
+            with self._lock:
+                self._busy_workers -= 1
+                self._executed += 1
+                self._latencies.append(time.perf_counter() - queued_at)
+                self._finish(subscriber)
+
+    def _finish(self, subscriber: _SubscriberQueue) -> None:
+        """Release topic slot and reschedule. Must be called with the lock held."""
+        topic = self._topics[subscriber.data_topic]
+        topic.running -= 1
+        subscriber.scheduled = False
+
+        # Waiting subscribers that were removed or have no items don't take the slot
+        while topic.waiting and topic.running < topic.limit:
+            waiting = topic.waiting.popleft()
+            waiting.scheduled = False
+            self._schedule(waiting)
+
+        if not subscriber.removed:
+            self._schedule(subscriber)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return dispatcher metrics."""
+        with self._lock:
+            pending = sum(len(sub.items) for sub in self._subscribers.values())
+            return {
+                "workers": self._max_workers,
+                "busy_workers": self._busy_workers,
+                "pending": pending,
+                "submitted": self._submitted,
+                "executed": self._executed,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "latency_p99": percentile(self._latencies, 0.99),
+            }
+
+    def stop(self) -> None:
+        """Stop the workers."""
+        self._kill_received = True
+        with self._lock:
+            self._ready_condition.notify_all()
@@ -0,0 +1,109 @@
+"""Consumer lanes used to publish DataStream data."""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import deque
+from queue import Empty, Full, Queue
+from typing import Any
+
+from viseron.helpers import percentile
+
+from .const import LANE_DEFAULT, LANE_PRIORITY
+
+# Topics that are part of the frame pipeline of a camera. These are published on a
+# priority lane picked by camera identifier, so that a burst of eg. state changes
+# cannot push frames of a camera out of the queue and stall its NVR.
+PRIORITY_TOPIC_RE = re.compile(
+    r"^event/(?:"
+    r"(?P<camera>[^/]+)/(?:camera/frame_bytes|nvr/processed_frame|nvr/[^/]+/scan)"
+    r"|(?:object_detector|motion_detector)/(?P<detector_camera>[^/]+)/(?:scan|result)"
+    r")$"
+)
+
+
+class DataLane:
+    """A queue of published data consumed by a single thread.
+
+    When the queue is full the oldest item is dropped and counted.
+    """
+
+    def __init__(self, name: str, maxsize: int) -> None:
+        self.name = name
+        self._queue: Queue[tuple[dict[str, Any], float]] = Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._published = 0
+        self._dropped = 0
+        self._latencies: deque[float] = deque(maxlen=1000)
+
+    def put(self, data_item: dict[str, Any]) -> None:
+        """Put data on the lane, dropping the oldest item if the lane is full."""
+        item = (data_item, time.perf_counter())
+        with self._lock:
+            self._published += 1
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    return
+                except Full:
+                    try:
+                        self._queue.get_nowait()
+                        self._dropped += 1
+                    except Empty:
+                        pass
+
+    def get(self, timeout: float) -> dict[str, Any]:
+        """Get data from the lane. Raises Empty if no data arrived within timeout."""
+        data_item, published_at = self._queue.get(timeout=timeout)
+        with self._lock:
+            self._latencies.append(time.perf_counter() - published_at)
+        return data_item
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return lane metrics."""
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "published": self._published,
+                "dropped": self._dropped,
+                "latency_p99": percentile(self._latencies, 0.99),
+            }
+
+
+class DataLanes:
+    """Route published data to a default lane or a priority lane per camera."""
+
+    def __init__(self, priority_lanes: int, maxsize: int) -> None:
+        self.default = DataLane(LANE_DEFAULT, maxsize)
+        self.priority = [
+            DataLane(f"{LANE_PRIORITY}_{i}", maxsize) for i in range(priority_lanes)
+        ]
+
+    @property
+    def lanes(self) -> list[DataLane]:
+        """Return all lanes."""
+        return [self.default, *self.priority]
+
+    def lane_for_topic(self, data_topic: str) -> DataLane:
+        """Return the lane that data_topic is published on."""
+        if not self.priority:
+            return self.default
+
+        match = PRIORITY_TOPIC_RE.match(data_topic)
+        if match is None:
+            return self.default
+
+        camera_identifier = match.group("camera") or match.group("detector_camera")
+        return self.priority[hash(camera_identifier) % len(self.priority)]
+
+    def put(self, data_topic: str, data: Any) -> None:
+        """Publish data on the lane matching data_topic."""
+        self.lane_for_topic(data_topic).put({"data_topic": data_topic, "data": data})
+
+    @property
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Return metrics of all lanes."""
+        return {lane.name: lane.metrics for lane in self.lanes}
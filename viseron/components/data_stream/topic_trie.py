@@ -0,0 +1,139 @@
+"""Topic trie used to match wildcard subscriptions."""
+
+from __future__ import annotations
+
+import fnmatch
+import threading
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import uuid
+
+
+class _Node:
+    """A single topic segment in the trie."""
+
+    __slots__ = ("children", "subscribers", "wildcard")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.wildcard: _Node | None = None
+        self.subscribers: dict[uuid.UUID, Any] = {}
+
+    def is_empty(self) -> bool:
+        """Return True if the node has no subscribers and no children."""
+        return not self.subscribers and not self.children and self.wildcard is None
+
+
+class TopicTrie:
+    """Index of wildcard subscriptions keyed on topic segments.
+
+    Topics are split on '/'. A segment consisting of only '*' matches one or more
+    segments, which gives the same result as fnmatch for those patterns.
+    Patterns where '*' is only part of a segment, eg camera_*, are rare and are
+    matched using fnmatch instead.
+
+    The cost of matching a topic depends on the depth of the topic rather than the
+    number of subscriptions.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._root = _Node()
+        self._patterns: dict[str, dict[uuid.UUID, Any]] = {}
+
+    @staticmethod
+    def _is_segment_pattern(data_topic: str) -> bool:
+        """Return True if all wildcards in the topic span whole segments."""
+        return all(
+            segment == "*" or "*" not in segment for segment in data_topic.split("/")
+        )
+
+    def add(self, data_topic: str, unique_id: uuid.UUID, subscriber: Any) -> None:
+        """Add a subscriber to a wildcard topic."""
+        with self._lock:
+            if not self._is_segment_pattern(data_topic):
+                self._patterns.setdefault(data_topic, {})[unique_id] = subscriber
+                return
+
+            node = self._root
+            for segment in data_topic.split("/"):
+                if segment == "*":
+                    if node.wildcard is None:
+                        node.wildcard = _Node()
+                    node = node.wildcard
+                    continue
+                node = node.children.setdefault(segment, _Node())
+            node.subscribers[unique_id] = subscriber
+
+    def remove(self, data_topic: str, unique_id: uuid.UUID) -> None:
+        """Remove a subscriber from a wildcard topic."""
+        with self._lock:
+            if not self._is_segment_pattern(data_topic):
+                subscribers = self._patterns[data_topic]
+                subscribers.pop(unique_id)
+                if not subscribers:
+                    del self._patterns[data_topic]
+                return
+
+            path: list[tuple[_Node, str]] = []
+            node = self._root
+            for segment in data_topic.split("/"):
+                path.append((node, segment))
+                next_node = (
+                    node.wildcard if segment == "*" else node.children.get(segment)
+                )
+                if next_node is None:
+                    raise KeyError(unique_id)
+                node = next_node
+            node.subscribers.pop(unique_id)
+
+            # Prune nodes that are no longer used
+            for parent, segment in reversed(path):
+                if not node.is_empty():
+                    break
+                if segment == "*":
+                    parent.wildcard = None
+                else:
+                    del parent.children[segment]
+                node = parent
+
+    def match(self, data_topic: str) -> list[dict[uuid.UUID, Any]]:
+        """Return the subscribers of all wildcard topics matching data_topic."""
+        matches: dict[int, dict[uuid.UUID, Any]] = {}
+        segments = data_topic.split("/")
+        with self._lock:
+            self._match(self._root, segments, 0, matches)
+            result = [subscribers.copy() for subscribers in matches.values()]
+            for pattern, subscribers in self._patterns.items():
+                if fnmatch.fnmatch(data_topic, pattern):
+                    result.append(subscribers.copy())
+        return result
+
+    def _match(
+        self,
+        node: _Node,
+        segments: list[str],
+        index: int,
+        matches: dict[int, dict[uuid.UUID, Any]],
+    ) -> None:
+        """Walk the trie and collect nodes matching the remaining segments."""
+        if index == len(segments):
+            if node.subscribers:
+                matches[id(node)] = node.subscribers
+            return
+
+        child = node.children.get(segments[index])
+        if child is not None:
+            self._match(child, segments, index + 1, matches)
+
+        if node.wildcard is not None:
+            # '*' consumes one or more segments
+            for end in range(index + 1, len(segments) + 1):
+                self._match(node.wildcard, segments, end, matches)
+
+    def clear(self) -> None:
+        """Remove all subscribers."""
+        with self._lock:
+            self._root = _Node()
+            self._patterns.clear()
@@ -20,7 +20,7 @@ from viseron.domains.image_classification import (
 from viseron.domains.motion_detector.const import DOMAIN as MOTION_DETECTOR_DOMAIN
 from viseron.domains.object_detector import BASE_CONFIG_SCHEMA
 from viseron.domains.object_detector.const import CONFIG_CAMERAS
-from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
 from viseron.exceptions import ViseronError
 from viseron.helpers import pop_if_full
 from viseron.helpers.subprocess_worker import SubProcessWorker
@@ -274,7 +274,7 @@ class EdgeTPU(SubProcessWorker):
         self._process_initialization_error = mp.Event()
         self._reload_lock = threading.Lock()
         self._consecutive_failures = 0
-        super().__init__(vis, f"{COMPONENT}.{domain}")
+        super().__init__(vis, f"{COMPONENT}.{domain}", shared_frames=True)
         self.initialize()
 
     def initialize(self) -> None:
@@ -393,20 +393,21 @@ class EdgeTPUDetection(EdgeTPU):
 
     def post_process(self, item) -> None:
         """Post process detections."""
-        processed_objects = [
-            DetectedObject.from_absolute(
-                self.labels.get(obj["label"], obj["label"]),
-                float(obj["score"]),
-                obj["bbox"]["xmin"],
-                obj["bbox"]["ymin"],
-                obj["bbox"]["xmax"],
-                obj["bbox"]["ymax"],
-                frame_res=item["frame_resolution"],
-                model_res=(self.model_width, self.model_height),
-            )
-            for obj in item["result"]
-        ]
-        item["result"] = processed_objects
+        item["result"] = DetectionBatch.from_absolute(
+            [self.labels.get(obj["label"], obj["label"]) for obj in item["result"]],
+            [obj["score"] for obj in item["result"]],
+            [
+                (
+                    obj["bbox"]["xmin"],
+                    obj["bbox"]["ymin"],
+                    obj["bbox"]["xmax"],
+                    obj["bbox"]["ymax"],
+                )
+                for obj in item["result"]
+            ],
+            frame_res=item["frame_resolution"],
+            model_res=(self.model_width, self.model_height),
+        )
 
 
 class EdgeTPUClassification(EdgeTPU):
@@ -22,7 +22,7 @@ import tflite_runtime.interpreter as tflite
 from pycoral.adapters import classify, common, detect
 from pycoral.utils.edgetpu import make_interpreter
 
-from manager import connect
+from manager import SharedFrameReader, connect
 
 LOGGER = logging.getLogger(__name__)
 
@@ -193,6 +193,7 @@ def worker_thread(
         output_queue.put((device, "init_failed"))
         return
     output_queue.put((device, "init_done"))
+    frame_reader = SharedFrameReader()
     while True:
         job = input_queue.get()
         if job == "get_model_size":
@@ -209,7 +210,9 @@ def worker_thread(
                 )
             )
             continue
+        frame_reader.read(job)
         edgetpu.work_input(job)
+        frame_reader.done(job)
         output_queue.put((device, job))
 
 
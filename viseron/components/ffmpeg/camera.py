@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import contextlib
+import math
 import multiprocessing as mp
 import os
 import signal
@@ -21,7 +21,7 @@ from viseron.domains.camera.config import (
     DEFAULT_RECORDER,
     RECORDER_SCHEMA as BASE_RECORDER_SCHEMA,
 )
-from viseron.domains.camera.shared_frames import SharedFrame
+from viseron.domains.camera.shared_frames import SharedFrame, SharedFrameRingBuffer
 from viseron.exceptions import DomainNotReady, FFprobeError, FFprobeTimeout
 from viseron.helpers import escape_string, utcnow
 from viseron.helpers.logs import SensitiveInformationFilter
@@ -132,6 +132,8 @@ from .const import (
     DESC_VIDEO_FILTERS,
     DESC_WIDTH,
     FFMPEG_LOGLEVELS,
+    FRAME_BUFFER_MIN_SLOTS,
+    FRAME_BUFFER_SECONDS,
     HWACCEL_VAAPI,
     MAX_EMPTY_FRAMES,
     STREAM_FORMAT_MAP,
@@ -348,8 +350,9 @@ class Camera(AbstractCamera):
 
         super().__init__(vis, COMPONENT, config, identifier)
         self._frame_queue: mp.Queue[  # pylint: disable=unsubscriptable-object
-            bytes
+            tuple[int, int]
         ] = mp.Queue(maxsize=2)
+        self._frame_buffer: SharedFrameRingBuffer | None = None
         self._capture_frames = mp.Event()
         self._thread_stuck = False
         self.resolution = self.stream.width, self.stream.height
@@ -372,10 +375,21 @@ class Camera(AbstractCamera):
         if self._frame_queue:
             self._frame_queue.close()
         self._frame_queue = mp.Queue(maxsize=2)
+        if self._frame_buffer:
+            self._frame_buffer.unlink()
+        # Frames are kept around for a couple of seconds by the NVR before they are
+        # removed, so size the ring buffer according to the output FPS
+        self._frame_buffer = SharedFrameRingBuffer(
+            self.stream.frame_bytes_size,
+            max(
+                FRAME_BUFFER_MIN_SLOTS,
+                math.ceil(self.stream.output_fps * FRAME_BUFFER_SECONDS),
+            ),
+        )
         # Start watchdogs for this process since it spawns a RestartablePopen
         return RestartableProcess(
             name="viseron.camera." + self.identifier,
-            args=(self._frame_queue,),
+            args=(self._frame_queue, self._frame_buffer),
             target=self.read_frames,
             daemon=True,
             register=True,
@@ -422,9 +436,16 @@ class Camera(AbstractCamera):
 
     def read_frames(
         self,
-        frame_queue: mp.Queue[bytes],  # pylint: disable=unsubscriptable-object
+        frame_queue: mp.Queue[  # pylint: disable=unsubscriptable-object
+            tuple[int, int]
+        ],
+        frame_buffer: SharedFrameRingBuffer,
     ) -> None:
-        """Read frames from camera."""
+        """Read frames from camera.
+
+        Frames are read straight into a free slot of the shared memory ring buffer,
+        and only the slot index and sequence number is passed to the relay thread.
+        """
         setproctitle.setproctitle("viseron.camera." + self.identifier + ".read_frames")
         self.decode_error.clear()
         empty_frames = 0
@@ -441,13 +462,27 @@ class Camera(AbstractCamera):
                 self.decode_error.clear()
                 empty_frames = 0
 
-            frame_bytes = self.stream.read()
-            if frame_bytes:
-                empty_frames = 0
-                # Dont queue frames if consumer is not ready
-                with contextlib.suppress(Full):
-                    frame_queue.put_nowait(frame_bytes)
-                continue
+            acquired = frame_buffer.acquire()
+            if acquired is None:
+                # All slots are still referenced, discard the frame to keep the
+                # pipe flowing
+                if self.stream.read():
+                    empty_frames = 0
+                    continue
+            else:
+                slot, sequence = acquired
+                if (
+                    self.stream.readinto(frame_buffer.slot_buffer(slot))
+                    == frame_buffer.frame_bytes_size
+                ):
+                    empty_frames = 0
+                    try:
+                        frame_queue.put_nowait((slot, sequence))
+                    except Full:
+                        # Dont queue frames if consumer is not ready
+                        frame_buffer.release(slot)
+                    continue
+                frame_buffer.release(slot)
 
             if self._thread_stuck:
                 return
@@ -477,26 +512,27 @@ class Camera(AbstractCamera):
                 self.still_image_available = self.still_image_configured
 
             try:
-                frame_bytes = self._frame_queue.get(timeout=1)
+                slot, sequence = self._frame_queue.get(timeout=1)
             except Empty:
                 continue
 
             self.connected = True
             self.still_image_available = True
 
-            if len(frame_bytes) == self.stream.frame_bytes_size:
-                shared_frame = SharedFrame(
-                    self.stream.color_plane_width,
-                    self.stream.color_plane_height,
-                    self.stream.pixel_format,
-                    (self.stream.width, self.stream.height),
-                    self.identifier,
-                )
-            else:
+            if not self._frame_buffer:
                 continue
 
+            shared_frame = SharedFrame(
+                self.stream.color_plane_width,
+                self.stream.color_plane_height,
+                self.stream.pixel_format,
+                (self.stream.width, self.stream.height),
+                self.identifier,
+            )
+            shared_frame.sequence = sequence
+
             self._poll_timer = utcnow().timestamp()
-            self.shared_frames.create(shared_frame, frame_bytes)
+            self.shared_frames.create_from_slot(shared_frame, self._frame_buffer, slot)
             self.current_frame = shared_frame
             self._vis.dispatch_event(
                 self.frame_bytes_topic,
@@ -575,6 +611,11 @@ class Camera(AbstractCamera):
                 self._frame_reader = None
                 self.stream.close_pipe()
 
+        if self._frame_buffer:
+            # Frames still referencing the buffer keep it mapped until removed
+            self._frame_buffer.unlink()
+            self._frame_buffer = None
+
         if self._config[CONFIG_RECORD_ONLY] and self._check_segment_process_thread:
             self._logger.debug("Stopping record-only process")
             self._check_segment_process_thread.stop()
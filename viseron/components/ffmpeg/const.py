@@ -9,6 +9,9 @@ DESC_COMPONENT = "FFmpeg Configuration."
 
 ENV_FFMPEG_PATH = "VISERON_FFMPEG_PATH"
 MAX_EMPTY_FRAMES = 10
+# Number of seconds worth of frames the shared memory ring buffer can hold
+FRAME_BUFFER_SECONDS = 4
+FRAME_BUFFER_MIN_SLOTS = 4
 
 STREAM_FORMAT_MAP = {
     "rtsp": {"protocol": "rtsp", "timeout_option": ["-timeout", "5000000"]},
@@ -7,7 +7,8 @@ import logging
 import os
 import subprocess as sp
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any
+from io import BufferedReader
+from typing import TYPE_CHECKING, Any, cast
 
 from viseron.const import (
     CAMERA_SEGMENT_DURATION,
@@ -628,6 +629,19 @@ class Stream:
             self._logger.exception("Error reading frame from pipe")
         return None
 
+    def readinto(self, buffer: memoryview) -> int:
+        """Read a single frame from FFmpeg pipe into buffer.
+
+        Returns the number of bytes read.
+        """
+        try:
+            if self._pipe and self._pipe.stdout:
+                # stdout is a BufferedReader since the pipe is opened in binary mode
+                return cast(BufferedReader, self._pipe.stdout).readinto(buffer) or 0
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("Error reading frame from pipe")
+        return 0
+
     def record_only(self) -> None:
         """Record only the stream."""
         self._logger.debug(
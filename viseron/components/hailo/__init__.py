@@ -25,7 +25,7 @@ from viseron.domains.object_detector import (
     BASE_CONFIG_SCHEMA as OBJECT_DETECTOR_BASE_CONFIG_SCHEMA,
 )
 from viseron.domains.object_detector.const import CONFIG_CAMERAS
-from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
 from viseron.exceptions import ComponentNotReady, ViseronError
 from viseron.helpers import letterbox_resize, pop_if_full
 from viseron.helpers.child_process_worker import ChildProcessWorker
@@ -264,36 +264,30 @@ class Hailo8Detector(ChildProcessWorker):
         camera_resolution: tuple[int, int],
         min_confidence: float,
         max_boxes: int = 50,
-    ) -> list[DetectedObject]:
+    ) -> DetectionBatch:
         """Post process detections."""
-        all_detections = []
-        for class_id, detection in enumerate(detections):
-            for det in detection:
-                bbox, score = det[:4], det[4]
-                if score >= min_confidence:
-                    all_detections.append((class_id, score, bbox))
-
-        # Sort all detections by score descending
-        all_detections.sort(reverse=True, key=lambda x: x[1])
+        # Each class has its own array with rows of y1, x1, y2, x2, score
+        per_class = [
+            np.asarray(detection, dtype=np.float64).reshape(-1, 5)
+            for detection in detections
+        ]
+        class_ids = np.repeat(
+            np.arange(len(per_class)), [len(detection) for detection in per_class]
+        )
+        rows = np.concatenate(per_class) if per_class else np.empty((0, 5))
+        above_min_confidence = rows[:, 4] >= min_confidence
+        class_ids = class_ids[above_min_confidence]
+        rows = rows[above_min_confidence]
 
         # Filter to max_boxes highest scoring detections
-        top_detections = all_detections[:max_boxes]
-        _detections = []
-        for class_id, score, bbox in top_detections:
-            _detections.append(
-                DetectedObject.from_relative_letterboxed(
-                    self.labels[int(class_id)],
-                    score,
-                    bbox[1],
-                    bbox[0],
-                    bbox[3],
-                    bbox[2],
-                    frame_res=camera_resolution,
-                    model_res=self.model_res,
-                )
-            )
-
-        return _detections
+        top_detections = np.argsort(-rows[:, 4], kind="stable")[:max_boxes]
+        return DetectionBatch.from_relative_letterboxed(
+            [self.labels[int(class_id)] for class_id in class_ids[top_detections]],
+            rows[top_detections, 4],
+            rows[top_detections][:, [1, 0, 3, 2]],
+            frame_res=camera_resolution,
+            model_res=self.model_res,
+        )
 
     @property
     def model_width(self) -> int:
@@ -12,6 +12,7 @@ from .const import COMPONENT, CONFIG_OBJECT_DETECTOR
 if TYPE_CHECKING:
     from viseron import Viseron
     from viseron.domains.object_detector.detected_object import DetectedObject
+    from viseron.domains.object_detector.detection_batch import DetectionBatch
 
 
 LOGGER = logging.getLogger(__name__)
@@ -38,7 +39,7 @@ class ObjectDetector(AbstractObjectDetector):
         """Preprocess frame before detection."""
         return self._hailo8.preprocess(frame)
 
-    def return_objects(self, frame) -> list[DetectedObject] | None:
+    def return_objects(self, frame) -> DetectionBatch | None:
         """Perform object detection."""
         detections = self._hailo8.detect(
             frame,
@@ -40,14 +40,6 @@ class MotionDetector(AbstractMotionDetectorScanner):
         self._empty_mat = cv2.Mat(np.empty((3, 3), np.uint8))
         self._first_frame = True
 
-    def preprocess(self, frame: np.ndarray) -> np.ndarray:
-        """Resize the frame to the desired width and height."""
-        return cv2.resize(
-            frame,
-            self._resolution,
-            interpolation=cv2.INTER_LINEAR,
-        )
-
     def return_motion(self, frame: np.ndarray) -> Contours:
         """Perform motion detection and return Contours."""
         if self._first_frame:
@@ -11,13 +11,17 @@ import datetime
 import logging
 import threading
 import time
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field
 from enum import Enum
 from queue import Empty, Queue
 from typing import TYPE_CHECKING, Any, Literal
 
 from viseron.components.nvr.const import COMPONENT
-from viseron.components.nvr.sensor import OperationStateSensor
+from viseron.components.nvr.sensor import (
+    ConversionsAvoidedSensor,
+    OperationStateSensor,
+)
 from viseron.components.nvr.toggle import ManualRecordingToggle
 from viseron.components.storage.models import TriggerTypes
 from viseron.const import VISERON_SIGNAL_SHUTDOWN
@@ -60,7 +64,7 @@ if TYPE_CHECKING:
     from viseron import Viseron
     from viseron.domains.camera import AbstractCamera, EventFrameBytesData
     from viseron.domains.camera.recorder import ManualRecording
-    from viseron.domains.camera.shared_frames import SharedFrame
+    from viseron.domains.camera.shared_frames import SharedFrame, SharedFrames
     from viseron.domains.motion_detector import AbstractMotionDetector, Contours
     from viseron.domains.object_detector import AbstractObjectDetector
     from viseron.domains.object_detector.detected_object import DetectedObject
@@ -94,11 +98,52 @@ def setup(vis: Viseron, config: dict[str, Any], identifier: str) -> bool:
 
 @dataclass
 class EventProcessedFrame(EventData):
-    """Processed frame that is sent on EVENT_PROCESSED_FRAME_TOPIC."""
+    """Processed frame that is sent on EVENT_PROCESSED_FRAME_TOPIC.
+
+    The frame is decoded to RGB the first time it is accessed. A reference to the
+    shared frame is held until then, or until the event is garbage collected.
+    """
 
-    frame: np.ndarray
+    shared_frame: SharedFrame
+    shared_frames: SharedFrames = field(repr=False)
     objects_in_fov: list[DetectedObject] | None
     motion_contours: Contours | None
+    on_discard: Callable[[], None] | None = field(default=None, repr=False)
+    _frame: np.ndarray | None = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    _release: weakref.finalize = field(init=False, repr=False)
+
+    json_serializable = False
+
+    def __post_init__(self) -> None:
+        """Hold a reference to the shared frame."""
+        self.shared_frame.add_reference()
+        self._release = weakref.finalize(
+            self, self._release_shared_frame, self.shared_frame, self.on_discard
+        )
+
+    @staticmethod
+    def _release_shared_frame(
+        shared_frame: SharedFrame, on_discard: Callable[[], None] | None
+    ) -> None:
+        """Release the shared frame without having decoded it."""
+        shared_frame.remove_reference()
+        if on_discard:
+            on_discard()
+
+    @property
+    def frame(self) -> np.ndarray:
+        """Return the frame in RGB format."""
+        with self._lock:
+            if self._frame is None:
+                self._frame = self.shared_frames.get_decoded_frame_rgb(
+                    self.shared_frame
+                )
+                self._release.detach()
+                self.shared_frame.remove_reference()
+            return self._frame
 
 
 @dataclass
@@ -280,6 +325,7 @@ class NVR(AbstractNVR):
         self._start_manual_recording = False
         self._kill_received = False
         self._removal_timers: list[threading.Timer] = []
+        self.conversions_avoided = 0
         self._operation_state: OperationState | None = None
 
         self._frame_scanners: dict[str, FrameIntervalCalculator] = {}
@@ -403,6 +449,12 @@ class NVR(AbstractNVR):
         vis.add_entity(
             COMPONENT, OperationStateSensor(vis, self), DOMAIN, self._camera.identifier
         )
+        vis.add_entity(
+            COMPONENT,
+            ConversionsAvoidedSensor(vis, self),
+            DOMAIN,
+            self._camera.identifier,
+        )
         vis.add_entity(
             COMPONENT, ManualRecordingToggle(vis, self), DOMAIN, self._camera.identifier
         )
@@ -868,24 +920,40 @@ class NVR(AbstractNVR):
 
         self.process_frame(shared_frame)
         self.process_recorder(shared_frame)
+        self.publish_processed_frame(shared_frame)
+        self.remove_frame(shared_frame)
+
+    def _conversion_avoided(self) -> None:
+        """Count a processed frame that was never decoded."""
+        self.conversions_avoided += 1
+
+    def publish_processed_frame(self, shared_frame: SharedFrame) -> None:
+        """Publish processed frame if anyone is listening.
+
+        The frame is only decoded by the subscribers that actually use it.
+        """
+        processed_frame_topic = EVENT_PROCESSED_FRAME_TOPIC.format(
+            camera_identifier=self._camera.identifier
+        )
+        if not self._vis.has_event_listeners(processed_frame_topic):
+            self._conversion_avoided()
+            return
+
         self._vis.dispatch_event(
-            EVENT_PROCESSED_FRAME_TOPIC.format(
-                camera_identifier=self._camera.identifier
-            ),
+            processed_frame_topic,
             EventProcessedFrame(
-                frame=self._camera.shared_frames.get_decoded_frame_rgb(
-                    shared_frame
-                ).copy(),
+                shared_frame=shared_frame,
+                shared_frames=self._camera.shared_frames,
                 objects_in_fov=self._object_detector.objects_in_fov
                 if self._object_detector
                 else None,
                 motion_contours=self._motion_detector.motion_contours
                 if self._motion_detector
                 else None,
+                on_discard=self._conversion_avoided,
             ),
             store=False,
         )
-        self.remove_frame(shared_frame)
 
     def unload(self) -> None:
         """Unload nvr."""
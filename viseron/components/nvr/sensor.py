@@ -1,4 +1,4 @@
-"""Sensor that represents NVR state of operation."""
+"""NVR sensors."""
 
 from __future__ import annotations
 
@@ -9,11 +9,15 @@ from viseron.domains.camera.entity.sensor import CameraSensor
 from .const import EVENT_OPERATION_STATE
 
 if TYPE_CHECKING:
+    from apscheduler.schedulers.base import Job
+
     from viseron import Event, Viseron
     from viseron.components.nvr.nvr import EventOperationState
 
     from .nvr import NVR
 
+UPDATE_INTERVAL = 30
+
 
 class OperationStateSensor(CameraSensor):
     """Entity that shows the current state of operation for nvr."""
@@ -49,3 +53,44 @@ class OperationStateSensor(CameraSensor):
             else "unknown"
         )
         self.set_state()
+
+
+class ConversionsAvoidedSensor(CameraSensor):
+    """Entity that counts processed frames that did not have to be decoded."""
+
+    def __init__(
+        self,
+        vis: Viseron,
+        nvr: NVR,
+    ) -> None:
+        super().__init__(vis, nvr.camera)
+        self.nvr = nvr
+
+        self.entity_category = "diagnostic"
+        self.object_id = f"{nvr.camera.identifier}_conversions_avoided"
+        self.name = f"{nvr.camera.name} Conversions Avoided"
+        self.icon = "mdi:counter"
+
+        self._update_job: Job | None = None
+
+    def setup(self) -> None:
+        """Set up state updates."""
+        self._update_job = self._vis.schedule_periodic_update(self, UPDATE_INTERVAL)
+
+    @property
+    def state(self) -> int:
+        """Return entity state."""
+        return self.nvr.conversions_avoided
+
+    def update(self) -> None:
+        """Update sensor."""
+        self.set_state()
+
+    def unload(self) -> None:
+        """Unload entity."""
+        try:
+            if self._update_job:
+                self._update_job.remove()
+        except Exception:  # pylint: disable=broad-except # noqa: BLE001, S110
+            pass
+        super().unload()
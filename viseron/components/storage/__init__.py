@@ -6,6 +6,7 @@ import copy
 import logging
 import os
 import pathlib
+import threading
 import time
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, overload
 
@@ -26,7 +27,10 @@ from viseron.components.storage.config import (
 from viseron.components.storage.const import (
     COMPONENT,
     CONFIG_CONTINUOUS,
+    CONFIG_EVENT_RECORDER,
     CONFIG_EVENTS,
+    CONFIG_FRAME_WIDTH,
+    CONFIG_JPEG_QUALITY,
     CONFIG_PATH,
     CONFIG_RECORDER,
     CONFIG_SNAPSHOTS,
@@ -34,9 +38,12 @@ from viseron.components.storage.const import (
     CONFIG_TIER_CHECK_CPU_LIMIT,
     CONFIG_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
     CONFIG_TIER_CHECK_WORKERS,
+    CONFIG_TIER_MOVE_MAX_BANDWIDTH,
+    CONFIG_TIER_MOVE_WORKERS,
     CONFIG_TIERS,
     CONFIG_TIMELAPSE,
     DEFAULT_COMPONENT,
+    DEFAULT_JPEG_QUALITY,
     DESC_COMPONENT,
     ENGINE,
     TIER_CATEGORY_RECORDER,
@@ -51,8 +58,11 @@ from viseron.components.storage.const import (
     TIER_SUBCATEGORY_THUMBNAILS,
     TIER_SUBCATEGORY_TIMELAPSE,
 )
+from viseron.components.storage.event_recorder import EventRecorder
+from viseron.components.storage.file_writer import FilesWriter
 from viseron.components.storage.jobs import CleanupManager
 from viseron.components.storage.models import Base, FilesMeta, Motion, Recordings
+from viseron.components.storage.move_engine import MoveMetrics
 from viseron.components.storage.storage_subprocess import TierCheckWorker
 from viseron.components.storage.tier_handler import (
     EventClipTierHandler,
@@ -69,6 +79,7 @@ from viseron.components.storage.util import (
     get_thumbnails_path,
     get_timelapse_path,
 )
+from viseron.components.storage.watcher import TierWatcher
 from viseron.const import EVENT_DOMAIN_REGISTERED, VISERON_SIGNAL_STOPPING
 from viseron.domains.camera.const import CONFIG_STORAGE, DOMAIN as CAMERA_DOMAIN
 from viseron.exceptions import ComponentNotReady
@@ -83,7 +94,9 @@ if TYPE_CHECKING:
     from viseron.components.storage.storage_subprocess import (
         DataItem,
         DataItemDeleteFile,
+        DataItemFileEvent,
         DataItemMoveFile,
+        DataItemReconcileLedgers,
     )
     from viseron.domain_registry import EventDomainRegisteredData
     from viseron.domains.camera import AbstractCamera
@@ -276,14 +289,48 @@ class Storage:
         self.cleanup_manager.start()
 
         self.tier_check_worker = TierCheckWorker(
-            vis, config[CONFIG_TIER_CHECK_CPU_LIMIT], config[CONFIG_TIER_CHECK_WORKERS]
+            vis,
+            config[CONFIG_TIER_CHECK_CPU_LIMIT],
+            config[CONFIG_TIER_CHECK_WORKERS],
+            config[CONFIG_TIER_MOVE_WORKERS],
+            config[CONFIG_TIER_MOVE_MAX_BANDWIDTH],
         )
+        self.move_metrics = MoveMetrics()
+
+        self.event_recorder = EventRecorder(vis, self, config[CONFIG_EVENT_RECORDER])
+        self.files_writer = FilesWriter(vis, self)
+
+        self._tier_watchers_lock = threading.Lock()
+        self._tier_watchers: dict[tuple[str, bool], TierWatcher] = {}
 
     @property
     def camera_tier_handlers(self):
         """Return camera tier handlers."""
         return self._camera_tier_handlers
 
+    def get_tier_watcher(self, path: str, poll: bool) -> TierWatcher:
+        """Return the watcher of a tier path, starting it if needed."""
+        key = (os.path.normpath(path), poll)
+        with self._tier_watchers_lock:
+            if key not in self._tier_watchers:
+                self._tier_watchers[key] = TierWatcher(self._vis, path, poll)
+                self._tier_watchers[key].start()
+            return self._tier_watchers[key]
+
+    @property
+    def timelapse_frame_width(self) -> int | None:
+        """Return the width of extracted timelapse frames."""
+        if not self._config.get(CONFIG_TIMELAPSE):
+            return None
+        return self._config[CONFIG_TIMELAPSE][CONFIG_FRAME_WIDTH]
+
+    @property
+    def timelapse_jpeg_quality(self) -> int:
+        """Return the JPEG quality of extracted timelapse frames."""
+        if not self._config.get(CONFIG_TIMELAPSE):
+            return DEFAULT_JPEG_QUALITY
+        return self._config[CONFIG_TIMELAPSE][CONFIG_JPEG_QUALITY]
+
     @property
     def file_batch_size(self) -> int:
         """Return the number of files to process in a single batch."""
@@ -298,6 +345,8 @@ class Storage:
         """Initialize storage component."""
         self._alembic_cfg = self._get_alembic_config()
         self.create_database()
+        self.event_recorder.start()
+        self.files_writer.start()
 
         self._vis.listen_event(
             EVENT_DOMAIN_REGISTERED.format(domain=CAMERA_DOMAIN),
@@ -681,9 +730,20 @@ class Storage:
         callback: Callable[[DataItemDeleteFile], None] | None = None,
     ) -> None: ...
 
+    @overload
+    def tier_check_worker_send_command(
+        self,
+        item: DataItemFileEvent | DataItemReconcileLedgers,
+        callback: None = None,
+    ) -> None: ...
+
     def tier_check_worker_send_command(
         self,
-        item: DataItem | DataItemMoveFile | DataItemDeleteFile,
+        item: DataItem
+        | DataItemMoveFile
+        | DataItemDeleteFile
+        | DataItemFileEvent
+        | DataItemReconcileLedgers,
         callback: Callable[[Any], None] | None = None,
     ) -> None:
         """Send command to tier check worker."""
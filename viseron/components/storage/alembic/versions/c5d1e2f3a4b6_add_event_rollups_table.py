@@ -0,0 +1,57 @@
+# pylint: disable=invalid-name
+"""Add event_rollups table.
+
+Revision ID: c5d1e2f3a4b6
+Revises: 7f6d3739fcd6
+Create Date: 2026-10-17 09:12:44.118204
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from viseron.components.storage.models import (
+    ROLLUP_SOURCES,
+    UTCDateTime,
+    rollup_counts,
+    rollup_ddl,
+)
+
+# revision identifiers, used by Alembic.
+revision: str | None = "c5d1e2f3a4b6"
+down_revision: str | None = "7f6d3739fcd6"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    """Run the upgrade migrations."""
+    op.create_table(
+        "event_rollups",
+        sa.Column("camera_identifier", sa.String(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("bucket", UTCDateTime(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("camera_identifier", "type", "bucket"),
+    )
+    for statement in rollup_ddl():
+        op.execute(statement)
+
+    # Backfill from the existing rows
+    for table, _, _ in ROLLUP_SOURCES:
+        op.execute(
+            "INSERT INTO event_rollups (camera_identifier, type, bucket, count) "
+            f"{rollup_counts(table, table)} "
+            "ON CONFLICT (camera_identifier, type, bucket) "
+            "DO UPDATE SET count = event_rollups.count + excluded.count"
+        )
+
+
+def downgrade() -> None:
+    """Run the downgrade migrations."""
+    for table, _, _ in ROLLUP_SOURCES:
+        op.execute(f"DROP TRIGGER IF EXISTS event_rollups_{table}_insert ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS event_rollups_{table}_delete ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS event_rollups_{table}()")
+    op.drop_table("event_rollups")
@@ -0,0 +1,47 @@
+# pylint: disable=invalid-name
+"""Add orig_end_time column and segment lookup index to Files table.
+
+Revision ID: d8a4f0b7c2e9
+Revises: c5d1e2f3a4b6
+Create Date: 2026-10-17 11:02:37.540913
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from viseron.components.storage.models import UTCDateTime
+
+# revision identifiers, used by Alembic.
+revision: str | None = "d8a4f0b7c2e9"
+down_revision: str | None = "c5d1e2f3a4b6"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    """Run the upgrade migrations."""
+    op.add_column(
+        "files",
+        sa.Column(
+            "orig_end_time",
+            UTCDateTime(),
+            sa.Computed(
+                "orig_ctime + make_interval(secs => round(duration))", persisted=True
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_files_orig_ctime",
+        "files",
+        ["camera_identifier", "category", "subcategory", "orig_ctime"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Run the downgrade migrations."""
+    op.drop_index("idx_files_orig_ctime", table_name="files")
+    op.drop_column("files", "orig_end_time")
@@ -0,0 +1,53 @@
+# pylint: disable=invalid-name
+"""Add camera and created_at indexes to event tables.
+
+Revision ID: e3b9c1d4f5a7
+Revises: d8a4f0b7c2e9
+Create Date: 2026-10-17 13:41:09.275163
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str | None = "e3b9c1d4f5a7"
+down_revision: str | None = "d8a4f0b7c2e9"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    """Run the upgrade migrations."""
+    op.create_index(
+        "idx_recordings_camera_created",
+        "recordings",
+        ["camera_identifier", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_objects_camera_created",
+        "objects",
+        ["camera_identifier", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_motion_camera_created",
+        "motion",
+        ["camera_identifier", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_ppr_camera_created",
+        "post_processor_results",
+        ["camera_identifier", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Run the downgrade migrations."""
+    op.drop_index("idx_ppr_camera_created", table_name="post_processor_results")
+    op.drop_index("idx_motion_camera_created", table_name="motion")
+    op.drop_index("idx_objects_camera_created", table_name="objects")
+    op.drop_index("idx_recordings_camera_created", table_name="recordings")
@@ -5,7 +5,6 @@ from __future__ import annotations
 import datetime
 import logging
 import os
-import shutil
 import threading
 from collections.abc import Callable
 from typing import TYPE_CHECKING
@@ -15,7 +14,13 @@ from sqlalchemy import delete, select
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from viseron.components.storage.const import ENGINE
+from viseron.components.storage.ledger import (
+    LEDGER_DTYPE,
+    FilesLedger,
+    RecordingsLedger,
+)
 from viseron.components.storage.models import Files, Recordings
+from viseron.components.storage.move_engine import MoveEngine, MoveResult
 from viseron.const import CAMERA_SEGMENT_DURATION
 from viseron.helpers import utcnow
 
@@ -25,7 +30,9 @@ if TYPE_CHECKING:
     from viseron.components.storage.storage_subprocess import (
         DataItem,
         DataItemDeleteFile,
+        DataItemFileEvent,
         DataItemMoveFile,
+        DataItemReconcileLedgers,
     )
 
 LOGGER = logging.getLogger(__name__)
@@ -63,17 +70,27 @@ RECORDINGS_FILES_DTYPE = np.dtype(
 
 
 class Worker:
-    """Worker process for checking storage tiers in a separate shell."""
+    """Worker process for checking storage tiers in a separate shell.
+
+    The files and recordings of each tier are kept in ledgers that are updated from
+    file events sent by the tier handlers, so a tier check does not have to load
+    every row from the database.
+    """
 
     def __init__(
         self,
+        move_engine: MoveEngine | None = None,
     ) -> None:
         self._get_session: Callable[[], Session] = scoped_session(
             sessionmaker(bind=ENGINE)
         )
+        self._move_engine = move_engine or MoveEngine()
         self._last_call: dict[str, float] = {}
         self._check_locks: dict[str, threading.Lock] = {}
         self._checks_in_progress: dict[str, bool] = {}
+        self._ledgers_lock = threading.Lock()
+        self._files_ledgers: dict[tuple[str, int, str, str], FilesLedger] = {}
+        self._recordings_ledgers: dict[str, RecordingsLedger] = {}
 
     def _check_tier(self, item: DataItem) -> None:
         files = np.empty(0, dtype=FILES_DTYPE)
@@ -178,12 +195,15 @@ class Worker:
 
     def move_file(self, item: DataItemMoveFile) -> None:
         """Move file from source to destination."""
-        move_file(
+        result = move_file(
             self._get_session,
             item.src,
             item.dst,
             LOGGER,
+            self._move_engine,
         )
+        item.method = result.method
+        item.size = result.size
 
     def delete_file(self, item: DataItemDeleteFile) -> None:
         """Delete file."""
@@ -193,10 +213,57 @@ class Worker:
             LOGGER,
         )
 
-    def work_input(self, item: DataItem | DataItemMoveFile | DataItemDeleteFile):
+    def file_event(self, item: DataItemFileEvent) -> None:
+        """Update the ledger of the tier that the file belongs to."""
+        ledger = self._files_ledgers.get(
+            (item.camera_identifier, item.tier_id, item.category, item.subcategory)
+        )
+        # Ledgers that are not loaded yet will get the file from the database
+        if ledger is None:
+            return
+
+        if item.event == "created":
+            if (
+                item.file_id is None
+                or item.size is None
+                or item.orig_ctime is None
+                or item.tier_path is None
+            ):
+                return
+            ledger.upsert(
+                item.file_id,
+                item.size,
+                int(item.orig_ctime),
+                item.path,
+                item.tier_path,
+            )
+        elif item.event == "modified" and item.size is not None:
+            ledger.set_size(item.path, item.size)
+        elif item.event == "deleted":
+            ledger.remove(item.path)
+
+    def reconcile_ledgers(self) -> None:
+        """Reload all files ledgers from the database on the next tier check."""
+        with self._ledgers_lock:
+            ledgers = list(self._files_ledgers.values())
+        for ledger in ledgers:
+            ledger.invalidate()
+
+    def work_input(
+        self,
+        item: DataItem
+        | DataItemMoveFile
+        | DataItemDeleteFile
+        | DataItemFileEvent
+        | DataItemReconcileLedgers,
+    ):
         """Perform work on input item from child process."""
         try:
-            if item.cmd == "check_tier":
+            if item.cmd == "file_event":
+                self.file_event(item)
+            elif item.cmd == "reconcile_ledgers":
+                self.reconcile_ledgers()
+            elif item.cmd == "check_tier":
                 self.check_tier(item)
             if item.cmd == "move_file":
                 self.move_file(item)
@@ -210,14 +277,43 @@ class Worker:
             )
             item.error = str(e)
 
+    def _files_ledger(
+        self, camera_identifier: str, tier_id: int, category: str, subcategory: str
+    ) -> FilesLedger:
+        """Return the files ledger, loading it from the database if needed."""
+        key = (camera_identifier, tier_id, category, subcategory)
+        with self._ledgers_lock:
+            ledger = self._files_ledgers.setdefault(key, FilesLedger())
+
+        if ledger.needs_reload:
+            ledger.reload(
+                lambda: load_tier(
+                    self._get_session,
+                    category,
+                    [subcategory],
+                    tier_id,
+                    camera_identifier,
+                    dtype=LEDGER_DTYPE,
+                )
+            )
+            LOGGER.debug(
+                "Reconciled files ledger for %s tier %s category %s subcategory %s",
+                camera_identifier,
+                tier_id,
+                category,
+                subcategory,
+            )
+        return ledger
+
     def load_tier(self, item: DataItem):
-        """Load the tier data for the camera."""
-        data = load_tier(
-            self._get_session,
-            item.category,
-            item.subcategories,
-            item.tier_id,
-            item.camera_identifier,
+        """Return the tier data for the camera from the ledgers."""
+        data = np.concatenate(
+            [
+                self._files_ledger(
+                    item.camera_identifier, item.tier_id, item.category, subcategory
+                ).snapshot()
+                for subcategory in item.subcategories
+            ]
         )
         LOGGER.debug(
             "Loaded %d files into numpy array",
@@ -226,11 +322,13 @@ class Worker:
         return data
 
     def load_recordings(self, item: DataItem):
-        """Load the recordings data for the camera."""
-        data = load_recordings(
-            self._get_session,
-            item.camera_identifier,
-        )
+        """Return the recordings data for the camera from the ledger."""
+        with self._ledgers_lock:
+            ledger = self._recordings_ledgers.setdefault(
+                item.camera_identifier,
+                RecordingsLedger(item.camera_identifier, RECORDINGS_DTYPE),
+            )
+        data = ledger.refresh(self._get_session)
         LOGGER.debug(
             "Loaded %d recordings into numpy array",
             len(data),
@@ -362,6 +460,7 @@ def load_tier(
     subcategories: list[str],
     tier_id: int,
     camera_identifier: str,
+    dtype: np.dtype = FILES_DTYPE,
 ):
     """Load the tier files data for the camera."""
     with get_session() as session:
@@ -386,7 +485,7 @@ def load_tier(
         ]
         return np.array(
             data,
-            dtype=FILES_DTYPE,
+            dtype=dtype,
         )
 
 
@@ -629,7 +728,7 @@ def get_recordings_to_move(
 
     # Remove any files that are not m4s
     stripped_files_to_move = stripped_files_to_move[
-        np.char.endswith(stripped_files_to_move["path"], ".m4s")
+        np.char.endswith(stripped_files_to_move["path"].astype(str), ".m4s")
     ]
     return stripped_files_to_move
 
@@ -658,18 +757,19 @@ def move_file(
     src: str,
     dst: str,
     logger: logging.Logger,
-) -> None:
+    move_engine: MoveEngine | None = None,
+) -> MoveResult:
     """Move file from src to dst.
 
-    To avoid race conditions where a file is referenced at the same time as it is being
-    moved, causing a 404 in the browser, we copy the file to the new location and then
-    delete the old one.
+    Files on the same device are renamed. Otherwise, to avoid race conditions where
+    a file is referenced at the same time as it is being moved, causing a 404 in the
+    browser, we copy the file to the new location and then delete the old one.
+    If the move fails, src and its row are kept so that the move is retried on the
+    next tier check.
     """
     logger.debug("Moving file from %s to %s", src, dst)
     try:
-        os.makedirs(os.path.dirname(dst), exist_ok=True)
-        shutil.copy(src, dst)
-        os.remove(src)
+        result = (move_engine or MoveEngine()).move(src, dst)
     except FileNotFoundError as error:
         logger.debug(f"Failed to move file {src} to {dst}: {error}")
         with get_session() as session:
@@ -679,12 +779,11 @@ def move_file(
         raise error
     except OSError as error:
         logger.debug(f"Failed to move file {src} to {dst}: {error}")
-        with get_session() as session:
-            stmt = delete(Files).where(Files.path == src)
-            session.execute(stmt)
-            session.commit()
-        try:
-            os.remove(src)
-        except FileNotFoundError as _error:
-            logger.debug(f"Failed to delete file {src}: {_error}")
         raise error
+    logger.debug(
+        "Moved %s bytes using %s in %.3f seconds",
+        result.size,
+        result.method,
+        result.elapsed,
+    )
+    return result
@@ -8,17 +8,24 @@ import voluptuous as vol
 
 from viseron.components.storage.const import (
     COMPONENT,
+    CONFIG_BATCH_SIZE,
     CONFIG_CHECK_INTERVAL,
+    CONFIG_COMMIT_INTERVAL,
     CONFIG_CONTINUOUS,
     CONFIG_DAYS,
     CONFIG_DRAIN,
+    CONFIG_EVENT_RECORDER,
     CONFIG_EVENTS,
+    CONFIG_EXCLUDE,
     CONFIG_FACE_RECOGNITION,
+    CONFIG_FRAME_WIDTH,
     CONFIG_GB,
     CONFIG_HOURS,
     CONFIG_INTERVAL,
+    CONFIG_JPEG_QUALITY,
     CONFIG_LICENSE_PLATE_RECOGNITION,
     CONFIG_MAX_AGE,
+    CONFIG_MAX_BUFFER_SIZE,
     CONFIG_MAX_SIZE,
     CONFIG_MB,
     CONFIG_MIN_AGE,
@@ -30,29 +37,39 @@ from viseron.components.storage.const import (
     CONFIG_PATH,
     CONFIG_POLL,
     CONFIG_RECORDER,
+    CONFIG_SAMPLE,
     CONFIG_SECONDS,
     CONFIG_SNAPSHOTS,
     CONFIG_TIER_CHECK_BATCH_SIZE,
     CONFIG_TIER_CHECK_CPU_LIMIT,
     CONFIG_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
     CONFIG_TIER_CHECK_WORKERS,
+    CONFIG_TIER_MOVE_MAX_BANDWIDTH,
+    CONFIG_TIER_MOVE_WORKERS,
     CONFIG_TIERS,
     CONFIG_TIMELAPSE,
+    DEFAULT_BATCH_SIZE,
     DEFAULT_CHECK_INTERVAL,
     DEFAULT_CHECK_INTERVAL_DAYS,
     DEFAULT_CHECK_INTERVAL_HOURS,
     DEFAULT_CHECK_INTERVAL_MINUTES,
     DEFAULT_CHECK_INTERVAL_SECONDS,
+    DEFAULT_COMMIT_INTERVAL,
     DEFAULT_CONTINUOUS,
     DEFAULT_DAYS,
     DEFAULT_DRAIN,
+    DEFAULT_EVENT_RECORDER,
     DEFAULT_EVENTS,
+    DEFAULT_EXCLUDE,
     DEFAULT_FACE_RECOGNITION,
+    DEFAULT_FRAME_WIDTH,
     DEFAULT_GB,
     DEFAULT_HOURS,
     DEFAULT_INTERVAL,
+    DEFAULT_JPEG_QUALITY,
     DEFAULT_LICENSE_PLATE_RECOGNITION,
     DEFAULT_MAX_AGE,
+    DEFAULT_MAX_BUFFER_SIZE,
     DEFAULT_MAX_SIZE,
     DEFAULT_MB,
     DEFAULT_MIN_AGE,
@@ -64,6 +81,7 @@ from viseron.components.storage.const import (
     DEFAULT_POLL,
     DEFAULT_RECORDER,
     DEFAULT_RECORDER_TIERS,
+    DEFAULT_SAMPLE,
     DEFAULT_SECONDS,
     DEFAULT_SNAPSHOTS,
     DEFAULT_SNAPSHOTS_TIERS,
@@ -71,20 +89,29 @@ from viseron.components.storage.const import (
     DEFAULT_TIER_CHECK_CPU_LIMIT,
     DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
     DEFAULT_TIER_CHECK_WORKERS,
+    DEFAULT_TIER_MOVE_MAX_BANDWIDTH,
+    DEFAULT_TIER_MOVE_WORKERS,
     DEFAULT_TIMELAPSE,
+    DESC_BATCH_SIZE,
     DESC_CHECK_INTERVAL,
     DESC_CHECK_INTERVAL_DAYS,
     DESC_CHECK_INTERVAL_HOURS,
     DESC_CHECK_INTERVAL_MINUTES,
     DESC_CHECK_INTERVAL_SECONDS,
+    DESC_COMMIT_INTERVAL,
     DESC_CONTINUOUS,
     DESC_DOMAIN_TIERS,
     DESC_DRAIN,
+    DESC_EVENT_RECORDER,
     DESC_EVENTS,
+    DESC_EXCLUDE,
     DESC_FACE_RECOGNITION,
+    DESC_FRAME_WIDTH,
     DESC_INTERVAL,
+    DESC_JPEG_QUALITY,
     DESC_LICENSE_PLATE_RECOGNITION,
     DESC_MAX_AGE,
+    DESC_MAX_BUFFER_SIZE,
     DESC_MAX_DAYS,
     DESC_MAX_GB,
     DESC_MAX_HOURS,
@@ -105,12 +132,15 @@ from viseron.components.storage.const import (
     DESC_POLL,
     DESC_RECORDER,
     DESC_RECORDER_TIERS,
+    DESC_SAMPLE,
     DESC_SNAPSHOTS,
     DESC_SNAPSHOTS_TIERS,
     DESC_TIER_CHECK_BATCH_SIZE,
     DESC_TIER_CHECK_CPU_LIMIT,
     DESC_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
     DESC_TIER_CHECK_WORKERS,
+    DESC_TIER_MOVE_MAX_BANDWIDTH,
+    DESC_TIER_MOVE_WORKERS,
     DESC_TIMELAPSE,
     DESC_TIMELAPSE_TIERS,
     TIER_CATEGORY_RECORDER,
@@ -452,11 +482,51 @@ def get_timelapse_schema():
             [TIER_SCHEMA_TIMELAPSE],
             vol.Length(min=1),
         ),
+        vol.Optional(
+            CONFIG_FRAME_WIDTH,
+            default=DEFAULT_FRAME_WIDTH,
+            description=DESC_FRAME_WIDTH,
+        ): Maybe(vol.All(int, vol.Range(min=16))),
+        vol.Optional(
+            CONFIG_JPEG_QUALITY,
+            default=DEFAULT_JPEG_QUALITY,
+            description=DESC_JPEG_QUALITY,
+        ): vol.All(int, vol.Range(min=1, max=100)),
     }
 
 
 TIMELAPSE_SCHEMA = get_timelapse_schema()
 
+EVENT_RECORDER_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            CONFIG_BATCH_SIZE,
+            default=DEFAULT_BATCH_SIZE,
+            description=DESC_BATCH_SIZE,
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(
+            CONFIG_COMMIT_INTERVAL,
+            default=DEFAULT_COMMIT_INTERVAL,
+            description=DESC_COMMIT_INTERVAL,
+        ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+        vol.Optional(
+            CONFIG_MAX_BUFFER_SIZE,
+            default=DEFAULT_MAX_BUFFER_SIZE,
+            description=DESC_MAX_BUFFER_SIZE,
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(
+            CONFIG_EXCLUDE,
+            default=DEFAULT_EXCLUDE,
+            description=DESC_EXCLUDE,
+        ): [str],
+        vol.Optional(
+            CONFIG_SAMPLE,
+            default=DEFAULT_SAMPLE,
+            description=DESC_SAMPLE,
+        ): {str: vol.All(vol.Coerce(float), vol.Range(min=0, max=1))},
+    }
+)
+
 STORAGE_SCHEMA = vol.Schema(
     {
         vol.Optional(
@@ -479,6 +549,21 @@ STORAGE_SCHEMA = vol.Schema(
             default=DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
             description=DESC_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
         ): Maybe(vol.Coerce(float)),
+        vol.Optional(
+            CONFIG_TIER_MOVE_WORKERS,
+            default=DEFAULT_TIER_MOVE_WORKERS,
+            description=DESC_TIER_MOVE_WORKERS,
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(
+            CONFIG_TIER_MOVE_MAX_BANDWIDTH,
+            default=DEFAULT_TIER_MOVE_MAX_BANDWIDTH,
+            description=DESC_TIER_MOVE_MAX_BANDWIDTH,
+        ): Maybe(vol.All(vol.Coerce(float), vol.Range(min=0.1))),
+        vol.Optional(
+            CONFIG_EVENT_RECORDER,
+            default=DEFAULT_EVENT_RECORDER,
+            description=DESC_EVENT_RECORDER,
+        ): EVENT_RECORDER_SCHEMA,
         vol.Optional(
             CONFIG_RECORDER,
             default=DEFAULT_RECORDER,
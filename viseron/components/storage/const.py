@@ -57,6 +57,10 @@ TIER_SUBCATEGORY_MOTION_DETECTOR: Final = "motion_detector"
 TIER_SUBCATEGORY_TIMELAPSE: Final = "timelapse"
 
 
+# Segments are assumed to be shorter than this many seconds when looking up the
+# segment that is playing at a given time
+MAX_SEGMENT_DURATION: Final = 600
+
 # Storage configuration
 DESC_COMPONENT = "Storage configuration."
 DEFAULT_COMPONENT: dict[str, Any] = {}
@@ -64,6 +68,8 @@ CONFIG_TIER_CHECK_CPU_LIMIT: Final = "tier_check_cpu_limit"
 CONFIG_TIER_CHECK_WORKERS: Final = "tier_check_workers"
 CONFIG_TIER_CHECK_BATCH_SIZE: Final = "tier_check_batch_size"
 CONFIG_TIER_CHECK_SLEEP_BETWEEN_BATCHES: Final = "tier_check_sleep_between_batches"
+CONFIG_TIER_MOVE_WORKERS: Final = "tier_move_workers"
+CONFIG_TIER_MOVE_MAX_BANDWIDTH: Final = "tier_move_max_bandwidth"
 CONFIG_PATH: Final = "path"
 CONFIG_POLL: Final = "poll"
 CONFIG_MOVE_ON_SHUTDOWN: Final = "move_on_shutdown"
@@ -90,12 +96,28 @@ CONFIG_MOTION_DETECTOR: Final = "motion_detector"
 CONFIG_TIMELAPSE: Final = "timelapse"
 CONFIG_TIERS: Final = "tiers"
 CONFIG_INTERVAL: Final = "interval"
+CONFIG_FRAME_WIDTH: Final = "frame_width"
+CONFIG_JPEG_QUALITY: Final = "jpeg_quality"
+CONFIG_EVENT_RECORDER: Final = "event_recorder"
+CONFIG_BATCH_SIZE: Final = "batch_size"
+CONFIG_COMMIT_INTERVAL: Final = "commit_interval"
+CONFIG_MAX_BUFFER_SIZE: Final = "max_buffer_size"
+CONFIG_EXCLUDE: Final = "exclude"
+CONFIG_SAMPLE: Final = "sample"
 
 
 DEFAULT_TIER_CHECK_CPU_LIMIT: Final = 10
 DEFAULT_TIER_CHECK_WORKERS: Final = 4
 DEFAULT_TIER_CHECK_BATCH_SIZE: Final = 5
 DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES: Final = 0.5
+DEFAULT_TIER_MOVE_WORKERS: Final = 2
+DEFAULT_TIER_MOVE_MAX_BANDWIDTH: Final = None
+DEFAULT_EVENT_RECORDER: dict[str, Any] = {}
+DEFAULT_BATCH_SIZE: Final = 500
+DEFAULT_COMMIT_INTERVAL: Final = 1.0
+DEFAULT_MAX_BUFFER_SIZE: Final = 10000
+DEFAULT_EXCLUDE: list[str] = []
+DEFAULT_SAMPLE: dict[str, float] = {}
 DEFAULT_RECORDER: dict[str, Any] = {}
 DEFAULT_RECORDER_TIERS = [
     {
@@ -117,6 +139,8 @@ DEFAULT_SNAPSHOTS_TIERS = [
     },
 ]
 DEFAULT_TIMELAPSE: Final = None
+DEFAULT_FRAME_WIDTH: Final = None
+DEFAULT_JPEG_QUALITY: Final = 85
 DEFAULT_FACE_RECOGNITION: Final = None
 DEFAULT_OBJECT_DETECTOR: Final = None
 DEFAULT_LICENSE_PLATE_RECOGNITION: Final = None
@@ -167,6 +191,37 @@ DESC_TIER_CHECK_SLEEP_BETWEEN_BATCHES = (
     "The number of seconds to sleep between batches. "
     "This can be used to reduce the load on the system by sleeping between batches. "
 )
+DESC_TIER_MOVE_WORKERS = (
+    "The number of worker threads used to move and delete files between tiers. "
+    "Files on the same device as the next tier are renamed, which is instant. "
+    "Files moved to another device are copied, and multiple workers copy files in "
+    "parallel."
+)
+DESC_TIER_MOVE_MAX_BANDWIDTH = (
+    "Maximum combined bandwidth in MB/s used when copying files to a tier on another "
+    "device. "
+    "Useful to not saturate a network share. "
+    "If not set, there is no limit."
+)
+DESC_EVENT_RECORDER = (
+    "Configuration for how dispatched events are stored in the database. "
+    "Events are buffered in memory and inserted in batches."
+)
+DESC_BATCH_SIZE = "Maximum number of events inserted in a single batch."
+DESC_COMMIT_INTERVAL = "Maximum number of seconds events are kept in memory."
+DESC_MAX_BUFFER_SIZE = (
+    "Maximum number of events kept in memory. "
+    "If the database cannot keep up, the oldest events are dropped."
+)
+DESC_EXCLUDE = (
+    "List of event names that are never stored. "
+    "Wildcards using <code>*</code> are supported."
+)
+DESC_SAMPLE = (
+    "Map of event names and the fraction of those events to store, "
+    "eg <code>0.1</code> stores every tenth event. "
+    "Wildcards using <code>*</code> are supported."
+)
 DESC_RECORDER = "Configuration for recordings."
 DESC_TYPE = (
     "<code>continuous</code>: Will save everything but highlight Events.<br>"
@@ -255,3 +310,9 @@ DESC_MAX_AGE = "Maximum age of files to keep in this tier."
 DESC_CONTINUOUS = "Retention rules for continuous recordings."
 DESC_EVENTS = "Retention rules for event recordings."
 DESC_INTERVAL = "Time interval between timelapse frame extractions."
+DESC_FRAME_WIDTH = (
+    "Width in pixels of the extracted timelapse frames. "
+    "The aspect ratio is kept. "
+    "If not set, or if the recording is narrower, frames are saved in full size."
+)
+DESC_JPEG_QUALITY = "JPEG quality of the extracted timelapse frames, from 1 to 100."
@@ -0,0 +1,208 @@
+"""Write-behind recorder of dispatched events."""
+
+from __future__ import annotations
+
+import datetime
+import fnmatch
+import json
+import logging
+import threading
+from collections import deque
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import insert
+
+from viseron.components.storage.const import (
+    CONFIG_BATCH_SIZE,
+    CONFIG_COMMIT_INTERVAL,
+    CONFIG_EXCLUDE,
+    CONFIG_MAX_BUFFER_SIZE,
+    CONFIG_SAMPLE,
+)
+from viseron.components.storage.models import Events
+from viseron.const import VISERON_SIGNAL_LAST_WRITE
+from viseron.helpers.json import JSONEncoder
+from viseron.watchdog.thread_watchdog import RestartableThread
+
+if TYPE_CHECKING:
+    from viseron import Event, Viseron
+    from viseron.components.storage import Storage
+    from viseron.events import EventData
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _EventNameFilter:
+    """Decide which events are stored, based on exclude and sample patterns."""
+
+    def __init__(self, exclude: list[str], sample: dict[str, float]) -> None:
+        self._exclude = exclude
+        self._sample = sample
+        self._rates: dict[str, float] = {}
+        self._counters: dict[str, int] = {}
+        # Events are recorded from several dispatcher threads
+        self._counters_lock = threading.Lock()
+
+    def _rate(self, name: str) -> float:
+        """Return the sample rate of an event name, cached per name."""
+        try:
+            return self._rates[name]
+        except KeyError:
+            pass
+
+        rate = 1.0
+        if any(fnmatch.fnmatch(name, pattern) for pattern in self._exclude):
+            rate = 0.0
+        else:
+            for pattern, sample_rate in self._sample.items():
+                if fnmatch.fnmatch(name, pattern):
+                    rate = sample_rate
+                    break
+        self._rates[name] = rate
+        return rate
+
+    def keep(self, name: str) -> bool:
+        """Return True if the event should be stored.
+
+        Sampling is deterministic, eg a rate of 0.25 stores every fourth event.
+        """
+        rate = self._rate(name)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+
+        with self._counters_lock:
+            count = self._counters.get(name, 0)
+            self._counters[name] = count + 1
+        return int((count + 1) * rate) > int(count * rate)
+
+
+class EventRecorder:
+    """Buffer dispatched events in memory and insert them in bulk.
+
+    The buffer is flushed when it holds batch_size events or every
+    commit_interval seconds, whichever comes first. The remaining events are
+    written in the last_write shutdown stage.
+    If the buffer fills up faster than it can be written, the oldest events are
+    dropped.
+    """
+
+    def __init__(self, vis: Viseron, storage: Storage, config: dict[str, Any]) -> None:
+        self._vis = vis
+        self._storage = storage
+        self._batch_size = config[CONFIG_BATCH_SIZE]
+        self._commit_interval = config[CONFIG_COMMIT_INTERVAL]
+        self._filter = _EventNameFilter(config[CONFIG_EXCLUDE], config[CONFIG_SAMPLE])
+
+        self._lock = threading.Lock()
+        self._flush_condition = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._buffer: deque[dict[str, Any]] = deque(
+            maxlen=config[CONFIG_MAX_BUFFER_SIZE]
+        )
+        self._dropped = 0
+        self._kill_received = False
+
+        self._thread = RestartableThread(
+            target=self._run,
+            name="storage.event_recorder",
+            daemon=True,
+            register=True,
+        )
+
+    def start(self) -> None:
+        """Start the flush thread."""
+        self._vis.register_signal_handler(VISERON_SIGNAL_LAST_WRITE, self.stop)
+        self._thread.start()
+
+    def record(self, event: Event[EventData]) -> None:
+        """Queue event for insertion."""
+        if not self._filter.keep(event.name):
+            return
+
+        event_data_json = "{}"
+        if event.data and event.data.json_serializable:
+            try:
+                event_data_json = partial(json.dumps, cls=JSONEncoder, allow_nan=False)(
+                    event.data
+                )
+            except (TypeError, ValueError, json.JSONDecodeError) as error:
+                LOGGER.warning(f"Failed to decode event {event.name} to JSON: {error}")
+                return
+
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._dropped += 1
+            self._buffer.append(
+                {
+                    "name": event.name,
+                    "data": event_data_json,
+                    "created_at": datetime.datetime.fromtimestamp(
+                        event.timestamp, tz=datetime.timezone.utc
+                    ),
+                }
+            )
+            if len(self._buffer) >= self._batch_size:
+                self._flush_condition.notify()
+
+    def _run(self) -> None:
+        """Flush the buffer on size or time thresholds."""
+        while not self._kill_received:
+            with self._lock:
+                if len(self._buffer) < self._batch_size:
+                    self._flush_condition.wait(timeout=self._commit_interval)
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert all buffered events."""
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    if self._dropped:
+                        LOGGER.warning(
+                            f"Event buffer is full, dropped {self._dropped} events"
+                        )
+                        self._dropped = 0
+                    if not self._buffer:
+                        return
+                    rows = [
+                        self._buffer.popleft()
+                        for _ in range(min(self._batch_size, len(self._buffer)))
+                    ]
+
+                try:
+                    self._insert(rows)
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.warning(
+                        f"Failed to insert {len(rows)} events, "
+                        "inserting them one at a time",
+                        exc_info=True,
+                    )
+                    self._insert_one_at_a_time(rows)
+
+    def _insert(self, rows: list[dict[str, Any]]) -> None:
+        """Insert rows in a single statement."""
+        with self._storage.get_session() as session:
+            session.execute(insert(Events), rows)
+            session.commit()
+
+    def _insert_one_at_a_time(self, rows: list[dict[str, Any]]) -> None:
+        """Insert rows one by one, so that a bad row does not discard the batch."""
+        failed = 0
+        for row in rows:
+            try:
+                self._insert([row])
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.debug(f"Failed to insert event {row['name']}", exc_info=True)
+                failed += 1
+        if failed:
+            LOGGER.error(f"Failed to insert {failed} of {len(rows)} events")
+
+    def stop(self) -> None:
+        """Stop the flush thread and write remaining events."""
+        self._kill_received = True
+        with self._lock:
+            self._flush_condition.notify()
+        self.flush()
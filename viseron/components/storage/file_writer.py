@@ -0,0 +1,278 @@
+"""Coalesce tier file events into bulk writes to the files table."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal
+
+from sqlalchemy import bindparam, delete, update
+from sqlalchemy.dialects.postgresql import insert
+
+from viseron.components.storage.models import Files
+from viseron.const import VISERON_SIGNAL_LAST_WRITE
+from viseron.watchdog.thread_watchdog import RestartableThread
+
+if TYPE_CHECKING:
+    from viseron import Viseron
+    from viseron.components.storage import Storage
+
+LOGGER = logging.getLogger(__name__)
+
+# Events are gathered for this many seconds before they are written
+FILES_WRITER_COMMIT_INTERVAL = 1.0
+# Write immediately when this many paths have pending changes
+FILES_WRITER_BATCH_SIZE = 500
+
+
+@dataclass
+class _PendingFile:
+    """Changes to a single path that have not been written yet."""
+
+    delete: bool = False
+    row: dict[str, Any] | None = None
+    update_size: bool = False
+    callbacks: list[tuple[Literal["created", "modified", "deleted"], Callable]] = (
+        field(default_factory=list)
+    )
+
+
+class FilesWriter:
+    """Gather file events and write them to the files table in bulk.
+
+    Changes to the same path are merged before they are written. A file that is
+    modified after it is created is inserted with its latest size, and a file that
+    is deleted before it was inserted is never written at all.
+    Callbacks are called in the order the events were received once the changes
+    are committed. If the bulk write fails, the changes are written one path at a
+    time.
+    """
+
+    def __init__(self, vis: Viseron, storage: Storage) -> None:
+        self._vis = vis
+        self._storage = storage
+
+        self._lock = threading.Lock()
+        self._flush_condition = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._pending: dict[str, _PendingFile] = {}
+        self._kill_received = False
+
+        self._thread = RestartableThread(
+            target=self._run,
+            name="storage.files_writer",
+            daemon=True,
+            register=True,
+        )
+
+    def start(self) -> None:
+        """Start the flush thread."""
+        self._vis.register_signal_handler(VISERON_SIGNAL_LAST_WRITE, self.stop)
+        self._thread.start()
+
+    def _add(
+        self,
+        path: str,
+        kind: Literal["created", "modified", "deleted"],
+        callback: Callable | None,
+    ) -> _PendingFile:
+        pending = self._pending.setdefault(path, _PendingFile())
+        if callback is not None:
+            pending.callbacks.append((kind, callback))
+        if len(self._pending) >= FILES_WRITER_BATCH_SIZE:
+            self._flush_condition.notify()
+        return pending
+
+    def created(
+        self,
+        row: dict[str, Any],
+        callback: Callable[[int], None] | None = None,
+    ) -> None:
+        """Insert a file.
+
+        The size in row is updated to the size of the file when it is written.
+        callback is called with the id of the inserted row. It is not called if the
+        file already exists in the database or was deleted again before it was
+        written.
+        """
+        with self._lock:
+            pending = self._add(row["path"], "created", callback)
+            pending.row = row
+            pending.update_size = False
+
+    def modified(
+        self, path: str, callback: Callable[[int], None] | None = None
+    ) -> None:
+        """Update the size of a file.
+
+        The size is read when the change is written, so a burst of events for the
+        same file only results in a single update. callback is called with the new
+        size. It is not called if the change was merged into a pending insert or
+        delete of the file.
+        """
+        with self._lock:
+            pending = self._add(path, "modified", callback)
+            if pending.row is None and not pending.delete:
+                pending.update_size = True
+
+    def deleted(self, path: str, callback: Callable[[], None] | None = None) -> None:
+        """Delete a file.
+
+        callback is not called if the file was never written to the database.
+        """
+        with self._lock:
+            pending = self._add(path, "deleted", callback)
+            # Nothing to delete if the file was created after the last write
+            if pending.row is None:
+                pending.delete = True
+            pending.row = None
+            pending.update_size = False
+
+    def _run(self) -> None:
+        """Flush pending changes on size or time thresholds."""
+        while not self._kill_received:
+            with self._lock:
+                if len(self._pending) < FILES_WRITER_BATCH_SIZE:
+                    self._flush_condition.wait(timeout=FILES_WRITER_COMMIT_INTERVAL)
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending changes."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                pending, self._pending = self._pending, {}
+
+            deletes = [path for path, item in pending.items() if item.delete]
+            rows: dict[str, dict[str, Any]] = {}
+            for path, item in pending.items():
+                if item.row is None:
+                    continue
+                try:
+                    item.row["size"] = os.path.getsize(path)
+                except FileNotFoundError:
+                    pass
+                rows[path] = item.row
+            sizes: dict[str, int] = {}
+            for path, item in pending.items():
+                if not item.update_size:
+                    continue
+                try:
+                    sizes[path] = os.path.getsize(path)
+                except FileNotFoundError:
+                    LOGGER.debug("File not found: %s", path)
+
+            failed: set[str] = set()
+            try:
+                file_ids = self._write(deletes, list(rows.values()), sizes)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.warning(
+                    f"Failed to write changes to {len(pending)} files, "
+                    "writing them one at a time",
+                    exc_info=True,
+                )
+                file_ids, failed = self._write_one_at_a_time(
+                    pending, deletes, rows, sizes
+                )
+
+            for path, item in pending.items():
+                if path not in failed:
+                    self._run_callbacks(path, item, file_ids, sizes)
+
+    def _write(
+        self,
+        deletes: list[str],
+        rows: list[dict[str, Any]],
+        sizes: dict[str, int],
+    ) -> dict[str, int]:
+        """Write changes in a single transaction and return the ids of new rows."""
+        file_ids: dict[str, int] = {}
+        with self._storage.get_session() as session:
+            if deletes:
+                session.execute(delete(Files).where(Files.path.in_(deletes)))
+            if rows:
+                result = session.execute(
+                    insert(Files)
+                    .values(rows)
+                    .on_conflict_do_nothing(index_elements=[Files.path])
+                    .returning(Files.id, Files.path)
+                )
+                file_ids = {row.path: row.id for row in result}
+            if sizes:
+                session.connection().execute(
+                    update(Files)
+                    .where(Files.path == bindparam("b_path"))
+                    .values(size=bindparam("b_size")),
+                    [{"b_path": path, "b_size": size} for path, size in sizes.items()],
+                )
+            session.commit()
+        return file_ids
+
+    def _write_one_at_a_time(
+        self,
+        pending: dict[str, _PendingFile],
+        deletes: list[str],
+        rows: dict[str, dict[str, Any]],
+        sizes: dict[str, int],
+    ) -> tuple[dict[str, int], set[str]]:
+        """Write the changes of each path separately.
+
+        Used when the bulk write fails, so that one bad row does not lose the changes
+        to every other file. Returns the ids of new rows and the paths that failed.
+        """
+        file_ids: dict[str, int] = {}
+        failed: set[str] = set()
+        for path in pending:
+            try:
+                file_ids.update(
+                    self._write(
+                        [path] if path in deletes else [],
+                        [rows[path]] if path in rows else [],
+                        {path: sizes[path]} if path in sizes else {},
+                    )
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.debug(f"Failed to write changes to {path}: {error}")
+                failed.add(path)
+        if failed:
+            LOGGER.error(f"Failed to write changes to {len(failed)} files")
+        return file_ids, failed
+
+    @staticmethod
+    def _run_callbacks(
+        path: str,
+        item: _PendingFile,
+        file_ids: dict[str, int],
+        sizes: dict[str, int],
+    ) -> None:
+        """Run the callbacks of a path in the order the events were received.
+
+        Nothing is written for a file that is created and deleted again before it is
+        written, so none of its created or deleted callbacks are called.
+        """
+        if item.row is not None and path not in file_ids:
+            LOGGER.error("Failed to insert file %s into database, already exists", path)
+
+        for kind, callback in item.callbacks:
+            try:
+                if kind == "created":
+                    if path in file_ids:
+                        callback(file_ids[path])
+                elif kind == "modified":
+                    if path in sizes:
+                        callback(sizes[path])
+                elif item.delete:
+                    callback()
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception(f"Error in {kind} callback for {path}")
+
+    def stop(self) -> None:
+        """Stop the flush thread and write remaining changes."""
+        self._kill_received = True
+        with self._lock:
+            self._flush_condition.notify()
+        self.flush()
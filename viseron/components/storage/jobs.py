@@ -28,6 +28,7 @@ from viseron.components.storage.models import (
     PostProcessorResults,
     Recordings,
 )
+from viseron.components.storage.storage_subprocess import DataItemReconcileLedgers
 from viseron.const import VISERON_SIGNAL_SHUTDOWN
 from viseron.domains.camera.const import DOMAIN as CAMERA_DOMAIN
 from viseron.exceptions import DomainNotRegisteredError
@@ -54,6 +55,10 @@ BATCH_SIZE = 100
 class BaseCleanupJob(ABC):
     """Base class for cleanup jobs."""
 
+    # Set by jobs that delete rows from Files without a file event, which the tier
+    # ledgers of the tier check worker have to be reconciled with
+    deletes_files_rows = False
+
     def __init__(
         self, vis: Viseron, storage: Storage, interval_trigger: IntervalTrigger
     ) -> None:
@@ -105,6 +110,11 @@ class BaseCleanupJob(ABC):
         process.start()
         process.join()
 
+        if self.deletes_files_rows:
+            self._storage.tier_check_worker_send_command(
+                DataItemReconcileLedgers(cmd="reconcile_ledgers")
+            )
+
         with self.run_lock:
             self.running = False
 
@@ -271,6 +281,8 @@ class OrphanedFilesCleanup(BaseCleanupJob):
 class OrphanedDatabaseFilesCleanup(BaseCleanupJob):
     """Cleanup job that removes rows from Files with no corresponding files on disk."""
 
+    deletes_files_rows = True
+
     @property
     def name(self) -> str:
         """Return job name."""
@@ -346,6 +358,8 @@ class ZeroSizeFilesCleanup(BaseCleanupJob):
     size. If the size on disk is zero the file is removed.
     """
 
+    deletes_files_rows = True
+
     @property
     def name(self) -> str:
         """Return job name."""
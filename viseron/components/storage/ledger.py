@@ -0,0 +1,229 @@
+"""In-memory ledgers of the files and recordings used by the tier check worker."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from sqlalchemy import or_, select
+
+from viseron.components.storage.models import Recordings
+from viseron.helpers import utcnow
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+# Same fields as FILES_DTYPE, but paths are stored as objects to not allocate 512
+# characters for every path of every file kept in memory
+LEDGER_DTYPE = np.dtype(
+    [
+        ("id", np.int64),
+        ("size", np.int64),
+        ("orig_ctime", np.int64),
+        ("path", object),
+        ("tier_path", object),
+    ]
+)
+
+# Ledgers are reloaded from the database at this interval to pick up changes that
+# were made without a file event, eg rows removed by the cleanup jobs
+LEDGER_RECONCILE_INTERVAL = 3600
+
+
+class FilesLedger:
+    """Files of one camera, tier, category and subcategory sorted by orig_ctime.
+
+    The ledger is loaded from the database once and then updated from file events.
+    Files are almost always created in orig_ctime order, so new files are appended.
+    Deleted files are only marked as removed and compacted away when they make up a
+    quarter of the ledger.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._rows = np.empty(16, dtype=LEDGER_DTYPE)
+        self._alive = np.zeros(16, dtype=bool)
+        self._length = 0
+        self._removed = 0
+        self._unsorted = False
+        self._index: dict[str, int] = {}
+        self._journal: list[tuple[Callable[..., None], tuple[Any, ...]]] | None = None
+        self._loaded_at: float | None = None
+
+    @property
+    def needs_reload(self) -> bool:
+        """Return True if the ledger has never been loaded or should be reconciled."""
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > LEDGER_RECONCILE_INTERVAL
+        )
+
+    def invalidate(self) -> None:
+        """Reload the ledger from the database on next use."""
+        with self._lock:
+            self._loaded_at = None
+
+    def reload(self, load: Callable[[], np.ndarray]) -> None:
+        """Replace the ledger with rows loaded from the database.
+
+        Events received while loading are applied on top of the loaded rows.
+        """
+        with self._reload_lock:
+            with self._lock:
+                self._journal = []
+            try:
+                rows = load()
+            except Exception:
+                with self._lock:
+                    self._journal = None
+                raise
+
+            with self._lock:
+                rows = rows[np.argsort(rows["orig_ctime"], kind="stable")]
+                self._rows = np.empty(max(len(rows) * 2, 16), dtype=LEDGER_DTYPE)
+                self._rows[: len(rows)] = rows
+                self._alive = np.zeros(len(self._rows), dtype=bool)
+                self._alive[: len(rows)] = True
+                self._length = len(rows)
+                self._removed = 0
+                self._unsorted = False
+                self._index = {path: i for i, path in enumerate(rows["path"])}
+                for func, args in self._journal:
+                    func(*args)
+                self._journal = None
+                self._loaded_at = time.monotonic()
+
+    def _apply(self, func: Callable[..., None], *args: Any) -> None:
+        """Apply a change, recording it if a reload is in progress."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((func, args))
+            func(*args)
+
+    def upsert(
+        self, file_id: int, size: int, orig_ctime: int, path: str, tier_path: str
+    ) -> None:
+        """Add a created file."""
+        self._apply(self._upsert, file_id, size, orig_ctime, path, tier_path)
+
+    def set_size(self, path: str, size: int) -> None:
+        """Update the size of a modified file."""
+        self._apply(self._set_size, path, size)
+
+    def remove(self, path: str) -> None:
+        """Remove a deleted file."""
+        self._apply(self._remove, path)
+
+    def _upsert(
+        self, file_id: int, size: int, orig_ctime: int, path: str, tier_path: str
+    ) -> None:
+        if path in self._index:
+            self._remove(path)
+
+        if self._length == len(self._rows):
+            self._rows = np.resize(self._rows, len(self._rows) * 2)
+            self._alive = np.resize(self._alive, len(self._alive) * 2)
+            self._alive[self._length :] = False
+
+        if self._length and orig_ctime < self._rows["orig_ctime"][self._length - 1]:
+            self._unsorted = True
+        self._rows[self._length] = (file_id, size, orig_ctime, path, tier_path)
+        self._alive[self._length] = True
+        self._index[path] = self._length
+        self._length += 1
+
+    def _set_size(self, path: str, size: int) -> None:
+        index = self._index.get(path)
+        if index is not None:
+            self._rows["size"][index] = size
+
+    def _remove(self, path: str) -> None:
+        index = self._index.pop(path, None)
+        if index is not None:
+            self._alive[index] = False
+            self._removed += 1
+
+    def _compact(self) -> None:
+        """Drop removed rows and restore the sort order."""
+        rows = self._rows[: self._length][self._alive[: self._length]]
+        if self._unsorted:
+            rows = rows[np.argsort(rows["orig_ctime"], kind="stable")]
+        self._rows = np.empty(max(len(rows) * 2, 16), dtype=LEDGER_DTYPE)
+        self._rows[: len(rows)] = rows
+        self._alive = np.zeros(len(self._rows), dtype=bool)
+        self._alive[: len(rows)] = True
+        self._length = len(rows)
+        self._removed = 0
+        self._unsorted = False
+        self._index = {path: i for i, path in enumerate(rows["path"])}
+
+    def snapshot(self) -> np.ndarray:
+        """Return a copy of the files in the ledger, sorted by orig_ctime."""
+        with self._lock:
+            if self._unsorted or self._removed > self._length // 4:
+                self._compact()
+            return self._rows[: self._length][self._alive[: self._length]]
+
+
+class RecordingsLedger:
+    """Recordings of one camera.
+
+    Only recordings that are new or still ongoing are fetched on refresh. A full
+    reload is done every LEDGER_RECONCILE_INTERVAL to drop deleted recordings.
+    """
+
+    def __init__(self, camera_identifier: str, dtype: np.dtype) -> None:
+        self._camera_identifier = camera_identifier
+        self._lock = threading.Lock()
+        self._rows: dict[int, tuple[int, int, int, int, int]] = {}
+        self._ongoing: set[int] = set()
+        self._max_id = -1
+        self._dtype = dtype
+        self._loaded_at: float | None = None
+
+    def refresh(self, get_session: Callable[..., Session]) -> np.ndarray:
+        """Fetch new and ongoing recordings and return all recordings."""
+        with self._lock:
+            if (
+                self._loaded_at is None
+                or time.monotonic() - self._loaded_at > LEDGER_RECONCILE_INTERVAL
+            ):
+                self._rows.clear()
+                self._ongoing.clear()
+                self._max_id = -1
+                self._loaded_at = time.monotonic()
+
+            with get_session() as session:
+                stmt = select(
+                    Recordings.id,
+                    Recordings.start_time,
+                    Recordings.end_time,
+                    Recordings.adjusted_start_time,
+                    Recordings.created_at,
+                ).where(
+                    Recordings.camera_identifier == self._camera_identifier,
+                    or_(
+                        Recordings.id > self._max_id,
+                        Recordings.id.in_(sorted(self._ongoing)),
+                    ),
+                )
+                now = int(utcnow().timestamp())
+                for row in session.execute(stmt).yield_per(1000):
+                    self._rows[row.id] = (
+                        row.id,
+                        int(row.start_time.timestamp()),
+                        int(row.adjusted_start_time.timestamp()),
+                        int(row.end_time.timestamp()) if row.end_time else now,
+                        int(row.created_at.timestamp()),
+                    )
+                    if row.end_time:
+                        self._ongoing.discard(row.id)
+                    else:
+                        self._ongoing.add(row.id)
+                    self._max_id = max(self._max_id, row.id)
+
+            return np.array(list(self._rows.values()), dtype=self._dtype)
@@ -9,7 +9,9 @@ from enum import Enum
 from typing import Literal
 
 from sqlalchemy import (
+    DDL,
     ColumnElement,
+    Computed,
     DateTime,
     Float,
     Index,
@@ -17,6 +19,7 @@ from sqlalchemy import (
     Label,
     LargeBinary,
     String,
+    event,
     text,
     types,
 )
@@ -116,6 +119,13 @@ class Files(Base):
             "category",
             "subcategory",
         ),
+        Index(
+            "idx_files_orig_ctime",
+            "camera_identifier",
+            "category",
+            "subcategory",
+            "orig_ctime",
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -132,6 +142,11 @@ class Files(Base):
     orig_ctime: Mapped[datetime.datetime] = mapped_column(
         UTCDateTime(timezone=False), nullable=False
     )
+    orig_end_time: Mapped[datetime.datetime | None] = mapped_column(
+        UTCDateTime(timezone=False),
+        Computed("orig_ctime + make_interval(secs => round(duration))", persisted=True),
+        nullable=True,
+    )
     created_at: Mapped[datetime.datetime] = mapped_column(
         UTCDateTime(timezone=False), server_default=UTCNow(), nullable=True
     )
@@ -170,6 +185,7 @@ class Recordings(Base):
         ),
         Index("idx_recordings_thumbnail", "thumbnail_path"),
         Index("idx_recordings_clip", "clip_path"),
+        Index("idx_recordings_camera_created", "camera_identifier", "created_at"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -213,7 +229,10 @@ class Objects(Base):
 
     __tablename__ = "objects"
 
-    __table_args__ = (Index("idx_objects_snapshot", "snapshot_path"),)
+    __table_args__ = (
+        Index("idx_objects_snapshot", "snapshot_path"),
+        Index("idx_objects_camera_created", "camera_identifier", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     camera_identifier: Mapped[str] = mapped_column(String)
@@ -240,7 +259,10 @@ class Motion(Base):
 
     __tablename__ = "motion"
 
-    __table_args__ = (Index("idx_motion_snapshot", "snapshot_path"),)
+    __table_args__ = (
+        Index("idx_motion_snapshot", "snapshot_path"),
+        Index("idx_motion_camera_created", "camera_identifier", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     camera_identifier: Mapped[str] = mapped_column(String)
@@ -278,7 +300,10 @@ class PostProcessorResults(Base):
 
     __tablename__ = "post_processor_results"
 
-    __table_args__ = (Index("idx_ppr_snapshot", "snapshot_path"),)
+    __table_args__ = (
+        Index("idx_ppr_snapshot", "snapshot_path"),
+        Index("idx_ppr_camera_created", "camera_identifier", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     camera_identifier: Mapped[str] = mapped_column(String)
@@ -307,3 +332,106 @@ class Events(Base):
     updated_at: Mapped[datetime.datetime] = mapped_column(
         UTCDateTime(timezone=False), onupdate=UTCNow(), nullable=True
     )
+
+
+class EventRollups(Base):
+    """Database model for the number of events per camera, type and time bucket.
+
+    Rows are maintained by triggers on the source tables, see ROLLUP_SOURCES.
+    Buckets are ROLLUP_BUCKET_MINUTES long and stored in UTC, so that they can be
+    grouped by local day for any UTC offset. Rows are not removed when their count
+    drops to zero.
+    """
+
+    __tablename__ = "event_rollups"
+
+    camera_identifier: Mapped[str] = mapped_column(String, primary_key=True)
+    type: Mapped[str] = mapped_column(String, primary_key=True)
+    bucket: Mapped[datetime.datetime] = mapped_column(
+        UTCDateTime(timezone=False), primary_key=True
+    )
+    count: Mapped[int] = mapped_column(Integer)
+
+
+ROLLUP_BUCKET_MINUTES = 15
+# Type used for rows in the files table
+ROLLUP_TYPE_FILES = "files"
+# Source table, rollup type expression and time column of each rollup type
+ROLLUP_SOURCES: list[tuple[str, str, str]] = [
+    ("motion", "'motion'", "start_time"),
+    ("recordings", "'recording'", "start_time"),
+    ("objects", "'object'", "created_at"),
+    ("post_processor_results", "domain", "created_at"),
+    ("files", f"'{ROLLUP_TYPE_FILES}'", "created_at"),
+]
+
+
+def _rollup_bucket(column: str) -> str:
+    return (
+        f"date_trunc('hour', {column}) + "
+        f"floor(date_part('minute', {column}) / {ROLLUP_BUCKET_MINUTES}) "
+        f"* interval '{ROLLUP_BUCKET_MINUTES} minutes'"
+    )
+
+
+def rollup_counts(table: str, rows: str) -> str:
+    """Return a query that counts rows of a source table per rollup key.
+
+    rows is the table to count, either the source table itself or one of the
+    transition tables of the rollup triggers.
+    """
+    type_expr, column = next(
+        (type_expr, column)
+        for source, type_expr, column in ROLLUP_SOURCES
+        if source == table
+    )
+    return (
+        f"SELECT camera_identifier, {type_expr} AS type, "  # noqa: S608
+        f"{_rollup_bucket(column)} AS bucket, count(*) AS count "
+        f"FROM {rows} "
+        f"WHERE {column} IS NOT NULL GROUP BY 1, 2, 3"
+    )
+
+
+def rollup_ddl() -> list[str]:
+    """Return statements that create the rollup triggers.
+
+    Statement level triggers are used so that bulk inserts and cleanup deletes
+    update each bucket once per statement.
+    """
+    statements = []
+    for table, _, _ in ROLLUP_SOURCES:
+        statements.append(
+            f"CREATE OR REPLACE FUNCTION event_rollups_{table}() "  # noqa: S608
+            "RETURNS trigger LANGUAGE plpgsql AS $$\n"
+            "BEGIN\n"
+            "  IF TG_OP = 'INSERT' THEN\n"
+            "    INSERT INTO event_rollups (camera_identifier, type, bucket, count)\n"
+            f"    {rollup_counts(table, 'new_rows')} ORDER BY 1, 2, 3\n"
+            "    ON CONFLICT (camera_identifier, type, bucket)\n"
+            "    DO UPDATE SET count = event_rollups.count + excluded.count;\n"
+            "  ELSE\n"
+            "    UPDATE event_rollups SET count = event_rollups.count - removed.count\n"
+            f"    FROM ({rollup_counts(table, 'old_rows')}) AS removed\n"
+            "    WHERE event_rollups.camera_identifier = removed.camera_identifier\n"
+            "    AND event_rollups.type = removed.type\n"
+            "    AND event_rollups.bucket = removed.bucket;\n"
+            "  END IF;\n"
+            "  RETURN NULL;\n"
+            "END;\n"
+            "$$"
+        )
+        for operation, transition in (("insert", "NEW"), ("delete", "OLD")):
+            trigger = f"event_rollups_{table}_{operation}"
+            statements.append(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+            statements.append(
+                f"CREATE TRIGGER {trigger} AFTER {operation.upper()} ON {table} "
+                f"REFERENCING {transition} TABLE AS {transition.lower()}_rows "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION event_rollups_{table}()"
+            )
+    return statements
+
+
+# Migrations create the triggers for existing databases, this covers new databases
+for _statement in rollup_ddl():
+    event.listen(Base.metadata, "after_create", DDL(_statement))
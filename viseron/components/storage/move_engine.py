@@ -0,0 +1,216 @@
+"""Move files between storage tiers."""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Literal
+
+MOVE_CHUNK_SIZE = 8 * 1024 * 1024
+# Throughput is reported as an average over this many seconds
+MOVE_METRICS_WINDOW = 60
+
+# copy_file_range fails with these when it is not supported for the file systems
+_COPY_FILE_RANGE_UNSUPPORTED = (
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+)
+
+
+@dataclass
+class MoveResult:
+    """Result of a single move."""
+
+    method: Literal["rename", "copy"]
+    size: int
+    elapsed: float
+
+
+class BandwidthLimiter:
+    """Limit the combined bandwidth of all copy workers.
+
+    Each chunk reserves a slot of len(chunk) / max_bytes_per_second seconds, and the
+    caller sleeps until its slot starts. Unused bandwidth is not saved up, so
+    copies resuming after an idle period do not burst.
+    """
+
+    def __init__(self, max_bytes_per_second: float | None) -> None:
+        self._rate = max_bytes_per_second
+        self._lock = threading.Lock()
+        self._next_free = 0.0
+
+    def acquire(self, nbytes: int) -> None:
+        """Wait until nbytes may be copied."""
+        if not self._rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_free)
+            self._next_free = start + nbytes / self._rate
+        if start > now:
+            time.sleep(start - now)
+
+
+class MoveEngine:
+    """Move files using rename when possible, and throttled copies when not.
+
+    Files on the same device are renamed, which is atomic and does not touch the
+    file data. Files moved to another device are copied in chunks, using
+    copy_file_range where available, and the size of the copy is verified before
+    the source is removed.
+    The engine is thread safe and is shared by all file workers, so max_bandwidth
+    caps the total copy bandwidth regardless of the number of workers.
+    """
+
+    def __init__(self, max_bandwidth: float | None = None) -> None:
+        """Initialize the engine. max_bandwidth is given in MB/s."""
+        self._limiter = BandwidthLimiter(
+            max_bandwidth * 1024 * 1024 if max_bandwidth else None
+        )
+        self._copy_file_range = hasattr(os, "copy_file_range")
+
+    @staticmethod
+    def same_device(src: str, dst: str) -> bool:
+        """Return True if src can be renamed to dst."""
+        return os.stat(src).st_dev == os.stat(os.path.dirname(dst)).st_dev
+
+    def move(self, src: str, dst: str) -> MoveResult:
+        """Move src to dst."""
+        start = time.perf_counter()
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if self.same_device(src, dst):
+            size = os.stat(src).st_size
+            os.replace(src, dst)
+            return MoveResult("rename", size, time.perf_counter() - start)
+
+        size = self.copy(src, dst)
+        os.remove(src)
+        return MoveResult("copy", size, time.perf_counter() - start)
+
+    def copy(self, src: str, dst: str) -> int:
+        """Copy src to dst and return the number of bytes copied.
+
+        Raises OSError if the copy does not match the size of src. dst is removed if
+        the copy fails, src is never touched.
+        """
+        try:
+            return self._copy(src, dst)
+        except OSError:
+            try:
+                os.remove(dst)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _copy(self, src: str, dst: str) -> int:
+        with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            copied = 0
+            while True:
+                count = max(min(MOVE_CHUNK_SIZE, size - copied), 1)
+                self._limiter.acquire(count)
+                written = self._copy_chunk(fsrc.fileno(), fdst.fileno(), count)
+                if written == 0:
+                    break
+                copied += written
+        shutil.copymode(src, dst)
+
+        dst_size = os.path.getsize(dst)
+        if copied != size or dst_size != size:
+            raise OSError(
+                f"Size of {dst} ({dst_size} bytes) does not match "
+                f"size of {src} ({size} bytes)"
+            )
+        return copied
+
+    def _copy_chunk(self, src_fd: int, dst_fd: int, count: int) -> int:
+        """Copy up to count bytes from the current position of src_fd to dst_fd."""
+        if self._copy_file_range:
+            try:
+                return os.copy_file_range(src_fd, dst_fd, count)
+            except OSError as error:
+                if error.errno not in _COPY_FILE_RANGE_UNSUPPORTED:
+                    raise
+                self._copy_file_range = False
+
+        data = os.read(src_fd, count)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(dst_fd, view) :]
+        return len(data)
+
+
+class _TierMoveStats:
+    """Move statistics of a single tier."""
+
+    def __init__(self) -> None:
+        self.backlog = 0
+        self.renamed = 0
+        self.copied = 0
+        self.failed = 0
+        self.bytes = 0
+        self.recent: deque[tuple[float, int]] = deque()
+
+
+class MoveMetrics:
+    """Backlog and throughput of the moves out of each tier."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tiers: dict[str, _TierMoveStats] = {}
+
+    def queued(self, tier: str) -> None:
+        """Count a move that was sent to the tier check worker."""
+        with self._lock:
+            self._tiers.setdefault(tier, _TierMoveStats()).backlog += 1
+
+    def done(
+        self,
+        tier: str,
+        method: Literal["rename", "copy"] | None,
+        size: int | None,
+        error: str | None,
+    ) -> None:
+        """Count a finished move."""
+        with self._lock:
+            stats = self._tiers.setdefault(tier, _TierMoveStats())
+            stats.backlog = max(stats.backlog - 1, 0)
+            if error or method is None:
+                stats.failed += 1
+                return
+            if method == "rename":
+                stats.renamed += 1
+            else:
+                stats.copied += 1
+            stats.bytes += size or 0
+            stats.recent.append((time.monotonic(), size or 0))
+
+    @property
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Return move metrics per tier. Throughput is given in MB/s."""
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for tier, stats in self._tiers.items():
+                while stats.recent and stats.recent[0][0] < now - MOVE_METRICS_WINDOW:
+                    stats.recent.popleft()
+                result[tier] = {
+                    "backlog": stats.backlog,
+                    "renamed": stats.renamed,
+                    "copied": stats.copied,
+                    "failed": stats.failed,
+                    "bytes": stats.bytes,
+                    "throughput": sum(size for _, size in stats.recent)
+                    / MOVE_METRICS_WINDOW
+                    / 1024
+                    / 1024,
+                }
+        return result
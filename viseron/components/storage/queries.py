@@ -5,15 +5,27 @@ import datetime
 import logging
 from collections.abc import Callable
 
-from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy import Select, delete, desc, func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.functions import coalesce
 
 from viseron.components.storage.const import (
+    MAX_SEGMENT_DURATION,
     TIER_CATEGORY_RECORDER,
+    TIER_SUBCATEGORY_FACE_RECOGNITION,
+    TIER_SUBCATEGORY_LICENSE_PLATE_RECOGNITION,
+    TIER_SUBCATEGORY_MOTION_DETECTOR,
+    TIER_SUBCATEGORY_OBJECT_DETECTOR,
     TIER_SUBCATEGORY_SEGMENTS,
 )
-from viseron.components.storage.models import Files, Recordings
+from viseron.components.storage.models import (
+    Files,
+    Motion,
+    MotionContours,
+    Objects,
+    PostProcessorResults,
+    Recordings,
+)
 from viseron.helpers import utcnow
 
 LOGGER = logging.getLogger(__name__)
@@ -36,46 +48,12 @@ def get_recording_fragments(
     This is to accommodate for the case where a file has been copied to a succeeding
     tier but has not been deleted from the original tier yet.
     """
-    row_number = (
-        func.row_number()
-        .over(partition_by=Files.filename, order_by=desc(Files.created_at))
-        .label("row_number")
-    )
+    start = Recordings.start_time - datetime.timedelta(seconds=lookback)
+    end = coalesce(Recordings.end_time, now if now else utcnow())
     recording_files = (
-        select(Files)
-        .add_columns(row_number)
+        _segments_between(start, end)
         .join(Recordings, Files.camera_identifier == Recordings.camera_identifier)
         .where(Recordings.id == recording_id)
-        .where(Files.category == TIER_CATEGORY_RECORDER)
-        .where(Files.subcategory == TIER_SUBCATEGORY_SEGMENTS)
-        .where(Files.duration.isnot(None))
-        .where(
-            or_(
-                # Fetch all files that start within the recording
-                Files.orig_ctime.between(
-                    Recordings.start_time - datetime.timedelta(seconds=lookback),
-                    coalesce(Recordings.end_time, now if now else utcnow()),
-                ),
-                # Fetch the first file that starts before the recording but
-                # ends during the recording
-                and_(
-                    Recordings.start_time - datetime.timedelta(seconds=lookback)
-                    >= Files.orig_ctime,
-                    Recordings.start_time - datetime.timedelta(seconds=lookback)
-                    <= Files.orig_ctime
-                    + func.make_interval(
-                        0,  # years
-                        0,  # months
-                        0,  # days
-                        0,  # hours
-                        0,  # minutes
-                        0,  # seconds
-                        func.round(Files.duration),
-                    ),
-                ),
-            )
-        )
-        .order_by(Files.orig_ctime.asc())
         .cte("recording_files")
     )
     stmt = (
@@ -102,49 +80,79 @@ def get_time_period_fragments(
     else:
         end = now if now else utcnow()
 
+    files = (
+        _segments_between(start, end)
+        .where(Files.camera_identifier.in_(camera_identifiers))
+        .cte("files")
+    )
+    stmt = (
+        select(files).where(files.c.row_number == 1).order_by(files.c.orig_ctime.asc())
+    )
+    with get_session() as session:
+        fragments = session.execute(stmt).all()
+    return fragments
+
+
+def _segments_between(start, end) -> Select:
+    """Select segments that are playing at some point between start and end.
+
+    Segments are found with a range scan on idx_files_orig_ctime, which is
+    possible since no segment is longer than MAX_SEGMENT_DURATION. The end of each
+    segment is precomputed in orig_end_time.
+    The row_number column is 1 for the latest copy of each segment.
+    """
     row_number = (
         func.row_number()
-        .over(partition_by=Files.filename, order_by=desc(Files.created_at))
+        .over(
+            partition_by=(Files.camera_identifier, Files.filename),
+            order_by=desc(Files.created_at),
+        )
         .label("row_number")
     )
-    files = (
+    return (
         select(Files)
         .add_columns(row_number)
-        .where(Files.camera_identifier.in_(camera_identifiers))
         .where(Files.category == TIER_CATEGORY_RECORDER)
         .where(Files.subcategory == TIER_SUBCATEGORY_SEGMENTS)
         .where(Files.duration.isnot(None))
         .where(
-            or_(
-                # Fetch all files that start between the start and end timestamp
-                Files.orig_ctime.between(
-                    start,
-                    end,
-                ),
-                # Fetch the first file that starts before the start timestamp but
-                # ends during the requested time period
-                and_(
-                    start >= Files.orig_ctime,
-                    start
-                    <= Files.orig_ctime
-                    + func.make_interval(
-                        0,  # years
-                        0,  # months
-                        0,  # days
-                        0,  # hours
-                        0,  # minutes
-                        0,  # seconds
-                        func.round(Files.duration),
-                    ),
-                ),
+            Files.orig_ctime.between(
+                start - datetime.timedelta(seconds=MAX_SEGMENT_DURATION), end
             )
         )
-        .order_by(Files.orig_ctime.asc())
-        .cte("files")
-    )
-    stmt = (
-        select(files).where(files.c.row_number == 1).order_by(files.c.orig_ctime.asc())
+        .where(Files.orig_end_time >= start)
     )
+
+
+def delete_snapshot_rows(
+    get_session: Callable[[], Session], subcategory: str, snapshot_path: str
+) -> None:
+    """Delete the rows of a snapshot subcategory that reference snapshot_path."""
     with get_session() as session:
-        fragments = session.execute(stmt).all()
-    return fragments
+        if subcategory == TIER_SUBCATEGORY_MOTION_DETECTOR:
+            result = session.execute(
+                delete(Motion)
+                .where(Motion.snapshot_path == snapshot_path)
+                .returning(Motion.id)
+            )
+            motion_ids = [row[0] for row in result]
+            if motion_ids:
+                session.execute(
+                    delete(MotionContours).where(
+                        MotionContours.motion_id.in_(motion_ids)
+                    )
+                )
+        elif subcategory == TIER_SUBCATEGORY_OBJECT_DETECTOR:
+            session.execute(
+                delete(Objects).where(Objects.snapshot_path == snapshot_path)
+            )
+        elif subcategory in (
+            TIER_SUBCATEGORY_FACE_RECOGNITION,
+            TIER_SUBCATEGORY_LICENSE_PLATE_RECOGNITION,
+        ):
+            session.execute(
+                delete(PostProcessorResults).where(
+                    PostProcessorResults.snapshot_path == snapshot_path
+                )
+            )
+        session.commit()
@@ -17,6 +17,7 @@ from apscheduler.schedulers.background import BackgroundScheduler
 
 from manager import connect
 from viseron.components.storage.check_tier import Worker
+from viseron.components.storage.move_engine import MoveEngine
 from viseron.helpers.subprocess_worker import SubProcessWorker
 from viseron.watchdog.subprocess_watchdog import RestartablePopen
 from viseron.watchdog.thread_watchdog import RestartableThread, ThreadWatchDog
@@ -74,6 +75,8 @@ class DataItemMoveFile:
     cmd: Literal["move_file"]
     src: str
     dst: str
+    method: Literal["rename", "copy"] | None = None
+    size: int | None = None
     callback_id: str | None = None
     error: str | None = None
 
@@ -88,12 +91,52 @@ class DataItemDeleteFile:
     error: str | None = None
 
 
+@dataclass
+class DataItemFileEvent:
+    """Data item used to keep the tier ledgers of the worker up to date."""
+
+    cmd: Literal["file_event"]
+    event: Literal["created", "modified", "deleted"]
+    camera_identifier: str
+    tier_id: int
+    category: str
+    subcategory: str
+    path: str
+    tier_path: str | None = None
+    file_id: int | None = None
+    size: int | None = None
+    orig_ctime: float | None = None
+    callback_id: str | None = None
+    error: str | None = None
+
+
+@dataclass
+class DataItemReconcileLedgers:
+    """Data item used to reload the tier ledgers of the worker.
+
+    Sent when rows are deleted from the Files table without a file event.
+    """
+
+    cmd: Literal["reconcile_ledgers"]
+    callback_id: str | None = None
+    error: str | None = None
+
+
 class TierCheckWorker(SubProcessWorker):
     """Check tiers in a separate subprocess."""
 
-    def __init__(self, vis: Viseron, cpulimit: int | None, workers: int) -> None:
+    def __init__(
+        self,
+        vis: Viseron,
+        cpulimit: int | None,
+        workers: int,
+        move_workers: int,
+        move_max_bandwidth: float | None,
+    ) -> None:
         self._cpulimit = cpulimit
         self._workers = workers
+        self._move_workers = move_workers
+        self._move_max_bandwidth = move_max_bandwidth
         self._callbacks: dict[
             str, Callable[[DataItem | DataItemMoveFile | DataItemDeleteFile], None]
         ] = {}
@@ -101,15 +144,19 @@ class TierCheckWorker(SubProcessWorker):
 
     def spawn_subprocess(self) -> RestartablePopen:
         """Spawn subprocess."""
+        command = (
+            "python3 -u viseron/components/storage/storage_subprocess.py "
+            f"--manager-port {self._server_port} "
+            f"--manager-authkey {self._authkey_store.authkey} "
+            f"--cpulimit {self._cpulimit} "
+            f"--workers {self._workers} "
+            f"--move-workers {self._move_workers} "
+            f"--loglevel DEBUG"
+        ).split(" ")
+        if self._move_max_bandwidth:
+            command += ["--move-max-bandwidth", str(self._move_max_bandwidth)]
         return RestartablePopen(
-            (
-                "python3 -u viseron/components/storage/storage_subprocess.py "
-                f"--manager-port {self._server_port} "
-                f"--manager-authkey {self._authkey_store.authkey} "
-                f"--cpulimit {self._cpulimit} "
-                f"--workers {self._workers} "
-                f"--loglevel DEBUG"
-            ).split(" "),
+            command,
             name=self.subprocess_name,
             stdout=self._log_pipe,
             stderr=self._log_pipe,
@@ -117,7 +164,11 @@ class TierCheckWorker(SubProcessWorker):
 
     def send_command(
         self,
-        item: DataItem | DataItemMoveFile | DataItemDeleteFile,
+        item: DataItem
+        | DataItemMoveFile
+        | DataItemDeleteFile
+        | DataItemFileEvent
+        | DataItemReconcileLedgers,
         callback: Callable[[DataItem | DataItemMoveFile | DataItemDeleteFile], None]
         | None,
     ) -> None:
@@ -176,6 +227,18 @@ def get_parser() -> argparse.ArgumentParser:
         type=int,
         default=4,
     )
+    parser.add_argument(
+        "--move-workers",
+        help="Number of worker threads that move and delete files",
+        type=int,
+        default=2,
+    )
+    parser.add_argument(
+        "--move-max-bandwidth",
+        help="Maximum combined bandwidth in MB/s used to copy files between tiers",
+        type=float,
+        default=None,
+    )
     parser.add_argument(
         "--loglevel",
         help="Loglevel",
@@ -247,7 +310,14 @@ def worker_task_mixed(
 
 
 def dispatcher_task(
-    process_queue: Queue[DataItem | DataItemDeleteFile | DataItemMoveFile],
+    worker: Worker,
+    process_queue: Queue[
+        DataItem
+        | DataItemDeleteFile
+        | DataItemMoveFile
+        | DataItemFileEvent
+        | DataItemReconcileLedgers
+    ],
     check_queue: Queue[DataItem],
     file_queue: Queue[DataItemDeleteFile | DataItemMoveFile],
 ) -> None:
@@ -255,6 +325,8 @@ def dispatcher_task(
 
     check_tier commands can be slow. File operations should not be blocked by them,
     so they get their own queue and worker.
+    File events and ledger reconciles only update the in-memory ledgers, so they are
+    applied directly and in the order they were sent.
     """
     while True:
         try:
@@ -263,7 +335,11 @@ def dispatcher_task(
             continue
 
         try:
-            if job.cmd == "check_tier":
+            if job.cmd == "file_event":
+                worker.work_input(job)
+            elif job.cmd == "reconcile_ledgers":
+                worker.work_input(job)
+            elif job.cmd == "check_tier":
                 check_queue.put(job)
             elif job.cmd in ("move_file", "delete_file"):
                 file_queue.put(job)
@@ -288,7 +364,7 @@ def main() -> None:
         cpulimit=args.cpulimit,
     )
 
-    worker = Worker()
+    worker = Worker(MoveEngine(args.move_max_bandwidth))
     # Run scheduler and watchdog in the subprocess since the Viseron main process
     # watchdog is not available in the subprocess.
     logging.getLogger("apscheduler.scheduler").setLevel(logging.ERROR)
@@ -305,7 +381,7 @@ def main() -> None:
     dispatcher = RestartableThread(
         name="storage_subprocess.dispatcher",
         target=dispatcher_task,
-        args=(process_queue, check_queue, file_queue),
+        args=(worker, process_queue, check_queue, file_queue),
         daemon=True,
     )
     dispatcher.start()
@@ -325,13 +401,14 @@ def main() -> None:
         )
         thread.start()
 
-    thread = RestartableThread(
-        name="storage_subprocess.file_worker",
-        target=worker_task_files,
-        args=(worker, file_queue, output_queue),
-        daemon=True,
-    )
-    thread.start()
+    for i in range(args.move_workers):
+        thread = RestartableThread(
+            name=f"storage_subprocess.file_worker.{i}",
+            target=worker_task_files,
+            args=(worker, file_queue, output_queue),
+            daemon=True,
+        )
+        thread.start()
 
     while True:
         time.sleep(1)
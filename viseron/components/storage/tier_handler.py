@@ -8,24 +8,19 @@ import threading
 import time
 from collections.abc import Callable
 from datetime import timedelta
-from queue import Queue
-from threading import Timer
+from functools import partial
 from typing import TYPE_CHECKING, Any, Literal
 
 import numpy as np
-from sqlalchemy import Delete, delete, insert, select, update
-from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import Session
-from sqlalchemy.sql.dml import ReturningDelete
 from watchdog.events import (
     FileCreatedEvent,
     FileDeletedEvent,
     FileModifiedEvent,
     FileSystemEvent,
-    FileSystemEventHandler,
 )
-from watchdog.observers import Observer
-from watchdog.observers.polling import PollingObserverVFS
 
 from viseron.components.storage.const import (
     COMPONENT,
@@ -50,26 +45,16 @@ from viseron.components.storage.const import (
     EVENT_FILE_DELETED,
     TIER_CATEGORY_RECORDER,
     TIER_SUBCATEGORY_EVENT_CLIPS,
-    TIER_SUBCATEGORY_FACE_RECOGNITION,
-    TIER_SUBCATEGORY_LICENSE_PLATE_RECOGNITION,
-    TIER_SUBCATEGORY_MOTION_DETECTOR,
-    TIER_SUBCATEGORY_OBJECT_DETECTOR,
     TIER_SUBCATEGORY_SEGMENTS,
     TIER_SUBCATEGORY_THUMBNAILS,
     CleanupJobNames,
 )
-from viseron.components.storage.models import (
-    Files,
-    FilesMeta,
-    Motion,
-    MotionContours,
-    Objects,
-    PostProcessorResults,
-    Recordings,
-)
+from viseron.components.storage.models import Files, FilesMeta, Recordings
+from viseron.components.storage.queries import delete_snapshot_rows
 from viseron.components.storage.storage_subprocess import (
     DataItem,
     DataItemDeleteFile,
+    DataItemFileEvent,
     DataItemMoveFile,
 )
 from viseron.components.storage.util import (
@@ -92,7 +77,6 @@ from viseron.domains.camera.const import (
 )
 from viseron.events import Event, EventEmptyData
 from viseron.helpers import utcnow
-from viseron.helpers.named_timer import NamedTimer
 from viseron.watchdog.thread_watchdog import RestartableThread
 
 if TYPE_CHECKING:
@@ -102,7 +86,7 @@ if TYPE_CHECKING:
     from viseron.domains.camera import AbstractCamera
 
 
-class TierHandler(FileSystemEventHandler):
+class TierHandler:
     """Moves files up configured tiers."""
 
     def __init__(
@@ -118,7 +102,6 @@ class TierHandler(FileSystemEventHandler):
         self._logger = logging.getLogger(
             f"{__name__}.{camera.identifier}.tier_{tier_id}.{category}.{subcategory}"
         )
-        super().__init__()
 
         self._vis = vis
         self._storage = vis.data[COMPONENT]
@@ -145,16 +128,6 @@ class TierHandler(FileSystemEventHandler):
         self._check_tier_lock = threading.Lock()
         self._tier_check_in_progress = False
 
-        self._pending_updates: dict[str, Timer] = {}
-        self._event_queue: Queue[FileSystemEvent | None] = Queue()
-        self._event_thread = RestartableThread(
-            target=self._process_events,
-            daemon=True,
-            name=f"tier_handler_{camera.identifier}",
-            stage=VISERON_SIGNAL_LAST_WRITE,
-        )
-        self._event_thread.start()
-
         self._throttle_period = timedelta(
             days=tier[CONFIG_CHECK_INTERVAL].get(CONFIG_DAYS, 0),
             hours=tier[CONFIG_CHECK_INTERVAL].get(CONFIG_HOURS, 0),
@@ -165,17 +138,10 @@ class TierHandler(FileSystemEventHandler):
 
         self._logger.debug("Tier %s monitoring path: %s", tier_id, self._path)
         os.makedirs(self._path, exist_ok=True)
-        self._observer = (
-            PollingObserverVFS(stat=os.stat, listdir=os.scandir, polling_interval=1)
-            if tier[CONFIG_POLL]
-            else Observer()
-        )
-        self._observer.schedule(
-            self,
-            self._path,
-            recursive=True,
+        self._watcher = self._storage.get_tier_watcher(
+            tier[CONFIG_PATH], tier[CONFIG_POLL]
         )
-        self._observer.start()
+        self._watcher.register(self._path, self)
 
     @property
     def tier(self) -> dict[str, Any]:
@@ -322,112 +288,110 @@ class TierHandler(FileSystemEventHandler):
             daemon=True,
         ).start()
 
-    def _process_events(self) -> None:
-        while True:
-            event = self._event_queue.get()
-            if event is None:
-                self._logger.debug("Stopping event handler")
-                break
-            if isinstance(event, FileDeletedEvent):
-                self._on_deleted(event)
-            elif isinstance(event, FileCreatedEvent):
-                self._on_created(event)
-            elif isinstance(event, FileModifiedEvent):
-                self._on_modified(event)
-
-    def on_any_event(self, event: FileSystemEvent) -> None:
-        """Handle file system events."""
+    def handle_event(self, event: FileSystemEvent) -> None:
+        """Handle file system events passed on by the tier watcher."""
         if os.path.basename(event.src_path) in self._storage.ignored_files:
             return
-        self._event_queue.put(event)
+        if isinstance(event, FileDeletedEvent):
+            self._on_deleted(event)
+        elif isinstance(event, FileCreatedEvent):
+            self._on_created(event)
+        elif isinstance(event, FileModifiedEvent):
+            self._on_modified(event)
+
+    def _send_file_event(
+        self,
+        event: Literal["created", "modified", "deleted"],
+        path: str,
+        **kwargs: Any,
+    ) -> None:
+        """Keep the tier ledger of the tier check worker up to date."""
+        self._storage.tier_check_worker_send_command(
+            DataItemFileEvent(
+                cmd="file_event",
+                event=event,
+                camera_identifier=self._camera.identifier,
+                tier_id=self._tier_id,
+                category=self._category,
+                subcategory=self._subcategory,
+                path=path,
+                **kwargs,
+            ),
+            None,
+        )
 
     def _on_created(self, event: FileCreatedEvent) -> None:
         """Insert into database when file is created."""
         self._logger.debug("File created: %s", event.src_path)
         file_meta = self._storage.temporary_files_meta.pop(event.src_path, None)
-        try:
-            with self._storage.get_session() as session:
-                stmt = insert(Files).values(
-                    tier_id=self._tier_id,
-                    tier_path=self._tier[CONFIG_PATH],
-                    camera_identifier=self._camera.identifier,
-                    category=self._category,
-                    subcategory=self._subcategory,
-                    path=event.src_path,
-                    directory=os.path.dirname(event.src_path),
-                    filename=os.path.basename(event.src_path),
-                    size=os.path.getsize(event.src_path),
-                    orig_ctime=file_meta.orig_ctime if file_meta else utcnow(),
-                    duration=file_meta.duration if file_meta else None,
-                )
-                session.execute(stmt)
-                session.commit()
-        except IntegrityError:
-            self._logger.error(
-                "Failed to insert file %s into database, already exists", event.src_path
-            )
-        else:
-            self._vis.dispatch_event(
-                EVENT_FILE_CREATED.format(
-                    camera_identifier=self._camera.identifier,
-                    category=self._category,
-                    subcategory=self._subcategory,
-                ),
-                EventFileCreated(
-                    camera_identifier=self._camera.identifier,
-                    category=self._category,
-                    subcategory=self._subcategory,
-                    file_name=os.path.basename(event.src_path),
-                    path=event.src_path,
-                ),
-                store=False,
-            )
-
+        row = {
+            "tier_id": self._tier_id,
+            "tier_path": self._tier[CONFIG_PATH],
+            "camera_identifier": self._camera.identifier,
+            "category": self._category,
+            "subcategory": self._subcategory,
+            "path": event.src_path,
+            "directory": os.path.dirname(event.src_path),
+            "filename": os.path.basename(event.src_path),
+            "size": os.path.getsize(event.src_path),
+            "orig_ctime": file_meta.orig_ctime if file_meta else utcnow(),
+            "duration": file_meta.duration if file_meta else None,
+        }
+        self._storage.files_writer.created(row, partial(self._file_created, row))
+
+    def _file_created(self, row: dict[str, Any], file_id: int) -> None:
+        """Handle a created file once it is written to the database."""
+        self._send_file_event(
+            "created",
+            row["path"],
+            tier_path=row["tier_path"],
+            file_id=file_id,
+            size=row["size"],
+            orig_ctime=row["orig_ctime"].timestamp(),
+        )
+        self._vis.dispatch_event(
+            EVENT_FILE_CREATED.format(
+                camera_identifier=self._camera.identifier,
+                category=self._category,
+                subcategory=self._subcategory,
+            ),
+            EventFileCreated(
+                camera_identifier=self._camera.identifier,
+                category=self._category,
+                subcategory=self._subcategory,
+                file_name=row["filename"],
+                path=row["path"],
+                tier_id=row["tier_id"],
+                tier_path=row["tier_path"],
+                orig_ctime=row["orig_ctime"],
+                duration=row["duration"],
+            ),
+            store=False,
+        )
         self.check_tier()
 
     def _on_modified(self, event: FileModifiedEvent) -> None:
-        """Update database when file is moved."""
-
-        def _update_size() -> None:
-            """Update the size of a file in the database.
-
-            Runs in a Timer to avoid spamming updates on duplicate events.
-            """
-            self._logger.debug("File modified (delayed event): %s", event.src_path)
-            self._pending_updates.pop(event.src_path, None)
-            try:
-                size = os.path.getsize(event.src_path)
-            except FileNotFoundError:
-                self._logger.debug("File not found: %s", event.src_path)
-                return
-
-            with self._storage.get_session() as session:
-                stmt = (
-                    update(Files).where(Files.path == event.src_path).values(size=size)
-                )
-                session.execute(stmt)
-                session.commit()
-
-            self.check_tier()
-
-        if event.src_path in self._pending_updates:
-            self._pending_updates[event.src_path].cancel()
-        self._pending_updates[event.src_path] = NamedTimer(
-            1,
-            _update_size,
-            name=f"update_size for {event.src_path}",
-            daemon=False,  # We want to wait for the update to finish on shutdown
+        """Update database when file is modified."""
+        self._storage.files_writer.modified(
+            event.src_path, partial(self._file_modified, event.src_path)
         )
-        self._pending_updates[event.src_path].start()
+
+    def _file_modified(self, path: str, size: int) -> None:
+        """Handle a modified file once its size is written to the database."""
+        self._logger.debug("File modified: %s", path)
+        self._send_file_event("modified", path, size=size)
+        self.check_tier()
 
     def _on_deleted(self, event: FileDeletedEvent) -> None:
         """Remove file from database when it is deleted."""
         self._logger.debug("File deleted: %s", event.src_path)
-        with self._storage.get_session() as session:
-            stmt = delete(Files).where(Files.path == event.src_path)
-            session.execute(stmt)
-            session.commit()
+        self._storage.files_writer.deleted(
+            event.src_path, partial(self._file_deleted, event.src_path)
+        )
 
+    def _file_deleted(self, path: str) -> None:
+        """Handle a deleted file once it is removed from the database."""
+        self._send_file_event("deleted", path)
         self._vis.dispatch_event(
             EVENT_FILE_DELETED.format(
                 camera_identifier=self._camera.identifier,
@@ -438,8 +402,8 @@ class TierHandler(FileSystemEventHandler):
                 camera_identifier=self._camera.identifier,
                 category=self._category,
                 subcategory=self._subcategory,
-                file_name=os.path.basename(event.src_path),
-                path=event.src_path,
+                file_name=os.path.basename(path),
+                path=path,
             ),
             store=False,
         )
@@ -463,14 +427,9 @@ class TierHandler(FileSystemEventHandler):
             )
 
     def _stop_observer(self) -> None:
-        """Stop the observer."""
+        """Stop receiving events from the tier watcher."""
         self._logger.debug("Stopping observer")
-        for pending_update in self._pending_updates.copy().values():
-            pending_update.join()
-        self._event_queue.put(None)
-        self._event_thread.join()
-        self._observer.stop()
-        self._observer.join()
+        self._watcher.unregister(self._path)
 
 
 class SegmentsTierHandler(TierHandler):
@@ -784,42 +743,9 @@ class SnapshotTierHandler(TierHandler):
         self.add_file_handler(self._path, rf"{self._path}/(.*.jpg$)")
 
     def _on_deleted(self, event: FileDeletedEvent) -> None:
-        stmt: Delete | ReturningDelete[tuple[int]]
-        if self._subcategory == TIER_SUBCATEGORY_MOTION_DETECTOR:
-            with self._storage.get_session() as session:
-                stmt = (
-                    delete(Motion)
-                    .where(Motion.snapshot_path == event.src_path)
-                    .returning(Motion.id)
-                )
-                result = session.execute(stmt)
-                motion_ids = [row[0] for row in result]
-
-                if motion_ids:
-                    stmt2 = delete(MotionContours).where(
-                        MotionContours.motion_id.in_(motion_ids)
-                    )
-                    session.execute(stmt2)
-
-                session.commit()
-
-        elif self._subcategory == TIER_SUBCATEGORY_OBJECT_DETECTOR:
-            with self._storage.get_session() as session:
-                stmt = delete(Objects).where(Objects.snapshot_path == event.src_path)
-                session.execute(stmt)
-                session.commit()
-
-        elif self._subcategory in [
-            TIER_SUBCATEGORY_FACE_RECOGNITION,
-            TIER_SUBCATEGORY_LICENSE_PLATE_RECOGNITION,
-        ]:
-            with self._storage.get_session() as session:
-                stmt = delete(PostProcessorResults).where(
-                    PostProcessorResults.snapshot_path == event.src_path
-                )
-                session.execute(stmt)
-                session.commit()
-
+        delete_snapshot_rows(
+            self._storage.get_session, self._subcategory, event.src_path
+        )
         super()._on_deleted(event)
 
 
@@ -1043,6 +969,17 @@ def handle_file(
             stmt = delete(Files).where(Files.path == path)
             session.execute(stmt)
             session.commit()
+        storage.tier_check_worker_send_command(
+            DataItemFileEvent(
+                cmd="file_event",
+                event="deleted",
+                camera_identifier=camera_identifier,
+                tier_id=curr_tier_id,
+                category=curr_tier_category,
+                subcategory=curr_tier_subcategory,
+                path=path,
+            )
+        )
 
 
 def delete_file(
@@ -1096,9 +1033,12 @@ def move_file(
             src,
         )
 
+    tier = f"{curr_tier_category}.{curr_tier_subcategory}.tier_{curr_tier_id}"
+
     def _move_file_callback(
         item: DataItemMoveFile,
     ) -> None:
+        storage.move_metrics.done(tier, item.method, item.size, item.error)
         if item.error:
             logger.error(f"Error moving file {src} to {dst}: {item.error}")
             vis.dispatch_event(
@@ -1114,6 +1054,7 @@ def move_file(
                 store=False,
             )
 
+    storage.move_metrics.queued(tier)
     storage.tier_check_worker_send_command(
         DataItemMoveFile(
             cmd="move_file",
@@ -1210,9 +1151,9 @@ class TimelapseTierHandler(TierHandler):
         self._interval = calculate_age(self._tier.get(CONFIG_INTERVAL, {}))
         self.add_file_handler(self._path, rf"{self._path}/(.*.jpg$)")
 
-    def _on_created(self, event: FileCreatedEvent) -> None:
+    def _file_created(self, row: dict[str, Any], file_id: int) -> None:
         """Handle file creation with interval-based cleanup."""
-        super()._on_created(event)
+        super()._file_created(row, file_id)
 
         # If no interval is set, keep all files
         if not self._interval:
@@ -1221,21 +1162,15 @@ class TimelapseTierHandler(TierHandler):
         # Check if there's already a file within the interval
         try:
             with self._storage.get_session() as session:
-                current_file_stmt = select(Files.orig_ctime).where(
-                    Files.path == event.src_path
-                )
-                current_file_result = session.execute(current_file_stmt).scalar_one()
-                current_file_datetime = current_file_result
-
-                interval_start = current_file_datetime - self._interval
-                interval_end = current_file_datetime
+                interval_start = row["orig_ctime"] - self._interval
+                interval_end = row["orig_ctime"]
 
                 stmt = select(Files).where(
                     Files.tier_id == self._tier_id,
                     Files.camera_identifier == self._camera.identifier,
                     Files.category == self._category,
                     Files.subcategory == self._subcategory,
-                    Files.path != event.src_path,
+                    Files.path != row["path"],
                     Files.orig_ctime >= interval_start,
                     Files.orig_ctime <= interval_end,
                 )
@@ -1245,11 +1180,11 @@ class TimelapseTierHandler(TierHandler):
                 if result:
                     self._logger.debug(
                         f"File within interval already exists, removing current file: "
-                        f"{event.src_path}"
+                        f"{row['path']}"
                     )
-                    delete_file(self._storage, event.src_path)
+                    delete_file(self._storage, row["path"])
 
-                    delete_stmt = delete(Files).where(Files.path == event.src_path)
+                    delete_stmt = delete(Files).where(Files.path == row["path"])
                     session.execute(delete_stmt)
                     session.commit()
 
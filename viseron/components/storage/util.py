@@ -5,7 +5,7 @@ from __future__ import annotations
 import os
 import threading
 from dataclasses import dataclass
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from viseron.components.storage.const import (
@@ -120,9 +120,15 @@ class EventFile(EventData):
     path: str
 
 
+@dataclass
 class EventFileCreated(EventFile):
     """Event data for file created events."""
 
+    tier_id: int | None = None
+    tier_path: str | None = None
+    orig_ctime: datetime | None = None
+    duration: float | None = None
+
 
 class EventFileDeleted(EventFile):
     """Event data for file deleted events."""
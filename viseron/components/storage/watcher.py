@@ -0,0 +1,288 @@
+"""Shared file system watchers for the storage tiers."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from queue import Queue
+from typing import TYPE_CHECKING, Protocol
+
+from watchdog.events import (
+    DirCreatedEvent,
+    DirDeletedEvent,
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileSystemEvent,
+    FileSystemEventHandler,
+)
+from watchdog.observers import Observer
+from watchdog.observers.api import (
+    DEFAULT_EMITTER_TIMEOUT,
+    BaseObserver,
+    EventEmitter,
+)
+
+from viseron.const import VISERON_SIGNAL_LAST_WRITE, VISERON_SIGNAL_STOPPING
+from viseron.watchdog.thread_watchdog import RestartableThread
+
+if TYPE_CHECKING:
+    from viseron import Viseron
+
+LOGGER = logging.getLogger(__name__)
+
+# Directories that changed within this many seconds are listed on every poll, since
+# files in them are likely still being written
+HOT_DIRECTORY_PERIOD = 30
+
+
+class WatchedPathHandler(Protocol):
+    """Handler of the events for files below a registered path."""
+
+    def handle_event(self, event: FileSystemEvent) -> None:
+        """Handle a file system event."""
+
+
+@dataclass
+class _DirectoryState:
+    """Last seen state of a polled directory."""
+
+    mtime_ns: int
+    files: dict[str, tuple[int, int]] = field(default_factory=dict)
+    subdirs: set[str] = field(default_factory=set)
+    hot_until: float = 0.0
+
+
+class DirectoryPollingEmitter(EventEmitter):
+    """Poll a directory tree for changes.
+
+    Unlike the watchdog PollingEmitter, which lists and stats every file in the
+    tree on each poll, only the directories themselves are stat:ed. A directory is
+    listed when its mtime changed, and keeps being listed for HOT_DIRECTORY_PERIOD
+    seconds after that to pick up files that are still growing as well as changes
+    that coarse mtime resolution, eg on NFS, would otherwise hide.
+    """
+
+    def __init__(
+        self,
+        event_queue,
+        watch,
+        timeout=DEFAULT_EMITTER_TIMEOUT,
+        event_filter=None,
+    ) -> None:
+        super().__init__(event_queue, watch, timeout, event_filter)
+        self._directories: dict[str, _DirectoryState] = {}
+
+    def on_thread_start(self) -> None:
+        """Take the initial snapshot without emitting events."""
+        self._add_directory(self.watch.path, emit=False)
+
+    def queue_events(self, timeout) -> None:
+        """Emit events for directories that changed since the last poll."""
+        # timeout behaves like an interval for polling emitters
+        if self.stopped_event.wait(timeout):
+            return
+
+        now = time.monotonic()
+        for path in list(self._directories):
+            state = self._directories.get(path)
+            # Removed together with its parent directory
+            if state is None:
+                continue
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                self._remove_directory(path)
+                continue
+
+            if mtime_ns != state.mtime_ns:
+                state.mtime_ns = mtime_ns
+                state.hot_until = now + HOT_DIRECTORY_PERIOD
+            elif now > state.hot_until:
+                continue
+            self._list_directory(path, state)
+
+    def _add_directory(self, path: str, emit: bool = True) -> None:
+        """Start tracking a directory and everything below it."""
+        try:
+            state = _DirectoryState(mtime_ns=os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            return
+        self._directories[path] = state
+        if emit:
+            state.hot_until = time.monotonic() + HOT_DIRECTORY_PERIOD
+            self.queue_event(DirCreatedEvent(path))
+        self._list_directory(path, state, emit=emit)
+
+    def _remove_directory(self, path: str) -> None:
+        """Stop tracking a directory and emit deleted events for its contents."""
+        state = self._directories.pop(path, None)
+        if state is None:
+            return
+        for subdir in state.subdirs:
+            self._remove_directory(os.path.join(path, subdir))
+        for name in state.files:
+            self.queue_event(FileDeletedEvent(os.path.join(path, name)))
+        self.queue_event(DirDeletedEvent(path))
+
+    def _list_directory(
+        self, path: str, state: _DirectoryState, emit: bool = True
+    ) -> None:
+        """List a directory and emit events for files that changed."""
+        files: dict[str, tuple[int, int]] = {}
+        subdirs: set[str] = set()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.add(entry.name)
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            self._remove_directory(path)
+            return
+
+        for name in state.files.keys() - files.keys():
+            self.queue_event(FileDeletedEvent(os.path.join(path, name)))
+        for name, file_state in files.items():
+            previous = state.files.get(name)
+            if previous is None:
+                if emit:
+                    self.queue_event(FileCreatedEvent(os.path.join(path, name)))
+            elif previous != file_state:
+                self.queue_event(FileModifiedEvent(os.path.join(path, name)))
+        state.files = files
+
+        for name in state.subdirs - subdirs:
+            self._remove_directory(os.path.join(path, name))
+        for name in subdirs - state.subdirs:
+            self._add_directory(os.path.join(path, name), emit=emit)
+        state.subdirs = subdirs
+
+
+class DirectoryPollingObserver(BaseObserver):
+    """Observer that polls using the DirectoryPollingEmitter."""
+
+    def __init__(self, polling_interval: float = 1) -> None:
+        super().__init__(
+            emitter_class=DirectoryPollingEmitter, timeout=polling_interval
+        )
+
+
+class TierWatcher(FileSystemEventHandler):
+    """Watch a tier path and hand file events to the tier handlers below it.
+
+    A single observer and event thread is used for all cameras, categories and
+    subcategories that store files in the tier path. The watcher of the temp
+    folder is shared the same way by the fragmenters. Events are passed to the
+    handler registered for the closest parent directory of the file, one at a time
+    and in the order they were received.
+    """
+
+    def __init__(self, vis: Viseron, path: str, poll: bool) -> None:
+        super().__init__()
+        self._vis = vis
+        self._path = os.path.normpath(path)
+        self._poll = poll
+        self._lock = threading.Lock()
+        self._handlers: dict[str, WatchedPathHandler] = {}
+
+        self._event_queue: Queue[tuple[WatchedPathHandler, FileSystemEvent] | None] = (
+            Queue()
+        )
+        self._event_thread = RestartableThread(
+            target=self._process_events,
+            daemon=True,
+            name=f"storage.tier_watcher.{self._path}",
+            stage=VISERON_SIGNAL_LAST_WRITE,
+        )
+        self._observer = DirectoryPollingObserver() if poll else Observer()
+
+    @property
+    def path(self) -> str:
+        """Return the watched path."""
+        return self._path
+
+    def start(self) -> None:
+        """Start watching the tier path."""
+        LOGGER.debug(
+            "Watching tier path %s%s",
+            self._path,
+            " using polling" if self._poll else "",
+        )
+        os.makedirs(self._path, exist_ok=True)
+        self._vis.register_signal_handler(VISERON_SIGNAL_STOPPING, self.stop)
+        self._event_thread.start()
+        self._observer.schedule(self, self._path, recursive=True)
+        self._observer.start()
+
+    def register(self, path: str, handler: WatchedPathHandler) -> None:
+        """Hand events for files below path to handler."""
+        with self._lock:
+            self._handlers[os.path.normpath(path)] = handler
+
+    def unregister(self, path: str) -> None:
+        """Stop handing events for files below path."""
+        with self._lock:
+            self._handlers.pop(os.path.normpath(path), None)
+
+    def _find_handler(self, src_path: str) -> WatchedPathHandler | None:
+        """Return the handler registered for the closest parent of src_path."""
+        directory = os.path.dirname(os.path.normpath(src_path))
+        with self._lock:
+            while True:
+                handler = self._handlers.get(directory)
+                if handler is not None:
+                    return handler
+                if directory == self._path:
+                    return None
+                parent = os.path.dirname(directory)
+                if parent == directory:
+                    return None
+                directory = parent
+
+    def _queue_event(self, event: FileSystemEvent) -> None:
+        handler = self._find_handler(os.fsdecode(event.src_path))
+        if handler is not None:
+            self._event_queue.put((handler, event))
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        """Queue file events for the handler of the file."""
+        if event.is_directory:
+            return
+        # Files renamed to another tier below the same path are seen as moves
+        if isinstance(event, FileMovedEvent):
+            self._queue_event(FileDeletedEvent(event.src_path))
+            self._queue_event(FileCreatedEvent(event.dest_path))
+            return
+        self._queue_event(event)
+
+    def _process_events(self) -> None:
+        while True:
+            item = self._event_queue.get()
+            if item is None:
+                LOGGER.debug("Stopping event handler for %s", self._path)
+                break
+            handler, event = item
+            try:
+                handler.handle_event(event)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception(
+                    "Error handling event %s for %s", event, event.src_path
+                )
+
+    def stop(self) -> None:
+        """Stop the observer and handle the remaining events."""
+        LOGGER.debug("Stopping watcher for %s", self._path)
+        self._observer.stop()
+        self._observer.join()
+        self._event_queue.put(None)
+        self._event_thread.join()
@@ -53,6 +53,8 @@ from .const import (
     DESC_SESSION_EXPIRY,
     DESC_SUBPATH,
     DOWNLOAD_TOKENS,
+    LIVE_PLAYLISTS,
+    MJPEG_ENCODERS,
     PUBLIC_IMAGE_TOKENS,
     PUBLIC_IMAGES_PATH,
     WEBSERVER_STORAGE_KEY,
@@ -83,6 +85,10 @@ from .websocket_api.commands import (
 if TYPE_CHECKING:
     from viseron import Viseron
     from viseron.components.webserver.download_token import DownloadToken
+    from collections.abc import Hashable
+
+    from viseron.components.webserver.live_playlist import LivePlaylist
+    from viseron.components.webserver.mjpeg_encoder import MJPEGEncoder
     from viseron.components.webserver.public_image_token import PublicImageToken
 
 
@@ -257,6 +263,8 @@ class Webserver(threading.Thread):
         vis.data[WEBSOCKET_CONNECTIONS] = []
         vis.data[DOWNLOAD_TOKENS] = {}
         vis.data[PUBLIC_IMAGE_TOKENS] = {}
+        vis.data[LIVE_PLAYLISTS] = {}
+        vis.data[MJPEG_ENCODERS] = {}
 
         # Create persistent directory for public images
         os.makedirs(PUBLIC_IMAGES_PATH, exist_ok=True)
@@ -366,6 +374,16 @@ class Webserver(threading.Thread):
         """Return public image tokens."""
         return self._vis.data[PUBLIC_IMAGE_TOKENS]
 
+    @property
+    def live_playlists(self) -> dict[str, LivePlaylist]:
+        """Return live HLS playlists by camera identifier."""
+        return self._vis.data[LIVE_PLAYLISTS]
+
+    @property
+    def mjpeg_encoders(self) -> dict[Hashable, MJPEGEncoder]:
+        """Return active MJPEG encoders by stream profile."""
+        return self._vis.data[MJPEG_ENCODERS]
+
     @property
     def public_base_url(self) -> str | None:
         """Return public base URL."""
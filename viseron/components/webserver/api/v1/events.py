@@ -2,16 +2,21 @@
 from __future__ import annotations
 
 import datetime
+import heapq
+import json
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from http import HTTPStatus
-from typing import TYPE_CHECKING, Any
+from itertools import islice
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import voluptuous as vol
-from sqlalchemy import func, select
+from sqlalchemy import ColumnElement, func, select, true, tuple_
+from tornado import iostream
 
 from viseron.components.storage.models import (
-    Files,
+    ROLLUP_TYPE_FILES,
+    EventRollups,
     Motion,
     Objects,
     PostProcessorResults,
@@ -25,6 +30,7 @@ from viseron.domains.license_plate_recognition.const import (
     DOMAIN as LICENSE_PLATE_RECOGNITION_DOMAIN,
 )
 from viseron.helpers import daterange_to_utc
+from viseron.helpers.json import JSONEncoder
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
@@ -33,6 +39,74 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# Events are written to the response in chunks of this size
+EVENTS_CHUNK_SIZE = 100
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class EventCursor(NamedTuple):
+    """Position in the event stream, which is ordered by created_at, type and id."""
+
+    created_at: datetime.datetime
+    type: str
+    id: int
+
+
+def encode_cursor(event: dict[str, Any]) -> str:
+    """Return the cursor of an event."""
+    micros = (event["created_at"] - _EPOCH) // datetime.timedelta(microseconds=1)
+    return f"{micros}:{event['type']}:{event['id']}"
+
+
+def decode_cursor(value: str) -> EventCursor:
+    """Validate and decode a cursor returned by encode_cursor."""
+    try:
+        micros, event_type, event_id = str(value).split(":")
+        return EventCursor(
+            _EPOCH + datetime.timedelta(microseconds=int(micros)),
+            event_type,
+            int(event_id),
+        )
+    except (ValueError, OverflowError) as error:
+        raise vol.Invalid(f"Invalid cursor {value}") from error
+
+
+def _event_sort_key(event: dict[str, Any]) -> tuple[datetime.datetime, str, int]:
+    return event["created_at"], event["type"], event["id"]
+
+
+def _after_cursor(
+    created_at: Any,
+    id_: Any,
+    event_type: str | Any,
+    cursor: EventCursor | None,
+) -> ColumnElement[bool]:
+    """Return a clause that selects the rows that come after cursor.
+
+    event_type is either the type of all rows in the table or the column that holds
+    the type. Rows are ordered by created_at, type and id, all descending.
+    """
+    if cursor is None:
+        return true()
+    if not isinstance(event_type, str):
+        return tuple_(created_at, event_type, id_) < (
+            cursor.created_at,
+            cursor.type,
+            cursor.id,
+        )
+    if event_type < cursor.type:
+        return created_at <= cursor.created_at
+    if event_type > cursor.type:
+        return created_at < cursor.created_at
+    return tuple_(created_at, id_) < (cursor.created_at, cursor.id)
+
+
+def _json_dumps_events(events: list[dict[str, Any]]) -> str:
+    return ",".join(
+        json.dumps(event, cls=JSONEncoder, allow_nan=False) for event in events
+    )
+
 
 class EventsAPIHandler(BaseAPIHandler):
     """API handler for Events."""
@@ -47,9 +121,17 @@ class EventsAPIHandler(BaseAPIHandler):
                     {
                         vol.Required("time_from"): vol.Coerce(int),
                         vol.Required("time_to"): vol.Coerce(int),
+                        vol.Optional("limit"): vol.All(
+                            vol.Coerce(int), vol.Range(min=1)
+                        ),
+                        vol.Optional("before"): decode_cursor,
                     },
                     {
                         vol.Required("date"): str,
+                        vol.Optional("limit"): vol.All(
+                            vol.Coerce(int), vol.Range(min=1)
+                        ),
+                        vol.Optional("before"): decode_cursor,
                     },
                 )
             ),
@@ -90,6 +172,8 @@ class EventsAPIHandler(BaseAPIHandler):
         time_from: int,
         time_to: int,
         subpath: str,
+        cursor: EventCursor | None,
+        limit: int | None,
     ) -> list:
         """Select motion events from database."""
         time_from_datetime = datetime.datetime.fromtimestamp(
@@ -104,7 +188,10 @@ class EventsAPIHandler(BaseAPIHandler):
                 .where(Motion.camera_identifier == camera.identifier)
                 .where(Motion.start_time >= time_from_datetime)
                 .where(Motion.start_time <= time_to_datetime)
-            ).order_by(Motion.start_time.desc())
+                .where(_after_cursor(Motion.created_at, Motion.id, "motion", cursor))
+                .order_by(Motion.created_at.desc(), Motion.id.desc())
+                .limit(limit)
+            )
             motion = session.execute(stmt).scalars().all()
         motion_events = []
         if motion:
@@ -140,6 +227,8 @@ class EventsAPIHandler(BaseAPIHandler):
         time_from: int,
         time_to: int,
         subpath: str,
+        cursor: EventCursor | None,
+        limit: int | None,
     ):
         """Select object events from database."""
         time_from_datetime = datetime.datetime.fromtimestamp(
@@ -153,7 +242,10 @@ class EventsAPIHandler(BaseAPIHandler):
                 select(Objects)
                 .where(Objects.camera_identifier == camera.identifier)
                 .where(Objects.created_at.between(time_from_datetime, time_to_datetime))
-            ).order_by(Objects.created_at.desc())
+                .where(_after_cursor(Objects.created_at, Objects.id, "object", cursor))
+                .order_by(Objects.created_at.desc(), Objects.id.desc())
+                .limit(limit)
+            )
             objects = session.execute(stmt).scalars().all()
         object_events = []
         if objects:
@@ -182,6 +274,8 @@ class EventsAPIHandler(BaseAPIHandler):
         time_from: int,
         time_to: int,
         subpath: str,
+        cursor: EventCursor | None,
+        limit: int | None,
     ) -> list:
         """Select recording events from database."""
         time_from_datetime = datetime.datetime.fromtimestamp(
@@ -196,7 +290,14 @@ class EventsAPIHandler(BaseAPIHandler):
                 .where(Recordings.camera_identifier == camera.identifier)
                 .where(Recordings.start_time >= time_from_datetime)
                 .where(Recordings.start_time <= time_to_datetime)
-            ).order_by(Recordings.start_time.desc())
+                .where(
+                    _after_cursor(
+                        Recordings.created_at, Recordings.id, "recording", cursor
+                    )
+                )
+                .order_by(Recordings.created_at.desc(), Recordings.id.desc())
+                .limit(limit)
+            )
             recordings = session.execute(stmt).scalars().all()
         recording_events = []
         if recordings:
@@ -235,6 +336,8 @@ class EventsAPIHandler(BaseAPIHandler):
         time_from: int,
         time_to: int,
         subpath: str,
+        cursor: EventCursor | None,
+        limit: int | None,
     ) -> list:
         """Select post processor events from database."""
         time_from_datetime = datetime.datetime.fromtimestamp(
@@ -257,7 +360,21 @@ class EventsAPIHandler(BaseAPIHandler):
                         time_from_datetime, time_to_datetime
                     )
                 )
-            ).order_by(PostProcessorResults.created_at.desc())
+                .where(
+                    _after_cursor(
+                        PostProcessorResults.created_at,
+                        PostProcessorResults.id,
+                        PostProcessorResults.domain,
+                        cursor,
+                    )
+                )
+                .order_by(
+                    PostProcessorResults.created_at.desc(),
+                    PostProcessorResults.domain.desc(),
+                    PostProcessorResults.id.desc(),
+                )
+                .limit(limit)
+            )
             post_processor_results = session.execute(stmt).scalars().all()
         post_processor_events = []
         if post_processor_results:
@@ -304,116 +421,95 @@ class EventsAPIHandler(BaseAPIHandler):
             time_to = self.request_arguments["time_to"]
 
         subpath = self.get_subpath()
-        motion_events = await self.run_in_executor(
+        limit: int | None = self.request_arguments.get("limit")
+        cursor: EventCursor | None = self.request_arguments.get("before")
+        # Fetch one extra event to know if there are more events after this page
+        query_limit = limit + 1 if limit else None
+        sources = []
+        for select_events in (
             self._motion_events,
-            self._get_session,
-            camera,
-            time_from,
-            time_to,
-            subpath,
-        )
-        recording_events = await self.run_in_executor(
             self._recording_events,
-            self._get_session,
-            camera,
-            time_from,
-            time_to,
-            subpath,
-        )
-        object_events = await self.run_in_executor(
             self._object_event,
-            self._get_session,
-            camera,
-            time_from,
-            time_to,
-            subpath,
-        )
-        post_processor_events = await self.run_in_executor(
             self._post_processor_events,
-            self._get_session,
-            camera,
-            time_from,
-            time_to,
-            subpath,
-        )
-
-        def sort_events():
-            return sorted(
-                motion_events
-                + recording_events
-                + object_events
-                + post_processor_events,
-                key=lambda k: k["created_at"],
-                reverse=True,
+        ):
+            sources.append(
+                await self.run_in_executor(
+                    select_events,
+                    self._get_session,
+                    camera,
+                    time_from,
+                    time_to,
+                    subpath,
+                    cursor,
+                    query_limit,
+                )
             )
 
-        sorted_events = await self.run_in_executor(sort_events)
-        await self.response_success(response={"events": sorted_events})
+        # Each source is already ordered, so they are merged using a heap
+        events = heapq.merge(*sources, key=_event_sort_key, reverse=True)
+        await self._stream_events(events, limit)
+
+    async def _stream_events(
+        self, events: Iterable[dict[str, Any]], limit: int | None
+    ) -> None:
+        """Write events to the response in chunks.
+
+        next_cursor is set to the cursor of the last event if the page is full and
+        there are more events, and is passed as before to fetch the next page.
+        """
+        events_iter = iter(events)
+        self.set_header("Content-Type", "application/json")
+        self.write('{"events": [')
+        count = 0
+        last_event: dict[str, Any] | None = None
+        while limit is None or count < limit:
+            chunk_size = EVENTS_CHUNK_SIZE
+            if limit is not None:
+                chunk_size = min(chunk_size, limit - count)
+            chunk = list(islice(events_iter, chunk_size))
+            if not chunk:
+                break
+            data = await self.run_in_executor(_json_dumps_events, chunk)
+            self.write(f",{data}" if count else data)
+            try:
+                await self.flush()
+            except iostream.StreamClosedError:
+                # The client disconnected before the page was complete
+                return
+            count += len(chunk)
+            last_event = chunk[-1]
+
+        next_cursor = None
+        if last_event is not None and next(events_iter, None) is not None:
+            next_cursor = encode_cursor(last_event)
+        self.finish(f'], "next_cursor": {json.dumps(next_cursor)}}}')
 
     def _events_amount(
         self,
         get_session: Callable[[], Session],
         camera_identifiers: list[str],
     ) -> dict[str, dict[str, Any]]:
+        local_date = func.date(EventRollups.bucket + self.utc_offset)
         with get_session() as session:
             stmt = (
                 select(
-                    func.date(Motion.start_time + self.utc_offset),
-                    func.count(),  # pylint: disable=not-callable
-                )
-                .where(Motion.camera_identifier.in_(camera_identifiers))
-                .group_by(func.date(Motion.start_time + self.utc_offset))
-            )
-            motion_events = session.execute(stmt).all()
-
-            stmt = (
-                select(
-                    func.date(Recordings.start_time + self.utc_offset),
-                    func.count(),  # pylint: disable=not-callable
+                    local_date,
+                    EventRollups.type,
+                    func.sum(EventRollups.count),
                 )
-                .where(Recordings.camera_identifier.in_(camera_identifiers))
-                .group_by(func.date(Recordings.start_time + self.utc_offset))
+                .where(EventRollups.camera_identifier.in_(camera_identifiers))
+                .where(EventRollups.type != ROLLUP_TYPE_FILES)
+                .group_by(local_date, EventRollups.type)
+                .having(func.sum(EventRollups.count) > 0)
             )
-            recording_events = session.execute(stmt).all()
-
-            stmt = (
-                select(
-                    func.date(Objects.created_at + self.utc_offset),
-                    func.count(),  # pylint: disable=not-callable
-                )
-                .where(Objects.camera_identifier.in_(camera_identifiers))
-                .group_by(func.date(Objects.created_at + self.utc_offset))
-            )
-            object_events = session.execute(stmt).all()
-
-            stmt_pp = (
-                select(
-                    func.date(PostProcessorResults.created_at + self.utc_offset),
-                    PostProcessorResults.domain,
-                    func.count(),  # pylint: disable=not-callable
-                )
-                .where(PostProcessorResults.camera_identifier.in_(camera_identifiers))
-                .group_by(
-                    func.date(PostProcessorResults.created_at + self.utc_offset),
-                    PostProcessorResults.domain,
-                )
-            )
-            post_processor_events = session.execute(stmt_pp).all()
+            rollups = session.execute(stmt).all()
 
         events_amount: dict[str, dict[str, Any]] = {}
         day: datetime.date
+        event_type: str
         count: int
-        for day, count in motion_events:
-            events_amount.setdefault(day.isoformat(), {}).setdefault("motion", count)
-
-        for day, count in recording_events:
-            events_amount.setdefault(day.isoformat(), {}).setdefault("recording", count)
-
-        for day, count in object_events:
-            events_amount.setdefault(day.isoformat(), {}).setdefault("object", count)
-
-        for day, domain, count in post_processor_events:
-            events_amount.setdefault(day.isoformat(), {}).setdefault(domain, count)
+        for day, event_type, count in rollups:
+            events_amount.setdefault(day.isoformat(), {})[event_type] = int(count)
 
         return events_amount
 
@@ -505,14 +601,15 @@ def _get_timespans_per_day(
     utc_offset: datetime.timedelta,
 ) -> list[str]:
     """Get the dates with timespans available for multiple cameras."""
+    local_date = func.date(EventRollups.bucket + utc_offset)
     with get_session() as session:
         stmt = (
-            select(
-                func.date(Files.created_at + utc_offset),
-            )
-            .where(Files.camera_identifier.in_(camera_identifiers))
-            .group_by(func.date(Files.created_at + utc_offset))
-            .order_by(func.date(Files.created_at + utc_offset))
+            select(local_date)
+            .where(EventRollups.camera_identifier.in_(camera_identifiers))
+            .where(EventRollups.type == ROLLUP_TYPE_FILES)
+            .group_by(local_date)
+            .having(func.sum(EventRollups.count) > 0)
+            .order_by(local_date)
         )
         dates = session.execute(stmt).all()
     date_list = [str(d[0]) for d in dates]
@@ -4,6 +4,7 @@ from __future__ import annotations
 import datetime
 import logging
 import os
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 from http import HTTPStatus
@@ -20,6 +21,11 @@ from viseron.components.storage.const import (
 from viseron.components.storage.models import Files, Recordings
 from viseron.components.storage.queries import get_time_period_fragments
 from viseron.components.webserver.api.handlers import BaseAPIHandler
+from viseron.components.webserver.live_playlist import (
+    LIVE_PLAYLIST_IDLE_TIMEOUT,
+    LivePlaylist,
+    LiveSegment,
+)
 from viseron.const import CAMERA_SEGMENT_DURATION
 from viseron.domains.camera.fragmenter import (
     Fragment,
@@ -36,6 +42,10 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# Clients of recording and time period playlists that are tracked at the same time.
+# Live playlists do not keep any state per client
+HLS_CLIENTS_MAX = 500
+
 
 def count_files_removed(
     previous_list: list[Fragment], current_list: list[Fragment]
@@ -66,7 +76,9 @@ class HlsClient:
 class HlsAPIHandler(BaseAPIHandler):
     """API handler for HLS."""
 
-    hls_client_ids: FixedSizeDict[str, HlsClient] = FixedSizeDict(maxlen=10)
+    hls_client_ids: FixedSizeDict[str, HlsClient] = FixedSizeDict(
+        maxlen=HLS_CLIENTS_MAX
+    )
 
     routes = [
         {
@@ -90,6 +102,9 @@ class HlsAPIHandler(BaseAPIHandler):
                         vol.Coerce(int)
                     ),
                     vol.Optional("date", default=None): vol.Maybe(str),
+                    vol.Optional("_HLS_msn", default=None): vol.Maybe(vol.Coerce(int)),
+                    vol.Optional("_HLS_part"): vol.Coerce(int),
+                    vol.Optional("_HLS_skip"): str,
                 }
             ),
         },
@@ -153,7 +168,11 @@ class HlsAPIHandler(BaseAPIHandler):
         self,
         camera_identifier: str,
     ):
-        """Get the HLS playlist for a time period."""
+        """Get the HLS playlist for a time period.
+
+        Live playlists are served from the LivePlaylist of the camera, which is
+        shared by all viewers and supports blocking playlist reloads.
+        """
         camera = self._get_camera(camera_identifier, failed=True)
 
         if not camera:
@@ -165,17 +184,63 @@ class HlsAPIHandler(BaseAPIHandler):
 
         hls_client_id = self.request.headers.get("Hls-Client-Id", None)
         subpath = self.get_subpath()
-        playlist = await self.run_in_executor(
-            _generate_playlist_time_period,
-            self._get_session,
-            camera,
-            hls_client_id,
+        start_timestamp = self.request_arguments["start_timestamp"]
+        end_timestamp, end_playlist = get_playlist_end(
             self.utc_offset,
-            self.request_arguments["start_timestamp"],
             self.request_arguments["end_timestamp"],
             self.request_arguments["date"],
-            subpath,
         )
+
+        playlist: str | None = None
+        live_playlist = None
+        if not end_playlist:
+            live_playlist = await self._get_live_playlist(camera)
+        start = datetime.datetime.fromtimestamp(
+            start_timestamp, tz=datetime.timezone.utc
+        )
+        if live_playlist and live_playlist.in_window(start):
+            hls_msn = self.request_arguments["_HLS_msn"]
+            if hls_msn is not None:
+                if hls_msn > live_playlist.last_sequence + 2:
+                    self.response_error(
+                        HTTPStatus.BAD_REQUEST,
+                        reason=f"_HLS_msn {hls_msn} is too far in the future",
+                    )
+                    return
+                # Respond with the current playlist if the segment does not show up
+                # in time, ie when the camera is not recording
+                await live_playlist.async_wait_for_sequence(
+                    hls_msn, 3 * live_playlist.target_duration
+                )
+
+            if not live_playlist.init_file or not os.path.exists(
+                live_playlist.init_file
+            ):
+                live_playlist.init_file = await self.run_in_executor(
+                    _get_init_file, self._get_session, camera
+                )
+            if live_playlist.init_file:
+                media_sequence, segments = live_playlist.segments_since(start)
+                playlist = await self.run_in_executor(
+                    _generate_live_playlist,
+                    camera,
+                    live_playlist.init_file,
+                    media_sequence,
+                    segments,
+                    live_playlist.target_duration,
+                    subpath,
+                )
+        else:
+            playlist = await self.run_in_executor(
+                _generate_playlist_time_period,
+                self._get_session,
+                camera,
+                hls_client_id,
+                start_timestamp,
+                end_timestamp,
+                end_playlist,
+                subpath,
+            )
         if not playlist:
             self.response_error(
                 HTTPStatus.NOT_FOUND, "HLS playlist could not be generated"
@@ -187,6 +252,25 @@ class HlsAPIHandler(BaseAPIHandler):
         self.set_header("Access-Control-Allow-Origin", "*")
         await self.response_success(response=playlist)
 
+    async def _get_live_playlist(
+        self, camera: AbstractCamera | FailedCamera
+    ) -> LivePlaylist:
+        """Return the live playlist of a camera, loading it on first use."""
+        live_playlists = self._webserver.live_playlists
+        now = time.monotonic()
+        for identifier, live_playlist in list(live_playlists.items()):
+            if now - live_playlist.last_requested > LIVE_PLAYLIST_IDLE_TIMEOUT:
+                live_playlist.close()
+                del live_playlists[identifier]
+
+        if camera.identifier not in live_playlists:
+            live_playlists[camera.identifier] = LivePlaylist(
+                self._vis, camera.identifier
+            )
+        live_playlist = live_playlists[camera.identifier]
+        await live_playlist.async_setup(self._get_session, self.ioloop)
+        return live_playlist
+
     async def get_available_timespans(
         self,
         camera_identifier: str,
@@ -312,6 +396,8 @@ def adjust_fragment_paths(
                 f"{subpath}/files{path}",
                 file.duration,
                 file.orig_ctime,
+                # Only segments of live playlists can be gaps
+                getattr(file, "gap", False),
             )
         )
     return fragments
@@ -374,28 +460,53 @@ def _generate_playlist(
     return playlist
 
 
+def get_playlist_end(
+    utc_offset: datetime.timedelta,
+    end_timestamp: int | None,
+    date: str | None,
+) -> tuple[int | None, bool]:
+    """Return the end timestamp and whether the playlist should end."""
+    if date and end_timestamp is None:
+        # If a date is provided, convert to timestamp range
+        _, time_to = daterange_to_utc(date, utc_offset)
+        # If the date is not today, playlist should end
+        return (
+            int(time_to.timestamp()),
+            date != client_current_datetime(utc_offset).date().isoformat(),
+        )
+    return end_timestamp, end_timestamp is not None
+
+
+def _generate_live_playlist(
+    camera: AbstractCamera | FailedCamera,
+    init_file: str,
+    media_sequence: int,
+    segments: list[LiveSegment],
+    target_duration: int,
+    subpath: str,
+) -> str:
+    """Generate the HLS playlist for the live window of a camera."""
+    return generate_playlist(
+        adjust_fragment_paths(camera, subpath, segments),
+        f"{subpath}/files{init_file}",
+        media_sequence=media_sequence,
+        target_duration=target_duration,
+        end=False,
+        file_directive=False,
+        can_block_reload=True,
+    )
+
+
 def _generate_playlist_time_period(
     get_session: Callable[[], Session],
     camera: AbstractCamera | FailedCamera,
     hls_client_id: str | None,
-    utc_offset: datetime.timedelta,
     start_timestamp: int,
-    end_timestamp: int | None = None,
-    date: str | None = None,
+    end_timestamp: int | None,
+    end_playlist: bool,
     subpath: str = "",
 ) -> str | None:
     """Generate the HLS playlist for a time period."""
-    end_playlist = False
-    if date and end_timestamp is None:
-        # If a date is provided, convert to timestamp range
-        _, time_to = daterange_to_utc(date, utc_offset)
-        end_timestamp = int(time_to.timestamp())
-        # If the date is not today, playlist should end
-        if date != client_current_datetime(utc_offset).date().isoformat():
-            end_playlist = True
-    elif end_timestamp is not None:
-        end_playlist = True
-
     files = get_time_period_fragments(
         [camera.identifier], start_timestamp, end_timestamp, get_session
     )
@@ -2,8 +2,16 @@
 
 import logging
 
+from viseron.components.data_stream import COMPONENT as DATA_STREAM_COMPONENT
+from viseron.components.storage.const import COMPONENT as STORAGE_COMPONENT
 from viseron.components.webserver.api.handlers import BaseAPIHandler
 from viseron.components.webserver.auth import Role
+from viseron.components.webserver.const import (
+    MJPEG_ENCODERS,
+    WEBSOCKET_CONNECTIONS,
+)
+from viseron.domains.camera.const import SNAPSHOT_WRITER
+from viseron.domains.object_detector.const import BATCH_METRICS
 
 LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +26,42 @@ class SystemAPIHandler(BaseAPIHandler):
             "supported_methods": ["GET"],
             "method": "get_dispatched_events",
         },
+        {
+            "requires_role": [Role.ADMIN],
+            "path_pattern": r"/system/data_stream",
+            "supported_methods": ["GET"],
+            "method": "get_data_stream",
+        },
+        {
+            "requires_role": [Role.ADMIN],
+            "path_pattern": r"/system/mjpeg_encoders",
+            "supported_methods": ["GET"],
+            "method": "get_mjpeg_encoders",
+        },
+        {
+            "requires_role": [Role.ADMIN],
+            "path_pattern": r"/system/websocket_connections",
+            "supported_methods": ["GET"],
+            "method": "get_websocket_connections",
+        },
+        {
+            "requires_role": [Role.ADMIN],
+            "path_pattern": r"/system/snapshot_writer",
+            "supported_methods": ["GET"],
+            "method": "get_snapshot_writer",
+        },
+        {
+            "requires_role": [Role.ADMIN],
+            "path_pattern": r"/system/object_detector_batches",
+            "supported_methods": ["GET"],
+            "method": "get_object_detector_batches",
+        },
+        {
+            "requires_role": [Role.ADMIN],
+            "path_pattern": r"/system/storage_moves",
+            "supported_methods": ["GET"],
+            "method": "get_storage_moves",
+        },
     ]
 
     async def get_dispatched_events(self) -> None:
@@ -26,3 +70,65 @@ class SystemAPIHandler(BaseAPIHandler):
         await self.response_success(
             response={"events": self._vis.dispatched_events},
         )
+
+    async def get_data_stream(self) -> None:
+        """Return data stream lane and dispatcher metrics."""
+        data_stream = self._vis.data[DATA_STREAM_COMPONENT]
+        await self.response_success(
+            response={
+                "lanes": data_stream.lane_metrics,
+                "dispatcher": data_stream.dispatcher_metrics,
+            },
+        )
+
+    async def get_mjpeg_encoders(self) -> None:
+        """Return viewer count and encode time of the active MJPEG encoders."""
+        await self.response_success(
+            response={
+                "encoders": [
+                    encoder.metrics
+                    for encoder in self._vis.data[MJPEG_ENCODERS].values()
+                ],
+            },
+        )
+
+    async def get_websocket_connections(self) -> None:
+        """Return buffered, dropped and coalesced messages of WebSocket connections."""
+        await self.response_success(
+            response={
+                "connections": [
+                    connection.metrics
+                    for connection in self._vis.data[WEBSOCKET_CONNECTIONS]
+                ],
+            },
+        )
+
+    async def get_snapshot_writer(self) -> None:
+        """Return pending, dropped and reused snapshots of the snapshot writer."""
+        snapshot_writer = self._vis.data.get(SNAPSHOT_WRITER)
+        await self.response_success(
+            response={
+                "snapshot_writer": snapshot_writer.metrics if snapshot_writer else None,
+            },
+        )
+
+    async def get_object_detector_batches(self) -> None:
+        """Return batch size and queue wait of object detectors that batch frames."""
+        await self.response_success(
+            response={
+                "object_detectors": {
+                    component: batch_metrics.metrics
+                    for component, batch_metrics in self._vis.data.get(
+                        BATCH_METRICS, {}
+                    ).items()
+                },
+            },
+        )
+
+    async def get_storage_moves(self) -> None:
+        """Return backlog and throughput of the moves out of each storage tier."""
+        await self.response_success(
+            response={
+                "tiers": self._vis.data[STORAGE_COMPONENT].move_metrics.metrics,
+            },
+        )
@@ -98,3 +98,5 @@ WEBSOCKET_COMMANDS: Final = "websocket_commands"
 WEBSOCKET_CONNECTIONS: Final = "websocket_connections"
 DOWNLOAD_TOKENS: Final = "download_tokens"
 PUBLIC_IMAGE_TOKENS: Final = "public_image_tokens"
+LIVE_PLAYLISTS: Final = "live_playlists"
+MJPEG_ENCODERS: Final = "mjpeg_encoders"
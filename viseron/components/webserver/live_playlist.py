@@ -0,0 +1,294 @@
+"""Live HLS playlists shared by all viewers of a camera."""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import datetime
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from math import ceil
+from typing import TYPE_CHECKING
+
+from viseron.components.storage.const import (
+    EVENT_FILE_CREATED,
+    EVENT_FILE_DELETED,
+    MAX_SEGMENT_DURATION,
+    TIER_CATEGORY_RECORDER,
+    TIER_SUBCATEGORY_SEGMENTS,
+)
+from viseron.components.storage.queries import get_time_period_fragments
+from viseron.const import CAMERA_SEGMENT_DURATION
+from viseron.helpers import utcnow
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+    from tornado.ioloop import IOLoop
+
+    from viseron import Viseron
+    from viseron.components.storage.util import EventFileCreated, EventFileDeleted
+    from viseron.events import Event
+
+LOGGER = logging.getLogger(__name__)
+
+# Segments are kept in the playlist for this long. Covers the current day in any
+# timezone plus the hour viewers rewind before the requested timestamp
+LIVE_PLAYLIST_WINDOW = datetime.timedelta(hours=25)
+# Deleted segments are kept for this many seconds in case they were moved to
+# another tier, in which case the delete event can arrive before the create event
+LIVE_PLAYLIST_DELETE_GRACE = 10
+# Playlists that have not been requested for this many seconds are dropped
+LIVE_PLAYLIST_IDLE_TIMEOUT = 600
+
+
+@dataclass
+class LiveSegment:
+    """A segment in a live playlist.
+
+    Has the same attributes as the rows of the files table used when generating
+    playlists.
+    """
+
+    filename: str
+    path: str
+    tier_id: int
+    tier_path: str
+    duration: float
+    orig_ctime: datetime.datetime
+    deleted_at: float | None = None
+    gap: bool = False
+
+
+def _segment_start(segment: LiveSegment) -> datetime.datetime:
+    return segment.orig_ctime
+
+
+def _segment_end(segment: LiveSegment) -> datetime.datetime:
+    return segment.orig_ctime + datetime.timedelta(seconds=segment.duration)
+
+
+class LivePlaylist:
+    """Sliding window of the recorded segments of a camera.
+
+    The window is loaded from the database once and is then kept up to date from
+    file created and deleted events. Each segment keeps its media sequence number
+    for as long as it is in the window, so every viewer gets the media sequence
+    from the window itself and no state is kept per viewer.
+    Segments are therefore only removed from the start of the window and only
+    appended once the window is loaded. Deleted segments in the middle of the window
+    are kept as gaps until they reach the start.
+    All methods have to be called from the webserver IOLoop.
+    """
+
+    def __init__(self, vis: Viseron, camera_identifier: str) -> None:
+        self._vis = vis
+        self._camera_identifier = camera_identifier
+
+        self._segments: list[LiveSegment] = []
+        self._segments_by_filename: dict[str, LiveSegment] = {}
+        self._first_sequence = 0
+        self._window_start = utcnow()
+        self._target_duration = CAMERA_SEGMENT_DURATION
+
+        self._setup_lock = asyncio.Lock()
+        self._condition = asyncio.Condition()
+        self._ready = False
+        self._deleted_during_setup: set[str] = set()
+        self._unsubscribe: list[Callable[[], None]] = []
+
+        self.init_file: str | None = None
+        self.last_requested = time.monotonic()
+
+    @property
+    def target_duration(self) -> int:
+        """Return the target duration, which never changes for a playlist."""
+        return self._target_duration
+
+    @property
+    def last_sequence(self) -> int:
+        """Return the media sequence number of the newest segment."""
+        return self._first_sequence + len(self._segments) - 1
+
+    async def async_setup(
+        self, get_session: Callable[[], Session], ioloop: IOLoop
+    ) -> None:
+        """Load the window from the database and start listening for events."""
+        async with self._setup_lock:
+            if self._ready:
+                return
+
+            for event, callback in (
+                (EVENT_FILE_CREATED, self._async_on_created),
+                (EVENT_FILE_DELETED, self._async_on_deleted),
+            ):
+                self._unsubscribe.append(
+                    self._vis.listen_event(
+                        event.format(
+                            camera_identifier=self._camera_identifier,
+                            category=TIER_CATEGORY_RECORDER,
+                            subcategory=TIER_SUBCATEGORY_SEGMENTS,
+                        ),
+                        callback,
+                        ioloop=ioloop,
+                    )
+                )
+
+            self._window_start = utcnow() - LIVE_PLAYLIST_WINDOW
+            files = await ioloop.run_in_executor(
+                None,
+                get_time_period_fragments,
+                [self._camera_identifier],
+                self._window_start.timestamp(),
+                None,
+                get_session,
+            )
+            # Events received while loading are already applied
+            for file in files:
+                if file.path in self._deleted_during_setup:
+                    continue
+                self._add(
+                    LiveSegment(
+                        filename=file.filename,
+                        path=file.path,
+                        tier_id=file.tier_id,
+                        tier_path=file.tier_path,
+                        duration=file.duration,
+                        orig_ctime=file.orig_ctime,
+                    )
+                )
+            self._deleted_during_setup.clear()
+
+            if self._segments:
+                self._target_duration = max(
+                    ceil(max(segment.duration for segment in self._segments)),
+                    CAMERA_SEGMENT_DURATION,
+                )
+            self._ready = True
+            LOGGER.debug(
+                f"Loaded live playlist for camera {self._camera_identifier} "
+                f"with {len(self._segments)} segments"
+            )
+
+    def close(self) -> None:
+        """Stop listening for events."""
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        self._unsubscribe.clear()
+
+    def in_window(self, timestamp: datetime.datetime) -> bool:
+        """Return True if timestamp is within the window."""
+        self.last_requested = time.monotonic()
+        self._purge()
+        return timestamp >= self._window_start
+
+    def segments_since(self, start: datetime.datetime) -> tuple[int, list[LiveSegment]]:
+        """Return the media sequence and the segments playing at or after start."""
+        self._purge()
+        index = bisect.bisect_left(
+            self._segments,
+            start - datetime.timedelta(seconds=MAX_SEGMENT_DURATION),
+            key=_segment_start,
+        )
+        while (
+            index < len(self._segments) and _segment_end(self._segments[index]) < start
+        ):
+            index += 1
+        return self._first_sequence + index, self._segments[index:]
+
+    async def async_wait_for_sequence(self, sequence: int, timeout: float) -> bool:
+        """Wait until the segment with the given media sequence number is added.
+
+        Returns False if the segment was not added within timeout seconds.
+        """
+        self.last_requested = time.monotonic()
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self.last_sequence >= sequence),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def _add(self, segment: LiveSegment) -> None:
+        """Add a segment, or update its location if it was moved to another tier."""
+        existing = self._segments_by_filename.get(segment.filename)
+        if existing:
+            existing.path = segment.path
+            existing.tier_id = segment.tier_id
+            existing.tier_path = segment.tier_path
+            existing.deleted_at = None
+            existing.gap = False
+            return
+
+        if not self._segments or segment.orig_ctime >= self._segments[-1].orig_ctime:
+            self._segments.append(segment)
+        elif not self._ready:
+            bisect.insort(self._segments, segment, key=_segment_start)
+        else:
+            # Inserting it would change the media sequence of the newer segments
+            LOGGER.debug(
+                f"Skipping segment {segment.filename} for live playlist of camera "
+                f"{self._camera_identifier} since it is older than the newest segment"
+            )
+            return
+        self._segments_by_filename[segment.filename] = segment
+
+    def _purge(self) -> None:
+        """Remove segments that are outside the window or have been deleted.
+
+        Only segments at the start of the window are removed, which advances the
+        media sequence. Deleted segments after the start are marked as gaps.
+        """
+        self._window_start = max(self._window_start, utcnow() - LIVE_PLAYLIST_WINDOW)
+        now = time.monotonic()
+
+        def expired(segment: LiveSegment) -> bool:
+            if segment.orig_ctime < self._window_start:
+                return True
+            return (
+                segment.deleted_at is not None
+                and now - segment.deleted_at > LIVE_PLAYLIST_DELETE_GRACE
+            )
+
+        index = 0
+        while index < len(self._segments) and expired(self._segments[index]):
+            del self._segments_by_filename[self._segments[index].filename]
+            index += 1
+        if index:
+            del self._segments[:index]
+            self._first_sequence += index
+
+        for segment in self._segments:
+            if not segment.gap and expired(segment):
+                segment.gap = True
+
+    async def _async_on_created(self, event: Event[EventFileCreated]) -> None:
+        """Add a new segment and wake up blocking playlist requests."""
+        data = event.data
+        if data.orig_ctime is None or data.duration is None:
+            return
+        self._add(
+            LiveSegment(
+                filename=data.file_name,
+                path=data.path,
+                tier_id=data.tier_id or 0,
+                tier_path=data.tier_path or "",
+                duration=data.duration,
+                orig_ctime=data.orig_ctime,
+            )
+        )
+        self._purge()
+        async with self._condition:
+            self._condition.notify_all()
+
+    async def _async_on_deleted(self, event: Event[EventFileDeleted]) -> None:
+        """Mark a segment as deleted unless a copy exists in another tier."""
+        data = event.data
+        if not self._ready:
+            self._deleted_during_setup.add(data.path)
+        segment = self._segments_by_filename.get(data.file_name)
+        if segment and segment.path == data.path:
+            segment.deleted_at = time.monotonic()
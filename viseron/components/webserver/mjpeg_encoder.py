@@ -0,0 +1,242 @@
+"""MJPEG encoders shared by all viewers of a stream profile."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Hashable
+from typing import TYPE_CHECKING, Any
+
+import cv2
+import imutils
+from tornado.queues import Queue
+
+from viseron.components.nvr.const import EVENT_PROCESSED_FRAME_TOPIC
+from viseron.domains.camera.const import CONFIG_MJPEG_QUALITY
+from viseron.domains.motion_detector import AbstractMotionDetectorScanner
+from viseron.helpers import (
+    draw_contours,
+    draw_motion_mask,
+    draw_object_mask,
+    draw_objects,
+    draw_post_processor_mask,
+    draw_zones,
+    pop_if_full,
+)
+
+from .const import MJPEG_ENCODERS
+
+if TYPE_CHECKING:
+    import numpy as np
+    from tornado.ioloop import IOLoop
+
+    from viseron import Viseron
+    from viseron.components.nvr.nvr import NVR, EventProcessedFrame
+    from viseron.events import Event
+
+LOGGER = logging.getLogger(__name__)
+
+# Weight of the latest encode when updating the average encode time
+ENCODE_TIME_SMOOTHING = 0.1
+
+
+def process_frame(
+    nvr: NVR, processed_frame: EventProcessedFrame, mjpeg_stream_config: dict
+) -> tuple[bool, np.ndarray]:
+    """Return JPG with drawn objects, zones etc."""
+    _frame = processed_frame.frame.copy()
+
+    if mjpeg_stream_config["width"] and mjpeg_stream_config["height"]:
+        resolution = mjpeg_stream_config["width"], mjpeg_stream_config["height"]
+        frame = cv2.resize(
+            _frame,
+            resolution,
+            interpolation=cv2.INTER_LINEAR,
+        )
+    else:
+        resolution = nvr.camera.resolution
+        frame = _frame
+
+    if nvr.motion_detector and isinstance(
+        nvr.motion_detector, AbstractMotionDetectorScanner
+    ):
+        if mjpeg_stream_config["draw_motion_mask"] and nvr.motion_detector.mask:
+            draw_motion_mask(
+                frame,
+                nvr.motion_detector.mask,
+            )
+        if mjpeg_stream_config["draw_motion"] and processed_frame.motion_contours:
+            draw_contours(
+                frame,
+                processed_frame.motion_contours,
+                resolution,
+                nvr.motion_detector.area,
+            )
+
+    if nvr.object_detector:
+        if mjpeg_stream_config["draw_zones"]:
+            draw_zones(frame, nvr.object_detector.zones)
+
+        if mjpeg_stream_config["draw_object_mask"] and nvr.object_detector.mask:
+            draw_object_mask(
+                frame,
+                nvr.object_detector.mask,
+            )
+        if mjpeg_stream_config["draw_objects"] and processed_frame.objects_in_fov:
+            draw_objects(
+                frame,
+                processed_frame.objects_in_fov,
+                resolution=resolution,
+            )
+
+    for domain, post_processor in nvr.post_processors.items():
+        if mjpeg_stream_config["draw_post_processor_mask"] and post_processor.mask:
+            draw_post_processor_mask(
+                frame,
+                domain,
+                post_processor.mask,
+            )
+
+    if mjpeg_stream_config["rotate"]:
+        frame = imutils.rotate_bound(frame, mjpeg_stream_config["rotate"])
+
+    if mjpeg_stream_config["mirror"]:
+        frame = cv2.flip(frame, 1)
+
+    ret, jpg = cv2.imencode(
+        ".jpg",
+        frame,
+        [int(cv2.IMWRITE_JPEG_QUALITY), mjpeg_stream_config[CONFIG_MJPEG_QUALITY]],
+    )
+    return ret, jpg
+
+
+def profile_key(camera_identifier: str, mjpeg_stream_config: dict) -> Hashable:
+    """Return the key of the stream profile described by mjpeg_stream_config."""
+    return (camera_identifier, tuple(sorted(mjpeg_stream_config.items())))
+
+
+class MJPEGEncoder:
+    """Encodes the frames of a camera once for all viewers of a stream profile.
+
+    Each viewer gets a queue that only holds the latest JPG. A viewer that is slower
+    than the camera skips frames instead of building up a backlog.
+    All methods have to be called from the webserver IOLoop.
+    """
+
+    def __init__(
+        self,
+        vis: Viseron,
+        nvr: NVR,
+        mjpeg_stream_config: dict,
+        ioloop: IOLoop,
+    ) -> None:
+        self._vis = vis
+        self._nvr = nvr
+        self._mjpeg_stream_config = mjpeg_stream_config
+        self._ioloop = ioloop
+        self._key = profile_key(nvr.camera.identifier, mjpeg_stream_config)
+
+        self._viewers: set[Queue[bytes]] = set()
+        self._task: asyncio.Future | None = None
+
+        self._frames = 0
+        self._encode_time: float | None = None
+
+    @property
+    def viewers(self) -> int:
+        """Return the number of viewers."""
+        return len(self._viewers)
+
+    @property
+    def encode_time(self) -> float | None:
+        """Return the average time in seconds it takes to process one frame."""
+        return self._encode_time
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return metrics of the encoder."""
+        return {
+            "camera_identifier": self._nvr.camera.identifier,
+            "config": self._mjpeg_stream_config,
+            "viewers": self.viewers,
+            "frames": self._frames,
+            "encode_time": self._encode_time,
+        }
+
+    def subscribe(self) -> Queue[bytes]:
+        """Add a viewer and return the queue that JPGs are published to."""
+        queue: Queue[bytes] = Queue(maxsize=1)
+        self._viewers.add(queue)
+        if self._task is None or self._task.done():
+            LOGGER.debug(
+                f"Starting MJPEG encoder for camera {self._nvr.camera.identifier}, "
+                f"config: {self._mjpeg_stream_config}"
+            )
+            self._vis.data[MJPEG_ENCODERS][self._key] = self
+            self._task = asyncio.ensure_future(self._run())
+        return queue
+
+    def unsubscribe(self, queue: Queue[bytes]) -> None:
+        """Remove a viewer. The encoder stops when the last viewer is removed."""
+        self._viewers.discard(queue)
+
+    async def _run(self) -> None:
+        """Process frames while there are viewers."""
+        frame_queue: Queue[Event[EventProcessedFrame]] = Queue(maxsize=1)
+        unsub = self._vis.listen_event(
+            EVENT_PROCESSED_FRAME_TOPIC.format(
+                camera_identifier=self._nvr.camera.identifier
+            ),
+            frame_queue,
+            ioloop=self._ioloop,
+        )
+
+        try:
+            while self._viewers:
+                processed_frame = await frame_queue.get()
+                if not self._viewers:
+                    break
+
+                start = time.perf_counter()
+                ret, jpg = await self._ioloop.run_in_executor(
+                    None,
+                    process_frame,
+                    self._nvr,
+                    processed_frame.data,
+                    self._mjpeg_stream_config,
+                )
+                self._update_encode_time(time.perf_counter() - start)
+                if not ret:
+                    continue
+
+                jpg_bytes = jpg.tobytes()
+                for queue in self._viewers:
+                    pop_if_full(queue, jpg_bytes)
+        finally:
+            unsub()
+            if self._vis.data[MJPEG_ENCODERS].get(self._key) is self:
+                del self._vis.data[MJPEG_ENCODERS][self._key]
+            LOGGER.debug(
+                f"Stopped MJPEG encoder for camera {self._nvr.camera.identifier}, "
+                f"config: {self._mjpeg_stream_config}"
+            )
+
+    def _update_encode_time(self, encode_time: float) -> None:
+        """Update the moving average of the encode time."""
+        self._frames += 1
+        if self._encode_time is None:
+            self._encode_time = encode_time
+            return
+        self._encode_time += ENCODE_TIME_SMOOTHING * (encode_time - self._encode_time)
+
+
+def get_mjpeg_encoder(
+    vis: Viseron, nvr: NVR, mjpeg_stream_config: dict, ioloop: IOLoop
+) -> MJPEGEncoder:
+    """Return the encoder of the stream profile, creating it if needed."""
+    encoders: dict[Hashable, MJPEGEncoder] = vis.data[MJPEG_ENCODERS]
+    encoder = encoders.get(profile_key(nvr.camera.identifier, mjpeg_stream_config))
+    if encoder is None:
+        encoder = MJPEGEncoder(vis, nvr, mjpeg_stream_config, ioloop)
+    return encoder
@@ -4,32 +4,17 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from dataclasses import dataclass
 from http import HTTPStatus
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING
 
-import cv2
-import imutils
 import tornado.ioloop
 import tornado.web
-from tornado.queues import Queue
 
-from viseron.components.nvr.const import EVENT_PROCESSED_FRAME_TOPIC
-from viseron.const import TOPIC_STATIC_MJPEG_STREAMS
 from viseron.domains.camera.config import MJPEG_STREAM_SCHEMA
-from viseron.domains.motion_detector import AbstractMotionDetectorScanner
-from viseron.events import EventData
 from viseron.exceptions import DomainNotRegisteredError
-from viseron.helpers import (
-    draw_contours,
-    draw_motion_mask,
-    draw_object_mask,
-    draw_objects,
-    draw_post_processor_mask,
-    draw_zones,
-)
 from viseron.viseron_types import Domain
 
+from .mjpeg_encoder import get_mjpeg_encoder
 from .request_handler import ViseronRequestHandler
 
 LOGGER = logging.getLogger(__name__)
@@ -38,10 +23,7 @@ BOUNDARY = "--jpgboundary"
 MAX_CAMERA_LOOKUP_TRIES = 60
 
 if TYPE_CHECKING:
-    import numpy as np
-
-    from viseron.components.nvr.nvr import NVR, EventProcessedFrame
-    from viseron.events import Event
+    from .mjpeg_encoder import MJPEGEncoder
 
 
 class StreamHandler(ViseronRequestHandler):
@@ -90,81 +72,29 @@ class StreamHandler(ViseronRequestHandler):
         )
         self.set_header("Pragma", "no-cache")
 
-    async def write_jpg(self, jpg: np.ndarray) -> None:
+    async def write_jpg(self, jpg: bytes) -> None:
         """Set the headers and write the jpg data."""
         self.write(f"{BOUNDARY}\r\n")
         self.write("Content-type: image/jpeg\r\n")
         self.write(f"Content-length: {len(jpg)}\r\n\r\n")
-        self.write(jpg.tobytes())
+        self.write(jpg)
         await self.flush()
 
-    @staticmethod
-    def process_frame(
-        nvr: NVR, processed_frame: EventProcessedFrame, mjpeg_stream_config: dict
-    ) -> tuple[bool, np.ndarray]:
-        """Return JPG with drawn objects, zones etc."""
-        _frame = processed_frame.frame.copy()
-
-        if mjpeg_stream_config["width"] and mjpeg_stream_config["height"]:
-            resolution = mjpeg_stream_config["width"], mjpeg_stream_config["height"]
-            frame = cv2.resize(
-                _frame,
-                resolution,
-                interpolation=cv2.INTER_LINEAR,
-            )
-        else:
-            resolution = nvr.camera.resolution
-            frame = _frame
-
-        if nvr.motion_detector and isinstance(
-            nvr.motion_detector, AbstractMotionDetectorScanner
+    async def stream(self, encoder: MJPEGEncoder) -> None:
+        """Write the JPGs published by encoder until the client disconnects."""
+        jpg_queue = encoder.subscribe()
+        self._set_stream_headers()
+        try:
+            while True:
+                jpg = await jpg_queue.get()
+                await self.write_jpg(jpg)
+        except (
+            tornado.iostream.StreamClosedError,
+            asyncio.exceptions.CancelledError,
         ):
-            if mjpeg_stream_config["draw_motion_mask"] and nvr.motion_detector.mask:
-                draw_motion_mask(
-                    frame,
-                    nvr.motion_detector.mask,
-                )
-            if mjpeg_stream_config["draw_motion"] and processed_frame.motion_contours:
-                draw_contours(
-                    frame,
-                    processed_frame.motion_contours,
-                    resolution,
-                    nvr.motion_detector.area,
-                )
-
-        if nvr.object_detector:
-            if mjpeg_stream_config["draw_zones"]:
-                draw_zones(frame, nvr.object_detector.zones)
-
-            if mjpeg_stream_config["draw_object_mask"] and nvr.object_detector.mask:
-                draw_object_mask(
-                    frame,
-                    nvr.object_detector.mask,
-                )
-            if mjpeg_stream_config["draw_objects"] and processed_frame.objects_in_fov:
-                draw_objects(
-                    frame,
-                    processed_frame.objects_in_fov,
-                    resolution=resolution,
-                )
-
-        for domain, post_processor in nvr.post_processors.items():
-            if mjpeg_stream_config["draw_post_processor_mask"] and post_processor.mask:
-                draw_post_processor_mask(
-                    frame,
-                    domain,
-                    post_processor.mask,
-                )
-
-        if mjpeg_stream_config["rotate"]:
-            frame = imutils.rotate_bound(frame, mjpeg_stream_config["rotate"])
-
-        if mjpeg_stream_config["mirror"]:
-            frame = cv2.flip(frame, 1)
-
-        # Write a low quality image to save bandwidth
-        ret, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 100])
-        return ret, jpg
+            pass
+        finally:
+            encoder.unsubscribe(jpg_queue)
 
 
 class DynamicStreamHandler(StreamHandler):
@@ -191,76 +121,14 @@ class DynamicStreamHandler(StreamHandler):
                 continue
             break
 
-        frame_queue: Queue[Event[EventProcessedFrame]] = Queue(maxsize=1)
-        unsub = self._vis.listen_event(
-            EVENT_PROCESSED_FRAME_TOPIC.format(camera_identifier=nvr.camera.identifier),
-            frame_queue,
-            ioloop=self.ioloop,
-        )
-
-        self._set_stream_headers()
-
-        while True:
-            try:
-                processed_frame = await frame_queue.get()
-                ret, jpg = await self.run_in_executor(
-                    self.process_frame, nvr, processed_frame.data, mjpeg_stream_config
-                )
-
-                if ret:
-                    await self.write_jpg(jpg)
-            except (
-                tornado.iostream.StreamClosedError,
-                asyncio.exceptions.CancelledError,
-            ):
-                unsub()
-                LOGGER.debug(f"Stream closed for camera {nvr.camera.identifier}")
-                break
-
-
-@dataclass
-class EventStaticStreamFrame(EventData):
-    """Event containing an annotated frame to output to a static MJPEG stream."""
-
-    frame: np.ndarray
+        encoder = get_mjpeg_encoder(self._vis, nvr, mjpeg_stream_config, self.ioloop)
+        await self.stream(encoder)
+        LOGGER.debug(f"Stream closed for camera {nvr.camera.identifier}")
 
 
 class StaticStreamHandler(StreamHandler):
     """Represents a static stream defined in config.yaml."""
 
-    active_streams: ClassVar[dict[tuple[str, str], int]] = {}
-
-    async def stream(
-        self,
-        nvr: NVR,
-        mjpeg_stream: str,
-        mjpeg_stream_config: dict,
-        publish_frame_topic: str,
-    ) -> None:
-        """Subscribe to frames, draw on them, then publish processed frame."""
-        frame_queue: Queue[Event[EventProcessedFrame]] = Queue(maxsize=1)
-        unsub = self._vis.listen_event(
-            EVENT_PROCESSED_FRAME_TOPIC.format(camera_identifier=nvr.camera.identifier),
-            frame_queue,
-            ioloop=self.ioloop,
-        )
-
-        while self.active_streams[(nvr.camera.identifier, mjpeg_stream)]:
-            processed_frame = await frame_queue.get()
-            ret, jpg = await self.run_in_executor(
-                self.process_frame, nvr, processed_frame.data, mjpeg_stream_config
-            )
-
-            if ret:
-                self._vis.dispatch_event(
-                    publish_frame_topic,
-                    EventStaticStreamFrame(frame=jpg),
-                    store=False,
-                )
-
-        unsub()
-        LOGGER.debug(f"Closing stream {mjpeg_stream}")
-
     async def get(self, camera: str, mjpeg_stream: str) -> None:
         """Handle GET request."""
         tries = 0
@@ -286,39 +154,6 @@ class StaticStreamHandler(StreamHandler):
             self.finish()
             return
 
-        frame_queue: Queue[Event[EventStaticStreamFrame]] = Queue(maxsize=1)
-        frame_topic = (
-            f"{TOPIC_STATIC_MJPEG_STREAMS}/{nvr.camera.identifier}/{mjpeg_stream}"
-        )
-        unsub = self._vis.listen_event(
-            frame_topic,
-            frame_queue,
-            ioloop=self.ioloop,
-        )
-
-        if self.active_streams.get((nvr.camera.identifier, mjpeg_stream), False):
-            self.active_streams[(nvr.camera.identifier, mjpeg_stream)] += 1
-            LOGGER.debug(
-                f"Stream {mjpeg_stream} already active, number of streams: "
-                f"{self.active_streams[(nvr.camera.identifier, mjpeg_stream)]}"
-            )
-        else:
-            LOGGER.debug(f"Stream {mjpeg_stream} is not active, starting")
-            self.active_streams[(nvr.camera.identifier, mjpeg_stream)] = 1
-            self.ioloop.add_callback(
-                self.stream, nvr, mjpeg_stream, mjpeg_stream_config, frame_topic
-            )
-
-        self._set_stream_headers()
-
-        while True:
-            try:
-                jpg = await frame_queue.get()
-                await self.write_jpg(jpg.data.frame)
-            except tornado.iostream.StreamClosedError:
-                unsub()
-                LOGGER.debug(
-                    f"Stream {mjpeg_stream} closed for camera {nvr.camera.identifier}"
-                )
-                break
-        self.active_streams[(nvr.camera.identifier, mjpeg_stream)] -= 1
+        encoder = get_mjpeg_encoder(self._vis, nvr, mjpeg_stream_config, self.ioloop)
+        await self.stream(encoder)
+        LOGGER.debug(f"Stream {mjpeg_stream} closed for camera {nvr.camera.identifier}")
@@ -5,13 +5,14 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
 from functools import partial
 from typing import TYPE_CHECKING, Any
 
 import tornado.websocket
 import voluptuous as vol
-from tornado.queues import Queue
 from voluptuous.humanize import humanize_error
 
 from viseron.components.webserver.const import (
@@ -36,13 +37,24 @@ from .messages import (
     auth_required_message,
     error_message,
     invalid_error_message,
+    subscription_result_json,
 )
 
 if TYPE_CHECKING:
+    from tornado.ioloop import IOLoop
+
     from viseron import Viseron
+    from viseron.events import Event
 
 LOGGER = logging.getLogger(__name__)
 
+# Max number of subscription events waiting to be written to a connection
+MESSAGE_BUFFER_SIZE = 256
+
+# Events that are being serialized, by id. Connections sending the same event
+# while it is being serialized wait for the same result
+_pending_events: dict[int, asyncio.Future[str]] = {}
+
 AUTH_MESSAGE_SCHEMA = vol.Schema(
     {
         vol.Required("type"): "auth",
@@ -51,6 +63,92 @@ AUTH_MESSAGE_SCHEMA = vol.Schema(
 )
 
 
+@dataclass
+class SubscriptionEvent:
+    """An event to send as a subscription result.
+
+    Events with the same coalesce_key supersede each other.
+    """
+
+    command_id: int
+    event: Event
+    coalesce_key: Hashable | None = None
+
+
+Message = str | dict[str, Any] | SubscriptionEvent | None
+
+
+class MessageBuffer:
+    """Bounded buffer of messages waiting to be written to a connection.
+
+    When the buffer is full, a subscription event replaces the buffered event with
+    the same coalesce key, and other subscription events are dropped.
+    All other messages, like command results, are always buffered.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._messages: deque[Message] = deque()
+        self._coalescable: dict[Hashable, SubscriptionEvent] = {}
+        self._not_empty = asyncio.Event()
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered messages."""
+        return len(self._messages)
+
+    def empty(self) -> bool:
+        """Return True if there are no buffered messages."""
+        return not self._messages
+
+    def put(self, message: Message) -> None:
+        """Buffer a message."""
+        if isinstance(message, SubscriptionEvent):
+            if len(self._messages) >= self._maxsize:
+                if (
+                    message.coalesce_key is not None
+                    and message.coalesce_key in self._coalescable
+                ):
+                    self._coalescable[message.coalesce_key].event = message.event
+                    self.coalesced += 1
+                    return
+                self.dropped += 1
+                return
+            if message.coalesce_key is not None:
+                self._coalescable[message.coalesce_key] = message
+
+        self._messages.append(message)
+        self._not_empty.set()
+
+    async def get(self) -> Message:
+        """Wait for and return the oldest message."""
+        while not self._messages:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        message = self._messages.popleft()
+        if (
+            isinstance(message, SubscriptionEvent)
+            and message.coalesce_key is not None
+            and self._coalescable.get(message.coalesce_key) is message
+        ):
+            del self._coalescable[message.coalesce_key]
+        return message
+
+
+async def async_event_json(ioloop: IOLoop, event: Event) -> str:
+    """Serialize event once, no matter how many connections it is sent to."""
+    if (event_json := event.cached_json) is not None:
+        return event_json
+
+    if (future := _pending_events.get(id(event))) is None:
+        future = ioloop.run_in_executor(None, event.as_json)
+        _pending_events[id(event)] = future
+        future.add_done_callback(lambda _: _pending_events.pop(id(event), None))
+    return await future
+
+
 class WebSocketHandler(ViseronRequestHandler, tornado.websocket.WebSocketHandler):
     """Websocket handler."""
 
@@ -61,7 +159,7 @@ class WebSocketHandler(ViseronRequestHandler, tornado.websocket.WebSocketHandler
         self._last_id = 0
         self.subscriptions: dict[int, Callable[[], None]] = {}
 
-        self._message_queue: Queue[str | dict[str, Any] | None] = Queue()
+        self._message_buffer = MessageBuffer(MESSAGE_BUFFER_SIZE)
         self._waiting_for_auth = True
         self._writer_task: asyncio.Task | None = None
         self._writer_exited = False
@@ -75,11 +173,32 @@ class WebSocketHandler(ViseronRequestHandler, tornado.websocket.WebSocketHandler
             return partial(json.dumps, cls=JSONEncoder, allow_nan=False)(message)
 
         while True:
-            if (message := await self._message_queue.get()) is None:
+            if (message := await self._message_buffer.get()) is None:
                 break
 
             # LOGGER.debug("Sending message {message}".format(message=message))
 
+            if isinstance(message, SubscriptionEvent):
+                try:
+                    event_json = await async_event_json(self.ioloop, message.event)
+                except (ValueError, TypeError):
+                    LOGGER.error(
+                        f"Unable to serialize to JSON. Object: {message.event}",
+                        exc_info=True,
+                    )
+                    await self.write_message(
+                        error_message(
+                            message.command_id,
+                            WS_ERROR_UNKNOWN_ERROR,
+                            "Invalid JSON in response",
+                        )
+                    )
+                    continue
+                await self.write_message(
+                    subscription_result_json(message.command_id, event_json)
+                )
+                continue
+
             if isinstance(message, dict):
                 try:
                     json_message = await self.run_in_executor(_json_dumps, message)
@@ -113,7 +232,27 @@ class WebSocketHandler(ViseronRequestHandler, tornado.websocket.WebSocketHandler
 
     async def async_send_message(self, message) -> None:
         """Send message to client."""
-        await self._message_queue.put(message)
+        self._message_buffer.put(message)
+
+    async def async_send_event(
+        self, command_id: int, event: Event, coalesce_key: Hashable | None = None
+    ) -> None:
+        """Send event as a subscription result to client.
+
+        The event is serialized once and shared with all other connections it is
+        sent to. A buffered event with the same coalesce_key is replaced by this
+        event if the client is too slow to keep up.
+        """
+        self._message_buffer.put(SubscriptionEvent(command_id, event, coalesce_key))
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        """Return metrics of the outgoing messages."""
+        return {
+            "buffered": len(self._message_buffer),
+            "dropped": self._message_buffer.dropped,
+            "coalesced": self._message_buffer.coalesced,
+        }
 
     def handle_auth(self, message):
         """Handle auth message."""
@@ -260,10 +399,10 @@ class WebSocketHandler(ViseronRequestHandler, tornado.websocket.WebSocketHandler
         for unsub in self.subscriptions.values():
             unsub()
 
-        self._message_queue.put(None)
+        self._message_buffer.put(None)
         # Wait until queue is empty
         while True:
-            if self._message_queue.empty() and self._writer_exited:
+            if self._message_buffer.empty() and self._writer_exited:
                 break
             await asyncio.sleep(0.5)
         self.vis.data[WEBSOCKET_CONNECTIONS].remove(self)
@@ -275,7 +414,7 @@ class WebSocketHandler(ViseronRequestHandler, tornado.websocket.WebSocketHandler
         for unsub in self.subscriptions.values():
             unsub()
 
-        self._message_queue.put(None)
+        self._message_buffer.put(None)
         if self._writer_task:
             self._writer_task.cancel()
         self.vis.data[WEBSOCKET_CONNECTIONS].remove(self)
@@ -157,9 +157,7 @@ async def subscribe_event(connection: WebSocketHandler, message) -> None:
 
     async def forward_event(event: Event) -> None:
         """Forward event to WebSocket connection."""
-        await connection.async_send_message(
-            subscription_result_message(message["command_id"], event)
-        )
+        await connection.async_send_event(message["command_id"], event)
 
     @debounce(
         wait=message["debounce"],
@@ -216,21 +214,20 @@ async def subscribe_states(connection: WebSocketHandler, message) -> None:
     """Subscribe to state changes for one or multiple entities."""
 
     async def forward_state_change(event: Event[EventStateChangedData]) -> None:
-        """Forward state_changed event to WebSocket connection."""
-        if "entity_id" in message:
-            if event.data.entity_id == message["entity_id"]:
-                await connection.async_send_message(
-                    subscription_result_message(message["command_id"], event)
-                )
+        """Forward state_changed event to WebSocket connection.
+
+        Only the latest state of an entity matters, so superseded state changes are
+        coalesced if the client falls behind.
+        """
+        entity_id = event.data.entity_id
+        if "entity_id" in message and entity_id != message["entity_id"]:
             return
-        if "entity_ids" in message:
-            if event.data.entity_id in message["entity_ids"]:
-                await connection.async_send_message(
-                    subscription_result_message(message["command_id"], event)
-                )
+        if "entity_ids" in message and entity_id not in message["entity_ids"]:
             return
-        await connection.async_send_message(
-            subscription_result_message(message["command_id"], event)
+        await connection.async_send_event(
+            message["command_id"],
+            event,
+            coalesce_key=(message["command_id"], entity_id),
         )
 
     connection.subscriptions[message["command_id"]] = connection.vis.listen_event(
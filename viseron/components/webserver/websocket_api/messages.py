@@ -112,6 +112,17 @@ def subscription_result_message(
     }
 
 
+def subscription_result_json(command_id: int, result_json: str) -> str:
+    """Return a subscription result message with an already serialized result.
+
+    Lets the same serialized result be shared by all connections.
+    """
+    return (
+        f'{{"command_id": {command_id}, "type": "{TYPE_SUBSCRIPTION_RESULT}", '
+        f'"success": true, "result": {result_json}}}'
+    )
+
+
 def subscription_error_message(
     command_id: int, code: str, message: str
 ) -> dict[str, Any]:
@@ -2,43 +2,65 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from queue import Empty, Queue
+from typing import TYPE_CHECKING, Any, cast
 
 import voluptuous as vol
+from ultralytics import YOLO
 
+from viseron.const import VISERON_SIGNAL_SHUTDOWN
 from viseron.domains import RequireDomain, setup_domain
 from viseron.domains.object_detector import (
     BASE_CONFIG_SCHEMA as OBJECT_DETECTOR_BASE_CONFIG_SCHEMA,
 )
+from viseron.domains.object_detector.batch_metrics import BatchMetrics
 from viseron.domains.object_detector.const import CONFIG_CAMERAS
-from viseron.helpers.schemas import FLOAT_MIN_ZERO_MAX_ONE
+from viseron.exceptions import ComponentNotReady
+from viseron.helpers.schemas import FLOAT_MIN_ZERO, FLOAT_MIN_ZERO_MAX_ONE
 from viseron.helpers.validators import Maybe
+from viseron.watchdog.thread_watchdog import RestartableThread
 
 from .const import (
     COMPONENT,
+    CONFIG_BATCH_TIMEOUT,
     CONFIG_DEVICE,
     CONFIG_HALF_PRECISION,
     CONFIG_IOU,
+    CONFIG_MAX_BATCH,
     CONFIG_MIN_CONFIDENCE,
     CONFIG_MODEL_PATH,
     CONFIG_OBJECT_DETECTOR,
+    DEFAULT_BATCH_TIMEOUT,
     DEFAULT_DEVICE,
     DEFAULT_HALF_PRECISION,
     DEFAULT_IOU,
+    DEFAULT_MAX_BATCH,
     DEFAULT_MIN_CONFIDENCE,
     DEFAULT_MODEL_PATH,
+    DESC_BATCH_TIMEOUT,
     DESC_COMPONENT,
     DESC_DEVICE,
     DESC_HALF_PRECISION,
     DESC_IOU,
+    DESC_MAX_BATCH,
     DESC_MIN_CONFIDENCE,
     DESC_MODEL_PATH,
     DESC_OBJECT_DETECTOR,
 )
 
 if TYPE_CHECKING:
+    import numpy as np
+    from ultralytics.engine.results import Results
+
     from viseron import Viseron
 
+LOGGER = logging.getLogger(__name__)
+
 OBJECT_DETECTOR_SCHEMA = OBJECT_DETECTOR_BASE_CONFIG_SCHEMA.extend(
     {
         vol.Required(
@@ -66,6 +88,16 @@ OBJECT_DETECTOR_SCHEMA = OBJECT_DETECTOR_BASE_CONFIG_SCHEMA.extend(
             default=DEFAULT_DEVICE,
             description=DESC_DEVICE,
         ): Maybe(str),
+        vol.Optional(
+            CONFIG_MAX_BATCH,
+            default=DEFAULT_MAX_BATCH,
+            description=DESC_MAX_BATCH,
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONFIG_BATCH_TIMEOUT,
+            default=DEFAULT_BATCH_TIMEOUT,
+            description=DESC_BATCH_TIMEOUT,
+        ): FLOAT_MIN_ZERO,
     }
 )
 
@@ -83,6 +115,16 @@ CONFIG_SCHEMA = vol.Schema(
 )
 
 
+def setup(vis: Viseron, config: dict[str, Any]) -> bool:
+    """Set up the YOLO component."""
+    config = config[COMPONENT]
+
+    if config.get(CONFIG_OBJECT_DETECTOR, None):
+        vis.data[COMPONENT] = YOLOInference(vis, config[CONFIG_OBJECT_DETECTOR])
+
+    return True
+
+
 def setup_domains(vis: Viseron, config: dict[str, Any]) -> None:
     """Set up YOLO domains."""
     config = config[COMPONENT]
@@ -102,3 +144,135 @@ def setup_domains(vis: Viseron, config: dict[str, Any]) -> None:
                     )
                 ],
             )
+
+
+def unload(vis: Viseron) -> None:
+    """Unload the YOLO component."""
+    if COMPONENT in vis.data:
+        vis.data[COMPONENT].stop()
+        del vis.data[COMPONENT]
+
+
+@dataclass
+class InferenceJob:
+    """A frame waiting for inference."""
+
+    frame: np.ndarray
+    queued_at: float = field(default_factory=time.perf_counter)
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Results | None = None
+    error: Exception | None = None
+
+
+class YOLOInference:
+    """YOLO model shared by the object detectors of all cameras.
+
+    The model is loaded once. Frames from all cameras are queued and a single
+    inference thread runs predict on batches of up to max_batch frames, waiting at
+    most batch_timeout seconds for a batch to fill up.
+    """
+
+    def __init__(self, vis: Viseron, config: dict[str, Any]) -> None:
+        self._config = config
+        try:
+            model = Path(config[CONFIG_MODEL_PATH])
+            self.model = YOLO(model)
+        except Exception as error:
+            LOGGER.error("YOLO model file not loaded: %s", error)
+            raise ComponentNotReady from error
+
+        LOGGER.info(f"Loaded YOLO model: {model}")
+        LOGGER.info(f"Labels: {self.model.names}")
+
+        self._max_batch: int = config[CONFIG_MAX_BATCH]
+        self._batch_timeout: float = config[CONFIG_BATCH_TIMEOUT]
+        self._queue: Queue[InferenceJob] = Queue()
+        self.batch_metrics = BatchMetrics(vis, COMPONENT)
+
+        self._kill_received = False
+        self._thread = RestartableThread(
+            target=self._run,
+            name=f"{COMPONENT}.inference",
+            register=True,
+            daemon=True,
+        )
+        self._thread.start()
+        vis.register_signal_handler(VISERON_SIGNAL_SHUTDOWN, self.stop)
+
+    def predict(self, frame: np.ndarray) -> Results | None:
+        """Run inference on frame and block until the result is available.
+
+        Exceptions raised by predict are re-raised in the calling thread.
+        Returns None if inference is stopped before the frame is processed.
+        """
+        if self._kill_received:
+            return None
+        job = InferenceJob(frame)
+        self._queue.put(job)
+        # A job queued while stopping might never be processed, so stop waiting
+        # once stopped
+        while not job.done.wait(timeout=1) and not self._kill_received:
+            pass
+        if not job.done.is_set():
+            return None
+        if job.error:
+            raise job.error
+        return job.result
+
+    def _get_batch(self) -> list[InferenceJob]:
+        """Block for one job, then collect up to max_batch jobs."""
+        jobs = [self._queue.get(timeout=1)]
+        deadline = time.monotonic() + self._batch_timeout
+        while len(jobs) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return jobs
+
+    def _run(self) -> None:
+        """Run inference on batches of queued frames."""
+        while not self._kill_received:
+            try:
+                jobs = self._get_batch()
+            except Empty:
+                continue
+            self._infer(jobs)
+
+    def _infer(self, jobs: list[InferenceJob]) -> None:
+        """Run predict on a batch and hand the results back to each job."""
+        started_at = time.perf_counter()
+        try:
+            results = self.model.predict(
+                [job.frame for job in jobs],
+                conf=self._config[CONFIG_MIN_CONFIDENCE],
+                iou=self._config[CONFIG_IOU],
+                half=self._config[CONFIG_HALF_PRECISION],
+                device=self._config[CONFIG_DEVICE],
+                verbose=False,
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            for job in jobs:
+                job.error = error
+                job.done.set()
+            return
+
+        for job, result in zip(jobs, results):
+            self.batch_metrics.add(len(jobs), started_at - job.queued_at)
+            # predict returns a list of Results when not streaming
+            job.result = cast("Results", result)
+            job.done.set()
+
+    def stop(self) -> None:
+        """Stop the inference thread and release waiting detectors."""
+        self._kill_received = True
+        self.batch_metrics.unregister()
+        self._thread.stop()
+        while True:
+            try:
+                self._queue.get_nowait().done.set()
+            except Empty:
+                break
@@ -12,12 +12,16 @@ CONFIG_MIN_CONFIDENCE = "min_confidence"
 CONFIG_IOU = "iou"
 CONFIG_HALF_PRECISION = "half_precision"
 CONFIG_DEVICE = "device"
+CONFIG_MAX_BATCH = "max_batch"
+CONFIG_BATCH_TIMEOUT = "batch_timeout"
 
 DEFAULT_MODEL_PATH: Final = None
 DEFAULT_MIN_CONFIDENCE = 0.25
 DEFAULT_IOU = 0.7
 DEFAULT_HALF_PRECISION = False
 DEFAULT_DEVICE: Final = None
+DEFAULT_MAX_BATCH = 1
+DEFAULT_BATCH_TIMEOUT = 0.01
 
 DESC_COMPONENT = "YOLO configuration."
 DESC_OBJECT_DETECTOR = "Object detector domain config."
@@ -34,3 +38,12 @@ DESC_HALF_PRECISION = (
     "If your GPU supports FP16, enabling this might give you a performance increase."
 )
 DESC_DEVICE = "Specifies the device for inference (e.g., cpu, cuda:0 or 0)."
+DESC_MAX_BATCH = (
+    "Maximum number of frames, from different cameras, to run through the model "
+    "in a single <code>predict</code> call.<br>"
+    "A value of 1 disables batching."
+)
+DESC_BATCH_TIMEOUT = (
+    "Maximum time in seconds to wait for more frames to arrive before running an "
+    "incomplete batch.<br>Only used when <code>max_batch</code> is larger than 1."
+)
@@ -1,27 +1,22 @@
 """YOLO object detector."""
 
+from __future__ import annotations
+
 import logging
-from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
-from ultralytics import YOLO
-from ultralytics.engine.results import Results
 
-from viseron import Viseron
 from viseron.domains.object_detector import AbstractObjectDetector
 from viseron.domains.object_detector.detected_object import DetectedObject
-from viseron.exceptions import DomainNotReady
-
-from .const import (
-    COMPONENT,
-    CONFIG_DEVICE,
-    CONFIG_HALF_PRECISION,
-    CONFIG_IOU,
-    CONFIG_MIN_CONFIDENCE,
-    CONFIG_MODEL_PATH,
-    CONFIG_OBJECT_DETECTOR,
-)
+
+from .const import COMPONENT, CONFIG_OBJECT_DETECTOR
+
+if TYPE_CHECKING:
+    from ultralytics.engine.results import Results
+
+    from viseron import Viseron
+    from viseron.components.yolo import YOLOInference
 
 LOGGER = logging.getLogger(__name__)
 
@@ -34,7 +29,10 @@ def setup(vis: Viseron, config: dict[str, Any], identifier: str) -> bool:
 
 
 class ObjectDetector(AbstractObjectDetector):
-    """YOLO object detection."""
+    """YOLO object detection.
+
+    Inference runs on the YOLOInference instance shared by all cameras.
+    """
 
     def __init__(
         self, vis: Viseron, config: dict[str, Any], camera_identifier: str
@@ -42,16 +40,7 @@ class ObjectDetector(AbstractObjectDetector):
         super().__init__(
             vis, COMPONENT, config[CONFIG_OBJECT_DETECTOR], camera_identifier
         )
-
-        try:
-            model = Path(self._config[CONFIG_MODEL_PATH])
-            self._detector = YOLO(model)
-        except Exception as error:
-            LOGGER.error("YOLO model file not loaded: %s", error)
-            raise DomainNotReady from error
-
-        LOGGER.info(f"Loaded YOLO model: {model}")
-        LOGGER.info(f"Labels: {self._detector.names}")
+        self._inference: YOLOInference = vis.data[COMPONENT]
 
     def preprocess(self, frame: np.ndarray) -> np.ndarray:
         """Preprocess frame before detection."""
@@ -89,21 +78,11 @@ class ObjectDetector(AbstractObjectDetector):
     def return_objects(self, frame: np.ndarray) -> list[DetectedObject]:
         """Perform object detection."""
         try:
-            results = self._detector.predict(
-                frame,
-                conf=self._config[CONFIG_MIN_CONFIDENCE],
-                iou=self._config[CONFIG_IOU],
-                half=self._config[CONFIG_HALF_PRECISION],
-                device=self._config[CONFIG_DEVICE],
-                verbose=False,
-            )
+            result = self._inference.predict(frame)
         except ValueError as error:
             LOGGER.error(f"Error calling yolo prediction check yolo config: {error}")
             return []
 
-        return self.postprocess(results)
-
-    def unload(self) -> None:
-        """Unload the object detector."""
-        super().unload()
-        del self._detector
+        if result is None:
+            return []
+        return self.postprocess([result])
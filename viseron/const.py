@@ -112,7 +112,6 @@ FONT_THICKNESS = 1
 
 MIN_LABEL_Y_POSITION = 10
 
-TOPIC_STATIC_MJPEG_STREAMS = "static_mjepg_streams"
 
 # Viseron.data constants
 LOADING: Final = "loading"
@@ -8,7 +8,7 @@ import secrets
 from abc import abstractmethod
 from collections import deque
 from dataclasses import dataclass
-from functools import lru_cache
+from functools import lru_cache, partial
 from threading import Event, Timer
 from typing import TYPE_CHECKING, Any, Literal
 from uuid import uuid4
@@ -28,6 +28,7 @@ from viseron.components.storage.const import (
     TIER_SUBCATEGORY_THUMBNAILS,
 )
 from viseron.components.storage.models import Files
+from viseron.components.storage.queries import delete_snapshot_rows
 from viseron.components.webserver.const import COMPONENT as WEBSERVER_COMPONENT
 from viseron.const import TEMP_DIR
 from viseron.domain_registry import DomainEntry, DomainState
@@ -40,7 +41,6 @@ from viseron.events import EventData, EventEmptyData
 from viseron.helpers import (
     annotate_frame,
     calculate_absolute_coords,
-    create_directory,
     draw_objects,
     escape_string,
     utcnow,
@@ -56,6 +56,7 @@ from .const import (
     CONFIG_NAME,
     CONFIG_PASSWORD,
     CONFIG_REFRESH_INTERVAL,
+    CONFIG_SNAPSHOT_QUALITY,
     CONFIG_STILL_IMAGE,
     CONFIG_STILL_IMAGE_HEIGHT,
     CONFIG_STILL_IMAGE_WIDTH,
@@ -77,10 +78,13 @@ from .entity.binary_sensor import (
 )
 from .entity.toggle import CameraConnectionToggle
 from .shared_frames import SharedFrames
+from .snapshot_writer import get_snapshot_writer
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    import numpy as np
+
     from viseron import Viseron
     from viseron.components.nvr.nvr import FrameIntervalCalculator
     from viseron.components.storage.models import TriggerTypes
@@ -140,6 +144,7 @@ class AbstractCamera(AbstractDomain):
         self.stopped.set()
         self.current_frame: SharedFrame | None = None
         self.shared_frames = SharedFrames(vis)
+        self._snapshot_writer = get_snapshot_writer(vis)
         self.frame_bytes_topic = EVENT_FRAME_BYTES_TOPIC.format(
             camera_identifier=self.identifier
         )
@@ -515,17 +520,15 @@ class AbstractCamera(AbstractDomain):
             return self.snapshots_motion_folder
         assert_never(domain)
 
-    def save_snapshot(
+    def _render_snapshot(
         self,
         shared_frame: SharedFrame,
-        domain: SnapshotDomain,
-        zoom_coordinates: tuple[float, float, float, float] | None = None,
-        detected_object: DetectedObject | None = None,
-        bbox: tuple[float, float, float, float] | None = None,
-        text: str | None = None,
-        subfolder: str | None = None,
-    ) -> str:
-        """Save snapshot to disk."""
+        zoom_coordinates: tuple[float, float, float, float] | None,
+        detected_object: DetectedObject | None,
+        bbox: tuple[float, float, float, float] | None,
+        text: str | None,
+    ) -> np.ndarray:
+        """Return frame with the object and bbox drawn, zoomed in if requested."""
         decoded_frame = self.shared_frames.get_decoded_frame_rgb(shared_frame)
         snapshot_frame = decoded_frame
 
@@ -544,19 +547,65 @@ class AbstractCamera(AbstractDomain):
                 calculate_absolute_coords(zoom_coordinates, self.resolution),
                 crop_correction_factor=1.2,
             )
+        return snapshot_frame
 
+    def snapshot_path(
+        self, domain: SnapshotDomain, subfolder: str | None = None
+    ) -> str:
+        """Return a new path for a snapshot of domain."""
         folder = self._get_folder(domain)
 
         if subfolder:
             folder = os.path.join(folder, subfolder)
 
         filename = f"{utcnow().strftime('%Y-%m-%d-%H-%M-%S-')}{uuid4()!s}.jpg"
+        return os.path.join(folder, filename)
+
+    def save_snapshot(
+        self,
+        shared_frame: SharedFrame,
+        domain: SnapshotDomain,
+        path: str,
+        zoom_coordinates: tuple[float, float, float, float] | None = None,
+        detected_object: DetectedObject | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+        text: str | None = None,
+    ) -> None:
+        """Save snapshot to path, which is returned by snapshot_path.
 
-        path = os.path.join(folder, filename)
+        The snapshot is written by the snapshot writer in the background. Domains
+        that save the same snapshot of a frame share a single encoded JPEG.
+        Rows referencing path have to be inserted before calling this, since they
+        are deleted if the snapshot is never written, the same way as when the
+        snapshot file is deleted.
+        """
         self._logger.debug(f"Saving snapshot to {path}")
-        create_directory(folder)
-        cv2.imwrite(path, snapshot_frame, [int(cv2.IMWRITE_JPEG_QUALITY), 100])
-        return path
+        self._snapshot_writer.write(
+            path,
+            (
+                shared_frame.name,
+                zoom_coordinates,
+                (
+                    detected_object.label,
+                    detected_object.confidence,
+                    detected_object.rel_coordinates,
+                )
+                if detected_object
+                else None,
+                bbox,
+                text,
+            ),
+            partial(
+                self._render_snapshot,
+                shared_frame,
+                zoom_coordinates,
+                detected_object,
+                bbox,
+                text,
+            ),
+            self._config[CONFIG_SNAPSHOT_QUALITY],
+            partial(delete_snapshot_rows, self._storage.get_session, domain.value),
+        )
 
     def unload(self) -> None:
         """Unload camera."""
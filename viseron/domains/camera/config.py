@@ -42,6 +42,7 @@ from .const import (
     CONFIG_MJPEG_DRAW_ZONES,
     CONFIG_MJPEG_HEIGHT,
     CONFIG_MJPEG_MIRROR,
+    CONFIG_MJPEG_QUALITY,
     CONFIG_MJPEG_ROTATE,
     CONFIG_MJPEG_STREAMS,
     CONFIG_MJPEG_WIDTH,
@@ -51,6 +52,7 @@ from .const import (
     CONFIG_REFRESH_INTERVAL,
     CONFIG_RETAIN,
     CONFIG_SAVE_TO_DISK,
+    CONFIG_SNAPSHOT_QUALITY,
     CONFIG_STILL_IMAGE,
     CONFIG_STILL_IMAGE_HEIGHT,
     CONFIG_STILL_IMAGE_WIDTH,
@@ -74,6 +76,7 @@ from .const import (
     DEFAULT_MJPEG_DRAW_ZONES,
     DEFAULT_MJPEG_HEIGHT,
     DEFAULT_MJPEG_MIRROR,
+    DEFAULT_MJPEG_QUALITY,
     DEFAULT_MJPEG_ROTATE,
     DEFAULT_MJPEG_STREAMS,
     DEFAULT_MJPEG_WIDTH,
@@ -82,6 +85,7 @@ from .const import (
     DEFAULT_RECORDER,
     DEFAULT_REFRESH_INTERVAL,
     DEFAULT_SAVE_TO_DISK,
+    DEFAULT_SNAPSHOT_QUALITY,
     DEFAULT_STILL_IMAGE,
     DEFAULT_STILL_IMAGE_HEIGHT,
     DEFAULT_STILL_IMAGE_WIDTH,
@@ -112,6 +116,7 @@ from .const import (
     DESC_MJPEG_DRAW_ZONES,
     DESC_MJPEG_HEIGHT,
     DESC_MJPEG_MIRROR,
+    DESC_MJPEG_QUALITY,
     DESC_MJPEG_ROTATE,
     DESC_MJPEG_STREAM,
     DESC_MJPEG_STREAMS,
@@ -122,6 +127,7 @@ from .const import (
     DESC_REFRESH_INTERVAL,
     DESC_RETAIN,
     DESC_SAVE_TO_DISK,
+    DESC_SNAPSHOT_QUALITY,
     DESC_STILL_IMAGE,
     DESC_STILL_IMAGE_HEIGHT,
     DESC_STILL_IMAGE_WIDTH,
@@ -189,6 +195,11 @@ MJPEG_STREAM_SCHEMA = vol.Schema(
             default=DEFAULT_MJPEG_MIRROR,
             description=DESC_MJPEG_MIRROR,
         ): vol.Coerce(bool),
+        vol.Optional(
+            CONFIG_MJPEG_QUALITY,
+            default=DEFAULT_MJPEG_QUALITY,
+            description=DESC_MJPEG_QUALITY,
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
     }
 )
 
@@ -341,6 +352,11 @@ BASE_CONFIG_SCHEMA = vol.Schema(
             default=DEFAULT_STILL_IMAGE,
             description=DESC_STILL_IMAGE,
         ): vol.All(CoerceNoneToDict(), STILL_IMAGE_SCHEMA),
+        vol.Optional(
+            CONFIG_SNAPSHOT_QUALITY,
+            default=DEFAULT_SNAPSHOT_QUALITY,
+            description=DESC_SNAPSHOT_QUALITY,
+        ): vol.All(int, vol.Range(min=1, max=100)),
         vol.Optional(
             CONFIG_STORAGE,
             default=DEFAULT_STORAGE,
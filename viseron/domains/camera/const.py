@@ -12,6 +12,18 @@ MAX_ACCESS_TOKENS = 2
 VIDEO_CONTAINER = "mp4"
 MP4BOX_PATH = "/usr/bin/MP4Box"
 
+# Snapshot writer constants
+# Key in vis.data where the snapshot writer shared by all cameras is stored
+SNAPSHOT_WRITER: Final = "snapshot_writer"
+# Number of threads that encode and write snapshots
+SNAPSHOT_WRITER_WORKERS = 2
+# Snapshots waiting to be written before the oldest is dropped
+SNAPSHOT_WRITER_MAX_PENDING = 32
+# Number of recently rendered snapshots kept to reuse their encoded JPEG
+SNAPSHOT_WRITER_CACHE_SIZE = 8
+# Seconds to wait on shutdown for pending snapshots to be written
+SNAPSHOT_WRITER_STOP_TIMEOUT = 5
+
 # Event topic constants
 EVENT_CAMERA_STATUS = "{camera_identifier}/camera/status"
 EVENT_CAMERA_STATUS_DISCONNECTED = "disconnected"
@@ -41,6 +53,7 @@ CONFIG_MJPEG_DRAW_POST_PROCESSOR_MASK = "draw_post_processor_mask"
 CONFIG_MJPEG_DRAW_ZONES = "draw_zones"
 CONFIG_MJPEG_ROTATE = "rotate"
 CONFIG_MJPEG_MIRROR = "mirror"
+CONFIG_MJPEG_QUALITY = "quality"
 
 DEFAULT_MJPEG_WIDTH = 0
 DEFAULT_MJPEG_HEIGHT = 0
@@ -52,6 +65,7 @@ DEFAULT_MJPEG_DRAW_POST_PROCESSOR_MASK = False
 DEFAULT_MJPEG_DRAW_ZONES = False
 DEFAULT_MJPEG_ROTATE = 0
 DEFAULT_MJPEG_MIRROR = False
+DEFAULT_MJPEG_QUALITY = 100
 
 DESC_MJPEG_WIDTH = "Frame will be rezied to this width. Required if height is set."
 DESC_MJPEG_HEIGHT = "Frame will be rezied to this height. Required if width is set."
@@ -68,6 +82,10 @@ DESC_MJPEG_ROTATE = (
     "Positive/negative values rotate clockwise/counter clockwise respectively"
 )
 DESC_MJPEG_MIRROR = "If set, mirror the image horizontally."
+DESC_MJPEG_QUALITY = (
+    "JPEG quality of the stream, from 1 to 100. "
+    "Lower values save bandwidth and CPU at the cost of image quality."
+)
 
 
 # THUMBNAIL_SCHEMA constants
@@ -227,14 +245,21 @@ AUTHENTICATION_DIGEST = "digest"
 CONFIG_NAME = "name"
 CONFIG_MJPEG_STREAMS = "mjpeg_streams"
 CONFIG_RECORDER = "recorder"
+CONFIG_SNAPSHOT_QUALITY = "snapshot_quality"
 
 DEFAULT_NAME: Final = None
 DEFAULT_MJPEG_STREAMS: Final = None
 DEFAULT_RECORDER: Final = None
+DEFAULT_SNAPSHOT_QUALITY: Final = 100
 
 DESC_NAME = "Camera friendly name."
 DESC_MJPEG_STREAMS = "MJPEG streams config."
 DESC_RECORDER = "Recorder config."
+DESC_SNAPSHOT_QUALITY = (
+    "JPEG quality of snapshots saved by the object detector, motion detector and "
+    "post processors, from 1 to 100. Lower values save disk space and CPU at the "
+    "cost of image quality."
+)
 DESC_MJPEG_STREAM = (
     "Name of the MJPEG stream. Used to build the URL to access the stream.<br>"
     "Valid characters are lowercase a-z, numbers and underscores."
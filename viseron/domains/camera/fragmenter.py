@@ -11,13 +11,15 @@ import queue
 import re
 import shutil
 import subprocess as sp
+import time
 import uuid
 from dataclasses import dataclass
 from math import ceil
-from typing import TYPE_CHECKING, Literal, TypedDict
+from typing import TYPE_CHECKING, Any, Literal, TypedDict
 
 import psutil
 from path import Path
+from watchdog.events import FileClosedEvent, FileCreatedEvent
 
 from viseron.components.storage.const import (
     COMPONENT as STORAGE_COMPONENT,
@@ -34,6 +36,7 @@ from viseron.domains.camera.const import (
     CONFIG_RECORDER,
     MP4BOX_PATH,
 )
+from viseron.domains.camera.timelapse import get_timelapse_frame_extractor
 from viseron.events import EventEmptyData
 from viseron.helpers import get_utc_offset
 from viseron.helpers.child_process_worker import ChildProcessWorker
@@ -43,13 +46,18 @@ if TYPE_CHECKING:
     from collections.abc import Callable
 
     from sqlalchemy.orm import Session
+    from watchdog.events import FileSystemEvent
 
     from viseron import Viseron
     from viseron.components.storage import Storage
+    from viseron.components.storage.watcher import TierWatcher
     from viseron.domains.camera import AbstractCamera
 
 # Constants
-TIMELAPSE_FFMPEG_TIMEOUT = 10
+# Timelapse sources not processed within this many seconds are removed
+TIMELAPSE_SOURCE_MAX_AGE = 300
+# Interval in seconds of the scan for segments that were missed by the watcher
+FRAGMENT_SCAN_INTERVAL = 30
 
 
 def _get_open_files(path: str, process: psutil.Process) -> list[str]:
@@ -133,6 +141,7 @@ class FragmenterSubProcessWorker(ChildProcessWorker):
         temp_segments_folder: str,
         segments_folder: str,
         metadata_callback: Callable[[dict], None],
+        timelapse_frame_callback: Callable[[dict], None],
     ) -> None:
         self._logger = logging.getLogger(
             f"{self.__module__}.subprocess.{camera.identifier}"
@@ -149,30 +158,71 @@ class FragmenterSubProcessWorker(ChildProcessWorker):
 
         self._worker_event = mp.Event()
         self.on_metadata = metadata_callback
+        self.on_timelapse_frame = timelapse_frame_callback
         super().__init__(
             vis,
             f"fragmenter.{camera.identifier}",
         )
 
     def work_input(self, item) -> None:
-        """Handle input commands in the child process."""
-        if item.get("cmd") == "fragment":
+        """Handle input commands in the child process.
+
+        Segments are fragmented when the main process reports them as complete,
+        either by name or as a change to the HLS playlist. Without either, the
+        folder is scanned for segments that are not open by ffmpeg/gstreamer.
+        """
+        if item.get("cmd") != "fragment":
+            return
+
+        if item.get("files"):
+            mp4s = [
+                file
+                for file in item["files"]
+                if os.path.exists(os.path.join(self.temp_segments_folder, file))
+            ]
+        elif item.get("playlist"):
+            mp4s = self._get_segments_in_playlist()
+        else:
             self._logger.debug(
                 f"Checking for new segments to fragment in {self.temp_segments_folder}"
             )
-            mp4s = _get_mp4_files_to_fragment(self.temp_segments_folder)
-            for mp4 in sorted(mp4s)[:5]:
-                self._logger.debug(f"Processing {mp4}")
-                if mp4.split(".")[1] == "m4s":
-                    self._handle_m4s(mp4)
-                else:
-                    self._handle_mp4(mp4)
+            mp4s = sorted(_get_mp4_files_to_fragment(self.temp_segments_folder))[:5]
+
+        for mp4 in sorted(mp4s):
+            self._logger.debug(f"Processing {mp4}")
+            if mp4.split(".")[1] == "m4s":
+                self._handle_m4s(mp4)
+            else:
+                self._handle_mp4(mp4)
+
+    def _get_segments_in_playlist(self) -> list[str]:
+        """Get m4s files that are listed in the HLS playlist.
+
+        ffmpeg adds a segment to the playlist after it is closed, so every segment
+        in the playlist that is still in the temp folder is ready to be moved.
+        """
+        try:
+            playlist = self._read_m3u8()
+        except FileNotFoundError:
+            return []
+        listed = {
+            line.strip()
+            for line in playlist.splitlines()
+            if line.strip().endswith(".m4s")
+        }
+        return [
+            file for file in os.listdir(self.temp_segments_folder) if file in listed
+        ]
 
     def work_output(self, item: dict | None) -> None:
         """Relay metadata from child process to main process via callback."""
         if item is None:
             return
 
+        if "timelapse" in item:
+            self.on_timelapse_frame(item["timelapse"])
+            return
+
         if item.get("error") == "no_space_left":
             self._vis.dispatch_event(
                 EVENT_CHECK_TIER.format(
@@ -226,26 +276,18 @@ class FragmenterSubProcessWorker(ChildProcessWorker):
 
         Currently only used for extracting timelapse frames from fragments.
         """
-        if (
-            self._camera.timelapse_folder is None
-            or self._camera.temp_timelapse_folder is None
-        ):
-            return
-
-        frame_filename = os.path.splitext(os.path.basename(file))[0] + ".jpg"
-        tmp_frame_path = os.path.join(
-            self._camera.temp_timelapse_folder, frame_filename
-        )
-        frame_path = os.path.join(self._camera.timelapse_folder, frame_filename)
-        init_path = os.path.join(
-            self.temp_segments_folder, file.split(".", maxsplit=1)[0], "clip_init.mp4"
-        )
-        segment_path = os.path.join(
-            self.temp_segments_folder, file.split(".", maxsplit=1)[0], "clip_1.m4s"
-        )
-
-        self._extract_timelapse_frame(
-            init_path, segment_path, tmp_frame_path, frame_path
+        self._queue_timelapse_frame(
+            file,
+            os.path.join(
+                self.temp_segments_folder,
+                file.split(".", maxsplit=1)[0],
+                "clip_init.mp4",
+            ),
+            os.path.join(
+                self.temp_segments_folder,
+                file.split(".", maxsplit=1)[0],
+                "clip_1.m4s",
+            ),
         )
 
     def _segment_hook(self, file: str) -> None:
@@ -253,67 +295,80 @@ class FragmenterSubProcessWorker(ChildProcessWorker):
 
         Currently only used for extracting timelapse frames from fragments.
         """
+        self._queue_timelapse_frame(
+            file,
+            os.path.join(self.temp_segments_folder, "init.mp4"),
+            os.path.join(self.temp_segments_folder, file),
+        )
+
+    def _queue_timelapse_frame(
+        self, file: str, init_path: str, segment_path: str
+    ) -> None:
+        """Send a segment to the timelapse frame extractor.
+
+        The segment is moved to storage right after this, so it is hard linked into
+        the temp timelapse folder instead of being copied. The small init segment is
+        copied, since it is rewritten in place when the stream restarts.
+        The extractor reads the init and media segment as one file.
+        """
         if (
             self._camera.timelapse_folder is None
             or self._camera.temp_timelapse_folder is None
         ):
             return
 
-        frame_filename = os.path.splitext(os.path.basename(file))[0] + ".jpg"
-        tmp_frame_path = os.path.join(
-            self._camera.temp_timelapse_folder, frame_filename
-        )
-        frame_path = os.path.join(self._camera.timelapse_folder, frame_filename)
-        init_path = os.path.join(self.temp_segments_folder, "init.mp4")
-        segment_path = os.path.join(self.temp_segments_folder, file)
-
-        self._extract_timelapse_frame(
-            init_path, segment_path, tmp_frame_path, frame_path
-        )
-
-    def _extract_timelapse_frame(
-        self, init_path: str, segment_path: str, tmp_frame_path: str, frame_path: str
-    ) -> None:
-        """Extract a timelapse frame from segment files."""
+        name = os.path.splitext(os.path.basename(file))[0]
+        source_paths = [
+            os.path.join(self._camera.temp_timelapse_folder, f"{name}_init.mp4"),
+            os.path.join(self._camera.temp_timelapse_folder, f"{name}.m4s"),
+        ]
         try:
-            # Run ffmpeg command to extract first keyframe of the segment
-            cmd = [
-                "bash",
-                "-c",
-                f"cat '{init_path}' '{segment_path}' | "
-                f"ffmpeg -skip_frame nokey -i pipe:0 -frames:v 1 "
-                f"-update true -f mjpeg '{tmp_frame_path}' -y",
-            ]
-
-            result = sp.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=TIMELAPSE_FFMPEG_TIMEOUT,
-                check=False,
-            )
-            if result.returncode == 0:
-                self._logger.debug(f"Timelapse: Extracted frame {tmp_frame_path}")
-                shutil.move(tmp_frame_path, frame_path)
-            else:
-                self._logger.warning(
-                    f"Timelapse: Failed to extract frame {frame_path}: {result.stderr}"
-                )
-                os.remove(tmp_frame_path)
-
-        except FileNotFoundError:
-            self._logger.debug(f"{tmp_frame_path} not found")
-
-        except (OSError, sp.TimeoutExpired, sp.SubprocessError) as error:
+            self._remove_stale_timelapse_sources(self._camera.temp_timelapse_folder)
+            shutil.copyfile(init_path, source_paths[0])
+            try:
+                os.link(segment_path, source_paths[1])
+            except OSError:
+                # Hard links are not supported across or by all file systems
+                shutil.copyfile(segment_path, source_paths[1])
+        except OSError as error:
             self._logger.error(
-                f"Timelapse: Error extracting frame {frame_path}: {error}"
+                f"Timelapse: Failed to prepare frame extraction for {file}: {error}"
             )
+            for path in source_paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            return
 
-        finally:
-            try:
-                os.remove(tmp_frame_path)
-            except FileNotFoundError:
-                pass
+        self._output_queue.put(
+            {
+                "timelapse": {
+                    "source_paths": source_paths,
+                    "tmp_frame_path": os.path.join(
+                        self._camera.temp_timelapse_folder, f"{name}.jpg"
+                    ),
+                    "frame_path": os.path.join(
+                        self._camera.timelapse_folder, f"{name}.jpg"
+                    ),
+                }
+            }
+        )
+
+    @staticmethod
+    def _remove_stale_timelapse_sources(folder: str) -> None:
+        """Remove sources that were never picked up by the frame extractor."""
+        now = time.time()
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    if (
+                        entry.name.endswith((".mp4", ".m4s"))
+                        and now - entry.stat().st_mtime > TIMELAPSE_SOURCE_MAX_AGE
+                    ):
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
 
     def _move_to_segments_folder_mp4box(self, file: str) -> None:
         """Move fragmented mp4 created by mp4box to segments folder."""
@@ -500,13 +555,28 @@ class Fragmenter:
             camera.temp_segments_folder,
             camera.segments_folder,
             self._on_metadata_from_worker,
+            self._on_timelapse_frame_from_worker,
         )
 
+        # Segments are fragmented as soon as they are closed. The folder is still
+        # scanned periodically to pick up leftovers and any missed events
+        self._watcher: TierWatcher | None = None
+        try:
+            self._watcher = self._storage.get_tier_watcher(TEMP_DIR, poll=False)
+            self._watcher.register(camera.temp_segments_folder, self)
+        except OSError as error:
+            self._logger.warning(
+                "Failed to watch %s, falling back to scanning for segments: %s",
+                camera.temp_segments_folder,
+                error,
+            )
+
         self._fragment_job_id = f"fragment_{self._camera.identifier}"
         self._fragment_job = self._vis.background_scheduler.add_job(
             self._fragment_command,
             "interval",
-            seconds=1,
+            seconds=FRAGMENT_SCAN_INTERVAL if self._watcher else 1,
+            next_run_time=datetime.datetime.now(),
             id=self._fragment_job_id,
             max_instances=1,
             coalesce=True,
@@ -522,6 +592,12 @@ class Fragmenter:
             orig_ctime=item["orig_ctime"], duration=item["duration"]
         )
 
+    def _on_timelapse_frame_from_worker(self, item) -> None:
+        """Pass timelapse frames to the extractor shared by all cameras."""
+        get_timelapse_frame_extractor(self._vis).extract(
+            item["source_paths"], item["tmp_frame_path"], item["frame_path"]
+        )
+
     def _fragment_command(self) -> None:
         """Periodically send work to the subprocess."""
         if self._camera.stopped.is_set():
@@ -532,6 +608,38 @@ class Fragmenter:
         except queue.Full:
             pass
 
+    def handle_event(self, event: FileSystemEvent) -> None:
+        """Send completed segments to the subprocess.
+
+        gstreamer segments are complete when they are closed. ffmpeg segments are
+        complete when they are added to the HLS playlist, which ffmpeg writes to a
+        temporary file that is then renamed.
+        """
+        if self._camera.stopped.is_set():
+            return
+        path = os.fsdecode(event.src_path)
+        if os.path.dirname(path) != os.path.normpath(self._camera.temp_segments_folder):
+            return
+
+        filename = os.path.basename(path)
+        if filename == "index.m3u8":
+            if not isinstance(event, (FileCreatedEvent, FileClosedEvent)):
+                return
+            item: dict[str, Any] = {"cmd": "fragment", "playlist": True}
+        elif (
+            isinstance(event, FileClosedEvent)
+            and filename.endswith(".mp4")
+            and filename != "init.mp4"
+        ):
+            item = {"cmd": "fragment", "files": [filename]}
+        else:
+            return
+
+        try:
+            self._fragment_worker.input_queue.put_nowait(item)
+        except queue.Full:
+            self._logger.debug(f"Fragment queue full, {filename} picked up by scan")
+
     def _shutdown(self) -> None:
         """Handle shutdown event."""
         self._logger.debug("Shutting down fragment thread")
@@ -546,6 +654,8 @@ class Fragmenter:
             self._fragment_job.remove()
         except Exception:  # pylint: disable=broad-except
             self._logger.exception("Failed to remove fragment job.")
+        if self._watcher:
+            self._watcher.unregister(self._camera.temp_segments_folder)
         self._fragment_worker.stop()
         self._shutdown()
         for unsubscribe in self._event_listeners:
@@ -631,11 +741,20 @@ def generate_playlist(
     *,
     end: bool = False,
     file_directive: bool = False,
+    can_block_reload: bool = False,
 ) -> str:
-    """Generate a playlist from a list of fragments."""
+    """Generate a playlist from a list of fragments.
+
+    can_block_reload advertises support for blocking playlist reloads using the
+    _HLS_msn query parameter.
+    """
     playlist = []
     playlist.append("#EXTM3U")
-    playlist.append("#EXT-X-VERSION:6")
+    # EXT-X-GAP requires version 8
+    if any(fragment.gap for fragment in fragments):
+        playlist.append("#EXT-X-VERSION:8")
+    else:
+        playlist.append("#EXT-X-VERSION:6")
 
     playlist.append(f"#EXT-X-MEDIA-SEQUENCE:{media_sequence}")
     if media_sequence:
@@ -650,6 +769,8 @@ def generate_playlist(
         target_duration = CAMERA_SEGMENT_DURATION
 
     playlist.append(f"#EXT-X-TARGETDURATION:{target_duration}")
+    if can_block_reload:
+        playlist.append("#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES")
     playlist.append("#EXT-X-INDEPENDENT-SEGMENTS")
     playlist.append(f'#EXT-X-MAP:URI="{_get_file_path(init_file, file_directive)}"')
 
@@ -662,6 +783,8 @@ def generate_playlist(
         ).isoformat(timespec="milliseconds")
         playlist.append(f"#EXT-X-PROGRAM-DATE-TIME:{program_date_time}")
         playlist.append(f"#EXTINF:{fragment.duration},")
+        if fragment.gap:
+            playlist.append("#EXT-X-GAP")
         playlist.append(_get_file_path(fragment.path, file_directive))
         prev_fragment = fragment
     if end:
@@ -677,6 +800,7 @@ class Fragment:
     path: str
     duration: float
     creation_time: datetime.datetime
+    gap: bool = False
 
 
 class Timespan(TypedDict):
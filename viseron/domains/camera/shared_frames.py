@@ -6,6 +6,7 @@ import threading
 import time
 import uuid
 from functools import lru_cache
+from multiprocessing import shared_memory
 from typing import TYPE_CHECKING
 
 import cv2
@@ -55,6 +56,10 @@ PIXEL_FORMATS = {
 class SharedFrame:
     """Information about a frame shared in memory."""
 
+    # The reference count is updated from many threads. The lock is shared by all
+    # frames since it is only held for a single update
+    _reference_lock = threading.Lock()
+
     def __init__(
         self,
         color_plane_width: int,
@@ -71,14 +76,105 @@ class SharedFrame:
         self.camera_identifier = camera_identifier
         self.capture_time = time.time()
         self.reference_count = 0
+        self.sequence: int | None = None
+
+    def add_reference(self) -> None:
+        """Increase reference count."""
+        with self._reference_lock:
+            self.reference_count += 1
+
+    def remove_reference(self) -> None:
+        """Decrease reference count."""
+        with self._reference_lock:
+            self.reference_count -= 1
 
     def __enter__(self) -> None:
         """Increase reference count."""
-        self.reference_count += 1
+        self.add_reference()
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         """Decrease reference count."""
-        self.reference_count -= 1
+        self.remove_reference()
+
+
+class SharedFrameRingBuffer:
+    """Ring buffer of raw frames in shared memory.
+
+    The buffer is split into a fixed number of slots, each holding one raw frame.
+    A process writes frames directly into a free slot and only passes the slot index
+    to the consumer, which avoids pickling and copying the frame bytes.
+    A trailing byte per slot marks if the slot is in use. The writer marks a slot as
+    used when acquiring it and the consumer releases it when the frame is removed,
+    so a slot is never overwritten while the frame is still referenced.
+    """
+
+    def __init__(self, frame_bytes_size: int, slots: int) -> None:
+        self.frame_bytes_size = frame_bytes_size
+        self.slots = slots
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=frame_bytes_size * slots + slots
+        )
+        self._in_use: np.ndarray = np.ndarray(
+            (slots,),
+            dtype=np.uint8,
+            buffer=self._shm.buf,
+            offset=frame_bytes_size * slots,
+        )
+        self._in_use[:] = 0
+        self._next_slot = 0
+        self._sequence = 0
+
+    @property
+    def name(self) -> str:
+        """Return name of the shared memory block."""
+        return self._shm.name
+
+    def acquire(self) -> tuple[int, int] | None:
+        """Acquire the next free slot.
+
+        Returns a tuple of slot index and sequence number, or None if all slots are
+        in use.
+        """
+        for offset in range(self.slots):
+            slot = (self._next_slot + offset) % self.slots
+            if not self._in_use[slot]:
+                self._in_use[slot] = 1
+                self._next_slot = (slot + 1) % self.slots
+                self._sequence += 1
+                return slot, self._sequence
+        return None
+
+    def release(self, slot: int) -> None:
+        """Mark slot as free so that it can be written to again."""
+        self._in_use[slot] = 0
+
+    def in_use(self) -> int:
+        """Return number of slots currently in use."""
+        return int(np.count_nonzero(self._in_use))
+
+    def slot_buffer(self, slot: int) -> memoryview:
+        """Return a writable memoryview of a slot."""
+        start = slot * self.frame_bytes_size
+        return self._shm.buf[start : start + self.frame_bytes_size]
+
+    def get_frame(self, slot: int, shape: tuple[int, int]) -> np.ndarray:
+        """Return a zero-copy numpy view of a slot."""
+        return np.ndarray(
+            shape,
+            dtype=np.uint8,
+            buffer=self._shm.buf,
+            offset=slot * self.frame_bytes_size,
+        )
+
+    def unlink(self) -> None:
+        """Unlink the shared memory block.
+
+        The memory stays mapped until all frames referencing it are removed.
+        """
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
 
 
 class SharedFrames:
@@ -87,6 +183,11 @@ class SharedFrames:
     def __init__(self, vis: Viseron) -> None:
         self._vis = vis
         self._frames: dict[uuid.UUID | str, np.ndarray] = {}
+        self._slots: dict[uuid.UUID | str, tuple[SharedFrameRingBuffer, int]] = {}
+        self._resized: dict[
+            uuid.UUID | str, dict[tuple[str, tuple[int, int]], np.ndarray]
+        ] = {}
+        self._resized_lock = threading.Lock()
 
     def create(self, shared_frame: SharedFrame, frame_bytes: bytes) -> None:
         """Create frame in shared memory."""
@@ -94,14 +195,48 @@ class SharedFrames:
             shared_frame.color_plane_height, shared_frame.color_plane_width
         )
 
+    def create_from_slot(
+        self,
+        shared_frame: SharedFrame,
+        ring_buffer: SharedFrameRingBuffer,
+        slot: int,
+    ) -> None:
+        """Create frame from a slot in a SharedFrameRingBuffer without copying.
+
+        The slot is released when the frame is removed.
+        """
+        self._frames[shared_frame.name] = ring_buffer.get_frame(
+            slot,
+            (shared_frame.color_plane_height, shared_frame.color_plane_width),
+        )
+        self._slots[shared_frame.name] = (ring_buffer, slot)
+
     def get_decoded_frame(self, shared_frame: SharedFrame) -> np.ndarray:
-        """Return byte frame in numpy format."""
+        """Return byte frame in numpy format.
+
+        Frames created from a ring buffer slot are returned as zero-copy views of the
+        slot, which is overwritten by new frames once the frame has been removed.
+        Use the result within a with shared_frame block, or copy it if it is needed
+        after the frame has been removed.
+        """
         return self._frames[shared_frame.name]
 
-    @return_copy
-    @lru_cache(maxsize=2)
-    def _color_convert(self, shared_frame: SharedFrame, color_model: str) -> np.ndarray:
-        """Return decoded frame in specified color format."""
+    def get_luma_view(self, shared_frame: SharedFrame) -> np.ndarray:
+        """Return a read-only, zero-copy view of the luma (Y) plane.
+
+        Both supported pixel formats store the full resolution Y plane in the first
+        height rows of the raw frame, which is the grayscale image.
+        Like get_decoded_frame, the view is only valid until the frame is removed.
+        """
+        luma = self.get_decoded_frame(shared_frame)[: shared_frame.resolution[1]]
+        luma.flags.writeable = False
+        return luma
+
+    def _convert(self, shared_frame: SharedFrame, color_model: str) -> np.ndarray:
+        """Return decoded frame in specified color format without copying it."""
+        if color_model == COLOR_MODEL_GRAY:
+            return self.get_luma_view(shared_frame)
+
         shared_frame_name = f"{shared_frame.name}_{color_model}"
         try:
             return self._frames[shared_frame_name]
@@ -117,6 +252,42 @@ class SharedFrames:
         self._frames[shared_frame_name] = decoded_frame
         return decoded_frame
 
+    @return_copy
+    @lru_cache(maxsize=2)
+    def _color_convert(self, shared_frame: SharedFrame, color_model: str) -> np.ndarray:
+        """Return decoded frame in specified color format."""
+        return self._convert(shared_frame, color_model)
+
+    def get_resized_frame(
+        self,
+        shared_frame: SharedFrame,
+        color_model: str,
+        resolution: tuple[int, int],
+    ) -> np.ndarray:
+        """Return a read-only frame in specified color format and resolution.
+
+        The result is cached per frame, so scanners using the same color model and
+        resolution share a single conversion and resize.
+        If no conversion or resize is needed this is a view of the raw frame, which
+        like get_decoded_frame is only valid until the frame is removed.
+        """
+        key = (color_model, resolution)
+        with self._resized_lock:
+            try:
+                return self._resized[shared_frame.name][key]
+            except KeyError:
+                pass
+
+        frame = self._convert(shared_frame, color_model)
+        if (frame.shape[1], frame.shape[0]) != resolution:
+            frame = cv2.resize(frame, resolution, interpolation=cv2.INTER_LINEAR)
+        frame.flags.writeable = False
+
+        with self._resized_lock:
+            return self._resized.setdefault(shared_frame.name, {}).setdefault(
+                key, frame
+            )
+
     def get_decoded_frame_rgb(self, shared_frame: SharedFrame) -> np.ndarray:
         """Return decoded frame in rgb numpy format."""
         return self._color_convert(shared_frame, COLOR_MODEL_RGB)
@@ -131,6 +302,15 @@ class SharedFrames:
         except KeyError:
             pass
 
+        with self._resized_lock:
+            self._resized.pop(name, None)
+
+        try:
+            ring_buffer, slot = self._slots.pop(name)
+        except KeyError:
+            return
+        ring_buffer.release(slot)
+
     def remove(self, shared_frame: SharedFrame, camera: AbstractCamera) -> None:
         """Remove frame from shared memory."""
         if (
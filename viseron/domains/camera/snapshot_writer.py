@@ -0,0 +1,275 @@
+"""Bounded worker pool used to encode and write snapshots."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import cv2
+
+from viseron.const import VISERON_SIGNAL_SHUTDOWN
+from viseron.helpers import create_directory, percentile
+from viseron.watchdog.thread_watchdog import RestartableThread
+
+from .const import (
+    SNAPSHOT_WRITER,
+    SNAPSHOT_WRITER_CACHE_SIZE,
+    SNAPSHOT_WRITER_MAX_PENDING,
+    SNAPSHOT_WRITER_STOP_TIMEOUT,
+    SNAPSHOT_WRITER_WORKERS,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    import numpy as np
+
+    from viseron import Viseron
+
+LOGGER = logging.getLogger(__name__)
+
+_SNAPSHOT_WRITER_LOCK = threading.Lock()
+
+
+class _Snapshot:
+    """A rendered snapshot which is encoded to JPEG at most once."""
+
+    def __init__(self, frame: np.ndarray, quality: int) -> None:
+        self._frame: np.ndarray | None = frame
+        self._quality = quality
+        self._jpg: bytes | None = None
+        self._lock = threading.Lock()
+
+    def encode(self) -> tuple[bytes, bool]:
+        """Return the JPEG and whether it was encoded by this call."""
+        with self._lock:
+            if self._jpg is not None:
+                return self._jpg, False
+            assert self._frame is not None  # For type checking  # noqa: S101
+            ret, jpg = cv2.imencode(
+                ".jpg", self._frame, [int(cv2.IMWRITE_JPEG_QUALITY), self._quality]
+            )
+            if not ret:
+                raise ValueError("Failed to encode snapshot")
+            self._jpg = jpg.tobytes()
+            # The frame is no longer needed once encoded
+            self._frame = None
+            return self._jpg, True
+
+
+@dataclass
+class _WriteJob:
+    """A snapshot waiting to be written to disk."""
+
+    path: str
+    snapshot: _Snapshot
+    queued_at: float
+    on_dropped: Callable[[str], None] | None
+
+
+class SnapshotWriter:
+    """Encode and write snapshots on a fixed number of worker threads.
+
+    Snapshots are rendered by the caller, but encoding and writing to disk is done
+    by the workers so that detectors and post processors are not held up by it.
+    The last cache_size rendered snapshots are kept by key, so that the same render
+    of a frame, saved by several domains, is only encoded once.
+
+    When the disk can't keep up and more than max_pending snapshots are waiting, the
+    oldest is dropped. The on_dropped callback of a snapshot that is dropped or fails
+    to be written is called with its path by the workers, so that rows referencing
+    it can be removed without holding up the caller.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, cache_size: int) -> None:
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._cache_size = cache_size
+
+        self._lock = threading.Lock()
+        self._jobs: deque[_WriteJob] = deque()
+        self._dropped_jobs: deque[tuple[str, Callable[[str], None]]] = deque()
+        self._jobs_condition = threading.Condition(self._lock)
+        self._cache: OrderedDict[Hashable, _Snapshot] = OrderedDict()
+
+        self._kill_received = False
+        self._submitted = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._encoded = 0
+        self._reused = 0
+        self._write_times: deque[float] = deque(maxlen=1000)
+
+        self._workers = [
+            RestartableThread(
+                name=f"camera.snapshot_writer.{i}",
+                target=self._worker,
+                daemon=True,
+                register=True,
+            )
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _get_snapshot(
+        self,
+        key: Hashable | None,
+        render: Callable[[], np.ndarray],
+        quality: int,
+    ) -> _Snapshot:
+        """Return the cached snapshot for key, rendering it if needed."""
+        if key is None:
+            return _Snapshot(render(), quality)
+
+        cache_key = (key, quality)
+        with self._lock:
+            snapshot = self._cache.get(cache_key)
+            if snapshot is not None:
+                self._cache.move_to_end(cache_key)
+                return snapshot
+
+        # Rendered without holding the lock since it decodes and draws on the frame
+        snapshot = _Snapshot(render(), quality)
+        with self._lock:
+            snapshot = self._cache.setdefault(cache_key, snapshot)
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return snapshot
+
+    def write(
+        self,
+        path: str,
+        key: Hashable | None,
+        render: Callable[[], np.ndarray],
+        quality: int,
+        on_dropped: Callable[[str], None] | None = None,
+    ) -> str:
+        """Queue a snapshot to be written to path and return path.
+
+        render is only called if no snapshot with the same key and quality is cached.
+        It is called before returning, so the frame it reads is still available.
+        If key is None the snapshot is never reused.
+        on_dropped is called by a worker if the snapshot is never written.
+        """
+        try:
+            snapshot = self._get_snapshot(key, render, quality)
+        except Exception:
+            with self._lock:
+                self._add_dropped(path, on_dropped)
+            raise
+
+        with self._lock:
+            if len(self._jobs) >= self._max_pending:
+                dropped = self._jobs.popleft()
+                self._dropped += 1
+                LOGGER.debug(
+                    "Snapshot writer is falling behind, "
+                    f"dropping oldest snapshot {dropped.path}"
+                )
+                self._add_dropped(dropped.path, dropped.on_dropped)
+            self._jobs.append(
+                _WriteJob(path, snapshot, time.perf_counter(), on_dropped)
+            )
+            self._submitted += 1
+            self._jobs_condition.notify()
+        return path
+
+    def _add_dropped(self, path: str, on_dropped: Callable[[str], None] | None) -> None:
+        """Queue on_dropped to be called by a worker. Must be called with the lock."""
+        if on_dropped is None:
+            return
+        self._dropped_jobs.append((path, on_dropped))
+        self._jobs_condition.notify()
+
+    @staticmethod
+    def _handle_dropped(path: str, on_dropped: Callable[[str], None]) -> None:
+        """Call the on_dropped callback of a snapshot that was not written."""
+        try:
+            on_dropped(path)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception(f"Failed to handle dropped snapshot {path}")
+
+    def _worker(self) -> None:
+        """Encode and write queued snapshots."""
+        while True:
+            with self._lock:
+                if not self._jobs and not self._dropped_jobs:
+                    # Pending snapshots are written before stopping
+                    if self._kill_received:
+                        return
+                    self._jobs_condition.wait(timeout=1)
+                    continue
+                dropped = self._dropped_jobs.popleft() if self._dropped_jobs else None
+                job = None if dropped else self._jobs.popleft()
+
+            if dropped:
+                self._handle_dropped(*dropped)
+            elif job:
+                self._write(job)
+
+    def _write(self, job: _WriteJob) -> None:
+        """Encode and write a snapshot."""
+        try:
+            jpg, encoded = job.snapshot.encode()
+            create_directory(os.path.dirname(job.path))
+            with open(job.path, "wb") as snapshot_file:
+                snapshot_file.write(jpg)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception(f"Failed to write snapshot {job.path}")
+            with self._lock:
+                self._failed += 1
+            if job.on_dropped:
+                self._handle_dropped(job.path, job.on_dropped)
+            return
+
+        with self._lock:
+            self._written += 1
+            if encoded:
+                self._encoded += 1
+            else:
+                self._reused += 1
+            self._write_times.append(time.perf_counter() - job.queued_at)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return snapshot writer metrics."""
+        with self._lock:
+            return {
+                "workers": self._max_workers,
+                "pending": len(self._jobs),
+                "submitted": self._submitted,
+                "written": self._written,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "encoded": self._encoded,
+                "reused": self._reused,
+                "write_time_p99": percentile(self._write_times, 0.99),
+            }
+
+    def stop(self) -> None:
+        """Write pending snapshots and stop the workers."""
+        with self._lock:
+            self._kill_received = True
+            self._jobs_condition.notify_all()
+        for worker in self._workers:
+            worker.join(timeout=SNAPSHOT_WRITER_STOP_TIMEOUT)
+
+
+def get_snapshot_writer(vis: Viseron) -> SnapshotWriter:
+    """Return the snapshot writer shared by all cameras, creating it if needed."""
+    with _SNAPSHOT_WRITER_LOCK:
+        if (snapshot_writer := vis.data.get(SNAPSHOT_WRITER)) is None:
+            snapshot_writer = vis.data[SNAPSHOT_WRITER] = SnapshotWriter(
+                SNAPSHOT_WRITER_WORKERS,
+                SNAPSHOT_WRITER_MAX_PENDING,
+                SNAPSHOT_WRITER_CACHE_SIZE,
+            )
+            vis.register_signal_handler(VISERON_SIGNAL_SHUTDOWN, snapshot_writer.stop)
+        return snapshot_writer
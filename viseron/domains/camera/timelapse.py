@@ -0,0 +1,139 @@
+"""Extract timelapse frames from recorded segments."""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import shutil
+import threading
+from typing import TYPE_CHECKING
+
+import cv2
+
+from viseron.components.storage.const import COMPONENT as STORAGE_COMPONENT
+from viseron.helpers.child_process_worker import ChildProcessWorker
+
+if TYPE_CHECKING:
+    from viseron import Viseron
+
+LOGGER = logging.getLogger(__name__)
+
+DATA_TIMELAPSE_FRAME_EXTRACTOR = "timelapse_frame_extractor"
+
+_extractor_lock = threading.Lock()
+
+
+def extract_keyframe(
+    source_paths: list[str], frame_width: int | None, jpeg_quality: int
+) -> bytes | None:
+    """Decode the first frame of a segment and return it encoded as JPEG.
+
+    Segments always start with a keyframe, so only a single frame is decoded.
+    source_paths are read as one playable file, ie the init segment followed by
+    the media segment for fragmented MP4, without joining them on disk.
+    """
+    if len(source_paths) == 1:
+        capture = cv2.VideoCapture(source_paths[0])
+    else:
+        capture = cv2.VideoCapture(f"concat:{'|'.join(source_paths)}", cv2.CAP_FFMPEG)
+    try:
+        ret, frame = capture.read()
+    finally:
+        capture.release()
+    if not ret:
+        return None
+
+    height, width = frame.shape[:2]
+    if frame_width and width > frame_width:
+        frame = cv2.resize(
+            frame,
+            (frame_width, round(height * frame_width / width)),
+            interpolation=cv2.INTER_AREA,
+        )
+    ret, jpg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    if not ret:
+        return None
+    return jpg.tobytes()
+
+
+class TimelapseFrameExtractor(ChildProcessWorker):
+    """Extract timelapse frames for all cameras in a single child process.
+
+    Input items contain the paths of the init and media segment, which are removed
+    once they are processed, a temporary path for the frame and the final frame
+    path.
+    The frame is written to the temporary path first so that the timelapse tier
+    handler never sees a partially written frame.
+    """
+
+    def __init__(
+        self, vis: Viseron, frame_width: int | None, jpeg_quality: int
+    ) -> None:
+        self._frame_width = frame_width
+        self._jpeg_quality = jpeg_quality
+        super().__init__(vis, "timelapse_frame_extractor")
+
+    def work_input(self, item: dict) -> dict:
+        """Extract the frame in the child process."""
+        try:
+            jpg = extract_keyframe(
+                item["source_paths"], self._frame_width, self._jpeg_quality
+            )
+            if jpg is None:
+                return {**item, "error": "Failed to decode frame"}
+            with open(item["tmp_frame_path"], "wb") as frame_file:
+                frame_file.write(jpg)
+            shutil.move(item["tmp_frame_path"], item["frame_path"])
+            return item
+        except OSError as error:
+            return {**item, "error": str(error)}
+        finally:
+            for path in [*item["source_paths"], item["tmp_frame_path"]]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def work_output(self, item: dict | None) -> None:
+        """Log the result of the extraction."""
+        if item is None:
+            return
+        if item.get("error"):
+            LOGGER.warning(
+                f"Timelapse: Failed to extract frame {item['frame_path']}: "
+                f"{item['error']}"
+            )
+            return
+        LOGGER.debug(f"Timelapse: Extracted frame {item['frame_path']}")
+
+    def extract(
+        self, source_paths: list[str], tmp_frame_path: str, frame_path: str
+    ) -> None:
+        """Queue extraction of a frame from source_paths."""
+        try:
+            self.input_queue.put_nowait(
+                {
+                    "source_paths": source_paths,
+                    "tmp_frame_path": tmp_frame_path,
+                    "frame_path": frame_path,
+                }
+            )
+        except queue.Full:
+            LOGGER.warning(f"Timelapse: Extractor is busy, skipping {frame_path}")
+            for path in source_paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+def get_timelapse_frame_extractor(vis: Viseron) -> TimelapseFrameExtractor:
+    """Return the extractor shared by all cameras, starting it if needed."""
+    with _extractor_lock:
+        if DATA_TIMELAPSE_FRAME_EXTRACTOR not in vis.data:
+            storage = vis.data[STORAGE_COMPONENT]
+            vis.data[DATA_TIMELAPSE_FRAME_EXTRACTOR] = TimelapseFrameExtractor(
+                vis, storage.timelapse_frame_width, storage.timelapse_jpeg_quality
+            )
+        return vis.data[DATA_TIMELAPSE_FRAME_EXTRACTOR]
@@ -162,15 +162,19 @@ class AbstractFaceRecognition(AbstractPostProcessor):
         """Save face to disk and database."""
         snapshot_path = None
         if shared_frame:
-            snapshot_path = self._camera.save_snapshot(
+            snapshot_path = self._camera.snapshot_path(
+                SnapshotDomain.FACE_RECOGNITION, subfolder=face_dict.name
+            )
+        self._insert_result(DOMAIN, snapshot_path, face_dict.as_dict())
+        if snapshot_path:
+            self._camera.save_snapshot(
                 shared_frame,
                 SnapshotDomain.FACE_RECOGNITION,
+                snapshot_path,
                 zoom_coordinates=calculate_relative_coords(
                     coordinates, self._camera.resolution
                 ),
-                subfolder=face_dict.name,
             )
-        self._insert_result(DOMAIN, snapshot_path, face_dict.as_dict())
 
     def known_face_found(
         self,
@@ -209,14 +209,19 @@ class AbstractLicensePlateRecognition(AbstractPostProcessor):
         """Save plate to disk and database."""
         snapshot_path = None
         if shared_frame:
-            snapshot_path = self._camera.save_snapshot(
+            snapshot_path = self._camera.snapshot_path(
+                SnapshotDomain.LICENSE_PLATE_RECOGNITION
+            )
+        self._insert_result(DOMAIN, snapshot_path, plate.as_dict())
+        if snapshot_path:
+            self._camera.save_snapshot(
                 shared_frame=shared_frame,
                 domain=SnapshotDomain.LICENSE_PLATE_RECOGNITION,
+                path=snapshot_path,
                 zoom_coordinates=plate.detected_object.rel_coordinates,
                 bbox=plate.rel_coordinates,
                 text=f"{plate.plate} {int(plate.confidence * 100)}%",
             )
-        self._insert_result(DOMAIN, snapshot_path, plate.as_dict())
 
     def _plate_detected(
         self, plate: LicensePlateRecognitionResult, shared_frame: SharedFrame
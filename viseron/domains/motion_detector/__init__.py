@@ -276,11 +276,14 @@ class AbstractMotionDetector(AbstractDomain):
         if self._motion_id is None:
             snapshot_path = None
             if shared_frame:
-                snapshot_path = self._camera.save_snapshot(
-                    shared_frame,
-                    SnapshotDomain.MOTION_DETECTOR,
+                snapshot_path = self._camera.snapshot_path(
+                    SnapshotDomain.MOTION_DETECTOR
                 )
             self._insert_motion(snapshot_path)
+            if shared_frame and snapshot_path:
+                self._camera.save_snapshot(
+                    shared_frame, SnapshotDomain.MOTION_DETECTOR, snapshot_path
+                )
             self._vis.dispatch_event(
                 EVENT_CAMERA_EVENT_DB_OPERATION.format(
                     camera_identifier=self._camera.identifier,
@@ -355,9 +358,7 @@ class AbstractMotionDetectorScanner(AbstractMotionDetector):
     ) -> None:
         super().__init__(vis, component, config, camera_identifier)
 
-        self._get_frame_function: Callable[[SharedFrame], np.ndarray] = getattr(
-            self, f"_get_decoded_frame_{color_format}"
-        )
+        self._color_format = color_format
 
         self._resolution = (
             config[CONFIG_CAMERAS][camera_identifier][CONFIG_WIDTH],
@@ -370,7 +371,10 @@ class AbstractMotionDetectorScanner(AbstractMotionDetector):
             self._mask = generate_mask(
                 config[CONFIG_CAMERAS][camera_identifier][CONFIG_MASK]
             )
-            self._mask_image = generate_mask_image(self._mask, self._camera.resolution)
+            # Mask coordinates are given in the camera resolution
+            self._mask_image = generate_mask_image(
+                self._mask, self._resolution, self._camera.resolution
+            )
 
         self._kill_received = False
         self.motion_detection_queue: Queue[Event[EventFrameToScan]] = Queue(maxsize=1)
@@ -400,9 +404,12 @@ class AbstractMotionDetectorScanner(AbstractMotionDetector):
             vis.register_signal_handler(VISERON_SIGNAL_SHUTDOWN, self.stop)
         )
 
-    @abstractmethod
     def preprocess(self, frame: np.ndarray) -> np.ndarray:
-        """Perform preprocessing of frame before running detection."""
+        """Perform preprocessing of frame before running detection.
+
+        The frame is already converted and resized to the configured resolution.
+        """
+        return frame
 
     def _apply_mask(self, frame: np.ndarray) -> np.ndarray:
         """Apply motion mask to frame."""
@@ -421,13 +428,14 @@ class AbstractMotionDetectorScanner(AbstractMotionDetector):
             contours,
         )
 
-    def _get_decoded_frame_rgb(self, shared_frame) -> np.ndarray:
-        """Return frame in rgb format."""
-        return self._camera.shared_frames.get_decoded_frame_rgb(shared_frame)
+    def _get_frame(self, shared_frame: SharedFrame) -> np.ndarray:
+        """Return frame in the scanners color format and resolution.
 
-    def _get_decoded_frame_gray(self, shared_frame) -> np.ndarray:
-        """Return frame in gray format."""
-        return self._camera.shared_frames.get_decoded_frame_gray(shared_frame)
+        The frame is shared with other scanners and must not be modified.
+        """
+        return self._camera.shared_frames.get_resized_frame(
+            shared_frame, self._color_format, self._resolution
+        )
 
     def _motion_detection(self) -> None:
         """Perform motion detection and publish the results."""
@@ -439,8 +447,9 @@ class AbstractMotionDetectorScanner(AbstractMotionDetector):
 
             shared_frame = frame_to_scan.data.shared_frame
             with shared_frame:
-                decoded_frame = self._get_frame_function(shared_frame).copy()
+                decoded_frame = self._get_frame(shared_frame)
                 if self._mask:
+                    decoded_frame = decoded_frame.copy()
                     apply_mask(decoded_frame, self._mask_image)
                 preprocessed_frame = self.preprocess(decoded_frame)
 
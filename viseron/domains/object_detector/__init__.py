@@ -6,11 +6,12 @@ import logging
 import time
 from abc import abstractmethod
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from queue import Empty, Queue
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import voluptuous as vol
 from sqlalchemy import insert
 
@@ -63,6 +64,8 @@ from .const import (
     CONFIG_MASK,
     CONFIG_MAX_FRAME_AGE,
     CONFIG_SCAN_ON_MOTION_ONLY,
+    CONFIG_TRACK_OBJECTS,
+    CONFIG_TRACK_REFRESH_INTERVAL,
     CONFIG_ZONE_NAME,
     CONFIG_ZONES,
     DEFAULT_FPS,
@@ -80,6 +83,8 @@ from .const import (
     DEFAULT_MASK,
     DEFAULT_MAX_FRAME_AGE,
     DEFAULT_SCAN_ON_MOTION_ONLY,
+    DEFAULT_TRACK_OBJECTS,
+    DEFAULT_TRACK_REFRESH_INTERVAL,
     DEFAULT_ZONES,
     DEPRECATED_LABEL_TRIGGER_RECORDER,
     DESC_CAMERAS,
@@ -101,6 +106,8 @@ from .const import (
     DESC_MASK,
     DESC_MAX_FRAME_AGE,
     DESC_SCAN_ON_MOTION_ONLY,
+    DESC_TRACK_OBJECTS,
+    DESC_TRACK_REFRESH_INTERVAL,
     DESC_ZONE_NAME,
     DESC_ZONES,
     DOMAIN,
@@ -110,7 +117,9 @@ from .const import (
     WARNING_LABEL_TRIGGER_RECORDER,
 )
 from .detected_object import DetectedObject, EventDetectedObjectsData
+from .detection_batch import DetectionBatch
 from .sensor import ObjectDetectorFPSSensor
+from .tracker import ObjectTracker
 from .zone import Zone
 
 if TYPE_CHECKING:
@@ -236,6 +245,16 @@ CAMERA_SCHEMA = vol.Schema(
         vol.Optional(CONFIG_ZONES, default=DEFAULT_ZONES, description=DESC_ZONES): [
             ZONE_SCHEMA
         ],
+        vol.Optional(
+            CONFIG_TRACK_OBJECTS,
+            default=DEFAULT_TRACK_OBJECTS,
+            description=DESC_TRACK_OBJECTS,
+        ): bool,
+        vol.Optional(
+            CONFIG_TRACK_REFRESH_INTERVAL,
+            default=DEFAULT_TRACK_REFRESH_INTERVAL,
+            description=DESC_TRACK_REFRESH_INTERVAL,
+        ): FLOAT_MIN_ZERO,
     },
 )
 
@@ -317,6 +336,12 @@ class AbstractObjectDetector(AbstractDomain):
                 "No labels or zones configured. No objects will be detected"
             )
 
+        self._tracker: ObjectTracker | None = None
+        if config[CONFIG_CAMERAS][camera_identifier][CONFIG_TRACK_OBJECTS]:
+            self._tracker = ObjectTracker(
+                config[CONFIG_CAMERAS][camera_identifier][CONFIG_TRACK_REFRESH_INTERVAL]
+            )
+
         self._min_confidence = min(
             (label.confidence for label in self.concat_labels()),
             default=1.0,
@@ -388,21 +413,72 @@ class AbstractObjectDetector(AbstractDomain):
 
         return list(self.object_filters.values()) + zone_filters
 
+    def filter_objects(
+        self, shared_frame: SharedFrame, detections: DetectionBatch
+    ) -> list[DetectedObject]:
+        """Filter detections against the field of view and all zones.
+
+        The filters are evaluated for all detections at once, and only the
+        detections that pass a filter are returned as DetectedObject, unless all
+        objects are logged.
+        """
+        in_fov = np.zeros(len(detections), dtype=bool)
+        for object_filter in self.object_filters.values():
+            in_fov |= object_filter.filter_batch(detections)
+        in_zones = np.array(
+            [zone.filter_batch(detections) for zone in self.zones], dtype=bool
+        ).reshape(len(self.zones), len(detections))
+
+        indices: np.ndarray
+        if self._config[CONFIG_CAMERAS][self._camera.identifier][
+            CONFIG_LOG_ALL_OBJECTS
+        ]:
+            indices = np.arange(len(detections))
+        else:
+            indices = np.flatnonzero(in_fov | in_zones.any(axis=0))
+        objects = detections.objects(indices)
+
+        self.track_objects(
+            objects,
+            [
+                frozenset(
+                    zone.name
+                    for zone, in_zone in zip(self.zones, in_zones)
+                    if in_zone[index]
+                )
+                for index in indices
+            ],
+            shared_frame.capture_time,
+        )
+        self.filter_fov(shared_frame, objects, in_fov[indices])
+        self.filter_zones(shared_frame, objects, in_zones[:, indices])
+        return objects
+
     def filter_fov(
-        self, shared_frame: SharedFrame, objects: list[DetectedObject]
+        self,
+        shared_frame: SharedFrame,
+        objects: list[DetectedObject],
+        in_fov: Sequence[bool],
     ) -> None:
-        """Filter field of view."""
+        """Filter field of view.
+
+        in_fov contains the result of the field of view filters for each object.
+        """
         objects_in_fov = []
-        for obj in objects:
-            if self.object_filters.get(obj.label) and self.object_filters[
-                obj.label
-            ].filter_object(obj):
-                obj.relevant = True
-                objects_in_fov.append(obj)
+        for obj, obj_in_fov in zip(objects, in_fov):
+            if not obj_in_fov:
+                # Sets which filter discarded the object, for logging
+                if obj.label in self.object_filters:
+                    self.object_filters[obj.label].filter_object(obj)
+                continue
+
+            object_filter = self.object_filters[obj.label]
+            obj.relevant = True
+            objects_in_fov.append(obj)
 
-                if self.object_filters[obj.label].trigger_event_recording:
-                    obj.trigger_event_recording = True
-                self.object_filters[obj.label].should_store(obj)
+            if object_filter.trigger_event_recording:
+                obj.trigger_event_recording = True
+            object_filter.should_store(obj)
 
         self._objects_in_fov_setter(shared_frame, objects_in_fov)
         if self._config[CONFIG_CAMERAS][self._camera.identifier][
@@ -451,9 +527,15 @@ class AbstractObjectDetector(AbstractDomain):
             if obj.store:
                 snapshot_path = None
                 if shared_frame:
-                    snapshot_path = self._camera.save_snapshot(
+                    snapshot_path = self._camera.snapshot_path(
+                        SnapshotDomain.OBJECT_DETECTOR
+                    )
+                self._insert_object(obj, snapshot_path)
+                if snapshot_path:
+                    self._camera.save_snapshot(
                         shared_frame,
                         SnapshotDomain.OBJECT_DETECTOR,
+                        snapshot_path,
                         (
                             obj.rel_x1,
                             obj.rel_y1,
@@ -462,7 +544,6 @@ class AbstractObjectDetector(AbstractDomain):
                         ),
                         detected_object=obj,
                     )
-                self._insert_object(obj, snapshot_path)
                 self._vis.dispatch_event(
                     EVENT_CAMERA_EVENT_DB_OPERATION.format(
                         camera_identifier=self._camera.identifier,
@@ -494,12 +575,32 @@ class AbstractObjectDetector(AbstractDomain):
             ),
         )
 
+    def track_objects(
+        self,
+        objects: list[DetectedObject],
+        zones: list[frozenset[str]],
+        frame_time: float,
+    ) -> None:
+        """Assign objects to tracks, which decides if they are stored and processed.
+
+        zones contains the names of the zones each object is in.
+        """
+        if self._tracker is None:
+            return
+        self._tracker.update(objects, zones, frame_time)
+
     def filter_zones(
-        self, shared_frame: SharedFrame, objects: list[DetectedObject]
+        self,
+        shared_frame: SharedFrame,
+        objects: list[DetectedObject],
+        in_zones: np.ndarray,
     ) -> None:
-        """Filter all zones."""
-        for zone in self.zones:
-            zone.filter_zone(shared_frame, objects)
+        """Filter all zones.
+
+        in_zones contains a row for each zone with the result of its filters.
+        """
+        for zone, in_zone in zip(self.zones, in_zones):
+            zone.filter_zone(shared_frame, objects, in_zone)
 
     @abstractmethod
     def preprocess(self, frame):
@@ -535,14 +636,17 @@ class AbstractObjectDetector(AbstractDomain):
         self._preproc_fps.append(1 / (time.time() - frame_time))
 
         frame_time = time.time()
-        objects = self.return_objects(preprocessed_frame)
-        if objects is None:
+        detections = self.return_objects(preprocessed_frame)
+        if detections is None:
             return
 
         self._inference_fps.append(1 / (time.time() - frame_time))
 
-        self.filter_fov(shared_frame, objects)
-        self.filter_zones(shared_frame, objects)
+        if not isinstance(detections, DetectionBatch):
+            detections = DetectionBatch.from_objects(
+                detections, self._camera.resolution
+            )
+        objects = self.filter_objects(shared_frame, detections)
         self._insert_objects(shared_frame, objects)
         self._vis.dispatch_event(
             EVENT_OBJECT_DETECTOR_RESULT.format(
@@ -557,8 +661,12 @@ class AbstractObjectDetector(AbstractDomain):
         self._theoretical_max_fps.append(1 / (time.time() - frame_time))
 
     @abstractmethod
-    def return_objects(self, frame) -> list[DetectedObject] | None:
-        """Perform object detection."""
+    def return_objects(self, frame) -> list[DetectedObject] | DetectionBatch | None:
+        """Perform object detection.
+
+        Detectors that get their detections as arrays should return a
+        DetectionBatch, so that objects are only created for relevant detections.
+        """
 
     @property
     def fps(self):
@@ -0,0 +1,60 @@
+"""Metrics of object detectors that batch frames from several cameras."""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from viseron.helpers import percentile
+
+from .const import BATCH_METRICS
+
+if TYPE_CHECKING:
+    from viseron import Viseron
+
+
+class BatchMetrics:
+    """Batch size and queue wait of the last 1000 inferred frames.
+
+    The metrics are registered per component and exposed in the system API.
+    """
+
+    def __init__(self, vis: Viseron, component: str) -> None:
+        self._vis = vis
+        self._component = component
+        self._lock = threading.Lock()
+        self._batch_sizes: deque[int] = deque(maxlen=1000)
+        self._queue_waits: deque[float] = deque(maxlen=1000)
+        vis.data.setdefault(BATCH_METRICS, {})[component] = self
+
+    def add(self, batch_size: int, queue_wait: float) -> None:
+        """Add a frame that was inferred in a batch of batch_size frames."""
+        with self._lock:
+            self._batch_sizes.append(batch_size)
+            self._queue_waits.append(queue_wait)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return batch size and queue wait metrics."""
+        with self._lock:
+            batch_sizes = list(self._batch_sizes)
+            queue_waits = list(self._queue_waits)
+        if not batch_sizes:
+            return {
+                "batch_size_avg": None,
+                "batch_size_max": None,
+                "queue_wait_avg": None,
+                "queue_wait_p99": None,
+            }
+        return {
+            "batch_size_avg": sum(batch_sizes) / len(batch_sizes),
+            "batch_size_max": max(batch_sizes),
+            "queue_wait_avg": sum(queue_waits) / len(queue_waits),
+            "queue_wait_p99": percentile(queue_waits, 0.99),
+        }
+
+    def unregister(self) -> None:
+        """Remove the metrics from the system API."""
+        batch_metrics = self._vis.data.get(BATCH_METRICS, {})
+        if batch_metrics.get(self._component) is self:
+            del batch_metrics[self._component]
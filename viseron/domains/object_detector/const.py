@@ -8,6 +8,10 @@ DOMAIN: Final = "object_detector"
 
 MODEL_CACHE: Final = os.path.join(CONFIG_DIR, "models")
 
+# Key in vis.data where the BatchMetrics of each object detector component that
+# batches frames are stored
+BATCH_METRICS: Final = "object_detector_batch_metrics"
+
 # Data stream topic constants
 EVENT_OBJECT_DETECTOR_SCAN = "object_detector/{camera_identifier}/scan"
 EVENT_OBJECT_DETECTOR_RESULT = "object_detector/{camera_identifier}/result"
@@ -85,7 +89,9 @@ DESC_LABEL_STORE = (
 )
 DESC_LABEL_STORE_INTERVAL = (
     "The interval at which the label should be stored in the database, in seconds. "
-    "If set to 0, the label will be stored every time it is detected."
+    "If set to 0, the label will be stored every time it is detected. "
+    "When <code>track_objects</code> is enabled, the interval applies to each "
+    "tracked object."
 )
 
 # CAMERA_SCHEMA constants
@@ -99,6 +105,8 @@ CONFIG_LOG_ALL_OBJECTS = "log_all_objects"
 CONFIG_MASK = "mask"
 CONFIG_ZONES = "zones"
 CONFIG_COORDINATES = "coordinates"
+CONFIG_TRACK_OBJECTS = "track_objects"
+CONFIG_TRACK_REFRESH_INTERVAL = "track_refresh_interval"
 
 DEFAULT_FPS = 1
 DEFAULT_SCAN_ON_MOTION_ONLY = True
@@ -107,6 +115,8 @@ DEFAULT_MAX_FRAME_AGE = 2
 DEFAULT_LOG_ALL_OBJECTS = False
 DEFAULT_MASK: list[dict[str, int]] = []
 DEFAULT_ZONES: list[dict[str, Any]] = []
+DEFAULT_TRACK_OBJECTS = False
+DEFAULT_TRACK_REFRESH_INTERVAL = 5
 
 DESC_CAMERAS = (
     "Camera-specific configuration. All subordinate "
@@ -138,6 +148,26 @@ DESC_ZONES = (
     "look for certain objects (labels)."
 )
 DESC_COORDINATES = "List of X and Y coordinates to form a polygon"
+DESC_TRACK_OBJECTS = (
+    "If set to <code>true</code>, objects are tracked across frames. "
+    "A tracked object is only stored and sent to post processors when it first "
+    "appears, changes label or enters/leaves a zone, instead of on every frame. "
+    "Stationary objects are stored again every <code>store_interval</code> seconds."
+)
+DESC_TRACK_REFRESH_INTERVAL = (
+    "Number of seconds between sending a tracked object that has not changed to "
+    "post processors, like face recognition and license plate recognition."
+)
+
+# Tracker constants
+# Minimum overlap (IoU) of the bounding boxes of an object in two frames
+TRACKER_IOU_THRESHOLD = 0.3
+# Objects that do not overlap are matched if their centers are closer than this,
+# relative to the diagonal of the bounding box of the tracked object.
+# Happens when objects move fast or the object detector runs at a low FPS
+TRACKER_MAX_CENTER_DISTANCE = 0.75
+# Tracks that have not been matched for this many seconds are removed
+TRACKER_MAX_AGE = 10
 
 # ZONE_SCHEMA constants
 CONFIG_ZONE_NAME = "name"
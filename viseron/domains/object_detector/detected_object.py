@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from viseron.domains.camera.shared_frames import SharedFrame
 from viseron.events import EventData
@@ -12,6 +12,9 @@ from viseron.helpers import (
     convert_letterboxed_bbox,
 )
 
+if TYPE_CHECKING:
+    from viseron.domains.object_detector.tracker import Track
+
 
 class DetectedObject:
     """Object that holds a detected object.
@@ -53,6 +56,10 @@ class DetectedObject:
         self._relevant = False
         self._filter_hit = None
 
+        self._track: Track | None = None
+        self._track_changed = True
+        self._track_refreshed = True
+
     @classmethod
     def from_relative(
         cls,
@@ -261,6 +268,45 @@ class DetectedObject:
     def filter_hit(self, value) -> None:
         self._filter_hit = value
 
+    @property
+    def track(self) -> Track | None:
+        """Return the track of the object, if objects are tracked."""
+        return self._track
+
+    @track.setter
+    def track(self, value: Track | None) -> None:
+        self._track = value
+
+    @property
+    def track_id(self) -> int | None:
+        """Return the ID of the track, which stays the same across frames."""
+        return self._track.track_id if self._track else None
+
+    @property
+    def track_changed(self) -> bool:
+        """Return if the object appeared, or changed label or zones in this frame.
+
+        Always True for objects that are not tracked.
+        """
+        return self._track_changed
+
+    @track_changed.setter
+    def track_changed(self, value: bool) -> None:
+        self._track_changed = value
+
+    @property
+    def track_refreshed(self) -> bool:
+        """Return if the object should be sent to post processors.
+
+        True if the object changed or if the refresh interval has passed.
+        Always True for objects that are not tracked.
+        """
+        return self._track_refreshed
+
+    @track_refreshed.setter
+    def track_refreshed(self, value: bool) -> None:
+        self._track_refreshed = value
+
     def as_dict(self) -> dict[str, Any]:
         """Convert to dict."""
         return self.formatted
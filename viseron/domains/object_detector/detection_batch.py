@@ -0,0 +1,203 @@
+"""Detections of a frame stored as arrays."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from viseron.helpers import convert_letterboxed_boxes, points_in_polygon
+
+from .detected_object import DetectedObject
+
+
+def _round(values: np.ndarray) -> np.ndarray:
+    """Round values to 3 decimals, the same way as the builtin round does.
+
+    np.round scales the values, which can turn a value just below or above a
+    midpoint into an exact midpoint. Those values are rounded with round instead.
+    """
+    rounded = np.round(values, 3)
+    scaled = values * 1000
+    midpoints = np.floor(scaled) + 0.5 == scaled
+    if midpoints.any():
+        rounded[midpoints] = [round(float(value), 3) for value in values[midpoints]]
+    return rounded
+
+
+class DetectionBatch:
+    """Holds all detections of a single frame as arrays.
+
+    Filters and zones are evaluated for all detections at once, and DetectedObject
+    is only created for the detections that are kept.
+    Boxes are relative and given as rows of x1, y1, x2, y2, rounded like in
+    DetectedObject.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+        objects: list[DetectedObject] | None = None,
+    ) -> None:
+        self._labels = np.array(labels, dtype=str).reshape(-1)
+        self._confidences = _round(
+            np.asarray(confidences, dtype=np.float64).reshape(-1)
+        )
+        self._boxes = _round(np.asarray(boxes, dtype=np.float64).reshape(-1, 4))
+        self._widths = _round(self._boxes[:, 2] - self._boxes[:, 0])
+        self._heights = _round(self._boxes[:, 3] - self._boxes[:, 1])
+        self._frame_res = frame_res
+        self._objects = objects
+        self._label_masks: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_relative(
+        cls,
+        labels: Sequence[str],
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+    ) -> DetectionBatch:
+        """Create batch from relative coordinates."""
+        return cls(labels, confidences, boxes, frame_res)
+
+    @classmethod
+    def from_absolute(
+        cls,
+        labels: Sequence[str],
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+        model_res: tuple[int, int],
+    ) -> DetectionBatch:
+        """Create batch from absolute coordinates."""
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        return cls(labels, confidences, boxes / (model_res * 2), frame_res)
+
+    @classmethod
+    def from_relative_letterboxed(
+        cls,
+        labels: Sequence[str],
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+        model_res: tuple[int, int],
+    ) -> DetectionBatch:
+        """Create batch from relative coordinates when frame is letterboxed."""
+        boxes = np.floor(
+            np.asarray(boxes, dtype=np.float64).reshape(-1, 4) * (model_res * 2)
+        )
+        return cls.from_absolute_letterboxed(
+            labels, confidences, boxes, frame_res, model_res
+        )
+
+    @classmethod
+    def from_absolute_letterboxed(
+        cls,
+        labels: Sequence[str],
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+        model_res: tuple[int, int],
+    ) -> DetectionBatch:
+        """Create batch from absolute coordinates when frame is letterboxed."""
+        relative_boxes = convert_letterboxed_boxes(
+            frame_res[0],
+            frame_res[1],
+            model_res[0],
+            model_res[1],
+            np.asarray(boxes, dtype=np.float64),
+        )
+        return cls(labels, confidences, relative_boxes, frame_res)
+
+    @classmethod
+    def from_objects(
+        cls, objects: list[DetectedObject], frame_res: tuple[int, int]
+    ) -> DetectionBatch:
+        """Create batch from already created objects, which are kept as is."""
+        batch = cls(
+            [obj.label for obj in objects],
+            [obj.confidence for obj in objects],
+            [obj.rel_coordinates for obj in objects],
+            frame_res,
+            objects=objects,
+        )
+        # Sizes are calculated before negative coordinates are clamped to zero
+        batch._widths = np.array([obj.rel_width for obj in objects], dtype=np.float64)
+        batch._heights = np.array([obj.rel_height for obj in objects], dtype=np.float64)
+        return batch
+
+    def __len__(self) -> int:
+        """Return number of detections."""
+        return len(self._labels)
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Return label of each detection."""
+        return self._labels
+
+    @property
+    def confidences(self) -> np.ndarray:
+        """Return confidence of each detection."""
+        return self._confidences
+
+    @property
+    def boxes(self) -> np.ndarray:
+        """Return relative bounding box of each detection."""
+        return self._boxes
+
+    @property
+    def widths(self) -> np.ndarray:
+        """Return relative width of each detection."""
+        return self._widths
+
+    @property
+    def heights(self) -> np.ndarray:
+        """Return relative height of each detection."""
+        return self._heights
+
+    def has_label(self, label: str) -> np.ndarray:
+        """Return which detections have label.
+
+        Cached, since the same label is usually filtered on in several zones.
+        """
+        if (mask := self._label_masks.get(label)) is None:
+            mask = self._label_masks[label] = self._labels == label
+        return mask
+
+    def in_polygon(
+        self,
+        resolution: tuple[int, int],
+        coordinates: np.ndarray,
+        indices: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Return which detections are within a boundary.
+
+        Same as object_in_polygon, which uses the bottom center of the bounding box.
+        If indices is given, only those detections are evaluated.
+        """
+        boxes = self._boxes if indices is None else self._boxes[indices]
+        # Objects close to the edge of the frame might have negative coordinates
+        boxes = np.clip(boxes, 0, None)
+        x1 = np.floor(boxes[:, 0] * resolution[0])
+        x2 = np.floor(boxes[:, 2] * resolution[0])
+        y2 = np.floor(boxes[:, 3] * resolution[1])
+        return points_in_polygon(
+            np.column_stack((((x2 - x1) / 2) + x1, y2)), coordinates
+        )
+
+    def objects(self, indices: Sequence[int] | np.ndarray) -> list[DetectedObject]:
+        """Return the detections at indices as DetectedObject."""
+        if self._objects is not None:
+            return [self._objects[index] for index in indices]
+        # Python floats are much faster to round than numpy scalars
+        return [
+            DetectedObject(label, confidence, x1, y1, x2, y2, self._frame_res)
+            for label, confidence, (x1, y1, x2, y2) in zip(
+                self._labels[indices].tolist(),
+                self._confidences[indices].tolist(),
+                self._boxes[indices].tolist(),
+            )
+        ]
@@ -0,0 +1,168 @@
+"""Tracking of detected objects across frames."""
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .const import TRACKER_IOU_THRESHOLD, TRACKER_MAX_AGE, TRACKER_MAX_CENTER_DISTANCE
+
+if TYPE_CHECKING:
+    from .detected_object import DetectedObject
+
+
+@dataclass
+class Track:
+    """An object that has been followed across frames."""
+
+    track_id: int
+    label: str
+    box: np.ndarray
+    zones: frozenset[str]
+    last_seen: float
+    last_refreshed: float
+    last_stored: datetime.datetime = field(
+        default_factory=lambda: datetime.datetime.min.replace(
+            tzinfo=datetime.timezone.utc
+        )
+    )
+
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Return the IoU of every box in boxes_a with every box in boxes_b.
+
+    Boxes are given as rows of x1, y1, x2, y2.
+    """
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.divide(
+        intersection, union, out=np.zeros_like(intersection), where=union > 0
+    )
+
+
+def _greedy_match(scores: np.ndarray, threshold: float) -> list[tuple[int, int]]:
+    """Pair rows and columns with the highest scores, each at most once."""
+    scores = scores.copy()
+    matches = []
+    for _ in range(min(scores.shape)):
+        row, col = divmod(int(np.argmax(scores)), scores.shape[1])
+        if scores[row, col] < threshold:
+            break
+        matches.append((row, col))
+        scores[row, :] = -np.inf
+        scores[:, col] = -np.inf
+    return matches
+
+
+class ObjectTracker:
+    """Follow detected objects across frames.
+
+    Objects are matched to tracks on the overlap of their bounding boxes, and
+    objects that moved too far to overlap are matched on the distance between the
+    centers of their bounding boxes.
+    Each object gets the track it belongs to. An object is marked as changed if
+    its track started, or if it changed label or zones since the previous frame.
+    It is marked as refreshed if it changed or if refresh_interval seconds have
+    passed since it was last refreshed.
+    """
+
+    def __init__(self, refresh_interval: float) -> None:
+        self._refresh_interval = refresh_interval
+        self._tracks: list[Track] = []
+        self._next_track_id = 1
+
+    @property
+    def tracks(self) -> list[Track]:
+        """Return the current tracks."""
+        return self._tracks
+
+    def _match(self, boxes: np.ndarray) -> dict[int, Track]:
+        """Return the matched track of each box, by box index."""
+        if not self._tracks or boxes.shape[0] == 0:
+            return {}
+
+        track_boxes = np.array([track.box for track in self._tracks])
+        matches = _greedy_match(box_iou(track_boxes, boxes), TRACKER_IOU_THRESHOLD)
+        matched_tracks = {row for row, _ in matches}
+        matched_boxes = {col for _, col in matches}
+
+        # Fall back to the distance between centers for the remaining objects
+        track_centers = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+        distances = np.linalg.norm(
+            track_centers[:, None, :] - centers[None, :, :], axis=2
+        )
+        diagonals = np.linalg.norm(track_boxes[:, 2:] - track_boxes[:, :2], axis=1)
+        # Negated so that the closest pair has the highest score
+        scores = -distances / np.maximum(diagonals, 1e-6)[:, None]
+        scores[list(matched_tracks), :] = -np.inf
+        scores[:, list(matched_boxes)] = -np.inf
+        matches += _greedy_match(scores, -TRACKER_MAX_CENTER_DISTANCE)
+
+        return {col: self._tracks[row] for row, col in matches}
+
+    def update(
+        self,
+        objects: list[DetectedObject],
+        zones: list[frozenset[str]],
+        timestamp: float,
+    ) -> None:
+        """Assign objects to tracks.
+
+        zones contains the names of the zones each object is in.
+        """
+        boxes = np.array(
+            [obj.rel_coordinates for obj in objects], dtype=np.float64
+        ).reshape(-1, 4)
+        matched = self._match(boxes)
+
+        tracks = []
+        for index, obj in enumerate(objects):
+            track = matched.get(index)
+            if track is None:
+                track = Track(
+                    track_id=self._next_track_id,
+                    label=obj.label,
+                    box=boxes[index],
+                    zones=zones[index],
+                    last_seen=timestamp,
+                    last_refreshed=timestamp,
+                )
+                self._next_track_id += 1
+                changed = True
+            else:
+                changed = track.label != obj.label or track.zones != zones[index]
+                track.label = obj.label
+                track.box = boxes[index]
+                track.zones = zones[index]
+                track.last_seen = timestamp
+
+            refreshed = (
+                changed or timestamp - track.last_refreshed >= self._refresh_interval
+            )
+            if refreshed:
+                track.last_refreshed = timestamp
+
+            obj.track = track
+            obj.track_changed = changed
+            obj.track_refreshed = refreshed
+            tracks.append(track)
+
+        # Keep unmatched tracks for a while in case the object is missed in a frame
+        matched_ids = {track.track_id for track in tracks}
+        for track in self._tracks:
+            if (
+                track.track_id not in matched_ids
+                and timestamp - track.last_seen <= TRACKER_MAX_AGE
+            ):
+                tracks.append(track)
+        self._tracks = tracks
@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 from viseron.domains.camera.const import DOMAIN as CAMERA_DOMAIN
 from viseron.domains.object_detector.const import CONFIG_LABEL_LABEL
 from viseron.domains.object_detector.detected_object import EventDetectedObjectsData
-from viseron.helpers import generate_numpy_from_coordinates, object_in_polygon
+from viseron.helpers import generate_numpy_from_coordinates
 from viseron.helpers.filter import Filter
 
 from .binary_sensor import (
@@ -26,6 +29,7 @@ if TYPE_CHECKING:
     from viseron import Viseron
     from viseron.domains.camera.shared_frames import SharedFrame
     from viseron.domains.object_detector.detected_object import DetectedObject
+    from viseron.domains.object_detector.detection_batch import DetectionBatch
 
 
 class Zone:
@@ -84,22 +88,40 @@ class Zone:
             camera_identifier,
         )
 
+    def filter_batch(self, batch: DetectionBatch) -> np.ndarray:
+        """Return which detections meet the zone filters and are within the zone."""
+        in_zone = np.zeros(len(batch), dtype=bool)
+        for object_filter in self._object_filters.values():
+            in_zone |= object_filter.filter_batch(batch)
+
+        # Only the detections that meet the filters are tested against the polygon
+        indices = np.flatnonzero(in_zone)
+        if len(indices):
+            in_zone[indices] = batch.in_polygon(
+                self._camera_resolution, self._coordinates, indices
+            )
+        return in_zone
+
     def filter_zone(
-        self, shared_frame: SharedFrame, objects: list[DetectedObject]
+        self,
+        shared_frame: SharedFrame,
+        objects: list[DetectedObject],
+        in_zone: Sequence[bool],
     ) -> None:
-        """Filter out objects to see if they are within the zone."""
+        """Set the objects that are within the zone.
+
+        in_zone contains the result of filter_batch for each object.
+        """
         objects_in_zone = []
-        for obj in objects:
-            if self._object_filters.get(obj.label) and self._object_filters[
-                obj.label
-            ].filter_object(obj):
-                if object_in_polygon(self._camera_resolution, obj, self._coordinates):
-                    obj.relevant = True
-                    objects_in_zone.append(obj)
-
-                    if self._object_filters[obj.label].trigger_event_recording:
-                        obj.trigger_event_recording = True
-                    self._object_filters[obj.label].should_store(obj)
+        for obj, obj_in_zone in zip(objects, in_zone):
+            if not obj_in_zone:
+                continue
+            obj.relevant = True
+            objects_in_zone.append(obj)
+
+            if self._object_filters[obj.label].trigger_event_recording:
+                obj.trigger_event_recording = True
+            self._object_filters[obj.label].should_store(obj)
 
         self.objects_in_zone_setter(shared_frame, objects_in_zone)
 
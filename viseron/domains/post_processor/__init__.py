@@ -199,16 +199,16 @@ class AbstractPostProcessor(AbstractDomain):
                 self._logger.debug("No frame, skipping post processing")
                 continue
 
-            if self._labels:
-                filtered_objects = [
-                    detected_object
-                    for detected_object in detected_objects_data.objects
-                    if detected_object.label in self._labels
-                ]
-                if filtered_objects:
-                    _process(detected_objects_data, filtered_objects)
-            elif detected_objects_data.objects:
-                _process(detected_objects_data, detected_objects_data.objects)
+            # Tracked objects are only processed when they appear or change, and
+            # then again every refresh interval
+            filtered_objects = [
+                detected_object
+                for detected_object in detected_objects_data.objects
+                if detected_object.track_refreshed
+                and (not self._labels or detected_object.label in self._labels)
+            ]
+            if filtered_objects:
+                _process(detected_objects_data, filtered_objects)
 
         self._logger.debug(f"Post processor {self.__class__.__name__} stopped")
 
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import partial
 from typing import Any, Generic
 
@@ -21,6 +21,7 @@ class Event(Generic[T]):
     name: str
     data: T
     timestamp: float
+    _json: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def as_dict(self) -> dict[str, Any]:
         """Convert Event to dict."""
@@ -30,9 +31,21 @@ class Event(Generic[T]):
             "timestamp": self.timestamp,
         }
 
+    @property
+    def cached_json(self) -> str | None:
+        """Return the JSON string if the event has already been serialized."""
+        return self._json
+
     def as_json(self) -> str:
-        """Convert Event to JSON string."""
-        return partial(json.dumps, cls=JSONEncoder, allow_nan=False)(self.as_dict())
+        """Convert Event to JSON string.
+
+        The result is cached since the same event is sent to many subscribers.
+        """
+        if self._json is None:
+            self._json = partial(json.dumps, cls=JSONEncoder, allow_nan=False)(
+                self.as_dict()
+            )
+        return self._json
 
 
 class EventData:
@@ -28,6 +28,7 @@ from viseron.const import FONT, FONT_SIZE, FONT_THICKNESS, MIN_LABEL_Y_POSITION
 
 if TYPE_CHECKING:
     import multiprocessing as mp
+    from collections.abc import Iterable
 
     from viseron.domains.object_detector.detected_object import DetectedObject
     from viseron.viseron_types import Domain
@@ -458,6 +459,17 @@ def pop_if_full(
     pop_if_full(queue, item, logger, name, warn, max_attempts, _attempt + 1)
 
 
+def percentile(values: Iterable[float], fraction: float) -> float | None:
+    """Return the nearest-rank percentile of values, eg 0.99 for p99.
+
+    Returns None if there are no values.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(math.ceil(len(ordered) * fraction) - 1, 0)]
+
+
 def slugify(text: str) -> str:
     """Slugify a given text."""
     return unicode_slug.slugify(text, separator="_")
@@ -489,8 +501,18 @@ def generate_mask(coordinates):
     return mask
 
 
-def generate_mask_image(mask, resolution):
-    """Return an image with the mask drawn on it."""
+def generate_mask_image(mask, resolution, mask_resolution=None):
+    """Return an image with the mask drawn on it.
+
+    If mask_resolution is given, the mask coordinates are in that resolution and are
+    scaled to resolution.
+    """
+    if mask_resolution and tuple(mask_resolution) != tuple(resolution):
+        scale = np.array(
+            [resolution[0] / mask_resolution[0], resolution[1] / mask_resolution[1]]
+        )
+        mask = [np.round(polygon * scale).astype(np.int32) for polygon in mask]
+
     mask_image = np.zeros(
         (
             resolution[1],
@@ -520,6 +542,34 @@ def object_in_polygon(resolution, obj: DetectedObject, coordinates):
     return cv2.pointPolygonTest(coordinates, (middle, y2), False) >= 0
 
 
+def points_in_polygon(points: np.ndarray, coordinates: np.ndarray) -> np.ndarray:
+    """Return which points are within or on the edge of a polygon.
+
+    Equivalent to cv2.pointPolygonTest(coordinates, point, False) >= 0 for every
+    point, given as rows of x, y, but evaluated for all points at once.
+    """
+    polygon = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.append(x1[1:], x1[0]), np.append(y1[1:], y1[0])
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x, y = points[:, 0:1], points[:, 1:2]
+
+    # Count the edges crossed by a ray from each point towards positive x
+    crosses = (y1 > y) != (y2 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing_x = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    inside = np.count_nonzero(crosses & (x < crossing_x), axis=1) % 2 == 1
+
+    on_edge = (
+        ((x2 - x1) * (y - y1) == (y2 - y1) * (x - x1))
+        & (np.minimum(x1, x2) <= x)
+        & (x <= np.maximum(x1, x2))
+        & (np.minimum(y1, y2) <= y)
+        & (y <= np.maximum(y1, y2))
+    )
+    return inside | on_edge.any(axis=1)
+
+
 def letterbox_resize(image: np.ndarray, width, height):
     """Resize image to expected size, keeping aspect ratio and pad with black pixels."""
     image_height, image_width, _ = image.shape
@@ -656,6 +706,50 @@ def convert_letterboxed_bbox(
     )
 
 
+def convert_letterboxed_boxes(
+    frame_width: int,
+    frame_height: int,
+    model_width: int,
+    model_height: int,
+    boxes: np.ndarray,
+) -> np.ndarray:
+    """Convert boundingboxes from a letterboxed image to the original image.
+
+    Same as convert_letterboxed_bbox, but for an array of ABSOLUTE boxes given as
+    rows of x1, y1, x2, y2. Returns relative coordinates, without rounding them.
+    """
+    if model_width != model_height:
+        raise ValueError(
+            "Can only convert bbox from a letterboxed image for models of equal "
+            f"width and height, got {model_width}x{model_height}",
+        )
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    x = boxes[:, [0, 2]]
+    y = boxes[:, [1, 3]]
+
+    scale = min(model_height / frame_height, model_width / frame_width)
+    output_height = int(frame_height * scale)
+    output_width = int(frame_width * scale)
+
+    if output_width > output_height:  # Horizontal padding
+        new_x = (x / model_width) * frame_width
+        new_y = (
+            (y - 1 / 2 * (model_height - frame_height / frame_width * model_height))
+            * frame_width
+            / model_width
+        )
+    else:  # Vertical padding
+        new_x = (
+            (x - 1 / 2 * (model_height - frame_width / frame_height * model_height))
+            * frame_height
+            / model_width
+        )
+        new_y = y / model_height * frame_height
+
+    converted = np.round(np.column_stack((new_x, new_y))[:, [0, 2, 1, 3]])
+    return converted / (frame_width, frame_height, frame_width, frame_height)
+
+
 def zoom_boundingbox(
     frame: np.ndarray,
     bounding_box: tuple[int, int, int, int],
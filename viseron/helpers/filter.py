@@ -20,7 +20,10 @@ from viseron.domains.object_detector.const import (
 from viseron.helpers import utcnow
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from viseron.domains.object_detector.detected_object import DetectedObject
+    from viseron.domains.object_detector.detection_batch import DetectionBatch
 
 
 class Filter:
@@ -81,8 +84,35 @@ class Filter:
             and self.filter_height(obj)
         )
 
+    def filter_batch(self, batch: DetectionBatch) -> np.ndarray:
+        """Return which detections are of this label and meet the filters.
+
+        Same as filter_object, but evaluated for all detections at once.
+        """
+        return (
+            batch.has_label(self._label)
+            & (batch.confidences > self._confidence)
+            & (batch.widths > self._width_min)
+            & (batch.widths < self._width_max)
+            & (batch.heights > self._height_min)
+            & (batch.heights < self._height_max)
+        )
+
     def should_store(self, obj: DetectedObject) -> bool:
         """Return True if object should be stored."""
+        if obj.track is not None:
+            # Tracked objects are stored when they change, and otherwise once every
+            # store interval per object. A filter that does not store the object
+            # does not override other filters that do
+            now = utcnow()
+            if self._store and (
+                obj.track_changed or now - obj.track.last_stored > self._store_interval
+            ):
+                obj.store = True
+                obj.track.last_stored = now
+                return True
+            return False
+
         # Only store if store interval has passed
         if self._store and utcnow() - self._last_stored > self._store_interval:
             obj.store = True
@@ -8,10 +8,10 @@ import secrets
 import subprocess as sp
 import threading
 from abc import ABC, abstractmethod
-from queue import Empty, Queue
+from queue import Empty, Full, Queue
 from typing import TYPE_CHECKING
 
-from manager import QueueManager, start, stop
+from manager import QueueManager, SharedFramePool, start, stop
 from viseron.const import VISERON_SIGNAL_SHUTDOWN
 from viseron.helpers import get_free_port, pop_if_full
 from viseron.helpers.logs import LogPipe
@@ -36,11 +36,18 @@ class SubProcessWorker(ABC):
     This input is then forwarded to another queue which is shared with a spawned
     python shell using QueueManager.
     Work is then performed in the child process and returned through output queue.
+
+    If shared_frames is True, numpy frames of dict items that are at least
+    SHARED_FRAME_MIN_BYTES large are passed through a SharedFramePool instead of
+    being pickled. The subprocess has to map the frame using SharedFrameReader.
     """
 
-    def __init__(self, vis: Viseron, name: str, qsize: int = 100) -> None:
+    def __init__(
+        self, vis: Viseron, name: str, qsize: int = 100, shared_frames: bool = False
+    ) -> None:
         self._name = name
         self._qsize = qsize
+        self._shared_frames = shared_frames
 
         self._authkey_store = BaseManagerAuthkeyStore(vis)
 
@@ -53,6 +60,7 @@ class SubProcessWorker(ABC):
         """Start the subprocess worker."""
         self._server_port = get_free_port(port=50000)
         self._process_frames_proc_exit = mp.Event()
+        self._frame_pool = SharedFramePool(self._qsize) if self._shared_frames else None
 
         self.input_queue: Queue = Queue(maxsize=self._qsize)
         self._input_thread = RestartableThread(
@@ -106,7 +114,26 @@ class SubProcessWorker(ABC):
                 input_item = self.input_queue.get(timeout=1)
             except Empty:
                 continue
-            pop_if_full(self._process_queue, input_item)
+            if self._frame_pool is None:
+                pop_if_full(self._process_queue, input_item)
+                continue
+            self._put_shared_frame(self._frame_pool, input_item)
+
+    def _put_shared_frame(self, frame_pool: SharedFramePool, input_item) -> None:
+        """Put item on the multiprocessing queue with its frame in shared memory.
+
+        Releases the slot of the oldest item if it has to be dropped.
+        """
+        input_item = frame_pool.put(input_item)
+        while True:
+            try:
+                self._process_queue.put_nowait(input_item)
+                return
+            except Full:
+                try:
+                    frame_pool.release(self._process_queue.get_nowait())
+                except Empty:
+                    pass
 
     @abstractmethod
     def spawn_subprocess(self) -> RestartablePopen:
@@ -123,6 +150,8 @@ class SubProcessWorker(ABC):
                 item = self._output_queue.get(timeout=1)
             except Empty:
                 continue
+            if self._frame_pool:
+                self._frame_pool.release(item)
             self.work_output(item)
 
     def stop(self) -> None:
@@ -141,6 +170,8 @@ class SubProcessWorker(ABC):
             )
             self._process_frames_proc.kill()
             self._process_frames_proc.communicate()
+        if self._frame_pool:
+            self._frame_pool.close()
         self._log_pipe.close()
         LOGGER.debug(f"{self.subprocess_name} exited")
 